@@ -6,7 +6,7 @@ import os
 import sys
 from datetime import date, datetime, time as dt_time
 from typing import Any
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 
 # Force unbuffered output
 sys.stdout.reconfigure(line_buffering=True)
@@ -30,6 +30,9 @@ if backend_path not in sys.path:
 
 # Import GHAminer streaming wrapper
 from ghaminer_stream import stream_workflow_runs_phase1, stream_job_details_phase2, load_config
+from extraction.jobs import extraction_scope_key
+from core.utils.metrics import WEBSOCKET_BYTES, WEBSOCKET_FRAMES
+from core.utils.tracing import current_extraction_id, span
 import time
 
 try:
@@ -39,7 +42,7 @@ except ImportError:
 
 # Try to import performance logger
 try:
-    from core.utils.logger import setup_performance_logger
+    from core.utils.logger import close_performance_logger, setup_performance_logger
     PERFORMANCE_LOGGING = True
 except ImportError:
     PERFORMANCE_LOGGING = False
@@ -59,6 +62,23 @@ class AggregationFilters:
     forceRefresh: bool = False
 
 
+def serialize_filters(filters: AggregationFilters) -> dict:
+    """Convert aggregation filters to a JSON-compatible dict (e.g. to queue an extraction job)"""
+    payload = asdict(filters)
+    payload["startDate"] = filters.startDate.isoformat()
+    payload["endDate"] = filters.endDate.isoformat()
+    return payload
+
+
+def deserialize_filters(payload: dict) -> AggregationFilters:
+    """Rebuild aggregation filters from the output of serialize_filters"""
+    values = dict(payload or {})
+    for key in ("startDate", "endDate"):
+        if isinstance(values.get(key), str):
+            values[key] = date.fromisoformat(values[key])
+    return AggregationFilters(**values)
+
+
 def json_default(o: Any):
     """JSON serializer for datetime objects"""
     if isinstance(o, datetime):
@@ -80,15 +100,21 @@ def _is_websocket_closed_error(exc: Exception) -> bool:
     return exc.__class__.__name__ == "ConnectionClosed"
 
 
-def _send_ws_json(ws: Any, msg: dict):
+def _send_ws_text(ws: Any, payload: str):
     try:
-        ws.send(json.dumps(msg, default=json_default))
+        ws.send(payload)
     except Exception as exc:
         if _is_websocket_closed_error(exc):
             raise WebSocketClientDisconnected(str(exc)) from exc
         raise
 
 
+def _send_ws_json(ws: Any, msg: dict):
+    payload = json.dumps(msg, default=json_default)
+    with span("websocket.send", type=msg.get("type"), bytes=len(payload)):
+        _send_ws_text(ws, payload)
+
+
 def _run_date_in_filter(run: dict, filters: AggregationFilters) -> bool:
     created_at = run.get("created_at") or run.get("createdAt")
     if not created_at:
@@ -173,6 +199,33 @@ def _send_keepalive_periodic(ws: Any, stop_flag: list):
             break
 
 
+def stream_job_events(ws: Any, job_queue: Any, job_id: str):
+    """
+    Relay the progress events of an extraction job to a WebSocket client.
+    The collection itself runs in an extraction worker; this only subscribes
+    to the job's event log until the job finishes or the client disconnects.
+    """
+    try:
+        for event in job_queue.follow_events(job_id):
+            if event is None:
+                payload = json.dumps({
+                    "type": "keepalive",
+                    "message": "Connection alive - waiting for API rate limit..."
+                })
+            else:
+                payload = event[1]
+            _send_ws_text(ws, payload)
+            WEBSOCKET_FRAMES.inc()
+            WEBSOCKET_BYTES.inc(len(payload.encode("utf-8")))
+    except WebSocketClientDisconnected as e:
+        print(f"[WebSocket] Client disconnected from job {job_id}: {e}")
+    finally:
+        try:
+            ws.close()
+        except Exception:
+            pass
+
+
 def send_data(ws: Any, repo: str, filters: AggregationFilters, token: str = None):
     """
     Stream workflow runs and jobs from GHAminer via WebSocket
@@ -181,10 +234,12 @@ def send_data(ws: Any, repo: str, filters: AggregationFilters, token: str = None
     print(f"[WebSocket] Starting GHAminer collection for {repo}")
     print(f"[WebSocket] ========================================")
     
-    # Set up performance logger with repo name
+    # Set up performance logger with repo name (private to the extraction of a job)
+    extraction_id = current_extraction_id()
+    perf_logger = None
     if PERFORMANCE_LOGGING:
         try:
-            setup_performance_logger(repo)
+            perf_logger = setup_performance_logger(repo, extraction_id)
         except Exception as e:
             print(f"[WebSocket] Warning: Could not set up performance logger: {e}")
     
@@ -204,6 +259,8 @@ def send_data(ws: Any, repo: str, filters: AggregationFilters, token: str = None
             ws.close()
         except Exception:
             pass
+        if perf_logger is not None and extraction_id:
+            close_performance_logger(perf_logger)
         return
     
     # Start background keepalive task to prevent timeout during rate limit waits
@@ -234,6 +291,8 @@ def send_data(ws: Any, repo: str, filters: AggregationFilters, token: str = None
             config["start_date"] = filters.startDate.isoformat()
         if filters.endDate != date(2100, 1, 1):
             config["end_date"] = filters.endDate.isoformat()
+        # Interrupted extractions of the same scope resume from their checkpoint
+        config["checkpoint_key"] = extraction_scope_key(repo, serialize_filters(filters))
         print(f"[WebSocket] GHAminer config loaded: fetch_job_details={config.get('fetch_job_details', False)}")
         
         all_runs_list = []
@@ -592,3 +651,5 @@ def send_data(ws: Any, repo: str, filters: AggregationFilters, token: str = None
             ws.close()
         except Exception:
             pass
+        if perf_logger is not None and extraction_id:
+            close_performance_logger(perf_logger)
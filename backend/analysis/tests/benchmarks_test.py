@@ -0,0 +1,39 @@
+from perf import benchmarks
+
+
+def test_run_case_times_and_profiles_an_isolated_case(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_STORAGE_DIR", str(tmp_path / "untouched"))
+
+    result = benchmarks.run_case("data_manager_load_cache", 50, repeat=2)
+
+    assert result["status"] == "ok"
+    assert result["items"] == 50
+    assert len(result["seconds_all"]) == 2
+    assert result["peak_memory_bytes"] > 0
+    assert result["max_rss_bytes"] > 0
+    # Every case writes into its own scratch storage
+    assert not (tmp_path / "untouched").exists()
+
+
+def test_phase1_case_collects_from_the_fake_server():
+    result = benchmarks.run_case("phase1", 150, measure_memory=False)
+
+    assert result["items"] == 150
+    assert result["peak_memory_bytes"] is None
+
+
+def test_compare_results_flags_regressions_over_the_threshold():
+    baseline = {"results": [
+        {"benchmark": "persistence_load", "size": 1000, "status": "ok", "seconds": 1.0, "peak_memory_bytes": 100},
+        {"benchmark": "phase1", "size": 1000, "status": "ok", "seconds": 2.0, "peak_memory_bytes": None},
+    ]}
+    current = {"results": [
+        {"benchmark": "persistence_load", "size": 1000, "status": "ok", "seconds": 1.5, "peak_memory_bytes": 110},
+        {"benchmark": "phase1", "size": 1000, "status": "timeout"},
+    ]}
+
+    rows = {row["metric"]: row for row in benchmarks.compare_results(baseline, current, threshold=20)}
+
+    assert set(rows) == {"seconds", "peak_memory_bytes"}
+    assert rows["seconds"]["change_pct"] == 50.0 and rows["seconds"]["regression"]
+    assert not rows["peak_memory_bytes"]["regression"]
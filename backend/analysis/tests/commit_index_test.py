@@ -0,0 +1,167 @@
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from commit_history_analyzer import (
+    count_commits_on_files_last_3_months, get_commit_data_local, get_unique_committers,
+    get_unique_committers_3_months,
+)
+from commit_index import CommitIndex, git_timestamp
+from conftest import commit, git
+
+START = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def _date(day):
+    return f"{int((START + timedelta(days=day)).timestamp())} +0000"
+
+
+def _git(repo, *args, day=None, **kwargs):
+    return git(repo, *args, date=None if day is None else _date(day), **kwargs)
+
+
+def _commit(repo, message, day, author="Alice", files=None, remove=()):
+    return commit(repo, message, files=files, remove=remove, date=_date(day), author=author)
+
+
+@pytest.fixture(scope="module")
+def history(tmp_path_factory):
+    """A repository with merges, a rename, deletions, binary files, a symlink and clock skew."""
+    repo = str(tmp_path_factory.mktemp("history"))
+    _git(repo, "init", "-q", "-b", "main")
+    shas = [_commit(repo, "initial", 0, files={
+        "src/app.py": "a\nb\nc\n", "README.md": "readme\n", "tests/test_app.py": "def test():\n    pass\n",
+    })]
+    shas.append(_commit(repo, "docker", 10, "Bob", files={
+        "src/app.py": "a\nB\nc\nd\n", "Dockerfile": "FROM python\n", "assets/logo.png": b"\x89PNG\x00\x01",
+    }))
+    _git(repo, "checkout", "-q", "-b", "feature")
+    shas.append(_commit(repo, "feature", 20, "Carol", files={
+        "src/feature.py": "x = 1\n" * 20, "tests/test_app.py": "def test():\n    assert True\n",
+    }))
+    _git(repo, "checkout", "-q", "main")
+    shas.append(_commit(repo, "compose", 25, files={"README.md": "readme\nmore\n", "docker-compose.yml": "x\n"}))
+    _git(repo, "merge", "-q", "--no-ff", "feature", "-m", "merge feature", day=30)
+    shas.append(_git(repo, "rev-parse", "HEAD"))
+    _git(repo, "mv", "src/feature.py", "src/features.py")
+    shas.append(_commit(repo, "rename", 40, "Bob"))
+    shas.append(_commit(repo, "delete", 50, "Dave", remove=["Dockerfile"], files={"docs/guide.md": "guide\n"}))
+    # Committed before its parent (clock skew): --since walks stop at it
+    shas.append(_commit(repo, "skewed", 35, "Erin", files={"src/app.py": "a\nB\nc\nd\ne\n"}))
+    os.symlink("src/app.py", os.path.join(repo, "link"))
+    shas.append(_commit(repo, "symlink", 60, files={"assets/logo.png": b"\x89PNG\x00\x02"}))
+
+    _git(repo, "checkout", "-q", "-b", "conflict")
+    shas.append(_commit(repo, "theirs", 70, "Carol", files={"src/app.py": "a\ntheirs\nc\nd\ne\n"}))
+    _git(repo, "checkout", "-q", "main")
+    os.remove(os.path.join(repo, "link"))
+    shas.append(_commit(repo, "ours", 75, files={"src/app.py": "a\nours\nc\nd\ne\n", "link": "plain file\n"}))
+    _git(repo, "merge", "-q", "conflict", day=80, check=False)
+    assert _git(repo, "rev-parse", "-q", "--verify", "MERGE_HEAD")
+    # Conflict resolved: src/app.py differs from both parents
+    shas.append(_commit(repo, "merge conflict", 80, files={"src/app.py": "a\nmerged\nc\nd\ne\n"}))
+
+    _git(repo, "checkout", "-q", "-b", "stale")
+    shas.append(_commit(repo, "stale branch", 90, "Frank", files={"src/stale.py": "s\n"}))
+    _git(repo, "checkout", "-q", "main")
+    shas.append(_commit(repo, "latest", 200, "Bob", files={
+        "src/app.py": "latest\n", "tests/test_app.py": "def test():\n    assert 1\n", "src/new.py": "n\n",
+    }))
+    return repo, shas
+
+
+def _legacy_and_indexed(repo, commit_index, sha, run_date, run_plus_1_date):
+    legacy = get_commit_data_local(sha, repo, run_date, run_plus_1_date)
+    indexed = get_commit_data_local(sha, repo, run_date, run_plus_1_date, commit_index)
+    for data in (legacy, indexed):
+        data["file_types"] = sorted(data["file_types"])
+    return legacy, indexed
+
+
+def test_index_gives_the_git_commands_results(history):
+    repo, shas = history
+    commit_index = CommitIndex(repo)
+    assert len(commit_index) == len(shas)
+
+    for position, sha in enumerate(shas):
+        commit_time = int(_git(repo, "show", "-s", "--format=%ct", sha))
+        run_date = datetime.fromtimestamp(commit_time, timezone.utc).replace(tzinfo=None) + timedelta(hours=1)
+        for run_plus_1_date in (None, run_date - timedelta(days=12), run_date - timedelta(days=365)):
+            legacy, indexed = _legacy_and_indexed(repo, commit_index, sha, run_date, run_plus_1_date)
+            assert indexed == legacy, (position, run_plus_1_date)
+
+
+def test_commits_missing_from_the_index_are_added(history):
+    repo, shas = history
+    commit_index = CommitIndex(repo)
+    # A commit outside every ref, created after the index (like a fetched fork commit)
+    tree = _git(repo, "rev-parse", f"{shas[-1]}^{{tree}}")
+    orphan = _git(repo, "commit-tree", tree, "-p", shas[5], "-p", shas[2], "-m", "outside", day=210)
+    assert orphan not in commit_index.ids
+
+    run_date = START + timedelta(days=211)
+    legacy, indexed = _legacy_and_indexed(repo, commit_index, orphan, run_date, run_date - timedelta(days=30))
+    assert indexed == legacy
+    assert orphan in commit_index.ids
+    assert commit_index.commit_count(orphan) == int(_git(repo, "rev-list", "--count", orphan))
+
+
+def test_committer_counts_match_git_log_at_any_date(history):
+    repo, _ = history
+    commit_index = CommitIndex(repo)
+    run_dates = [START + timedelta(days=day, hours=hour) for day in range(-5, 215, 5) for hour in (0, 13)]
+    # Runs are mined newest first; the sliding window must also handle any order
+    for dates in (sorted(run_dates, reverse=True), random.Random(4).sample(run_dates, len(run_dates))):
+        for run_date in dates:
+            until = git_timestamp(run_date)
+            since = git_timestamp(run_date - timedelta(days=90))
+            assert commit_index.unique_committer_count(until) == len(get_unique_committers(repo, run_date))
+            assert commit_index.team_size(since, until) == len(get_unique_committers_3_months(repo, run_date))
+
+
+def test_file_commits_match_git_log_on_a_random_history(tmp_path):
+    """Merges keeping one side's file (history simplification) and backdated commits (--since stops)."""
+    repo = str(tmp_path)
+    rng = random.Random(7)
+    files = ["a.txt", "b.txt", "dir/c.txt", "dir/d.txt", "e.txt"]
+    branches = ["main", "one", "two"]
+    _git(repo, "init", "-q", "-b", "main")
+    _commit(repo, "initial", 0, files={path: "0\n" for path in files})
+    for branch in branches[1:]:
+        _git(repo, "branch", branch)
+
+    day = 0
+    for step in range(70):
+        day += rng.choice((0.5, 1, 2, 3))
+        commit_day = day - 40 if rng.random() < 0.08 else day
+        branch = rng.choice(branches)
+        _git(repo, "checkout", "-q", branch)
+        if rng.random() < 0.3:
+            other = rng.choice([name for name in branches if name != branch])
+            strategy = rng.choice(([], ["-s", "ours"], ["-X", "theirs"], ["-X", "ours"]))
+            _git(repo, "merge", "-q", "--no-ff", *strategy, other, "-m", f"merge {other}", day=commit_day,
+                 check=False)
+            if _git(repo, "rev-parse", "-q", "--verify", "MERGE_HEAD", check=False):
+                _git(repo, "checkout", "-q", "--theirs", ".")
+                _commit(repo, f"merge {other}", commit_day)
+        else:
+            changed = rng.sample(files, rng.choice((1, 1, 2)))
+            # Some changes are reverted later: the file ends up identical on several branches
+            _commit(repo, f"step {step}", commit_day, rng.choice(("Alice", "Bob")),
+                    files={path: f"{rng.choice((0, step))}\n" for path in changed})
+    _git(repo, "checkout", "-q", "main")
+
+    commit_index = CommitIndex(repo)
+    start = int(_git(repo, "log", "--reverse", "--format=%ct", "--max-parents=0"))
+    for since_day in range(0, int(day) + 2, 3):
+        since = start + since_day * 86400
+        for path in files:
+            expected = set(_git(repo, "log", "--since", str(since), "--format=%H", "--", path).split())
+            commits = commit_index.file_history.commits_since(path, since, commit_index.head)
+            assert {commit_index.shas[commit] for commit in commits} == expected, (path, since_day)
+
+    for sha in _git(repo, "rev-list", "--all").split():
+        assert commit_index.count_commits_on_files_last_3_months(sha) == \
+            count_commits_on_files_last_3_months(repo, sha)
@@ -0,0 +1,49 @@
+"""
+Shared test setup: the GHAminer sources (imported as flat modules, as GHAMetrics.py does)
+on sys.path, and helpers building git repositories.
+"""
+import os
+import subprocess
+import sys
+
+GHAMINER_SRC_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "ghaminer", "src")
+if GHAMINER_SRC_PATH not in sys.path:
+    sys.path.insert(0, GHAMINER_SRC_PATH)
+
+
+def git(repo, *args, date=None, author="Alice", check=True, text=True):
+    """
+    Run a git command in a repository as author, with a fixed author and committer date if given.
+
+    Returns:
+        The stripped output (text), or the raw output bytes with text=False
+    """
+    env = dict(os.environ, GIT_AUTHOR_NAME=author, GIT_AUTHOR_EMAIL=f"{author.lower()}@example.com",
+               GIT_COMMITTER_NAME=author, GIT_COMMITTER_EMAIL=f"{author.lower()}@example.com")
+    if date is not None:
+        env.update(GIT_AUTHOR_DATE=date, GIT_COMMITTER_DATE=date)
+    result = subprocess.run(["git", "-C", repo, *args], capture_output=True, text=text, env=env, check=check)
+    return result.stdout.strip() if text else result.stdout
+
+
+def write_file(repo, path, content):
+    """Write a file of a working tree (bytes or text, without newline translation)."""
+    full_path = os.path.join(repo, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    if isinstance(content, bytes):
+        with open(full_path, "wb") as f:
+            f.write(content)
+    else:
+        with open(full_path, "w", newline="") as f:
+            f.write(content)
+
+
+def commit(repo, message="change", files=None, remove=(), date=None, author="Alice"):
+    """Write and remove files, commit everything (even nothing) and return the commit SHA."""
+    for path, content in (files or {}).items():
+        write_file(repo, path, content)
+    for path in remove:
+        git(repo, "rm", "-q", path)
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "--allow-empty", "-m", message, date=date, author=author)
+    return git(repo, "rev-parse", "HEAD")
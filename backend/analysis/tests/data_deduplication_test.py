@@ -82,3 +82,79 @@ def test_dashboard_run_conversion_preserves_commit_sha():
 
     assert run["commit_sha"] == "abc123456789"
     assert run["head_sha"] == "abc123456789"
+
+
+def test_concurrent_writer_processes_do_not_lose_updates(tmp_path):
+    import subprocess
+    import sys
+    import textwrap
+    from pathlib import Path
+
+    backend_dir = Path(__file__).resolve().parents[2]
+    writer = textwrap.dedent("""
+        import sys
+        sys.path.insert(0, sys.argv[1])
+        from data.persistence import DataPersistence
+
+        persistence = DataPersistence(data_dir=sys.argv[2])
+        writer_id = int(sys.argv[3])
+        for batch in range(10):
+            run_ids = [writer_id * 1000 + batch * 5 + offset for offset in range(5)]
+            persistence.save_runs_batch("owner/repo", [{"id": run_id} for run_id in run_ids])
+            persistence.save_jobs_batch("owner/repo", {run_id: [{"name": "build"}] for run_id in run_ids})
+    """)
+
+    writers = [
+        subprocess.Popen([sys.executable, "-c", writer, str(backend_dir), str(tmp_path), str(writer_id)])
+        for writer_id in range(1, 7)
+    ]
+    assert [process.wait(timeout=120) for process in writers] == [0] * 6
+
+    persistence = DataPersistence(data_dir=str(tmp_path))
+    assert len(persistence.get_all_runs("owner/repo")) == 6 * 50
+    assert len(persistence.get_runs_with_jobs("owner/repo")) == 6 * 50
+
+
+def test_stale_save_is_merged_with_newer_data_on_disk(tmp_path):
+    persistence = DataPersistence(data_dir=str(tmp_path))
+    repo = "owner/repo"
+
+    stale = persistence._load_data(repo)
+    persistence.save_runs_batch(repo, [{"id": 401}])
+    stale["runs"]["402"] = {"id": 402}
+    persistence._save_data(repo, stale)
+
+    assert set(persistence.get_all_runs(repo)) == {"401", "402"}
+
+
+def test_lock_held_by_another_process_does_not_stall_other_greenlets(tmp_path, monkeypatch):
+    import subprocess
+    import sys
+    import textwrap
+
+    import gevent
+    import pytest
+
+    from data import persistence as persistence_module
+
+    if not persistence_module.FILE_LOCKING_AVAILABLE:
+        pytest.skip("file locks are only taken with fcntl")
+    monkeypatch.setattr(persistence_module, "_gevent_patched", lambda: True)
+    persistence = DataPersistence(data_dir=str(tmp_path))
+    holder = subprocess.Popen([sys.executable, "-c", textwrap.dedent("""
+        import fcntl, sys, time
+        with open(sys.argv[1], "a+") as lock_handle:
+            fcntl.flock(lock_handle.fileno(), fcntl.LOCK_EX)
+            print("locked", flush=True)
+            time.sleep(0.5)
+    """), str(persistence._get_lock_file("owner/repo"))], stdout=subprocess.PIPE, text=True)
+    assert holder.stdout.readline().strip() == "locked"
+
+    ticks = []
+    ticker = gevent.spawn(lambda: [ticks.append(gevent.sleep(0.01)) for _ in range(20)])
+    persistence.save_runs_batch("owner/repo", [{"id": 1}])
+
+    assert len(ticks) >= 10  # The other greenlet ran while the save waited for the lock
+    assert list(persistence.get_all_runs("owner/repo")) == ["1"]
+    ticker.kill()
+    assert holder.wait(timeout=10) == 0
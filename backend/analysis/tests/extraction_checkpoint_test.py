@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from data.checkpoints import ExtractionCheckpointStore
+from data.persistence import DataPersistence
+
+
+def _github_run(number):
+    created_at = datetime(2026, 6, 30, 12, 0, 0) - timedelta(minutes=number)
+    return {
+        "id": 10_000 - number,
+        "workflow_id": 10,
+        "name": "CI",
+        "status": "completed",
+        "conclusion": "success",
+        "created_at": created_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "updated_at": created_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "head_branch": "main",
+        "head_sha": f"sha{number}",
+        "actor": {"login": "tester"},
+    }
+
+
+class FakeRunsApi:
+    """Serves the repository runs endpoint newest first, 100 runs per page."""
+
+    def __init__(self, runs):
+        self.runs = runs
+        self.requested_pages = []
+
+    def get(self, url, headers, params, timeout):
+        api = self
+
+        class GithubResponse:
+            status_code = 200
+
+            def __init__(self, payload, has_next=False):
+                self.payload = payload
+                self.headers = {"Link": '<next>; rel="next"'} if has_next else {}
+                self.url = url
+
+            def json(self):
+                return self.payload
+
+        if "page" not in params:
+            return GithubResponse({"total_count": len(api.runs)})
+
+        page = params["page"]
+        self.requested_pages.append(page)
+        page_runs = api.runs[(page - 1) * 100:page * 100]
+        return GithubResponse({"workflow_runs": page_runs}, has_next=page * 100 < len(api.runs))
+
+
+@pytest.fixture
+def stream_module(tmp_path, monkeypatch):
+    import requests
+    import ghaminer_stream
+
+    api = FakeRunsApi([_github_run(number) for number in range(1, 501)])
+    monkeypatch.setattr(requests, "get", api.get)
+    monkeypatch.setattr(ghaminer_stream, "DataPersistence", lambda: DataPersistence(data_dir=str(tmp_path)))
+    return ghaminer_stream, api
+
+
+def _interrupt_after(stream_module, config, count):
+    generator = stream_module.stream_workflow_runs_phase1("owner/repo", "token", config)
+    for index, _ in enumerate(generator, start=1):
+        if index == count:
+            generator.close()
+            break
+
+
+def test_checkpoint_store_expires_old_checkpoints(tmp_path):
+    store = ExtractionCheckpointStore(str(tmp_path), ttl=-1)
+    store.save("scope", {"page": 3})
+
+    assert store.load("scope") is None
+    assert ExtractionCheckpointStore(str(tmp_path)).load("scope") is None
+
+
+def test_phase1_resume_catches_up_new_runs_then_jumps_to_checkpoint_page(stream_module, tmp_path):
+    stream_module, api = stream_module
+    config = {"workflow_ids": [], "fetch_job_details": False, "checkpoint_key": "scope"}
+
+    _interrupt_after(stream_module, config, 410)
+    checkpoint = ExtractionCheckpointStore(str(tmp_path / "checkpoints")).load("scope")
+    assert checkpoint["page"] == 5
+
+    api.runs = [_github_run(-number) for number in range(10, 0, -1)] + api.runs
+    api.requested_pages.clear()
+
+    list(stream_module.stream_workflow_runs_phase1("owner/repo", "token", config))
+
+    assert api.requested_pages == [1, 2, 5, 6]
+    assert len(DataPersistence(data_dir=str(tmp_path)).get_all_runs("owner/repo")) == 510
+    assert ExtractionCheckpointStore(str(tmp_path / "checkpoints")).load("scope") is None
+
+
+def test_phase1_resume_steps_back_when_deleted_runs_shift_pages(stream_module, tmp_path):
+    stream_module, api = stream_module
+    config = {"workflow_ids": [], "fetch_job_details": False, "checkpoint_key": "scope"}
+
+    _interrupt_after(stream_module, config, 410)
+    api.runs = api.runs[10:]
+    api.requested_pages.clear()
+
+    list(stream_module.stream_workflow_runs_phase1("owner/repo", "token", config))
+
+    assert api.requested_pages == [1, 5, 4, 5]
+    stored_runs = DataPersistence(data_dir=str(tmp_path)).get_all_runs("owner/repo")
+    assert {str(run["id"]) for run in api.runs} <= set(stored_runs)
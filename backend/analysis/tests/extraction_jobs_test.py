@@ -0,0 +1,179 @@
+import json
+from datetime import date
+
+from extraction.jobs import JOB_DONE, JOB_FAILED, ExtractionJobQueue
+
+
+def test_job_queue_claims_each_job_once_and_replays_events(tmp_path):
+    queue = ExtractionJobQueue(str(tmp_path / "jobs.sqlite3"))
+    job_id = queue.enqueue("owner/repo", {"fetchJobDetails": True}, "token")
+
+    claimed = queue.claim_job("worker-1")
+    assert claimed["id"] == job_id
+    assert claimed["filters"] == {"fetchJobDetails": True}
+    assert queue.claim_job("worker-2") is None
+
+    queue.publish(job_id, json.dumps({"type": "runs"}))
+    queue.publish(job_id, json.dumps({"type": "complete"}))
+    queue.finish_job(job_id)
+
+    events = list(queue.follow_events(job_id, poll_interval=0))
+
+    assert [seq for seq, _ in events] == [1, 2]
+    assert json.loads(events[-1][1]) == {"type": "complete"}
+    assert queue.get_job(job_id)["status"] == JOB_DONE
+    assert queue.get_job(job_id)["token"] is None
+
+
+def test_job_queue_fails_running_jobs_without_heartbeat(tmp_path):
+    queue = ExtractionJobQueue(str(tmp_path / "jobs.sqlite3"), stale_after=-1)
+    job_id = queue.enqueue("owner/repo", {}, "token")
+    queue.claim_job("worker-1")
+
+    assert queue.fail_stale_jobs() == 1
+
+    events, status = queue.read_events(job_id)
+    assert status == JOB_FAILED
+    assert json.loads(events[-1][1])["type"] == "error"
+
+
+def test_run_job_publishes_send_data_messages(tmp_path, monkeypatch):
+    from analysis import endpoint as endpoint_module
+    from extraction import worker as worker_module
+
+    received = {}
+
+    def fake_send_data(ws, repo, filters, token=None):
+        received.update(repo=repo, filters=filters, token=token)
+        ws.send(json.dumps({"type": "complete", "totalRuns": 0}))
+        ws.close()
+
+    monkeypatch.setattr(endpoint_module, "send_data", fake_send_data)
+
+    queue = ExtractionJobQueue(str(tmp_path / "jobs.sqlite3"))
+    filters = endpoint_module.AggregationFilters(
+        startDate=date(2026, 6, 1),
+        endDate=date(2026, 6, 30),
+        workflowIds=[10],
+        fetchJobDetails=True,
+    )
+    job_id = queue.enqueue("owner/repo", endpoint_module.serialize_filters(filters), "token")
+
+    worker_module.run_job(queue, queue.claim_job("worker-1"), heartbeat_interval=60)
+
+    events, status = queue.read_events(job_id)
+    assert status == JOB_DONE
+    assert [json.loads(payload)["type"] for _, payload in events] == ["complete"]
+    assert received == {"repo": "owner/repo", "filters": filters, "token": "token"}
+
+
+def test_submit_coalesces_active_jobs_with_the_same_scope(tmp_path):
+    queue = ExtractionJobQueue(str(tmp_path / "jobs.sqlite3"))
+    scope = {"startDate": "2026-06-01", "endDate": "2026-06-30", "workflowIds": [20, 10]}
+
+    first_id, first_created = queue.submit("owner/repo", scope, "token-a")
+    same_id, same_created = queue.submit("Owner/Repo", {**scope, "workflowIds": [10, 20], "branch": "main"}, "token-b")
+    other_id, other_created = queue.submit("owner/repo", {**scope, "fetchJobDetails": True}, "token-a")
+
+    assert first_created and other_created
+    assert same_created is False
+    assert same_id == first_id
+    assert other_id != first_id
+
+
+def test_submit_never_attaches_forced_refresh_to_a_cached_extraction(tmp_path):
+    queue = ExtractionJobQueue(str(tmp_path / "jobs.sqlite3"))
+
+    cached_id, _ = queue.submit("owner/repo", {}, "token")
+    forced_id, forced_created = queue.submit("owner/repo", {"forceRefresh": True}, "token")
+    attached_id, attached_created = queue.submit("owner/repo", {}, "token")
+
+    assert forced_created is True
+    assert forced_id != cached_id
+    assert attached_created is False
+    assert attached_id == cached_id
+
+    queue.finish_job(cached_id)
+    assert queue.submit("owner/repo", {}, "token") == (forced_id, False)
+
+
+def test_websocket_subscriber_with_another_token_attaches_only_with_repo_access(tmp_path, monkeypatch):
+    import importlib
+    import sys
+
+    monkeypatch.setattr(sys, "argv", ["app.py"])
+    sys.modules.pop("app", None)
+    app_module = importlib.import_module("app")
+
+    class GithubResponse:
+        def __init__(self, status_code):
+            self.status_code = status_code
+
+    access = {"status_code": 404}
+    monkeypatch.setattr(app_module.requests, "get", lambda url, headers, timeout: GithubResponse(access["status_code"]))
+
+    queue = ExtractionJobQueue(str(tmp_path / "jobs.sqlite3"))
+    job_id, _ = app_module._submit_extraction_job(queue, "owner/repo", {}, "token-a")
+
+    assert app_module._submit_extraction_job(queue, "owner/repo", {}, "token-a") == (job_id, False)
+    assert app_module._submit_extraction_job(queue, "owner/repo", {}, "token-b")[1] is True
+
+    access["status_code"] = 200
+    assert app_module._submit_extraction_job(queue, "owner/repo", {}, "token-c") == (job_id, False)
+
+
+def test_worker_exits_once_its_parent_process_is_gone(tmp_path, monkeypatch):
+    from extraction.worker import run_worker
+
+    monkeypatch.setenv("METRICS_DIR", str(tmp_path / "metrics"))
+    queue = ExtractionJobQueue(str(tmp_path / "jobs.sqlite3"))
+    job_id = queue.enqueue("owner/repo", {}, "token")
+
+    # Reparented worker: the loop exits before claiming a job
+    run_worker(queue, "worker-1", poll_interval=0, parent_pid=-1)
+
+    assert queue.claim_job("worker-2")["id"] == job_id
+
+
+def test_tokens_stay_on_disk_only_until_a_worker_claims_the_job(tmp_path):
+    import sqlite3
+    import stat
+
+    from extraction.sessions import SQLiteSessionStore
+
+    db_path = tmp_path / "jobs.sqlite3"
+    queue = ExtractionJobQueue(str(db_path))
+    job_id = queue.enqueue("owner/repo", {}, "secret-token")
+    sessions = SQLiteSessionStore(str(db_path))
+    session_id = sessions.create("secret-token", "owner/repo", {}, ttl=-1)
+
+    assert queue.claim_job("worker-1")["token"] == "secret-token"
+    assert queue.get_job(job_id)["token"] is None
+    assert sessions.get(session_id) is None
+    assert sessions.cleanup_expired() == 1
+
+    for path in tmp_path.iterdir():
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600, path
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    assert b"secret-token" not in db_path.read_bytes()
+
+
+def test_queued_jobs_fail_when_no_worker_claims_them(tmp_path):
+    queue = ExtractionJobQueue(str(tmp_path / "jobs.sqlite3"))
+    running_id = queue.enqueue("owner/running", {}, "token")
+    queued_id = queue.enqueue("owner/queued", {}, "token")
+    queue.queued_timeout = -1
+
+    # A busy worker: the queued job waits for it
+    queue.claim_job("worker-1", running_id)
+    assert queue.fail_stale_jobs() == 0
+    queue.finish_job(running_id)
+
+    # No worker
+    assert list(queue.follow_events(queued_id, poll_interval=0, idle_timeout=0))[-1] is not None
+    events, status = queue.read_events(queued_id)
+    assert status == JOB_FAILED
+    assert queue.get_job(queued_id)["token"] is None
+    assert json.loads(events[-1][1])["type"] == "error"
@@ -0,0 +1,72 @@
+import importlib
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from extraction.sessions import InMemorySessionStore, SQLiteSessionStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InMemorySessionStore()
+    return SQLiteSessionStore(str(tmp_path / "sessions.sqlite3"))
+
+
+def test_session_can_only_be_claimed_by_one_connection(store):
+    session_id = store.create("token", "owner/repo", {"workflowIds": [10]})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        claims = list(executor.map(lambda _: store.claim(session_id), range(8)))
+
+    claimed = [claim for claim in claims if claim is not None]
+    assert len(claimed) == 1
+    assert claimed[0]["repo"] == "owner/repo"
+    assert claimed[0]["filters"] == {"workflowIds": [10]}
+
+
+def test_released_session_can_be_reclaimed_with_its_job(store):
+    session_id = store.create("token", "owner/repo", {})
+    store.claim(session_id)
+    store.set_job(session_id, "job-1")
+
+    store.release(session_id)
+
+    assert store.claim(session_id)["job_id"] == "job-1"
+
+
+def test_expired_sessions_cannot_be_claimed(store):
+    session_id = store.create("token", "owner/repo", {}, ttl=-1)
+
+    assert store.claim(session_id) is None
+    assert store.get(session_id) is None
+    assert store.cleanup_expired() in (0, 1)
+
+
+def test_sqlite_sessions_are_shared_between_store_instances(tmp_path):
+    first_process = SQLiteSessionStore(str(tmp_path / "sessions.sqlite3"))
+    second_process = SQLiteSessionStore(str(tmp_path / "sessions.sqlite3"))
+
+    session_id = first_process.create("token", "owner/repo", {})
+
+    assert second_process.claim(session_id)["token"] == "token"
+    assert first_process.claim(session_id) is None
+
+
+def test_create_extraction_stores_session_in_configured_store(monkeypatch, tmp_path):
+    monkeypatch.setenv("EXTRACTION_DB_PATH", str(tmp_path / "extractions.sqlite3"))
+    monkeypatch.setattr(sys, "argv", ["app.py"])
+    sys.modules.pop("app", None)
+    app_module = importlib.import_module("app")
+
+    response = app_module.app.test_client().post(
+        "/api/extractions",
+        json={"repo": "owner/repo", "filters": {"fetchJobDetails": True}},
+        headers={"Authorization": "Bearer token"},
+    )
+
+    assert response.status_code == 201
+    session = SQLiteSessionStore(str(tmp_path / "extractions.sqlite3")).get(response.get_json()["extractionId"])
+    assert session["repo"] == "owner/repo"
+    assert session["filters"] == {"fetchJobDetails": True}
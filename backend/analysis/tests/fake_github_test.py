@@ -0,0 +1,75 @@
+import requests
+
+import pytest
+
+from data.persistence import DataPersistence
+from perf.fake_github import FakeGitHubServer, SyntheticRepository
+
+
+@pytest.fixture
+def fake_github(monkeypatch):
+    server = FakeGitHubServer([SyntheticRepository("owner/repo", runs=250, workflows=3, jobs_per_run=2)]).start()
+    monkeypatch.setenv("GITHUB_API_URL", server.url)
+    yield server
+    server.stop()
+
+
+def test_synthetic_runs_are_paginated_and_filtered(fake_github):
+    url = f"{fake_github.url}/repos/owner/repo/actions/runs"
+
+    first = requests.get(url, params={"per_page": 100}, timeout=5)
+    assert first.status_code == 200
+    assert first.json()["total_count"] == 250
+    runs = first.json()["workflow_runs"]
+    assert [run["run_number"] for run in runs[:2]] == [250, 249]
+    assert 'rel="next"' in first.headers["Link"] and "page=2" in first.headers["Link"]
+
+    last = requests.get(url, params={"per_page": 100, "page": 3}, timeout=5)
+    assert len(last.json()["workflow_runs"]) == 50
+    assert 'rel="next"' not in last.headers["Link"]
+
+    # Runs are created every 30 minutes from 2025-01-01: 48 per day
+    day = requests.get(url, params={"created": "2025-01-02..2025-01-02"}, timeout=5).json()
+    assert day["total_count"] == 48
+    assert all(run["created_at"].startswith("2025-01-02") for run in day["workflow_runs"])
+
+    workflow_runs = requests.get(
+        f"{fake_github.url}/repos/owner/repo/actions/workflows/1001/runs", params={"per_page": 100}, timeout=5
+    ).json()
+    assert workflow_runs["total_count"] == 84
+    assert {run["workflow_id"] for run in workflow_runs["workflow_runs"]} == {1001}
+
+    assert requests.get(f"{fake_github.url}/repos/owner/missing/actions/runs", timeout=5).status_code == 404
+
+
+def test_rate_limit_responses_carry_github_headers():
+    with FakeGitHubServer([SyntheticRepository("owner/repo", runs=10)], rate_limit=2,
+                          rate_limit_status=429, latency=0.01) as server:
+        url = f"{server.url}/repos/owner/repo/actions/runs"
+        headers = {"Authorization": "token a"}
+
+        assert requests.get(url, headers=headers, timeout=5).headers["X-RateLimit-Remaining"] == "1"
+        requests.get(url, headers=headers, timeout=5)
+        limited = requests.get(url, headers=headers, timeout=5)
+        assert limited.status_code == 429
+        assert limited.headers["X-RateLimit-Remaining"] == "0"
+        assert int(limited.headers["Retry-After"]) > 0
+        assert "rate limit" in limited.json()["message"]
+
+        # Budgets are per token
+        assert requests.get(url, headers={"Authorization": "token b"}, timeout=5).status_code == 200
+
+
+def test_collectors_run_against_the_fake_server(fake_github, tmp_path, monkeypatch):
+    import ghaminer_stream
+
+    monkeypatch.setattr(ghaminer_stream, "DataPersistence", lambda: DataPersistence(data_dir=str(tmp_path)))
+
+    collected = list(ghaminer_stream.stream_workflow_runs_phase1("owner/repo", "token", {}))
+    assert len(collected) == 250
+    assert fake_github.request_counts["runs"] == 4
+
+    run = collected[0][0]
+    jobs_ids, job_details, job_count = ghaminer_stream.get_jobs_for_run("owner/repo", int(run["id"]), "token")
+    assert job_count == 2
+    assert [job["job_name"] for job in job_details] == ["job-0", "job-1"]
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from perf import loadtest
+
+
+def test_process_sampler_follows_the_process_tree():
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+    try:
+        assert child.pid in loadtest._process_tree(os.getpid())
+
+        sampler = loadtest.ProcessSampler(os.getpid(), interval=0.05).start()
+        sum(value * value for value in range(300_000))
+        usage = sampler.stop()
+    finally:
+        child.kill()
+        child.wait()
+
+    assert usage["cpu_seconds"] > 0
+    assert usage["peak_rss_bytes"] > 0
+
+
+def test_wave_summarizes_client_timings_and_errors(monkeypatch):
+    def fake_client(backend_url, repo, token, filters, origin, timeout):
+        index = int(repo.rsplit("-", 1)[1])
+        if index == 3:
+            return {"repo": repo, "status": "error", "error": "TimeoutError: No completion after 1s",
+                    "time_to_first_batch": None, "completion_time": None, "messages": {}, "bytes": 0, "runs": 0}
+        return {"repo": repo, "status": "ok", "error": None, "time_to_first_batch": 0.1 * (index + 1),
+                "completion_time": 1.0 + index, "messages": {"runs": 2, "complete": 1}, "bytes": 100, "runs": 150}
+
+    monkeypatch.setattr(loadtest, "run_client", fake_client)
+
+    wave = loadtest.run_wave("http://backend", 4, [f"o/r-{index}" for index in range(4)], "token", {},
+                             loadtest.DEFAULT_ORIGIN, 1, server_pid=None)
+
+    assert wave["clients_completed"] == 3
+    assert wave["errors"] == {"TimeoutError": 1}
+    assert wave["time_to_first_batch"]["max"] == pytest.approx(0.3)
+    assert wave["completion_time"]["p50"] == 2.0
+    assert wave["messages"] == 9
+    assert wave["runs_received"] == 450
+    assert wave["server"]["cpu_seconds"] is None
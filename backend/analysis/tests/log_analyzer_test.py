@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from perf import log_analyzer
+
+
+def _write_log(path, repo, job_durations, phase2_duration):
+    lines = [
+        "2026-01-20 23:00:00 - INFO - " + "=" * 80,
+        f"2026-01-20 23:00:00 - INFO - Performance logging started for repository: {repo}",
+        f"2026-01-20 23:00:00 - INFO - PHASE_START - PHASE_1_WORKFLOW_RUNS_COLLECTION - Repository: {repo}",
+        "2026-01-20 23:00:01 - INFO - API_CALL - WORKFLOW_RUNS_API - URL: https://api.github.com/repos/o/r/actions/runs?page=1 "
+        "- Duration: 0.400s - Status: 200 - Page: 1 - Runs: 100",
+        "2026-01-20 23:00:02 - INFO - API_CALL - WORKFLOW_RUNS_API - URL: https://api.github.com/repos/o/r/actions/runs?page=2 "
+        "- Duration: 0.600s - Status: 200 - Page: 2 - Runs: 50",
+        "2026-01-20 23:00:10 - INFO - PHASE_END - PHASE_1_WORKFLOW_RUNS_COLLECTION - Total Duration: 10.000s "
+        "- New Runs: 150 - Total Runs: 150",
+        f"2026-01-20 23:00:10 - INFO - PHASE_START - PHASE_2_JOBS_COLLECTION - Repository: {repo} - Total Runs: 150",
+    ]
+    for index, duration in enumerate(job_durations):
+        lines.append(
+            f"2026-01-20 23:01:{index:02d} - INFO - API_CALL - JOBS_API - URL: https://api.github.com/repos/o/r/actions/runs/{index}/jobs "
+            f"- Duration: {duration:.3f}s - Status: 200 - Jobs: 3"
+        )
+    lines.append("2026-01-20 23:01:30 - INFO - RATE_LIMIT_SLEEP - URL: https://api.github.com/x - Duration: 12.500s - Status: 403")
+    lines.append(
+        f"2026-01-20 23:02:00 - INFO - PHASE_END - PHASE_2_JOBS_COLLECTION - Total Duration: {phase2_duration:.3f}s - Total Runs: 150"
+    )
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_percentile_interpolates_between_ranks():
+    values = [float(value) for value in range(1, 11)]
+
+    assert log_analyzer.percentile(values, 50) == pytest.approx(5.5)
+    assert log_analyzer.percentile(values, 90) == pytest.approx(9.1)
+    assert log_analyzer.percentile([2.0], 99) == 2.0
+    assert log_analyzer.percentile([], 50) is None
+
+
+def test_analyze_reports_latency_throughput_sleeps_and_phases(tmp_path):
+    log = _write_log(tmp_path / "performance_o_r.log", "o/r", [0.1 * n for n in range(1, 11)], 100)
+
+    summary = log_analyzer.analyze([log], interval=60)[0]
+
+    jobs = summary["api"]["JOBS_API"]
+    assert jobs["calls"] == 10
+    assert jobs["p50"] == pytest.approx(0.55)
+    assert jobs["p99"] == pytest.approx(0.991)
+    assert summary["api"]["WORKFLOW_RUNS_API"]["statuses"] == {"200": 2}
+    assert summary["runs_fetched"] == 150
+    assert summary["runs_per_second"] == pytest.approx(15)
+    assert summary["jobs_per_second"] == pytest.approx(0.3)
+    assert summary["rate_limit_sleeps"] == 1
+    assert summary["rate_limit_sleep_seconds"] == pytest.approx(12.5)
+    assert summary["phases"]["PHASE_2_JOBS_COLLECTION"]["total"] == pytest.approx(100)
+    assert summary["repositories"] == ["o/r"]
+    assert [bucket["start"] for bucket in summary["throughput"]] == [0, 60]
+    assert summary["throughput"][1]["jobs"] == 30
+
+
+def test_cli_compares_logs_and_groups_by_repository(tmp_path, capsys):
+    baseline = _write_log(tmp_path / "old.log", "o/r", [1.0] * 4, 100)
+    candidate = _write_log(tmp_path / "new.log", "o/r", [0.5] * 4, 50)
+    other = _write_log(tmp_path / "other.log", "o/other", [0.2], 10)
+
+    log_analyzer.main([candidate, other, "--baseline", baseline, "--group-by", "repo", "--json"])
+    result = json.loads(capsys.readouterr().out)
+
+    assert sorted(report["name"] for report in result["reports"]) == ["o/other", "o/r"]
+    rows = {row["metric"]: row for row in result["comparison"]}
+    assert rows["JOBS_API p50 (s)"]["change_pct"] == pytest.approx(-50.0)
+    assert rows["PHASE_2_JOBS_COLLECTION mean (s)"]["change_pct"] == pytest.approx(-70.0)
+
+    log_analyzer.main([candidate, "--baseline", baseline])
+    text = capsys.readouterr().out
+    assert "JOBS_API" in text and "change" in text
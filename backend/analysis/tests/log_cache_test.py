@@ -0,0 +1,59 @@
+import os
+import time
+
+from log_cache import RunLogCache
+
+
+def _downloader(contents, downloads):
+    def download(directory):
+        downloads.append(directory)
+        path = os.path.join(directory, f"download_{len(downloads)}.zip")
+        with open(path, "wb") as f:
+            f.write(contents)
+        return path
+    return download
+
+
+def test_cached_run_attempts_are_not_downloaded_again(tmp_path):
+    cache = RunLogCache(str(tmp_path))
+    downloads = []
+
+    first = cache.get_or_download("owner/repo", 1, 1, _downloader(b"logs of run 1", downloads))
+    again = cache.get_or_download("owner/repo", 1, 1, _downloader(b"other", downloads))
+    rerun = cache.get_or_download("owner/repo", 1, 2, _downloader(b"logs of run 1 attempt 2", downloads))
+
+    assert first == again != rerun
+    assert len(downloads) == 2
+    with open(first, "rb") as f:
+        assert f.read() == b"logs of run 1"
+    assert os.listdir(cache.tmp_dir) == []
+    # A new cache instance (another mining process) reads the same index
+    assert RunLogCache(str(tmp_path)).get("owner/repo", 1, 1) == first
+
+
+def test_identical_archives_are_stored_once(tmp_path):
+    cache = RunLogCache(str(tmp_path))
+    downloads = []
+
+    first = cache.get_or_download("owner/repo", 1, 1, _downloader(b"same logs", downloads))
+    second = cache.get_or_download("owner/repo", 2, 1, _downloader(b"same logs", downloads))
+
+    assert first == second
+    assert cache.stats() == {"runs": 2, "archives": 1, "bytes": len(b"same logs"), "max_bytes": cache.max_bytes}
+
+
+def test_least_recently_used_archives_are_evicted(tmp_path):
+    cache = RunLogCache(str(tmp_path), max_bytes=25)
+    downloads = []
+
+    oldest = cache.get_or_download("owner/repo", 1, 1, _downloader(b"a" * 10, downloads))
+    cache.get_or_download("owner/repo", 2, 1, _downloader(b"b" * 10, downloads))
+    time.sleep(0.01)
+    cache.get("owner/repo", 1, 1)  # Run 1 becomes the most recently used
+    cache.get_or_download("owner/repo", 3, 1, _downloader(b"c" * 10, downloads))
+
+    assert cache.get("owner/repo", 2, 1) is None
+    assert cache.get("owner/repo", 1, 1) == oldest
+    assert cache.get("owner/repo", 3, 1) is not None
+    assert cache.stats()["bytes"] == 20
+    assert len(os.listdir(cache.blob_dir)) == 2
@@ -0,0 +1,115 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+from log_parser import parse_test_results
+from log_scanner import LogScanner
+from patterns import framework_regex
+from perf.benchmarks import build_log_archive
+
+LOGS = {
+    "pytest": [
+        "collected 12 items",
+        "tests/test_app.py::test_ok \x1b[32mPASSED\x1b[0m   [ 50%]",
+        "\x1b[32m===== 10 pas\x1b[0msed, 1 failed, 1 skipped in 1.23s =====\x1b[0m",
+        "  3 passed, 2 failed  ",
+        "Résumé: ✓ 4 passed",
+    ],
+    "junit": [
+        "[INFO] Tests run: 10, Failures: 2, Errors: 1, Skipped: 0, Time elapsed: 1.1 s",
+        "[INFO] Results:",
+        "[ERROR] Tests run: 4, Failures: 1, Errors: 0, Skipped: 1",
+    ],
+    "rspec": ["Finished in 0.5 seconds", "10 examples, 2 failures, 1 pending", "1 example, 0 failures"],
+    "testunit": ["10 tests, 15 assertions, 2 failures, 1 errors, 0 pendings, 0 omissions, 0 notifications"],
+    "mocha": ["5 passing (1s)", "2 failing"],
+}
+
+
+def _line_by_line(archive_bytes, framework, build_language):
+    # Test result parsing of GHAMetrics.compile_build_info before log_scanner
+    results = {"passed": 0, "failed": 0, "skipped": 0, "total": 0}
+    with zipfile.ZipFile(io.BytesIO(archive_bytes)) as zip_ref:
+        for file_info in zip_ref.infolist():
+            if file_info.filename.endswith(".txt"):
+                with zip_ref.open(file_info) as log_file:
+                    for line in log_file:
+                        log_content = line.decode("utf-8").strip()
+                        if log_content:
+                            line_results = parse_test_results(framework, log_content, build_language, framework_regex)
+                            for key in results:
+                                results[key] += line_results[key]
+    return results
+
+
+def _archive(lines, members=3):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for index in range(members):
+            # The last member has no trailing newline
+            archive.writestr(f"{index}_job.txt", "\n".join(lines * 20) + ("\n" if index < members - 1 else ""))
+        archive.writestr("job/metadata.json", "\n".join(lines))
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("framework,build_language", [
+    ("pytest", None), ("junit", "java-maven"), ("rspec", "ruby"), ("testunit", "ruby"), ("mocha", "javascript"),
+])
+@pytest.mark.parametrize("chunk_size", [7, 64, 1024 * 1024])
+def test_scanner_counts_match_line_by_line_parsing(framework, build_language, chunk_size):
+    archive_bytes = _archive(LOGS[framework])
+
+    expected = _line_by_line(archive_bytes, framework, build_language)
+    scanner = LogScanner(framework, build_language, framework_regex, chunk_size=chunk_size)
+
+    assert scanner.scan_archive(archive_bytes) == expected
+    if framework != "mocha":
+        assert expected["total"] > 0
+
+
+def test_scanner_counts_match_on_a_synthetic_run_log(tmp_path):
+    archive_path = build_log_archive(str(tmp_path / "logs.zip"), 5)
+    with open(archive_path, "rb") as f:
+        archive_bytes = f.read()
+
+    expected = _line_by_line(archive_bytes, "pytest", None)
+
+    assert LogScanner("pytest", None, framework_regex, chunk_size=4096).scan_archive(archive_path) == expected
+    assert expected["passed"] > 0
+
+
+def test_run_log_archive_is_downloaded_to_a_file(tmp_path, monkeypatch):
+    from log_parser import download_github_actions_log
+    from perf.fake_github import RUN_ID_BASE, FakeGitHubServer, SyntheticRepository
+
+    with FakeGitHubServer([SyntheticRepository("owner/repo", runs=3)]) as server:
+        monkeypatch.setenv("GITHUB_API_URL", server.url)
+        log_path = download_github_actions_log("owner/repo", RUN_ID_BASE + 1, "token", directory=str(tmp_path))
+        missing_path = download_github_actions_log("owner/repo", RUN_ID_BASE + 99, "token", directory=str(tmp_path))
+
+    assert missing_path is None
+    assert os.listdir(tmp_path) == [os.path.basename(log_path)]
+    results = LogScanner("junit", "java-maven", framework_regex).scan_archive(log_path)
+    assert results == {"passed": 3 * 41, "failed": 0, "skipped": 3, "total": 3 * 42}
+
+
+def test_log_pool_merges_the_counts_of_archive_members(tmp_path):
+    from log_pool import LogParsingPool, split_archive_members
+
+    archive_path = build_log_archive(str(tmp_path / "logs.zip"), 6)
+    expected = LogScanner("pytest", None, framework_regex).scan_archive(archive_path)
+    # Every member is large enough to get a worker task of its own
+    assert len(split_archive_members(archive_path, large_member_bytes=1)) == 6
+
+    with LogParsingPool(workers=2, large_member_bytes=1) as pool:
+        split_results = pool.submit(archive_path, "pytest", None, framework_regex).result(timeout=60)
+        deleted_results = pool.submit(archive_path, "pytest", None, framework_regex, delete=True).result(timeout=60)
+
+    assert split_results == deleted_results == expected
+    assert not os.path.exists(archive_path)
+
+    (tmp_path / "broken.zip").write_bytes(b"not a zip")
+    with LogParsingPool(workers=1) as pool, pytest.raises(zipfile.BadZipFile):
+        pool.submit(str(tmp_path / "broken.zip"), "pytest", None, framework_regex)
@@ -0,0 +1,69 @@
+from core.utils.metrics import MetricsRegistry
+
+
+def test_registry_renders_counters_and_cumulative_histogram_buckets():
+    registry = MetricsRegistry()
+    requests_total = registry.counter("api_requests_total", "API requests", ("api_type", "status"))
+    latency = registry.histogram("api_latency_seconds", "API latency", ("api_type",), buckets=(0.1, 1.0))
+
+    requests_total.inc(api_type="JOBS_API", status=200)
+    requests_total.inc(api_type="JOBS_API", status=200)
+    requests_total.inc(api_type="JOBS_API", status=403)
+    latency.observe(0.05, api_type="JOBS_API")
+    latency.observe(0.5, api_type="JOBS_API")
+    latency.observe(3, api_type="JOBS_API")
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE api_requests_total counter" in lines
+    assert 'api_requests_total{api_type="JOBS_API",status="200"} 2' in lines
+    assert 'api_requests_total{api_type="JOBS_API",status="403"} 1' in lines
+    assert 'api_latency_seconds_bucket{api_type="JOBS_API",le="0.1"} 1' in lines
+    assert 'api_latency_seconds_bucket{api_type="JOBS_API",le="1"} 2' in lines
+    assert 'api_latency_seconds_bucket{api_type="JOBS_API",le="+Inf"} 3' in lines
+    assert 'api_latency_seconds_sum{api_type="JOBS_API"} 3.55' in lines
+    assert 'api_latency_seconds_count{api_type="JOBS_API"} 3' in lines
+
+
+def test_registry_merges_worker_snapshots():
+    web = MetricsRegistry()
+    worker = MetricsRegistry()
+    for registry in (web, worker):
+        registry.counter("runs_total", "Runs").inc(10)
+        registry.histogram("phase_seconds", "Phases", ("phase",), buckets=(1.0,)).observe(2, phase="phase_1")
+    worker.gauge("active", "Active").inc()
+
+    merged = web.merged_with([worker.snapshot()])
+
+    assert merged.get("runs_total").value() == 20
+    assert 'phase_seconds_count{phase="phase_1"} 2' in merged.render()
+    assert merged.get("active") is None
+    assert web.get("runs_total").value() == 10
+
+
+def test_metrics_endpoint_exports_api_calls_and_storage_writes(tmp_path, monkeypatch):
+    import importlib
+    import sys
+
+    from core.utils import metrics
+    from core.utils.logger import log_api_call
+    from data.persistence import DataPersistence
+
+    monkeypatch.setenv("METRICS_DIR", str(tmp_path / "metrics"))
+    monkeypatch.setattr(sys, "argv", ["app.py"])
+    sys.modules.pop("app", None)
+    app_module = importlib.import_module("app")
+    metrics.REGISTRY.reset()
+
+    log_api_call("JOBS_API", "https://api.github.com/repos/owner/repo/actions/runs/1/jobs", 0.2, 200, Jobs=3)
+    DataPersistence(data_dir=str(tmp_path)).save_run("owner/repo", {"id": 1, "created_at": "2026-06-01T00:00:00Z"})
+
+    response = app_module.app.test_client().get("/metrics")
+    body = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert 'gha_api_requests_total{api_type="JOBS_API",status="200"} 1' in body
+    assert 'gha_api_request_duration_seconds_bucket{api_type="JOBS_API",le="0.25"} 1' in body
+    assert 'gha_persistence_duration_seconds_count{operation="write"} 1' in body
+    assert metrics.PERSISTENCE_BYTES.value(operation="write") > 0
@@ -0,0 +1,62 @@
+import itertools
+import os
+import random
+import subprocess
+
+from commit_history_analyzer import is_documentation_file
+from file_indicators import (
+    DOC_DIRECTORIES, DOC_EXTENSIONS, PRODUCTION_EXTENSIONS, TEST_DIRECTORIES, TEST_FILE_PATTERNS, TEST_INDICATORS,
+    is_production_file, is_test_file,
+)
+from path_classifier import DockerFile, PathCategory, classify_path
+
+
+def _legacy_classification(path):
+    if is_test_file(path):
+        category = PathCategory.TEST
+    elif is_production_file(path):
+        category = PathCategory.SOURCE
+    elif is_documentation_file(path):
+        category = PathCategory.DOCUMENTATION
+    else:
+        category = PathCategory.OTHER
+    if "dockerfile" in path.lower():
+        docker = DockerFile.DOCKERFILE
+    elif "docker-compose" in path.lower():
+        docker = DockerFile.COMPOSE
+    else:
+        docker = DockerFile.NONE
+    return category, docker
+
+
+def _generated_paths(count, seed=0):
+    """Paths built from the rules' own fragments, in random case, to hit every rule and its edges."""
+    rng = random.Random(seed)
+    fragments = [fragment.strip("/") for fragment in TEST_DIRECTORIES + TEST_FILE_PATTERNS + TEST_INDICATORS]
+    directories = ["src", "lib", "app", "docs2", "Doc", "x.y", "tests", "docker", ".github", "helpers", "manual"]
+    directories += DOC_DIRECTORIES + [fragment for fragment in fragments if fragment]
+    names = ["main", "index", "Dockerfile", "docker-compose", "README", "conftest", "app.component", "Attest", ".env"]
+    names += [fragment for fragment in fragments if fragment]
+    extensions = list(PRODUCTION_EXTENSIONS) + list(DOC_EXTENSIONS) + [
+        "", ".html", ".HTML", ".PY", ".lock", ".dev.yml", ".txt.bak", ".", ".min.js", ".S", ".Rmd",
+    ]
+    for _ in range(count):
+        parts = [rng.choice(directories) for _ in range(rng.choice((0, 1, 2, 3)))]
+        parts.append(rng.choice(names) + rng.choice(extensions))
+        if rng.random() < 0.3:
+            parts = [part.upper() if rng.random() < 0.5 else part for part in parts]
+        yield "/".join(parts)
+
+
+def test_classification_matches_the_file_indicators():
+    repo_root = os.path.join(os.path.dirname(__file__), "..", "..", "..")
+    tracked = subprocess.run(["git", "-C", repo_root, "ls-files"], capture_output=True, text=True).stdout.split()
+    paths = itertools.chain(tracked, _generated_paths(50_000), [
+        "", "Dockerfile", "deploy/docker-compose.prod.yml", "docs/index.html", "site/guides-v2/page.html",
+        "site/page.html", "help", "a.b/c", "src/.py", "src/app.component.ts", "x.tar.gz",
+    ])
+    mismatches = [(path, classify_path(path), _legacy_classification(path))
+                  for path in paths if classify_path(path) != _legacy_classification(path)]
+    assert mismatches == []
+    categories = {classify_path(path)[0] for path in _generated_paths(2_000)}
+    assert categories == set(PathCategory)
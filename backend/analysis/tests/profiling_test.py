@@ -0,0 +1,113 @@
+import importlib
+import json
+import sys
+
+from core.utils.profiling import request_profile, sample_thread, take_profile_request
+
+
+def _load_app(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["app.py"])
+    sys.modules.pop("app", None)
+    return importlib.import_module("app")
+
+
+def test_debug_profile_endpoints_are_disabled_by_default(monkeypatch):
+    monkeypatch.delenv("EXTRACTION_PROFILING", raising=False)
+    client = _load_app(monkeypatch).app.test_client()
+
+    assert client.get("/api/debug").get_json()["profiling"]["enabled"] is False
+    assert client.get("/api/debug/profiles").status_code == 404
+    assert client.post("/api/debug/profiles", json={"repo": "owner/repo"}).status_code == 404
+
+
+def test_profile_request_is_claimed_once(tmp_path):
+    request_profile("owner/repo", cpu=True, memory=True, profile_dir=tmp_path)
+
+    assert take_profile_request("owner/repo", tmp_path)["memory"] is True
+    assert take_profile_request("owner/repo", tmp_path) is None
+
+
+def test_next_extraction_of_a_repository_is_profiled(tmp_path, monkeypatch):
+    from analysis import endpoint as endpoint_module
+    from extraction import worker as worker_module
+    from extraction.jobs import ExtractionJobQueue
+
+    def fake_send_data(ws, repo, filters, token=None):
+        payload = [str(value) * 10 for value in range(20_000)]
+        endpoint_module._send_ws_json(ws, {"type": "complete", "totalRuns": len(payload)})
+
+    monkeypatch.setenv("EXTRACTION_PROFILING", "1")
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path / "profiles"))
+    monkeypatch.setenv("TRACE_DIR", str(tmp_path / "traces"))
+    monkeypatch.setenv("EXTRACTION_DB_PATH", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(endpoint_module, "send_data", fake_send_data)
+    client = _load_app(monkeypatch).app.test_client()
+
+    assert client.post("/api/debug/profiles", json={"repo": "bad"}).status_code == 400
+    response = client.post("/api/debug/profiles", json={"repo": "owner/repo", "memory": True})
+    assert response.status_code == 201
+    assert client.get("/api/debug/profiles").get_json()["pending"]["profiles"][0]["repo"] == "owner/repo"
+
+    queue = ExtractionJobQueue(str(tmp_path / "jobs.sqlite3"))
+    job_id = queue.enqueue("owner/repo", {}, "token")
+    worker_module.run_job(queue, queue.claim_job("worker-1"), heartbeat_interval=60)
+
+    listing = client.get("/api/debug/profiles").get_json()
+    assert [profile["id"] for profile in listing["profiles"]] == [job_id]
+    assert listing["pending"]["profiles"] == []
+
+    profile = client.get(f"/api/debug/profiles/{job_id}").get_json()
+    assert profile["repo"] == "owner/repo"
+    assert any("fake_send_data" in row["function"] for row in profile["cpu"]["top_functions"])
+    assert profile["memory"]["peak_bytes"] > 0
+    assert profile["memory"]["top_allocations"]
+    pstats_file = client.get(f"/api/debug/profiles/{job_id}/pstats")
+    assert pstats_file.status_code == 200 and pstats_file.data
+
+    # The following extraction of the repository is not profiled
+    second_job = queue.enqueue("owner/repo", {"branch": "main"}, "token")
+    worker_module.run_job(queue, queue.claim_job("worker-1"), heartbeat_interval=60)
+    assert client.get(f"/api/debug/profiles/{second_job}").status_code == 404
+
+
+def _start_os_thread(target):
+    # Other tests import app, which monkey patches threading with gevent: the sampled
+    # extraction must run in a real thread, as it does in an extraction worker
+    try:
+        from gevent.monkey import get_original
+        start_new_thread, allocate_lock, get_ident = get_original(
+            "_thread", ["start_new_thread", "allocate_lock", "get_ident"])
+    except ImportError:
+        from _thread import allocate_lock, get_ident, start_new_thread
+    started = allocate_lock()
+    started.acquire()
+    thread_ids = []
+
+    def run():
+        thread_ids.append(get_ident())
+        started.release()
+        target()
+
+    start_new_thread(run, ())
+    started.acquire()
+    return thread_ids[0]
+
+
+def test_sampling_records_the_stacks_of_a_running_thread(tmp_path):
+    running = [True]
+
+    def busy_extraction():
+        while running[0]:
+            sum(value for value in range(1000))
+
+    thread_id = _start_os_thread(busy_extraction)
+    try:
+        summary_file = sample_thread("job-sample", "owner/repo", thread_id, duration=0.3, interval=0.005,
+                                     profile_dir=tmp_path)
+    finally:
+        running[0] = False
+
+    summary = json.loads(summary_file.read_text())
+    assert summary["samples"] > 5
+    assert any(row["function"].startswith("busy_extraction") for row in summary["top_functions"])
+    assert "busy_extraction" in (tmp_path / "job-sample.folded").read_text()
@@ -0,0 +1,121 @@
+import random
+import re
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs, urlparse
+
+import pull_request_index
+from pull_request_index import PullRequestIndex, lookup_pull_request_details
+
+REPO = "owner/repo"
+START = datetime(2025, 1, 1)
+
+
+def _time(hours):
+    return (START + timedelta(hours=hours)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class FakePulls:
+    """The pull request endpoints of GitHub for a generated repository, counting requests."""
+
+    def __init__(self, seed=0):
+        rng = random.Random(seed)
+        self.pulls, self.issues, self.commits = [], [], {}
+        self.runs = []
+        self.calls = 0
+        hours = 0
+        for number in range(1, 41):
+            hours += rng.randrange(1, 12)
+            if rng.random() < 0.25:
+                # Plain issue, with comments
+                self.issues.append({"number": number, "updated_at": _time(hours), "comments": rng.randrange(5)})
+                continue
+            shas = [f"{number:04d}{push:036d}" for push in range(rng.randrange(1, 4))]
+            for push, sha in enumerate(shas):
+                self.runs.append((sha, hours + push))
+            state = rng.choice(("open", "merged", "merged", "closed"))
+            updated = hours + len(shas)
+            merge_sha = f"{number:04d}{'m' * 36}"
+            pull = {
+                "number": number, "state": "open" if state == "open" else "closed", "head": {"sha": shas[-1]},
+                "merged_at": _time(updated) if state == "merged" else None, "merge_commit_sha": merge_sha,
+                "title": f"Change {number}", "body": None if number % 3 else "Longer description " * number,
+                "updated_at": _time(updated),
+            }
+            if state == "merged":
+                self.runs.append((merge_sha, updated))
+            self.pulls.append(pull)
+            self.issues.append({"number": number, "updated_at": pull["updated_at"], "comments": number % 7,
+                                "pull_request": {}})
+            self.commits[number] = shas + ([merge_sha] if state == "merged" else [])
+        # A commit of two pull requests, and commits pushed to the default branch only
+        self.commits[self.pulls[-1]["number"]].append(self.runs[0][0])
+        self.runs += [(f"{'d' * 4}{index:036d}", index * 7) for index in range(10)]
+
+    def _page(self, items, query):
+        items = sorted(items, key=lambda item: item["updated_at"], reverse=True)
+        if "since" in query:
+            items = [item for item in items if item["updated_at"] >= query["since"][0]]
+        per_page, page = int(query["per_page"][0]), int(query["page"][0])
+        return items[(page - 1) * per_page:page * per_page]
+
+    def get_request(self, url, token):
+        self.calls += 1
+        parsed = urlparse(url)
+        query = parse_qs(parsed.query)
+        path = parsed.path.split(f"/repos/{REPO}", 1)[1]
+        if path == "/pulls":
+            return self._page(self.pulls, query)
+        if path == "/issues":
+            return self._page(self.issues, query)
+        match = re.fullmatch(r"/pulls/(\d+)", path)
+        if match:
+            pull = next(pull for pull in self.pulls if pull["number"] == int(match.group(1)))
+            return {**pull, "comments": next(issue["comments"] for issue in self.issues
+                                             if issue["number"] == pull["number"])}
+        match = re.fullmatch(r"/commits/(\w+)/pulls", path)
+        if match:
+            # Open and merged pull requests of the commit
+            return [pull for pull in self.pulls if match.group(1) in self.commits[pull["number"]]
+                    and (pull["state"] == "open" or pull["merged_at"])]
+        raise AssertionError(url)
+
+
+def test_index_gives_the_api_results_with_fewer_requests(monkeypatch):
+    github = FakePulls()
+    monkeypatch.setattr(pull_request_index, "get_request", github.get_request)
+    monkeypatch.setattr(pull_request_index, "PAGE_SIZE", 4)
+
+    # Runs are mined newest first, some of them several times (re-runs, other workflows)
+    runs = sorted(github.runs * 2, key=lambda run: -run[1])
+    expected = [lookup_pull_request_details(REPO, sha, "token") for sha, _ in runs]
+    assert any(details["gh_is_pr"] for details in expected)
+    assert not all(details["gh_is_pr"] for details in expected)
+    api_calls = github.calls
+
+    github.calls = 0
+    pr_index = PullRequestIndex(REPO, "token")
+    details = []
+    for position, (sha, hours) in enumerate(runs):
+        if position % 50 == 0:
+            pr_index.refresh()
+        details.append(pr_index.details(sha, START + timedelta(hours=hours)))
+    assert details == expected
+    assert github.calls < api_calls / 2
+
+
+def test_refresh_reads_updated_pull_requests(monkeypatch):
+    github = FakePulls()
+    monkeypatch.setattr(pull_request_index, "get_request", github.get_request)
+    pr_index = PullRequestIndex(REPO, "token")
+    merged = next(pull for pull in github.pulls if pull["merged_at"])
+    opened = next(pull for pull in reversed(github.pulls) if pull["state"] == "open")
+    pr_index.load_until(START)
+    assert pr_index.get(merged["merge_commit_sha"])["gh_pull_req_number"] == merged["number"]
+
+    # Closed without merge: /commits/{sha}/pulls no longer lists it
+    opened.update(state="closed", updated_at=_time(10_000))
+    next(issue for issue in github.issues if issue["number"] == merged["number"]).update(
+        comments=42, updated_at=_time(10_001))
+    pr_index.refresh()
+    assert pr_index.get(opened["head"]["sha"]) is None
+    assert pr_index.get(merged["merge_commit_sha"])["gh_num_pr_comments"] == 42
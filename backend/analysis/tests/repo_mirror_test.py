@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from conftest import commit, git
+from repo_mirror import RepoMirror, fetch_missing_commits, missing_commits
+
+
+def _missing_objects(repo):
+    objects = git(repo, "rev-list", "--objects", "--all", "--missing=print").splitlines()
+    return [line for line in objects if line.startswith("?")]
+
+
+@pytest.fixture
+def origin(tmp_path):
+    """A remote serving partial clones and commits by SHA, like GitHub."""
+    repo = str(tmp_path / "origin")
+    os.makedirs(repo)
+    git(repo, "init", "-q", "-b", "main")
+    git(repo, "config", "uploadpack.allowFilter", "true")
+    git(repo, "config", "uploadpack.allowAnySHA1InWant", "true")
+    commit(repo, "initial", files={"app.py": "a\n", "README.md": "readme\n"})
+    commit(repo, "second", files={"app.py": "a\nb\n"})
+    return repo
+
+
+def _mirror(tmp_path, origin):
+    return RepoMirror(str(tmp_path / "cache"), "owner/repo", url=f"file://{origin}")
+
+
+def test_mirror_fetches_only_new_commits(tmp_path, origin):
+    mirror = _mirror(tmp_path, origin)
+    path = mirror.update(blobs=False)
+    assert path == os.path.join(str(tmp_path / "cache"), "owner", "repo.git")
+    assert mirror.is_partial() and _missing_objects(path)
+    assert git(path, "rev-parse", "HEAD") == git(origin, "rev-parse", "HEAD")
+
+    git(origin, "checkout", "-q", "-b", "feature")
+    feature = commit(origin, "feature", files={"feature.py": "f\n"})
+    git(origin, "tag", "v1")
+    git(origin, "checkout", "-q", "main")
+    head = commit(origin, "third", files={"app.py": "a\nb\nc\n"})
+
+    # A new session on the same cache directory
+    mirror = _mirror(tmp_path, origin)
+    assert mirror.update(blobs=False) == path
+    assert git(path, "rev-parse", "HEAD", "feature", "v1") == f"{head}\n{feature}\n{feature}"
+    assert not os.path.exists(f"{path}.lock")
+
+    # A session reading file contents completes the blobless mirror
+    mirror.update(blobs=True)
+    assert not mirror.is_partial() and not _missing_objects(path)
+    assert git(path, "show", f"{head}:app.py") == "a\nb\nc"
+
+
+def test_missing_commits_are_fetched_in_batches(tmp_path, origin):
+    path = _mirror(tmp_path, origin).update()
+    # Commits on refs the mirror does not fetch (like pull requests from forks)
+    git(origin, "checkout", "-q", "-b", "fork")
+    fork_commits = [commit(origin, f"fork {n}", files={"fork.py": f"{n}\n"}) for n in range(3)]
+    git(origin, "update-ref", "refs/pull/1/head", "fork")
+    git(origin, "checkout", "-q", "main")
+    git(origin, "branch", "-D", "fork")
+    head = git(path, "rev-parse", "HEAD")
+    unknown = "0123456789" * 4
+
+    shas = [head, fork_commits[0], unknown, fork_commits[2], fork_commits[0]]
+    assert missing_commits(path, shas) == [fork_commits[0], unknown, fork_commits[2]]
+    assert fetch_missing_commits(path, shas) == [unknown]
+    assert missing_commits(path, fork_commits) == []
+    assert fetch_missing_commits(path, fork_commits) == []
+
+
+def test_failed_clone_leaves_no_mirror(tmp_path):
+    mirror = RepoMirror(str(tmp_path / "cache"), "owner/missing", url=f"file://{tmp_path / 'missing'}")
+    assert mirror.update() is None
+    assert os.listdir(os.path.join(str(tmp_path / "cache"), "owner")) == []
@@ -0,0 +1,106 @@
+import os
+import stat
+import sys
+import textwrap
+
+import pytest
+
+import commit_history_analyzer
+from commit_history_analyzer import calculate_sloc_and_test_lines
+from conftest import commit, git
+from sloc_counter import SlocCounter
+
+
+@pytest.fixture
+def fake_scc(tmp_path):
+    """An scc stand-in counting the non-empty lines of the Python and Ruby files of a directory, logging its calls."""
+    calls = tmp_path / "scc_calls.log"
+    script = tmp_path / "scc"
+    script.write_text(textwrap.dedent(f"""\
+        #!{sys.executable}
+        import json, os, sys
+        with open({str(calls)!r}, "a") as f:
+            f.write(sys.argv[-1] + "\\n")
+        code = 0
+        for root, dirs, files in os.walk(sys.argv[-1]):
+            dirs[:] = [name for name in dirs if name != ".git"]
+            for name in files:
+                if not name.endswith((".py", ".rb")):
+                    continue
+                with open(os.path.join(root, name), errors="ignore") as f:
+                    code += sum(1 for line in f if line.strip())
+        print(json.dumps([{{"Name": "Text", "Code": code}}]))
+    """))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return str(script), calls
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = str(tmp_path / "repo")
+    os.makedirs(repo)
+    git(repo, "init", "-q", "-b", "main")
+    shas = [commit(repo, "initial", date="2025-01-01T12:00:00Z", files={
+        "src/app.py": "a\nb\n\nc\n", "tests/test_app.py": "def test():\n    pass\n",
+    })]
+    shas.append(commit(repo, "specs", date="2025-01-05T12:00:00Z", files={
+        "spec/app_spec.rb": "it 'works'\r\nend\r\n", "src/app.py": "a\nb\n",
+    }))
+    # Same tree as the previous commit
+    shas.append(commit(repo, "empty", date="2025-01-06T12:00:00Z"))
+    shas.append(commit(repo, "tests", date="2025-01-10T12:00:00Z", files={
+        "tests/test_app.py": "def test():\n    assert True\n    assert 1\n", "src/Testing.py": "t\n",
+    }))
+    shas.append(commit(repo, "revert", date="2025-01-15T12:00:00Z", files={
+        "src/app.py": "a\nb\n\nc\n",
+    }, remove=["src/Testing.py"]))
+    return repo, shas
+
+
+def test_counts_match_the_checked_out_repository(repo, fake_scc, monkeypatch):
+    repo, shas = repo
+    scc_path, _ = fake_scc
+    monkeypatch.setattr(commit_history_analyzer, "get_scc_path", lambda: scc_path)
+
+    runs = [(sha, "2025-02-01T00:00:00Z") for sha in shas]
+    # Commits missing from the clone are counted at the run date (then at HEAD)
+    runs += [("0" * 40, "2025-01-07T00:00:00Z"), ("0" * 40, "2024-01-01T00:00:00Z"), (None, None)]
+    expected = [calculate_sloc_and_test_lines(repo, commit_sha=sha, timestamp=timestamp) for sha, timestamp in runs]
+
+    sloc_counter = SlocCounter(repo, workers=2, scc_path=scc_path)
+    sloc_counter.prefetch(runs)
+    try:
+        assert [sloc_counter.count(sha, timestamp) for sha, timestamp in runs] == expected
+    finally:
+        sloc_counter.close()
+    # The clone is left as it was
+    assert git(repo, "rev-parse", "--abbrev-ref", "HEAD") == "main"
+    assert git(repo, "worktree", "list").count("\n") == 0
+    assert not os.path.exists(sloc_counter.worktree_dir)
+
+
+def test_each_tree_is_counted_once(repo, fake_scc):
+    repo, shas = repo
+    scc_path, calls = fake_scc
+    sloc_counter = SlocCounter(repo, workers=2, scc_path=scc_path)
+    try:
+        counts = [sloc_counter.count(sha) for sha in shas + shas[::-1]]
+    finally:
+        sloc_counter.close()
+    assert counts[:len(shas)] == counts[len(shas):][::-1]
+    trees = {git(repo, "rev-parse", f"{sha}^{{tree}}") for sha in shas}
+    assert len(calls.read_text().splitlines()) == len(trees) == len(shas) - 1
+
+
+def test_failed_counts_are_retried(repo, tmp_path):
+    repo, shas = repo
+    scc_path = str(tmp_path / "missing-scc")
+    sloc_counter = SlocCounter(repo, workers=1, scc_path=scc_path)
+    try:
+        assert sloc_counter.count(shas[0]) == (None, None)
+        with open(scc_path, "w") as f:
+            f.write(f"#!{sys.executable}\nimport json\nprint(json.dumps([{{'Code': 7}}]))\n")
+        os.chmod(scc_path, 0o755)
+        assert sloc_counter.count(shas[0]) == (7, 2)
+    finally:
+        sloc_counter.close()
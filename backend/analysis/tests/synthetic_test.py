@@ -0,0 +1,65 @@
+import requests
+
+from data.manager import DataManager
+from data.persistence import DataPersistence
+from perf.fake_github import FakeGitHubServer
+from perf.synthetic import SyntheticHistoryRepository, generate_history, write_to_storage
+
+
+def test_history_is_deterministic_and_follows_the_configured_shape():
+    history = generate_history(runs=5000, workflows=3, branches=4, actors=5, failure_rate=0.1,
+                               flake_rate=0.1, rerun_rate=1.0, jobs_min=2, jobs_max=2, seed=7)
+    runs = list(history.dashboard_runs())
+
+    assert len(runs) == 5000
+    assert runs == list(generate_history(runs=5000, workflows=3, branches=4, actors=5, failure_rate=0.1,
+                                         flake_rate=0.1, rerun_rate=1.0, jobs_min=2, jobs_max=2, seed=7).dashboard_runs())
+    assert [run["created_at"] for run in runs] == sorted(run["created_at"] for run in runs)
+    assert {run["workflow_id"] for run in runs} == {1000, 1001, 1002}
+    assert len({run["branch"] for run in runs}) == 4
+    assert len({run["actor"] for run in runs}) <= 5
+
+    # Flaky runs: a failed run re-run on the same commit and workflow succeeds
+    reruns = history.attempt == 2
+    assert reruns.any()
+    attempts = {}
+    for run, attempt in zip(runs, history.attempt.tolist()):
+        attempts.setdefault((run["commit_sha"], run["workflow_id"], run["run_number"]), {})[attempt] = run["conclusion"]
+    pairs = [value for value in attempts.values() if 2 in value]
+    assert all(value[1] == "failure" for value in pairs)
+    assert {value[2] for value in pairs} == {"success", "failure"}
+
+    for index in (0, 4999):
+        jobs = history.dashboard_jobs(index)
+        assert len(jobs) == 2
+        assert set(jobs[0]) == {"id", "name", "status", "conclusion", "duration", "started_at", "completed_at"}
+        assert all(runs[index]["created_at"] <= job["started_at"] <= job["completed_at"] for job in jobs)
+        if runs[index]["conclusion"] == "failure":
+            assert "failure" in {job["conclusion"] for job in jobs}
+
+
+def test_history_is_written_to_storage(tmp_path):
+    history = generate_history(repo="owner/repo", runs=300)
+    persistence = write_to_storage(history, DataPersistence(str(tmp_path)))
+
+    manager = DataManager("owner/repo", persistence)
+    manager._load_cache()
+    assert len(manager._cached_run_ids) == 300
+    assert manager._cached_runs_with_jobs == manager._cached_run_ids
+    run_id = str(history.run_id(10))
+    assert persistence.get_jobs_for_run("owner/repo", run_id) == history.dashboard_jobs(10)
+
+
+def test_history_feeds_the_fake_github_server():
+    history = generate_history(repo="owner/repo", runs=250, workflows=2)
+    with FakeGitHubServer([SyntheticHistoryRepository(history)]) as server:
+        page = requests.get(f"{server.url}/repos/owner/repo/actions/runs", params={"per_page": 100}, timeout=5)
+        assert page.json()["total_count"] == 250
+        assert page.json()["workflow_runs"][0]["id"] == history.run_id(249)
+
+        workflow_runs = requests.get(f"{server.url}/repos/owner/repo/actions/workflows/1000/runs", timeout=5).json()
+        assert workflow_runs["total_count"] == int((history.workflow == 0).sum())
+
+        jobs = requests.get(f"{server.url}/repos/owner/repo/actions/runs/{history.run_id(0)}/jobs", timeout=5).json()
+        assert [job["name"] for job in jobs["jobs"]] == [job["name"] for job in history.dashboard_jobs(0)]
+        assert jobs["jobs"][0]["steps"][0]["started_at"] == jobs["jobs"][0]["started_at"]
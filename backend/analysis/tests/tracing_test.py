@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+
+import pytest
+
+from core.utils.tracing import extraction_trace, load_spans, span, to_chrome_trace
+
+
+@pytest.fixture(autouse=True)
+def enable_tracing(monkeypatch):
+    monkeypatch.setenv("EXTRACTION_TRACING", "1")
+
+
+def test_tracing_is_off_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv("EXTRACTION_TRACING")
+    with extraction_trace("job-a", "owner/a", str(tmp_path)) as trace_file:
+        with span("phase_1.workflow_runs") as attributes:
+            assert attributes is None
+    assert trace_file is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spans_are_tagged_with_their_extraction_across_concurrent_threads(tmp_path):
+    barrier = threading.Barrier(2)
+
+    def extraction(extraction_id, repo):
+        with extraction_trace(extraction_id, repo, str(tmp_path)):
+            with span("phase_1.workflow_runs"):
+                barrier.wait(timeout=5)
+                with span("github.workflow_runs_page", page=1) as attributes:
+                    attributes["status"] = 200
+
+    threads = [
+        threading.Thread(target=extraction, args=("job-a", "owner/a")),
+        threading.Thread(target=extraction, args=("job-b", "owner/b")),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for extraction_id, repo in (("job-a", "owner/a"), ("job-b", "owner/b")):
+        spans = {record["name"]: record for record in load_spans([tmp_path / f"{extraction_id}.jsonl"])}
+        assert set(spans) == {"phase_1.workflow_runs", "github.workflow_runs_page"}
+        assert {record["repo"] for record in spans.values()} == {repo}
+        page = spans["github.workflow_runs_page"]
+        assert page["parent_id"] == spans["phase_1.workflow_runs"]["span_id"]
+        assert page["attributes"] == {"page": 1, "status": 200}
+
+    with span("untraced") as attributes:
+        assert attributes is None
+
+
+def test_chrome_trace_shows_each_extraction_as_a_process(tmp_path):
+    with extraction_trace("job-a", "owner/a", str(tmp_path)):
+        with span("phase_2.jobs"):
+            with span("github.jobs", run_id="1"):
+                pass
+    with extraction_trace("job-b", "owner/b", str(tmp_path)):
+        try:
+            with span("persistence.update"):
+                raise OSError("disk full")
+        except OSError:
+            pass
+
+    trace = to_chrome_trace(load_spans(sorted(tmp_path.glob("*.jsonl"))))
+    json.dumps(trace)
+
+    names = {event["args"]["name"] for event in trace["traceEvents"] if event["ph"] == "M"}
+    assert names == {"owner/a (job-a)", "owner/b (job-b)"}
+    complete = {event["name"]: event for event in trace["traceEvents"] if event["ph"] == "X"}
+    assert complete["github.jobs"]["pid"] == complete["phase_2.jobs"]["pid"] != complete["persistence.update"]["pid"]
+    assert complete["github.jobs"]["cat"] == "github"
+    assert complete["persistence.update"]["args"]["error"] == "OSError: disk full"
+
+
+def test_concurrent_extractions_write_to_their_own_performance_logs():
+    from core.utils.logger import (
+        close_performance_logger,
+        get_performance_logger,
+        log_api_call,
+        setup_performance_logger,
+    )
+
+    log_files = {}
+    barrier = threading.Barrier(2)
+
+    def extraction(extraction_id, repo):
+        logger = setup_performance_logger(repo, extraction_id)
+        log_files[extraction_id] = logger.handlers[0].baseFilename
+        barrier.wait(timeout=5)
+        log_api_call("JOBS_API", f"https://api.github.com/repos/{repo}/actions/runs/1/jobs", 0.1, 200)
+        assert get_performance_logger() is logger
+        close_performance_logger(logger)
+
+    threads = [
+        threading.Thread(target=extraction, args=("extraction-a", "owner/a")),
+        threading.Thread(target=extraction, args=("extraction-b", "owner/b")),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    try:
+        assert log_files["extraction-a"] != log_files["extraction-b"]
+        for extraction_id, repo, other in (("extraction-a", "owner/a", "owner/b"), ("extraction-b", "owner/b", "owner/a")):
+            with open(log_files[extraction_id], encoding="utf-8") as f:
+                content = f.read()
+            assert f"repos/{repo}/actions" in content
+            assert f"repos/{other}/actions" not in content
+    finally:
+        for log_file in log_files.values():
+            os.remove(log_file)
+
+
+def test_run_job_traces_the_extraction_and_its_websocket_sends(tmp_path, monkeypatch):
+    from analysis import endpoint as endpoint_module
+    from extraction import worker as worker_module
+    from extraction.jobs import ExtractionJobQueue
+
+    def fake_send_data(ws, repo, filters, token=None):
+        endpoint_module._send_ws_json(ws, {"type": "complete", "totalRuns": 0})
+
+    monkeypatch.setenv("TRACE_DIR", str(tmp_path / "traces"))
+    monkeypatch.setattr(endpoint_module, "send_data", fake_send_data)
+
+    queue = ExtractionJobQueue(str(tmp_path / "jobs.sqlite3"))
+    job_id = queue.enqueue("owner/repo", {}, "token")
+    worker_module.run_job(queue, queue.claim_job("worker-1"), heartbeat_interval=60)
+
+    spans = {record["name"]: record for record in load_spans([tmp_path / "traces" / f"{job_id}.jsonl"])}
+    assert spans["extraction"]["attributes"] == {"worker_id": "worker-1"}
+    assert spans["websocket.send"]["parent_id"] == spans["extraction"]["span_id"]
+    assert spans["websocket.send"]["attributes"]["type"] == "complete"
+
+
+def test_extractions_without_tracing_still_get_their_own_performance_logs(tmp_path, monkeypatch):
+    from core.utils.logger import close_performance_logger, get_performance_logger, setup_performance_logger
+    from core.utils.tracing import current_extraction_id
+
+    monkeypatch.delenv("EXTRACTION_TRACING")
+    monkeypatch.setenv("TRACE_DIR", str(tmp_path / "traces"))
+    log_files = {}
+    barrier = threading.Barrier(2)
+
+    def extraction(extraction_id, repo):
+        with extraction_trace(extraction_id, repo) as trace_file:
+            assert trace_file is None
+            # As send_data sets it up
+            logger = setup_performance_logger(repo, current_extraction_id())
+            log_files[extraction_id] = logger.handlers[0].baseFilename
+            barrier.wait(timeout=5)
+            get_performance_logger().info(f"API call for {repo}")
+            close_performance_logger(logger)
+
+    threads = [
+        threading.Thread(target=extraction, args=("untraced-a", "owner/a")),
+        threading.Thread(target=extraction, args=("untraced-b", "owner/b")),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    try:
+        assert log_files["untraced-a"] != log_files["untraced-b"]
+        for extraction_id, repo, other in (("untraced-a", "owner/a", "owner/b"), ("untraced-b", "owner/b", "owner/a")):
+            with open(log_files[extraction_id], encoding="utf-8") as f:
+                content = f.read()
+            assert f"API call for {repo}" in content
+            assert f"API call for {other}" not in content
+    finally:
+        for log_file in log_files.values():
+            os.remove(log_file)
+    assert not (tmp_path / "traces").exists()
@@ -0,0 +1,107 @@
+import base64
+import os
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+import repo_info_collector
+import workflow_files
+from conftest import commit, git
+from repo_info_collector import count_lines_in_workflow_yml
+from workflow_files import WorkflowFiles
+
+REPO = "owner/repo"
+CI = ".github/workflows/ci.yml"
+RELEASE = ".github/workflows/release.yml"
+
+
+class FakeContents:
+    """The contents and blobs endpoints of GitHub, served from a repository and counting requests."""
+
+    def __init__(self, repo):
+        self.repo = repo
+        self.calls = 0
+
+    def get_request(self, url, token):
+        self.calls += 1
+        parsed = urlparse(url)
+        path = parsed.path.split(f"/repos/{REPO}/", 1)[1]
+        if path.startswith("git/blobs/"):
+            content = git(self.repo, "cat-file", "blob", path.rsplit("/", 1)[1], text=False)
+            return {"encoding": "base64", "content": base64.b64encode(content).decode()}
+        path = path.split("contents/", 1)[1].rstrip("/")
+        ref = parse_qs(parsed.query)["ref"][0]
+        entries = git(self.repo, "ls-tree", "-z", ref, "--", path, text=False).split(b"\0")[0]
+        if not entries:
+            return {"message": "Not Found"}
+        _, object_type, sha = entries.split(b"\t")[0].decode().split(" ")
+        if object_type == "blob":
+            content = git(self.repo, "cat-file", "blob", sha, text=False)
+            return {"type": "file", "sha": sha, "content": base64.b64encode(content).decode()}
+        listing = git(self.repo, "ls-tree", "-z", f"{ref}:{path}", text=False).split(b"\0")
+        return [
+            {"type": "file" if kind == "blob" else "dir", "path": f"{path}/{name}", "sha": sha}
+            for kind, sha, name in (
+                (info.split(" ")[1], info.split(" ")[2], name)
+                for info, name in (entry.decode().split("\t") for entry in listing if entry)
+            )
+        ]
+
+
+def _repository(tmp_path):
+    repo = str(tmp_path / "repo")
+    os.makedirs(repo)
+    git(repo, "init", "-q")
+    commits = [commit(repo, files={"app.py": b"a\n", CI: b"on: push\njobs: {}\n"})]
+    for index in range(20):
+        files = {"app.py": f"a{index}\n".encode()}
+        if index % 7 == 3:
+            files[CI] = b"on: push\n" + b"# step\n" * index
+        if index == 10:
+            files[RELEASE] = b"\xff\xfe binary"
+        commits.append(commit(repo, files=files))
+    return repo, commits
+
+
+def _runs(commits):
+    # Several workflows run on every commit, some of them re-run
+    return [(sha, path) for sha in commits for path in (CI, CI, RELEASE, ".github/workflows/gone.yml")]
+
+
+def _same(left, right):
+    return all((a is None and b is None) or (a == b) or (np.isnan(a) and np.isnan(b)) for a, b in zip(left, right))
+
+
+def test_line_counts_from_the_clone_cost_no_request(tmp_path, monkeypatch):
+    repo, commits = _repository(tmp_path)
+    github = FakeContents(repo)
+    monkeypatch.setattr(repo_info_collector, "get_request", github.get_request)
+    monkeypatch.setattr(workflow_files, "get_request", github.get_request)
+    runs = _runs(commits)
+    expected = [count_lines_in_workflow_yml(REPO, path, sha, "token") for sha, path in runs]
+    assert github.calls == len(runs)
+    assert {type(count) for count in expected} >= {int, float, type(None)}
+
+    github.calls = 0
+    files = WorkflowFiles(REPO, "token", repo)
+    assert _same([files.line_count(path, sha) for sha, path in runs], expected)
+    assert github.calls == 0
+    assert files.content_bytes(CI, commits[-1]) == b"on: push\n" + b"# step\n" * 17
+    assert files.content_bytes(RELEASE, commits[-1]) == b"\xff\xfe binary"
+    assert files.content_bytes(".github/workflows/gone.yml", commits[-1]) is None
+
+
+def test_line_counts_without_clone_are_read_once_per_blob(tmp_path, monkeypatch):
+    repo, commits = _repository(tmp_path)
+    github = FakeContents(repo)
+    monkeypatch.setattr(repo_info_collector, "get_request", github.get_request)
+    monkeypatch.setattr(workflow_files, "get_request", github.get_request)
+    runs = _runs(commits)
+    expected = [count_lines_in_workflow_yml(REPO, path, sha, "token") for sha, path in runs]
+
+    github.calls = 0
+    # One listing of the workflow directory per commit, one download per version of a workflow file
+    files = WorkflowFiles(REPO, "token", str(tmp_path / "no-clone"))
+    assert _same([files.line_count(path, sha) for sha, path in runs], expected)
+    assert len(files.blobs) == 5
+    assert github.calls == len(commits) + len(files.blobs)
@@ -1,11 +1,11 @@
+import atexit
 import base64
 import re
 import urllib.parse
 
 import os
-import secrets
+import signal
 import sys
-import time
 
 # Gevent monkey patch must be done before importing other modules
 try:
@@ -15,7 +15,7 @@ try:
 except ImportError:
     GEVENT_AVAILABLE = False
 
-from flask import Flask, jsonify, request, redirect
+from flask import Flask, Response, jsonify, request, redirect, send_file
 from flask_cors import CORS
 from dotenv import load_dotenv
 from flask_sock import Sock
@@ -23,7 +23,21 @@ import argparse
 import json
 import requests
 
-from analysis.endpoint import AggregationFilters, send_data
+from analysis.endpoint import AggregationFilters, serialize_filters, stream_job_events
+from extraction.jobs import JOB_DONE, JOB_QUEUED, JOB_RUNNING, ExtractionJobQueue, token_fingerprint
+from core.utils.github import github_api_url
+from core.utils.metrics import render_metrics
+from core.utils.profiling import (
+    default_profile_dir,
+    list_profiles,
+    load_profile,
+    pending_requests,
+    profiling_enabled,
+    request_profile,
+    request_sampling,
+)
+from extraction.sessions import create_session_store
+from extraction.worker import ExtractionWorkerPool, start_inline_job
 from typing import Iterable, cast
 from datetime import date, datetime
 from urllib.parse import unquote
@@ -66,19 +80,74 @@ CORS(
     },
 )
 
-# in-memory store pour multiples extractions simultanées (TTL 5 mins)
-extractions = {}
+# Extraction sessions (TTL 5 mins), shared by all backend processes unless
+# EXTRACTION_SESSION_STORE=memory (see extraction/sessions.py)
+EXTRACTION_SESSION_TTL = 300
+session_store = None
+
+# Extraction jobs run in worker processes (see extraction/worker.py); the
+# WebSocket handler only relays their progress events.
+job_queue = None
+extraction_workers = None
+inline_extraction_warned = False
 
 
-def _cleanup_expired_extractions():
-    now = time.time()
-    expired_ids = [
-        extraction_id
-        for extraction_id, extraction in extractions.items()
-        if extraction["expires_at"] <= now
-    ]
-    for extraction_id in expired_ids:
-        extractions.pop(extraction_id, None)
+def _get_job_queue():
+    global job_queue
+    if job_queue is None:
+        job_queue = ExtractionJobQueue()
+    return job_queue
+
+
+def _token_can_read_repo(token, repo):
+    try:
+        response = requests.get(
+            github_api_url(f"/repos/{repo}"),
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/vnd.github+json"
+            },
+            timeout=15
+        )
+    except requests.RequestException:
+        return False
+    return response.status_code == 200
+
+
+def _submit_extraction_job(queue, repo, filters_payload, token):
+    # Single-flight: attach to an active extraction of the same scope instead of
+    # collecting the same pages twice. A subscriber with another token may only
+    # attach once GitHub confirms that token can read the repository.
+    active_job = queue.find_active_job(repo, filters_payload)
+    coalesce = active_job is None or (
+        active_job.get("token_hash") == token_fingerprint(token)
+        or _token_can_read_repo(token, repo)
+    )
+    return queue.submit(repo, filters_payload, token, coalesce=coalesce)
+
+
+def _run_extractions_inline():
+    # Without a worker pool (tests, EXTRACTION_WORKERS=0) jobs run in this
+    # process, unless workers are managed separately (python -m extraction.worker).
+    # The pool is only started by `python app.py`, not under a WSGI server.
+    global inline_extraction_warned
+    if extraction_workers is not None:
+        return False
+    if os.getenv("EXTRACTION_EXTERNAL_WORKERS") == "1":
+        return False
+    if not inline_extraction_warned and os.getenv("EXTRACTION_WORKERS") != "0":
+        inline_extraction_warned = True
+        print("WARNING: No extraction worker pool in this process (served without `python app.py`?): "
+              "extractions run inside the web server process. Set EXTRACTION_EXTERNAL_WORKERS=1 and "
+              "run `python -m extraction.worker --processes N` in production.")
+    return True
+
+
+def _get_session_store():
+    global session_store
+    if session_store is None:
+        session_store = create_session_store()
+    return session_store
 
 
 def _first_filter_value(value):
@@ -244,6 +313,12 @@ def health():
     }, 200
 
 
+@app.get("/metrics")
+def metrics():
+    """Prometheus text exposition of the web server and extraction worker metrics."""
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4; charset=utf-8")
+
+
 # ============================================
 # Authentication Endpoint
 # ============================================
@@ -321,7 +396,7 @@ def github_callback():
     # 2. Retrieve the username with the token
     try:
         user_response = requests.get(
-            "https://api.github.com/user",
+            github_api_url("/user"),
             headers={
                 "Authorization": f"Bearer {access_token}",
                 "Accept": "application/vnd.github+json"
@@ -373,19 +448,9 @@ def create_extraction():
             "error": "Invalid filters payload"
         }), 400
 
-    _cleanup_expired_extractions()
-    now = time.time()
-
-    # Generate an unique extraction ID
-    extraction_id = secrets.token_urlsafe(32)
-
-    # Store extraction info in memory with TTL 5 mins
-    extractions[extraction_id] = {
-        "token": token,
-        "repo": repo,
-        "filters": filters,
-        "expires_at": now + 300
-    }
+    store = _get_session_store()
+    store.cleanup_expired()
+    extraction_id = store.create(token, repo, filters, ttl=EXTRACTION_SESSION_TTL)
 
     return jsonify({
         "success": True,
@@ -409,17 +474,20 @@ def websocket_data(ws, extractionId: str):
         ws.close()
         return
 
-    _cleanup_expired_extractions()
-    extraction = extractions.get(extractionId)
+    store = _get_session_store()
+    store.cleanup_expired()
+    extraction = store.claim(extractionId)
 
     if not extraction:
+        message = "Invalid or expired extraction session"
+        if store.get(extractionId):
+            message = "Extraction session is already streaming on another connection"
         error_msg = {
             "type": "error",
-            "message": "Invalid or expired extraction session"
+            "message": message
         }
         ws.send(json.dumps(error_msg))
         ws.close()
-        extractions.pop(extractionId, None)
         return
 
     token = extraction["token"]
@@ -433,6 +501,7 @@ def websocket_data(ws, extractionId: str):
         }
         ws.send(json.dumps(error_msg))
         ws.close()
+        store.delete(extractionId)
         return
 
     try:
@@ -444,14 +513,34 @@ def websocket_data(ws, extractionId: str):
         }
         ws.send(json.dumps(error_msg))
         ws.close()
-        extractions.pop(extractionId, None)
+        store.delete(extractionId)
         return
 
+    queue = _get_job_queue()
+    previous_job = queue.get_job(extraction["job_id"]) if extraction.get("job_id") else None
+    if previous_job and previous_job["status"] in (JOB_QUEUED, JOB_RUNNING):
+        # Reconnect after a dropped connection: follow the job that is still running
+        job_id = previous_job["id"]
+        print(f"[WebSocket] Reconnected to extraction job {job_id} for {repo}")
+    else:
+        job_id, created = _submit_extraction_job(queue, repo, serialize_filters(filters), token)
+        if not created:
+            print(f"[WebSocket] Attached to running extraction job {job_id} for {repo}")
+        else:
+            print(f"[WebSocket] Queued extraction job {job_id} for {repo}")
+            if _run_extractions_inline():
+                start_inline_job(queue, job_id)
+    store.set_job(extractionId, job_id)
+
     try:
-        # Stream data using GHAminer
-        send_data(ws, repo, filters, token)
+        stream_job_events(ws, queue, job_id)
     finally:
-        extractions.pop(extractionId, None)
+        job = queue.get_job(job_id)
+        if job and job["status"] == JOB_DONE:
+            store.delete(extractionId)
+        else:
+            # Keep the session so the client can reconnect and resume the extraction
+            store.release(extractionId, job_id, ttl=EXTRACTION_SESSION_TTL)
 
 
 # ============================================
@@ -485,7 +574,7 @@ def get_workflows(repositoryName: str):
     try:
         while True:
             response = requests.get(
-                f"https://api.github.com/repos/{repo}/actions/workflows",
+                github_api_url(f"/repos/{repo}/actions/workflows"),
                 headers={
                     "Authorization": f"Bearer {token}",
                     "Accept": "application/vnd.github+json",
@@ -549,7 +638,7 @@ def get_commit_files(owner: str, repo: str, commit_sha: str):
 
     try:
         response = requests.get(
-            f"https://api.github.com/repos/{repository}/commits/{commit_sha}",
+            github_api_url(f"/repos/{repository}/commits/{commit_sha}"),
             headers={
                 "Authorization": f"Bearer {token}",
                 "Accept": "application/vnd.github+json",
@@ -706,17 +795,107 @@ def debug():
             "config_exists": os.path.exists(ghaminer_config_path),
             "config": config_info
         },
+        "profiling": {
+            "enabled": profiling_enabled(),
+            "directory": str(default_profile_dir())
+        },
         "working_directory": os.getcwd(),
         "python_version": sys.version
     })
 
 
+def _profiling_disabled():
+    return jsonify({
+        "error": "Extraction profiling is disabled. Set EXTRACTION_PROFILING=1 to enable it."
+    }), 404
+
+
+@app.get("/api/debug/profiles")
+def get_debug_profiles():
+    """Stored extraction profiles and the requests not picked up yet"""
+    if not profiling_enabled():
+        return _profiling_disabled()
+    return jsonify({
+        "profiles": list_profiles(),
+        "pending": pending_requests()
+    })
+
+
+@app.post("/api/debug/profiles")
+def create_debug_profile():
+    """Profile the next extraction of a repository (cProfile and/or tracemalloc)"""
+    if not profiling_enabled():
+        return _profiling_disabled()
+
+    data = request.get_json(silent=True) or {}
+    repo = data.get("repo")
+    if not repo or "/" not in repo or repo.count("/") != 1:
+        return jsonify({"error": "Invalid repository format. Expected owner/repo"}), 400
+
+    cpu = _bool_filter_value(data.get("cpu"), default=True)
+    memory = _bool_filter_value(data.get("memory"), default=False)
+    if not cpu and not memory:
+        return jsonify({"error": "Enable cpu and/or memory profiling"}), 400
+
+    return jsonify({"request": request_profile(repo, cpu=cpu, memory=memory)}), 201
+
+
+@app.get("/api/debug/profiles/<profile_id>")
+def get_debug_profile(profile_id: str):
+    """Summary of a profile: top functions and allocation sites, or sampled stacks"""
+    if not profiling_enabled():
+        return _profiling_disabled()
+    profile = load_profile(profile_id)
+    if profile is None:
+        return jsonify({"error": f"Unknown profile: {profile_id}"}), 404
+    return jsonify(profile)
+
+
+@app.get("/api/debug/profiles/<profile_id>/<file_type>")
+def download_debug_profile(profile_id: str, file_type: str):
+    """Raw profile data: the pstats file of a profile or the folded stacks of a sample"""
+    if not profiling_enabled():
+        return _profiling_disabled()
+    profile = load_profile(profile_id)
+    file_name = None
+    if profile and file_type == "pstats":
+        file_name = (profile.get("cpu") or {}).get("pstats_file")
+    elif profile and file_type == "folded":
+        file_name = profile.get("folded_file")
+    if not file_name:
+        return jsonify({"error": f"No {file_type} file for profile {profile_id}"}), 404
+    return send_file(default_profile_dir() / file_name, as_attachment=True, download_name=file_name)
+
+
+@app.post("/api/debug/extractions/<job_id>/sample")
+def sample_debug_extraction(job_id: str):
+    """Sample the stack of a running extraction (picked up at the worker's next heartbeat)"""
+    if not profiling_enabled():
+        return _profiling_disabled()
+
+    job = _get_job_queue().get_job(job_id)
+    if not job:
+        return jsonify({"error": f"Unknown extraction job: {job_id}"}), 404
+    if job["status"] != JOB_RUNNING:
+        return jsonify({"error": f"Extraction job {job_id} is not running ({job['status']})"}), 409
+
+    data = request.get_json(silent=True) or {}
+    try:
+        duration = float(data.get("duration", 10))
+        interval = float(data.get("interval", 0.01))
+    except (TypeError, ValueError):
+        return jsonify({"error": "duration and interval must be numbers"}), 400
+
+    return jsonify({"request": request_sampling(job_id, duration=duration, interval=interval)}), 202
+
+
 # ============================================
 # Start Application
 # ============================================
 if __name__ == "__main__":
     port = int(os.getenv("FLASK_RUN_PORT", 3000))
     host = os.getenv("FLASK_RUN_HOST", "127.0.0.1")
+    # The dev server fallbacks run without the reloader: it runs __main__ again, starting another worker pool
     debug = os.getenv("FLASK_DEBUG", "1") == "1"
     env_token_set = bool(os.getenv("GITHUB_TOKEN"))
     env_token_fallback_enabled = os.getenv("ALLOW_ENV_GITHUB_TOKEN_FALLBACK") == "1"
@@ -724,6 +903,21 @@ if __name__ == "__main__":
     print(f"Starting GHA Dashboard Backend (GHAminer) on {host}:{port}")
     print(f"GitHub env token fallback enabled: {env_token_fallback_enabled} (GITHUB_TOKEN configured: {env_token_set})")
 
+    worker_count = int(os.getenv("EXTRACTION_WORKERS", min(4, os.cpu_count() or 1)))
+    if os.getenv("EXTRACTION_EXTERNAL_WORKERS") == "1":
+        print("Extraction jobs are run by external workers (python -m extraction.worker)")
+    elif worker_count > 0:
+        extraction_workers = ExtractionWorkerPool(worker_count, _get_job_queue().db_path)
+        extraction_workers.start()
+        # Terminate the workers with the server (their loop also exits if the server is killed).
+        # The signal handlers only exit: under gevent they run in the event loop, where
+        # waiting for the workers is not allowed; atexit stops them once the server returned.
+        atexit.register(extraction_workers.stop)
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        signal.signal(signal.SIGINT, lambda signum, frame: sys.exit(0))
+    else:
+        print("WARNING: EXTRACTION_WORKERS=0, extractions will run inside the web server process")
+
     # Use gevent for WebSocket support with Flask-Sock
     if GEVENT_AVAILABLE:
         try:
@@ -744,7 +938,7 @@ if __name__ == "__main__":
             import traceback
             traceback.print_exc()
             print("Falling back to Flask dev server (WebSockets may not work)")
-            app.run(host=host, port=port, debug=debug)
+            app.run(host=host, port=port, debug=debug, use_reloader=False)
     else:
         print("WARNING: gevent not installed, using Flask dev server (WebSockets may not work)")
-        app.run(host=host, port=port, debug=debug)
+        app.run(host=host, port=port, debug=debug, use_reloader=False)
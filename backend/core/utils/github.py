@@ -0,0 +1,24 @@
+"""
+GitHub API location used by every collector path.
+Set GITHUB_API_URL to point the backend at GitHub Enterprise or at the local
+fake server (python -m perf.fake_github) for offline performance testing.
+"""
+import os
+
+DEFAULT_GITHUB_API_URL = "https://api.github.com"
+
+
+def github_api_url(path: str = "") -> str:
+    """
+    Build a GitHub API URL.
+
+    Args:
+        path: API path (e.g., '/repos/owner/repo/actions/runs')
+
+    Returns:
+        Absolute URL on the configured API base (GITHUB_API_URL, defaults to api.github.com)
+    """
+    base_url = (os.getenv("GITHUB_API_URL") or DEFAULT_GITHUB_API_URL).rstrip("/")
+    if path and not path.startswith("/"):
+        path = f"/{path}"
+    return f"{base_url}{path}"
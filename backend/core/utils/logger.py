@@ -4,16 +4,29 @@ Logs API call durations and collection phase timings to a file.
 """
 import logging
 import os
+from contextvars import ContextVar
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
+from core.utils.metrics import record_api_call, record_rate_limit_sleep
 
-def setup_performance_logger(repo_name: str = None) -> logging.Logger:
+
+# Logger of the extraction running in the current context (greenlet/thread)
+_extraction_logger: ContextVar[Optional[logging.Logger]] = ContextVar("gha_performance_logger", default=None)
+
+
+def setup_performance_logger(repo_name: str = None, extraction_id: str = None) -> logging.Logger:
     """
     Set up a logger that writes to a file with repo name and timestamp.
+
+    When an extraction ID is given, the logger is private to that extraction and
+    bound to the current context, so concurrent extractions keep writing to their
+    own files. Release it with close_performance_logger().
     
     Args:
         repo_name: Repository name (e.g., 'AUTOMATIC1111/stable-diffusion-webui')
+        extraction_id: ID of the extraction the logger belongs to
     
     Returns:
         Configured logger instance
@@ -24,19 +37,27 @@ def setup_performance_logger(repo_name: str = None) -> logging.Logger:
     
     # Create log filename with repo name and timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    suffix = f"_{extraction_id[:8]}" if extraction_id else ""
     if repo_name:
         # Sanitize repo name for filename
         safe_repo_name = repo_name.replace("/", "_").replace("\\", "_")
-        log_filename = logs_dir / f"performance_{safe_repo_name}_{timestamp}.log"
+        log_filename = logs_dir / f"performance_{safe_repo_name}_{timestamp}{suffix}.log"
     else:
-        log_filename = logs_dir / f"performance_{timestamp}.log"
+        log_filename = logs_dir / f"performance_{timestamp}{suffix}.log"
     
     # Create logger
-    logger = logging.getLogger("gha_performance")
+    if extraction_id:
+        # Not registered with logging.getLogger so finished extractions can be collected
+        logger = logging.Logger(f"gha_performance.{extraction_id}")
+        logger.propagate = False
+    else:
+        logger = logging.getLogger("gha_performance")
     logger.setLevel(logging.INFO)
     
     # Remove existing handlers to avoid duplicates
-    logger.handlers = []
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
     
     # File handler
     file_handler = logging.FileHandler(log_filename, mode='w', encoding='utf-8')
@@ -59,16 +80,37 @@ def setup_performance_logger(repo_name: str = None) -> logging.Logger:
     
     logger.info("=" * 80)
     logger.info(f"Performance logging started for repository: {repo_name or 'Unknown'}")
+    if extraction_id:
+        logger.info(f"Extraction: {extraction_id}")
     logger.info(f"Log file: {log_filename}")
     logger.info("=" * 80)
+
+    if extraction_id:
+        _extraction_logger.set(logger)
     
     return logger
 
 
+def close_performance_logger(logger: logging.Logger):
+    """
+    Close the handlers of an extraction logger and unbind it from the current context.
+    """
+    if _extraction_logger.get() is logger:
+        _extraction_logger.set(None)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
 def get_performance_logger() -> logging.Logger:
     """
-    Get the existing performance logger, or create a default one if it doesn't exist.
+    Get the logger of the current extraction, or the shared default logger
+    (created on first use) outside of an extraction.
     """
+    logger = _extraction_logger.get()
+    if logger is not None:
+        return logger
+
     logger = logging.getLogger("gha_performance")
     if not logger.handlers:
         # If no handlers, create a default logger
@@ -76,3 +118,36 @@ def get_performance_logger() -> logging.Logger:
         return setup_performance_logger("unknown_repo")
     return logger
 
+
+def log_api_call(api_type: str, url: str, duration: float, status: object, **counts):
+    """
+    Record a GitHub API call in the metrics registry and the performance log.
+
+    Args:
+        api_type: API type label (e.g., 'JOBS_API', 'WORKFLOW_RUNS_API')
+        url: Requested URL
+        duration: Request duration in seconds
+        status: HTTP status code
+        **counts: Extra fields appended to the log line (e.g., Page=2, Runs=100)
+    """
+    record_api_call(api_type, status, duration)
+
+    log_msg = f"API_CALL - {api_type} - URL: {url} - Duration: {duration:.3f}s - Status: {status}"
+    for name, value in counts.items():
+        log_msg += f" - {name}: {value}"
+    get_performance_logger().info(log_msg)
+
+
+def log_rate_limit_sleep(url: str, sleep_seconds: float, status: object):
+    """
+    Record a wait for the GitHub API rate limit in the metrics registry and the performance log.
+
+    Args:
+        url: URL whose request hit the rate limit
+        sleep_seconds: Seconds the collection sleeps before retrying
+        status: HTTP status code of the rate-limited response
+    """
+    record_rate_limit_sleep(sleep_seconds)
+    get_performance_logger().info(
+        f"RATE_LIMIT_SLEEP - URL: {url} - Duration: {sleep_seconds:.3f}s - Status: {status}"
+    )
@@ -0,0 +1,337 @@
+"""
+In-process metrics registry for GHA-Dashboard performance monitoring.
+Counters, gauges and latency histograms exported in the Prometheus text
+exposition format on /metrics.
+
+Extraction worker processes write snapshots of their registry to a shared
+directory; the web server merges them into its own export.
+"""
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Seconds; covers GitHub API calls, storage reads/writes and collection phases
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 1800.0)
+
+
+class _Metric:
+    """Base class of the metric types; one value (or histogram) per label set."""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def snapshot(self) -> List[Tuple[Tuple[str, ...], object]]:
+        raise NotImplementedError
+
+    def merge(self, key: Tuple[str, ...], value: object):
+        raise NotImplementedError
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    metric_type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def snapshot(self):
+        with self._lock:
+            return list(self._values.items())
+
+    def merge(self, key, value):
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+
+class Gauge(Counter):
+    """Value that can go up and down (merged across processes by summing)."""
+
+    metric_type = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, with their sum and count."""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            state["counts"][index] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                (key, {"counts": list(state["counts"]), "sum": state["sum"], "count": state["count"]})
+                for key, state in self._values.items()
+            ]
+
+    def merge(self, key, value):
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            if len(value["counts"]) != len(state["counts"]):
+                return
+            for index, count in enumerate(value["counts"]):
+                state["counts"][index] += count
+            state["sum"] += value["sum"]
+            state["count"] += value["count"]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for name, value in zip(names, values)
+    ]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class MetricsRegistry:
+    """Holds the metrics of a process and renders them as text."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def reset(self):
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+    def snapshot(self) -> Dict[str, list]:
+        """JSON-serializable values of every metric (used to share worker metrics)."""
+        return {
+            name: [[list(key), value] for key, value in metric.snapshot()]
+            for name, metric in list(self._metrics.items())
+        }
+
+    def merged_with(self, snapshots: Iterable[Dict[str, list]]) -> "MetricsRegistry":
+        """
+        Build a registry holding this registry's values plus the given snapshots.
+
+        Args:
+            snapshots: Snapshots of other processes (metrics unknown here are ignored)
+        """
+        merged = MetricsRegistry()
+        for name, metric in list(self._metrics.items()):
+            if isinstance(metric, Histogram):
+                copy = merged.histogram(name, metric.documentation, metric.labelnames, metric.buckets)
+            else:
+                copy = merged._register(type(metric)(name, metric.documentation, metric.labelnames))
+            for key, value in metric.snapshot():
+                copy.merge(key, value)
+
+        for snapshot in snapshots:
+            for name, entries in snapshot.items():
+                metric = merged.get(name)
+                if metric is None:
+                    continue
+                for key, value in entries:
+                    metric.merge(tuple(key), value)
+        return merged
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.metric_type}")
+            for key, value in sorted(metric.snapshot()):
+                if isinstance(metric, Histogram):
+                    cumulative = 0
+                    for bound, count in zip(list(metric.buckets) + [math.inf], value["counts"]):
+                        cumulative += count
+                        labels = _format_labels(metric.labelnames + ("le",), key + (_format_value(bound),))
+                        lines.append(f"{name}_bucket{labels} {cumulative}")
+                    labels = _format_labels(metric.labelnames, key)
+                    lines.append(f"{name}_sum{labels} {_format_value(value['sum'])}")
+                    lines.append(f"{name}_count{labels} {value['count']}")
+                else:
+                    lines.append(f"{name}{_format_labels(metric.labelnames, key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+API_REQUESTS = REGISTRY.counter(
+    "gha_api_requests_total", "GitHub API requests by API type and HTTP status", ("api_type", "status"))
+API_REQUEST_DURATION = REGISTRY.histogram(
+    "gha_api_request_duration_seconds", "GitHub API request latency by API type", ("api_type",))
+RATE_LIMIT_SLEEPS = REGISTRY.counter(
+    "gha_rate_limit_sleeps_total", "Waits for the GitHub API rate limit to reset")
+RATE_LIMIT_SLEEP_SECONDS = REGISTRY.counter(
+    "gha_rate_limit_sleep_seconds_total", "Seconds spent waiting for the GitHub API rate limit to reset")
+PHASE_DURATION = REGISTRY.histogram(
+    "gha_phase_duration_seconds", "Duration of the collection phases", ("phase",))
+RUNS_COLLECTED = REGISTRY.counter(
+    "gha_runs_collected_total", "Workflow runs collected from the GitHub API")
+JOBS_COLLECTED = REGISTRY.counter(
+    "gha_jobs_collected_total", "Jobs collected from the GitHub API")
+PERSISTENCE_DURATION = REGISTRY.histogram(
+    "gha_persistence_duration_seconds", "Repository storage file reads and writes", ("operation",))
+PERSISTENCE_BYTES = REGISTRY.counter(
+    "gha_persistence_bytes_total", "Bytes read from and written to repository storage files", ("operation",))
+WEBSOCKET_FRAMES = REGISTRY.counter(
+    "gha_websocket_frames_sent_total", "WebSocket frames sent to dashboard clients")
+WEBSOCKET_BYTES = REGISTRY.counter(
+    "gha_websocket_bytes_sent_total", "Bytes of WebSocket frames sent to dashboard clients")
+ACTIVE_EXTRACTIONS = REGISTRY.gauge(
+    "gha_active_extractions", "Extractions currently running")
+
+
+def record_api_call(api_type: str, status: object, duration: float):
+    """Record one GitHub API request."""
+    API_REQUESTS.inc(api_type=api_type, status=status)
+    API_REQUEST_DURATION.observe(duration, api_type=api_type)
+
+
+def record_rate_limit_sleep(sleep_seconds: float):
+    """Record one wait for the GitHub API rate limit."""
+    RATE_LIMIT_SLEEPS.inc()
+    RATE_LIMIT_SLEEP_SECONDS.inc(sleep_seconds)
+
+
+def default_snapshot_dir() -> Path:
+    """Directory where processes share their metric snapshots (METRICS_DIR, or next to the extraction queue)."""
+    configured_dir = os.getenv("METRICS_DIR")
+    if configured_dir:
+        return Path(configured_dir)
+
+    from extraction.jobs import default_db_path
+    return default_db_path().parent / "metrics"
+
+
+def write_snapshot(directory: Optional[Path] = None, registry: MetricsRegistry = REGISTRY):
+    """Write the snapshot of this process's registry (called periodically by extraction workers)."""
+    directory = Path(directory) if directory else default_snapshot_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        snapshot_file = directory / f"{os.getpid()}.json"
+        temp_file = snapshot_file.with_suffix(".tmp")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump({"pid": os.getpid(), "written_at": time.time(), "metrics": registry.snapshot()}, f)
+        temp_file.replace(snapshot_file)
+    except Exception as e:
+        print(f"[Metrics] Error writing metrics snapshot: {e}")
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_snapshots(directory: Optional[Path] = None) -> List[Dict[str, list]]:
+    """
+    Read the snapshots written by other live processes; snapshots of exited processes are removed.
+    """
+    directory = Path(directory) if directory else default_snapshot_dir()
+    snapshots = []
+    if not directory.exists():
+        return snapshots
+
+    for snapshot_file in directory.glob("*.json"):
+        try:
+            pid = int(snapshot_file.stem)
+        except ValueError:
+            continue
+        if pid == os.getpid():
+            continue
+        if not _process_alive(pid):
+            try:
+                snapshot_file.unlink()
+            except OSError:
+                pass
+            continue
+        try:
+            with open(snapshot_file, "r", encoding="utf-8") as f:
+                snapshots.append(json.load(f)["metrics"])
+        except Exception as e:
+            print(f"[Metrics] Error reading metrics snapshot {snapshot_file.name}: {e}")
+    return snapshots
+
+
+def render_metrics(include_workers: bool = True) -> str:
+    """Render this process's metrics, merged with the snapshots of the extraction workers."""
+    if not include_workers:
+        return REGISTRY.render()
+    return REGISTRY.merged_with(read_snapshots()).render()
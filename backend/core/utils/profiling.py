@@ -0,0 +1,358 @@
+"""
+On-demand CPU and memory profiling of extractions (opt-in with EXTRACTION_PROFILING=1).
+
+Profiles are requested through the /api/debug/profiles endpoints and picked up by
+the process running the extraction (usually an extraction worker) through request
+files in the profile directory:
+
+- the next extraction of a repository runs under cProfile and/or tracemalloc;
+- a running extraction has its stack sampled for a few seconds.
+
+Results (pstats file, folded stacks, top functions and allocation sites) are written
+to PROFILE_DIR (default backend/logs/profiles). When profiling is disabled, workers
+only check the environment variable once per job and heartbeat.
+"""
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+DEFAULT_TOP = 30
+MAX_SAMPLING_SECONDS = 300
+
+
+def profiling_enabled() -> bool:
+    """Profiling hooks are off unless EXTRACTION_PROFILING is set to 1."""
+    return os.getenv("EXTRACTION_PROFILING", "0").strip().lower() in ("1", "true", "yes")
+
+
+def default_profile_dir() -> Path:
+    """Directory of the profiling requests and results (PROFILE_DIR, or backend/logs/profiles)."""
+    configured_dir = os.getenv("PROFILE_DIR")
+    if configured_dir:
+        return Path(configured_dir)
+    return Path(__file__).parent.parent.parent / "logs" / "profiles"
+
+
+def _safe_name(value: str) -> str:
+    return str(value).replace("/", "_").replace("\\", "_")
+
+
+def _write_json(path: Path, payload: Dict[str, Any]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = path.with_name(f".{path.name}.tmp")
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    temp_file.replace(path)
+
+
+def _take_request(path: Path) -> Optional[Dict[str, Any]]:
+    # Renaming is atomic: only one process can claim a request
+    claimed = path.with_name(f".{path.name}.{os.getpid()}.claimed")
+    try:
+        path.rename(claimed)
+    except OSError:
+        return None
+    try:
+        with open(claimed, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[Profiling] Ignoring unreadable request {path.name}: {e}")
+        return None
+    finally:
+        try:
+            claimed.unlink()
+        except OSError:
+            pass
+
+
+def request_profile(repo: str, cpu: bool = True, memory: bool = False,
+                    profile_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Profile the next extraction of a repository.
+
+    Args:
+        repo: Repository (owner/repo)
+        cpu: Run the extraction under cProfile
+        memory: Trace allocations with tracemalloc
+        profile_dir: Profile directory (defaults to default_profile_dir())
+
+    Returns:
+        The stored request
+    """
+    request = {"repo": repo, "cpu": bool(cpu), "memory": bool(memory), "requested_at": time.time()}
+    directory = Path(profile_dir) if profile_dir else default_profile_dir()
+    _write_json(directory / "requests" / f"{_safe_name(repo)}.json", request)
+    return request
+
+
+def take_profile_request(repo: str, profile_dir: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Claim the pending profile request of a repository, if any."""
+    directory = Path(profile_dir) if profile_dir else default_profile_dir()
+    return _take_request(directory / "requests" / f"{_safe_name(repo)}.json")
+
+
+def request_sampling(job_id: str, duration: float = 10.0, interval: float = 0.01,
+                     profile_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Sample the stack of a running extraction.
+
+    Args:
+        job_id: Extraction job ID
+        duration: Seconds to sample for (at most MAX_SAMPLING_SECONDS)
+        interval: Seconds between samples
+        profile_dir: Profile directory (defaults to default_profile_dir())
+
+    Returns:
+        The stored request
+    """
+    request = {
+        "job_id": job_id,
+        "duration": min(max(float(duration), 0.1), MAX_SAMPLING_SECONDS),
+        "interval": max(float(interval), 0.001),
+        "requested_at": time.time(),
+    }
+    directory = Path(profile_dir) if profile_dir else default_profile_dir()
+    _write_json(directory / "samples" / f"{_safe_name(job_id)}.json", request)
+    return request
+
+
+def take_sampling_request(job_id: str, profile_dir: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Claim the pending sampling request of a job, if any."""
+    directory = Path(profile_dir) if profile_dir else default_profile_dir()
+    return _take_request(directory / "samples" / f"{_safe_name(job_id)}.json")
+
+
+def pending_requests(profile_dir: Optional[Path] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Profile and sampling requests not yet picked up by an extraction."""
+    directory = Path(profile_dir) if profile_dir else default_profile_dir()
+    pending = {"profiles": [], "samples": []}
+    for kind, subdirectory in (("profiles", "requests"), ("samples", "samples")):
+        for request_file in sorted((directory / subdirectory).glob("*.json")):
+            try:
+                with open(request_file, "r", encoding="utf-8") as f:
+                    pending[kind].append(json.load(f))
+            except (OSError, ValueError):
+                continue
+    return pending
+
+
+def _function_label(key) -> str:
+    filename, line, function = key
+    if filename == "~":
+        return function
+    return f"{filename}:{line}({function})"
+
+
+def top_functions(stats: pstats.Stats, top: int = DEFAULT_TOP) -> List[Dict[str, Any]]:
+    """Functions with the highest cumulative time of a pstats.Stats."""
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+    return [
+        {
+            "function": _function_label(key),
+            "calls": calls,
+            "total_time": round(total_time, 6),
+            "cumulative_time": round(cumulative_time, 6),
+        }
+        for key, (primitive_calls, calls, total_time, cumulative_time, callers) in rows
+    ]
+
+
+def top_allocations(snapshot: tracemalloc.Snapshot, top: int = DEFAULT_TOP) -> List[Dict[str, Any]]:
+    """Allocation sites holding the most memory in a tracemalloc snapshot."""
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+    return [
+        {
+            "location": f"{statistic.traceback[0].filename}:{statistic.traceback[0].lineno}",
+            "size_bytes": statistic.size,
+            "count": statistic.count,
+        }
+        for statistic in snapshot.statistics("lineno")[:top]
+    ]
+
+
+@contextmanager
+def profile_extraction(profile_id: str, repo: str, cpu: bool = True, memory: bool = False,
+                       profile_dir: Optional[Path] = None, top: int = DEFAULT_TOP) -> Iterator[Path]:
+    """
+    Profile the code run in this context (cProfile only sees the current thread).
+
+    Writes {profile_id}.json (summary) and, with cpu, {profile_id}.pstats to the profile directory.
+
+    Yields:
+        Path of the summary file
+    """
+    directory = Path(profile_dir) if profile_dir else default_profile_dir()
+    summary_file = directory / f"{_safe_name(profile_id)}.json"
+    profiler = cProfile.Profile() if cpu else None
+    trace_memory = memory and not tracemalloc.is_tracing()
+    if trace_memory:
+        tracemalloc.start()
+    started_at = time.time()
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    error = None
+    try:
+        yield summary_file
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        if profiler:
+            profiler.disable()
+        duration = time.perf_counter() - start
+        summary = {
+            "id": profile_id,
+            "kind": "profile",
+            "repo": repo,
+            "pid": os.getpid(),
+            "started_at": started_at,
+            "duration_seconds": round(duration, 6),
+            "error": error,
+        }
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            if profiler:
+                pstats_file = directory / f"{_safe_name(profile_id)}.pstats"
+                profiler.dump_stats(str(pstats_file))
+                stats = pstats.Stats(profiler)
+                summary["cpu"] = {
+                    "pstats_file": pstats_file.name,
+                    "total_calls": stats.total_calls,
+                    "top_functions": top_functions(stats, top),
+                }
+            if memory and tracemalloc.is_tracing():
+                summary["memory"] = {
+                    "peak_bytes": tracemalloc.get_traced_memory()[1],
+                    "top_allocations": top_allocations(tracemalloc.take_snapshot(), top),
+                }
+            _write_json(summary_file, summary)
+            print(f"[Profiling] Profile of {repo} written to {summary_file}")
+        except Exception as e:
+            print(f"[Profiling] Error writing profile {profile_id}: {e}")
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+
+
+def _frame_stack(frame) -> List[str]:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def sample_thread(profile_id: str, repo: str, thread_id: int, duration: float = 10.0, interval: float = 0.01,
+                  profile_dir: Optional[Path] = None, top: int = DEFAULT_TOP) -> Path:
+    """
+    Sample the stack of another thread, then write {profile_id}.json (summary) and
+    {profile_id}.folded (collapsed stacks, for flamegraph.pl or speedscope).
+
+    Returns:
+        Path of the summary file
+    """
+    directory = Path(profile_dir) if profile_dir else default_profile_dir()
+    stacks: Counter = Counter()
+    started_at = time.time()
+    deadline = time.perf_counter() + duration
+    samples = 0
+    while time.perf_counter() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            break
+        stacks[";".join(_frame_stack(frame))] += 1
+        samples += 1
+        del frame
+        time.sleep(interval)
+
+    leaf_counts: Counter = Counter()
+    inclusive_counts: Counter = Counter()
+    for stack, count in stacks.items():
+        functions = stack.split(";")
+        leaf_counts[functions[-1]] += count
+        for function in set(functions):
+            inclusive_counts[function] += count
+
+    directory.mkdir(parents=True, exist_ok=True)
+    folded_file = directory / f"{_safe_name(profile_id)}.folded"
+    with open(folded_file, "w", encoding="utf-8") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+    summary_file = directory / f"{_safe_name(profile_id)}.json"
+    _write_json(summary_file, {
+        "id": profile_id,
+        "kind": "sample",
+        "repo": repo,
+        "pid": os.getpid(),
+        "started_at": started_at,
+        "duration_seconds": round(time.time() - started_at, 6),
+        "interval": interval,
+        "samples": samples,
+        "folded_file": folded_file.name,
+        "top_functions": [
+            {"function": function, "self_samples": leaf_counts[function], "total_samples": count}
+            for function, count in inclusive_counts.most_common(top)
+        ],
+        "top_self_functions": [
+            {"function": function, "self_samples": count} for function, count in leaf_counts.most_common(top)
+        ],
+    })
+    print(f"[Profiling] {samples} stack samples of {repo} written to {summary_file}")
+    return summary_file
+
+
+def start_sampling(profile_id: str, repo: str, thread_id: int, request: Dict[str, Any],
+                   profile_dir: Optional[Path] = None) -> threading.Thread:
+    """Run sample_thread for a sampling request in a background thread."""
+    thread = threading.Thread(
+        target=sample_thread,
+        args=(profile_id, repo, thread_id, request.get("duration", 10.0), request.get("interval", 0.01), profile_dir),
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def list_profiles(profile_dir: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Summaries of the stored profiles (without their top lists), newest first."""
+    directory = Path(profile_dir) if profile_dir else default_profile_dir()
+    profiles = []
+    for summary_file in directory.glob("*.json"):
+        try:
+            with open(summary_file, "r", encoding="utf-8") as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            continue
+        profiles.append({
+            key: summary.get(key)
+            for key in ("id", "kind", "repo", "pid", "started_at", "duration_seconds", "error", "samples")
+            if key in summary
+        })
+    return sorted(profiles, key=lambda profile: profile.get("started_at") or 0, reverse=True)
+
+
+def load_profile(profile_id: str, profile_dir: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Summary of a stored profile, or None if it does not exist."""
+    directory = Path(profile_dir) if profile_dir else default_profile_dir()
+    summary_file = directory / f"{_safe_name(profile_id)}.json"
+    try:
+        with open(summary_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,212 @@
+"""
+Per-extraction tracing for GHA-Dashboard performance monitoring (opt-in with EXTRACTION_TRACING=1).
+Spans around collection phases, GitHub API calls, storage flushes and
+WebSocket sends are tagged with the extraction ID and repository of the
+extraction that made them, written as JSONL to backend/logs/traces/ and
+convertible to the Chrome/Perfetto trace format:
+
+    python -m core.utils.tracing logs/traces/<extraction_id>.jsonl -o trace.json
+"""
+import argparse
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+_trace_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar("gha_trace_context", default=None)
+_current_span_id: ContextVar[Optional[str]] = ContextVar("gha_trace_span", default=None)
+_write_lock = threading.Lock()
+
+
+def default_trace_dir() -> Path:
+    """Directory of the trace files (TRACE_DIR, or backend/logs/traces)."""
+    configured_dir = os.getenv("TRACE_DIR")
+    if configured_dir:
+        return Path(configured_dir)
+    return Path(__file__).parent.parent.parent / "logs" / "traces"
+
+
+def tracing_enabled() -> bool:
+    """Tracing is off unless EXTRACTION_TRACING is set to 1 (trace files are never deleted)."""
+    return os.getenv("EXTRACTION_TRACING", "0").strip().lower() in ("1", "true", "yes")
+
+
+@contextmanager
+def extraction_trace(extraction_id: str, repo: str, trace_dir: Optional[str] = None) -> Iterator[Optional[Path]]:
+    """
+    Tag every span opened in this context with an extraction.
+
+    The extraction ID is set even when tracing is disabled (current_extraction_id()
+    keeps the performance log of the extraction private); spans are only written
+    with EXTRACTION_TRACING=1.
+
+    Args:
+        extraction_id: ID of the extraction (the extraction job ID)
+        repo: Repository being collected
+        trace_dir: Directory of the trace files (defaults to default_trace_dir())
+
+    Yields:
+        Path of the trace file, or None if tracing is disabled
+    """
+    trace_file = None
+    if tracing_enabled():
+        directory = Path(trace_dir) if trace_dir else default_trace_dir()
+        safe_id = str(extraction_id).replace("/", "_").replace("\\", "_")
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            trace_file = directory / f"{safe_id}.jsonl"
+        except OSError as e:
+            print(f"[Tracing] Could not create trace directory {directory}: {e}")
+
+    context_token = _trace_context.set({"extraction_id": str(extraction_id), "repo": repo, "file": trace_file})
+    span_token = _current_span_id.set(None)
+    try:
+        yield trace_file
+    finally:
+        _current_span_id.reset(span_token)
+        _trace_context.reset(context_token)
+
+
+def current_extraction_id() -> Optional[str]:
+    """ID of the extraction traced in the current context, if any."""
+    context = _trace_context.get()
+    return context["extraction_id"] if context else None
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Optional[Dict[str, Any]]]:
+    """
+    Time a block as a span of the current extraction (no-op outside extraction_trace or with tracing disabled).
+
+    Args:
+        name: Span name (e.g., 'github.jobs', 'persistence.update')
+        **attributes: Extra fields stored with the span
+
+    Yields:
+        The span's attribute dict (add fields to it while the block runs), or None
+    """
+    context = _trace_context.get()
+    if context is None or context["file"] is None:
+        yield None
+        return
+
+    span_id = secrets.token_hex(8)
+    parent_id = _current_span_id.get()
+    token = _current_span_id.set(span_id)
+    start = time.time()
+    start_counter = time.perf_counter()
+    error = None
+    try:
+        yield attributes
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        duration = time.perf_counter() - start_counter
+        _current_span_id.reset(token)
+        record = {
+            "extraction_id": context["extraction_id"],
+            "repo": context["repo"],
+            "span_id": span_id,
+            "parent_id": parent_id,
+            "name": name,
+            "start": start,
+            "duration": duration,
+            "pid": os.getpid(),
+            "thread": threading.get_ident(),
+            "attributes": attributes,
+        }
+        if error:
+            record["error"] = error
+        _write_span(context["file"], record)
+
+
+def _write_span(trace_file: Path, record: Dict[str, Any]):
+    try:
+        line = json.dumps(record, default=str) + "\n"
+        with _write_lock:
+            with open(trace_file, "a", encoding="utf-8") as f:
+                f.write(line)
+    except Exception as e:
+        print(f"[Tracing] Error writing span to {trace_file}: {e}")
+
+
+def load_spans(paths: Iterable[str]) -> List[Dict[str, Any]]:
+    """Load the spans of one or more JSONL trace files (unreadable lines are skipped)."""
+    spans = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    spans.append(json.loads(line))
+                except ValueError:
+                    continue
+    return spans
+
+
+def to_chrome_trace(spans: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Convert spans to the Chrome trace event format (chrome://tracing, ui.perfetto.dev).
+    Each extraction is shown as its own process track, named after its repository.
+    """
+    events = []
+    extraction_pids: Dict[str, int] = {}
+    thread_ids: Dict[Any, int] = {}
+
+    for record in sorted(spans, key=lambda item: item.get("start", 0)):
+        extraction_id = record.get("extraction_id", "unknown")
+        pid = extraction_pids.get(extraction_id)
+        if pid is None:
+            pid = extraction_pids[extraction_id] = len(extraction_pids) + 1
+            events.append({
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": f"{record.get('repo')} ({extraction_id})"},
+            })
+
+        thread_key = (record.get("pid"), record.get("thread"))
+        tid = thread_ids.get(thread_key)
+        if tid is None:
+            tid = thread_ids[thread_key] = len(thread_ids) + 1
+
+        args = dict(record.get("attributes") or {})
+        args["os_pid"] = record.get("pid")
+        if record.get("error"):
+            args["error"] = record["error"]
+        events.append({
+            "name": record.get("name"),
+            "cat": str(record.get("name", "")).split(".", 1)[0],
+            "ph": "X",
+            "ts": round(record.get("start", 0) * 1_000_000),
+            "dur": round(record.get("duration", 0) * 1_000_000),
+            "pid": pid,
+            "tid": tid,
+            "args": args,
+        })
+
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert GHA Dashboard extraction traces to Chrome trace JSON")
+    parser.add_argument("traces", nargs="+", help="JSONL trace files (backend/logs/traces/*.jsonl)")
+    parser.add_argument("-o", "--output", default="trace.json", help="Output file (default: trace.json)")
+    args = parser.parse_args()
+
+    chrome_trace = to_chrome_trace(load_spans(args.traces))
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(chrome_trace, f)
+    print(f"[Tracing] Wrote {len(chrome_trace['traceEvents'])} events to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
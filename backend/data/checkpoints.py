@@ -0,0 +1,102 @@
+"""
+Extraction checkpoint module for resuming interrupted collections.
+Stores the Phase 1 pagination cursor, and whether Phase 1 completed, per extraction scope.
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class ExtractionCheckpointStore:
+    """
+    Persists extraction checkpoints as JSON files, one file per extraction scope.
+    Checkpoints older than the TTL are ignored and removed.
+    """
+
+    def __init__(self, data_dir: str = None, ttl: float = None):
+        """
+        Initialize the checkpoint store.
+
+        Args:
+            data_dir: Directory to store checkpoint files. Defaults to 'backend/data/storage/checkpoints'
+            ttl: Seconds a checkpoint stays valid (defaults to EXTRACTION_CHECKPOINT_TTL or 24 hours)
+        """
+        if data_dir is None:
+            backend_dir = Path(__file__).parent.parent
+            data_dir = os.path.join(backend_dir, 'data', 'storage', 'checkpoints')
+
+        if ttl is None:
+            try:
+                ttl = float(os.getenv("EXTRACTION_CHECKPOINT_TTL", 24 * 3600))
+            except ValueError:
+                ttl = 24 * 3600
+
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+
+    def _get_checkpoint_file(self, key: str) -> Path:
+        """Get the file path for a checkpoint key."""
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+        return self.data_dir / f"{digest}.json"
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the checkpoint of an extraction scope.
+
+        Args:
+            key: Extraction scope key
+
+        Returns:
+            Checkpoint state, or None if there is no valid checkpoint
+        """
+        checkpoint_file = self._get_checkpoint_file(key)
+        if not checkpoint_file.exists():
+            return None
+
+        try:
+            with open(checkpoint_file, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except Exception as e:
+            print(f"[Checkpoints] Error loading checkpoint {checkpoint_file.name}: {e}")
+            return None
+
+        if checkpoint.get('key') != key:
+            return None
+
+        if time.time() - checkpoint.get('saved_at', 0) > self.ttl:
+            self.clear(key)
+            return None
+
+        return checkpoint.get('state')
+
+    def save(self, key: str, state: Dict[str, Any]):
+        """
+        Save the checkpoint of an extraction scope.
+
+        Args:
+            key: Extraction scope key
+            state: JSON-serializable checkpoint state
+        """
+        checkpoint_file = self._get_checkpoint_file(key)
+        payload = {'key': key, 'saved_at': time.time(), 'state': state}
+
+        try:
+            temp_file = checkpoint_file.with_suffix(f'.{os.getpid()}.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            temp_file.replace(checkpoint_file)
+        except Exception as e:
+            print(f"[Checkpoints] Error saving checkpoint {checkpoint_file.name}: {e}")
+
+    def clear(self, key: str):
+        """Remove the checkpoint of an extraction scope (after a completed collection)."""
+        try:
+            self._get_checkpoint_file(key).unlink()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[Checkpoints] Error removing checkpoint: {e}")
@@ -1,13 +1,78 @@
 """
 Data persistence module for saving and loading workflow runs and jobs locally.
 Uses JSON format for storage, organized by repository.
+Writes hold an advisory lock on the repository file so concurrent collections
+(greenlets, worker processes) never lose each other's runs and jobs.
 """
 import json
 import os
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from pathlib import Path
 
+try:
+    import fcntl
+    FILE_LOCKING_AVAILABLE = True
+except ImportError:
+    # Windows: only writers of the same process are serialized
+    FILE_LOCKING_AVAILABLE = False
+
+try:
+    from core.utils.metrics import PERSISTENCE_BYTES, PERSISTENCE_DURATION
+    from core.utils.tracing import span
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+    @contextmanager
+    def span(name, **attributes):
+        yield None
+
+
+# Serializes writers of the same process (greenlets/threads) before they take
+# the file lock. It cannot keep the lock holder of another process (an extraction
+# worker) from blocking a flock call, so under gevent the file lock is polled
+# without blocking instead (see _lock_file).
+_process_locks: Dict[str, threading.RLock] = {}
+_process_locks_guard = threading.Lock()
+
+
+def _gevent_patched() -> bool:
+    """Whether gevent monkey patching is active (blocking calls would stall the hub)."""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched("time")
+
+
+def _lock_file(fd: int, max_delay: float = 0.05):
+    """Take an exclusive flock, yielding to other greenlets while another process holds it."""
+    if not _gevent_patched():
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return
+
+    import gevent
+    delay = 0.001
+    while True:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return
+        except BlockingIOError:
+            gevent.sleep(delay)
+            delay = min(delay * 2, max_delay)
+
+
+def _process_lock(path: Path) -> threading.RLock:
+    key = str(path)
+    with _process_locks_guard:
+        if key not in _process_locks:
+            _process_locks[key] = threading.RLock()
+        return _process_locks[key]
+
 
 class DataPersistence:
     """
@@ -20,8 +85,10 @@ class DataPersistence:
         Initialize the persistence manager.
         
         Args:
-            data_dir: Directory to store data files. Defaults to 'backend/data/storage'
+            data_dir: Directory to store data files. Defaults to DATA_STORAGE_DIR, or 'backend/data/storage'
         """
+        if data_dir is None:
+            data_dir = os.getenv("DATA_STORAGE_DIR")
         if data_dir is None:
             # Default to backend/data/storage
             backend_dir = Path(__file__).parent.parent
@@ -36,6 +103,25 @@ class DataPersistence:
         safe_repo = repo.replace('/', '_').replace('\\', '_')
         return self.data_dir / f"{safe_repo}.json"
 
+    def _get_lock_file(self, repo: str) -> Path:
+        """Get the lock file path for a repository's data."""
+        return self._get_repo_file(repo).with_suffix('.lock')
+
+    @contextmanager
+    def _repo_lock(self, repo: str):
+        """Hold the exclusive write lock of a repository file (shared across processes)."""
+        lock_file = self._get_lock_file(repo)
+        with _process_lock(lock_file):
+            if not FILE_LOCKING_AVAILABLE:
+                yield
+                return
+            with open(lock_file, 'a+') as lock_handle:
+                _lock_file(lock_handle.fileno())
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_handle.fileno(), fcntl.LOCK_UN)
+
     def _run_id(self, run: Dict[str, Any]) -> Optional[str]:
         """Return a normalized run ID, or None when the run cannot be keyed."""
         run_id = run.get('id')
@@ -57,8 +143,12 @@ class DataPersistence:
             }
         
         try:
+            start_time = time.perf_counter()
             with open(repo_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
+                if METRICS_AVAILABLE:
+                    PERSISTENCE_DURATION.observe(time.perf_counter() - start_time, operation="read")
+                    PERSISTENCE_BYTES.inc(os.fstat(f.fileno()).st_size, operation="read")
                 # Ensure all required keys exist
                 if 'runs' not in data:
                     data['runs'] = {}
@@ -77,20 +167,69 @@ class DataPersistence:
                 'last_updated': None
             }
     
-    def _save_data(self, repo: str, data: Dict[str, Any]):
-        """Save data for a repository to disk."""
+    def _write_data(self, repo: str, data: Dict[str, Any]):
+        """Write data for a repository to disk (caller holds the repository lock)."""
         repo_file = self._get_repo_file(repo)
         data['last_updated'] = datetime.utcnow().isoformat()
+        data['version'] = data.get('version', 0) + 1
         
         try:
-            # Write atomically using a temp file
-            temp_file = repo_file.with_suffix('.tmp')
+            # Write atomically using a temp file unique to this writer
+            temp_file = repo_file.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+            start_time = time.perf_counter()
             with open(temp_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
+                written_bytes = f.tell()
             temp_file.replace(repo_file)
+            if METRICS_AVAILABLE:
+                PERSISTENCE_DURATION.observe(time.perf_counter() - start_time, operation="write")
+                PERSISTENCE_BYTES.inc(written_bytes, operation="write")
         except Exception as e:
             print(f"[DataPersistence] Error saving data for {repo}: {e}")
             raise
+
+    def _merge_data(self, current: Dict[str, Any], incoming: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge a stale document into the newer one on disk, keeping entries of both."""
+        merged = dict(current)
+        merged['runs'] = {**current.get('runs', {}), **incoming.get('runs', {})}
+        merged['jobs_by_run'] = {**current.get('jobs_by_run', {}), **incoming.get('jobs_by_run', {})}
+
+        date_ranges = {
+            workflow_id: dict(date_range)
+            for workflow_id, date_range in current.get('workflow_date_ranges', {}).items()
+        }
+        for workflow_id, date_range in incoming.get('workflow_date_ranges', {}).items():
+            existing = date_ranges.get(workflow_id)
+            if existing is None:
+                date_ranges[workflow_id] = dict(date_range)
+                continue
+            existing['earliest'] = min(existing['earliest'], date_range['earliest'])
+            existing['latest'] = max(existing['latest'], date_range['latest'])
+        merged['workflow_date_ranges'] = date_ranges
+        return merged
+
+    def _save_data(self, repo: str, data: Dict[str, Any]):
+        """
+        Save data for a repository to disk.
+        If another writer saved a newer version since `data` was loaded, the two
+        documents are merged instead of overwriting the other writer's changes.
+        """
+        with span("persistence.save", repo=repo), self._repo_lock(repo):
+            current = self._load_data(repo)
+            if current.get('version', 0) > data.get('version', 0):
+                data = self._merge_data(current, data)
+                data['version'] = current['version']
+            self._write_data(repo, data)
+
+    def _update_data(self, repo: str, mutate: Callable[[Dict[str, Any]], None]):
+        """
+        Apply a change to the latest data of a repository and save it, holding
+        the repository lock only for the load-modify-save cycle.
+        """
+        with span("persistence.update", repo=repo), self._repo_lock(repo):
+            data = self._load_data(repo)
+            mutate(data)
+            self._write_data(repo, data)
     
     def save_run(self, repo: str, run: Dict[str, Any]):
         """
@@ -105,9 +244,10 @@ class DataPersistence:
             print(f"[DataPersistence] Warning: Run missing 'id' field, skipping save")
             return
         
-        data = self._load_data(repo)
-        data['runs'][run_id] = run
-        self._save_data(repo, data)
+        def mutate(data):
+            data['runs'][run_id] = run
+
+        self._update_data(repo, mutate)
     
     def save_runs_batch(self, repo: str, runs: List[Dict[str, Any]]):
         """
@@ -120,14 +260,13 @@ class DataPersistence:
         if not runs:
             return
         
-        data = self._load_data(repo)
-        
-        for run in runs:
-            run_id = self._run_id(run)
-            if run_id:
-                data['runs'][run_id] = run
-        
-        self._save_data(repo, data)
+        def mutate(data):
+            for run in runs:
+                run_id = self._run_id(run)
+                if run_id:
+                    data['runs'][run_id] = run
+
+        self._update_data(repo, mutate)
     
     def save_jobs_for_run(self, repo: str, run_id: str, jobs: List[Dict[str, Any]]):
         """
@@ -139,9 +278,11 @@ class DataPersistence:
             jobs: List of job data dictionaries
         """
         run_id_str = str(run_id)
-        data = self._load_data(repo)
-        data['jobs_by_run'][run_id_str] = jobs
-        self._save_data(repo, data)
+
+        def mutate(data):
+            data['jobs_by_run'][run_id_str] = jobs
+
+        self._update_data(repo, mutate)
 
     def save_jobs_batch(self, repo: str, jobs_by_run: Dict[str, List[Dict[str, Any]]]):
         """
@@ -154,14 +295,13 @@ class DataPersistence:
         if not jobs_by_run:
             return
 
-        data = self._load_data(repo)
-
-        for run_id, jobs in jobs_by_run.items():
-            run_id_str = str(run_id)
-            if run_id_str:
-                data['jobs_by_run'][run_id_str] = jobs
+        def mutate(data):
+            for run_id, jobs in jobs_by_run.items():
+                run_id_str = str(run_id)
+                if run_id_str:
+                    data['jobs_by_run'][run_id_str] = jobs
 
-        self._save_data(repo, data)
+        self._update_data(repo, mutate)
     
     def get_run(self, repo: str, run_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific run by ID."""
@@ -222,25 +362,26 @@ class DataPersistence:
             earliest_date: Earliest run date (ISO format)
             latest_date: Latest run date (ISO format)
         """
-        data = self._load_data(repo)
-        if 'workflow_date_ranges' not in data:
-            data['workflow_date_ranges'] = {}
-        
         workflow_id_str = str(workflow_id)
-        if workflow_id_str not in data['workflow_date_ranges']:
-            data['workflow_date_ranges'][workflow_id_str] = {
-                'earliest': earliest_date,
-                'latest': latest_date
-            }
-        else:
-            # Update to expand the range if needed
-            existing = data['workflow_date_ranges'][workflow_id_str]
-            if earliest_date < existing['earliest']:
-                existing['earliest'] = earliest_date
-            if latest_date > existing['latest']:
-                existing['latest'] = latest_date
-        
-        self._save_data(repo, data)
+
+        def mutate(data):
+            if 'workflow_date_ranges' not in data:
+                data['workflow_date_ranges'] = {}
+            
+            if workflow_id_str not in data['workflow_date_ranges']:
+                data['workflow_date_ranges'][workflow_id_str] = {
+                    'earliest': earliest_date,
+                    'latest': latest_date
+                }
+            else:
+                # Update to expand the range if needed
+                existing = data['workflow_date_ranges'][workflow_id_str]
+                if earliest_date < existing['earliest']:
+                    existing['earliest'] = earliest_date
+                if latest_date > existing['latest']:
+                    existing['latest'] = latest_date
+
+        self._update_data(repo, mutate)
     
     def get_workflow_date_range(self, repo: str, workflow_id: str) -> Optional[Dict[str, str]]:
         """Get the date range for a workflow."""
@@ -0,0 +1,5 @@
+"""
+Extraction job system for GHA Dashboard
+Runs GHAminer collections in worker processes and streams their progress
+events back to the WebSocket handlers of the web server
+"""
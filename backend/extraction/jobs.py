@@ -0,0 +1,489 @@
+"""
+SQLite-backed extraction job queue
+Stores queued extractions and the progress events they publish so that worker
+processes and WebSocket handlers can communicate without an external broker.
+"""
+import hashlib
+import json
+import os
+import secrets
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+FINISHED_STATUSES = (JOB_DONE, JOB_FAILED)
+
+
+def extraction_scope_key(repo: str, filters: Dict[str, Any]) -> str:
+    """
+    Build the single-flight key of an extraction.
+
+    Only the filters that change what is collected from GitHub are part of the
+    key (date range, workflows and job details); display-only filters such as
+    branch or author are applied by the dashboard and do not split extractions.
+    """
+    filters = filters or {}
+    scope = {
+        "repo": repo.strip().lower(),
+        "startDate": filters.get("startDate"),
+        "endDate": filters.get("endDate"),
+        "workflowIds": sorted(int(value) for value in filters.get("workflowIds") or []),
+        "refreshWorkflowIds": sorted(int(value) for value in filters.get("refreshWorkflowIds") or []),
+        "fetchJobDetails": bool(filters.get("fetchJobDetails")),
+    }
+    return json.dumps(scope, sort_keys=True)
+
+
+def token_fingerprint(token: Optional[str]) -> Optional[str]:
+    """Hash a GitHub token so jobs can be matched to their owner without storing it longer."""
+    if not token:
+        return None
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def default_db_path() -> Path:
+    configured_path = os.getenv("EXTRACTION_DB_PATH")
+    if configured_path:
+        return Path(configured_path)
+
+    backend_dir = Path(__file__).parent.parent
+    return backend_dir / "data" / "storage" / "extractions.sqlite3"
+
+
+def restrict_db_permissions(db_path: Path):
+    """
+    Make a database that holds GitHub tokens readable by its owner only (0600).
+
+    The file is created with these permissions before SQLite opens it; SQLite
+    gives its WAL and shared memory files the permissions of the database.
+    """
+    try:
+        os.close(os.open(str(db_path), os.O_RDWR | os.O_CREAT, 0o600))
+        for suffix in ("", "-wal", "-shm"):
+            path = Path(f"{db_path}{suffix}")
+            if path.exists():
+                os.chmod(path, 0o600)
+    except OSError as e:
+        print(f"[Extraction] Warning: Could not restrict the permissions of {db_path}: {e}")
+
+
+class ExtractionJobQueue:
+    """
+    Durable queue of extraction jobs shared by the web server and workers.
+
+    Every operation opens its own short-lived connection, so a queue instance
+    can be used from greenlets, threads and forked processes alike.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, stale_after: float = 120.0,
+                 retention: float = 3600.0, queued_timeout: float = 300.0):
+        """
+        Initialize the job queue.
+
+        Args:
+            db_path: Path of the SQLite database (defaults to data/storage/extractions.sqlite3)
+            stale_after: Seconds without a heartbeat after which a running job is failed
+            retention: Seconds a finished job and its events are kept for late subscribers
+            queued_timeout: Seconds after which a job no worker claimed is failed, unless
+                workers are busy with other jobs (idle workers claim jobs within seconds)
+        """
+        self.db_path = Path(db_path) if db_path else default_db_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        restrict_db_permissions(self.db_path)
+        self.stale_after = stale_after
+        self.retention = retention
+        self.queued_timeout = queued_timeout
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout = 30000")
+        # Cleared tokens are overwritten on disk, not left in free pages
+        conn.execute("PRAGMA secure_delete = ON")
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS extraction_jobs (
+                    id TEXT PRIMARY KEY,
+                    repo TEXT NOT NULL,
+                    filters TEXT NOT NULL,
+                    token TEXT,
+                    status TEXT NOT NULL,
+                    scope_key TEXT,
+                    force_refresh INTEGER NOT NULL DEFAULT 0,
+                    token_hash TEXT,
+                    error TEXT,
+                    worker_id TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    heartbeat_at REAL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS extraction_job_events (
+                    job_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (job_id, seq)
+                )
+            """)
+            existing_columns = {row["name"] for row in conn.execute("PRAGMA table_info(extraction_jobs)")}
+            for column, definition in (
+                ("scope_key", "TEXT"),
+                ("force_refresh", "INTEGER NOT NULL DEFAULT 0"),
+                ("token_hash", "TEXT"),
+            ):
+                if column not in existing_columns:
+                    conn.execute(f"ALTER TABLE extraction_jobs ADD COLUMN {column} {definition}")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_extraction_jobs_status "
+                "ON extraction_jobs (status, created_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_extraction_jobs_scope "
+                "ON extraction_jobs (scope_key, status)"
+            )
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row_to_job(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        job = dict(row)
+        job["filters"] = json.loads(job["filters"])
+        return job
+
+    def enqueue(self, repo: str, filters: Dict[str, Any], token: Optional[str]) -> str:
+        """
+        Add a new extraction job to the queue, without coalescing.
+
+        Args:
+            repo: Repository name (owner/repo)
+            filters: Serialized aggregation filters for the extraction
+            token: GitHub token used by the worker (cleared once a worker claims the job)
+
+        Returns:
+            The new job ID
+        """
+        job_id, _ = self.submit(repo, filters, token, coalesce=False)
+        return job_id
+
+    def submit(self, repo: str, filters: Dict[str, Any], token: Optional[str],
+               coalesce: bool = True) -> Tuple[str, bool]:
+        """
+        Queue an extraction, or attach to an active one for the same scope.
+
+        A forced refresh never attaches to a job that may serve cached data,
+        but a regular request can attach to an active forced refresh.
+
+        Args:
+            repo: Repository name (owner/repo)
+            filters: Serialized aggregation filters for the extraction
+            token: GitHub token used by the worker (cleared once a worker claims the job)
+            coalesce: Whether an active job for the same scope may be reused
+
+        Returns:
+            Tuple of (job ID, True if a new job was created)
+        """
+        self.fail_stale_jobs()
+        self.prune_finished_jobs()
+
+        scope_key = extraction_scope_key(repo, filters)
+        force_refresh = 1 if (filters or {}).get("forceRefresh") else 0
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = None
+            if coalesce:
+                row = conn.execute(
+                    "SELECT id FROM extraction_jobs WHERE scope_key = ? AND status IN (?, ?) "
+                    "AND force_refresh >= ? ORDER BY created_at LIMIT 1",
+                    (scope_key, JOB_QUEUED, JOB_RUNNING, force_refresh)
+                ).fetchone()
+
+            if row is not None:
+                job_id, created = row["id"], False
+            else:
+                job_id, created = secrets.token_urlsafe(16), True
+                conn.execute(
+                    "INSERT INTO extraction_jobs (id, repo, filters, token, status, scope_key, "
+                    "force_refresh, token_hash, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, repo, json.dumps(filters), token, JOB_QUEUED, scope_key,
+                     force_refresh, token_fingerprint(token), time.time())
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return job_id, created
+
+    def find_active_job(self, repo: str, filters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get the queued or running job a submit() for this scope would attach to."""
+        force_refresh = 1 if (filters or {}).get("forceRefresh") else 0
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT * FROM extraction_jobs WHERE scope_key = ? AND status IN (?, ?) "
+                "AND force_refresh >= ? ORDER BY created_at LIMIT 1",
+                (extraction_scope_key(repo, filters), JOB_QUEUED, JOB_RUNNING, force_refresh)
+            ).fetchone()
+        finally:
+            conn.close()
+        return self._row_to_job(row)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job by ID, or None if it does not exist."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM extraction_jobs WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+        return self._row_to_job(row)
+
+    def claim_job(self, worker_id: str, job_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Atomically move a queued job to the running state.
+
+        The token is only returned to the claiming worker: it is cleared from the
+        database, so running jobs of a crashed worker do not keep it.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+            job_id: Claim this specific job instead of the oldest queued one
+
+        Returns:
+            The claimed job, or None if nothing could be claimed
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if job_id is None:
+                row = conn.execute(
+                    "SELECT id FROM extraction_jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                    (JOB_QUEUED,)
+                ).fetchone()
+                job_id = row["id"] if row else None
+
+            claimed = None
+            if job_id is not None:
+                now = time.time()
+                cursor = conn.execute(
+                    "UPDATE extraction_jobs SET status = ?, worker_id = ?, started_at = ?, heartbeat_at = ? "
+                    "WHERE id = ? AND status = ?",
+                    (JOB_RUNNING, worker_id, now, now, job_id, JOB_QUEUED)
+                )
+                if cursor.rowcount == 1:
+                    claimed = conn.execute(
+                        "SELECT * FROM extraction_jobs WHERE id = ?", (job_id,)
+                    ).fetchone()
+                    conn.execute("UPDATE extraction_jobs SET token = NULL WHERE id = ?", (job_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return self._row_to_job(claimed)
+
+    def heartbeat(self, job_id: str):
+        """Record that the worker running a job is still alive."""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE extraction_jobs SET heartbeat_at = ? WHERE id = ? AND status = ?",
+                (time.time(), job_id, JOB_RUNNING)
+            )
+        finally:
+            conn.close()
+
+    def publish(self, job_id: str, payload: str) -> int:
+        """
+        Append a progress event (a serialized WebSocket message) to a job.
+
+        Returns:
+            The sequence number of the stored event
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) AS seq FROM extraction_job_events WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+            seq = row["seq"] + 1
+            now = time.time()
+            conn.execute(
+                "INSERT INTO extraction_job_events (job_id, seq, payload, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, seq, payload, now)
+            )
+            conn.execute(
+                "UPDATE extraction_jobs SET heartbeat_at = ? WHERE id = ? AND status = ?",
+                (now, job_id, JOB_RUNNING)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return seq
+
+    def finish_job(self, job_id: str, error: Optional[str] = None):
+        """Mark a job as done (or failed when an error is given) and forget its token."""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE extraction_jobs SET status = ?, error = ?, token = NULL, finished_at = ? "
+                "WHERE id = ? AND status IN (?, ?)",
+                (JOB_FAILED if error else JOB_DONE, error, time.time(), job_id, JOB_QUEUED, JOB_RUNNING)
+            )
+        finally:
+            conn.close()
+
+    def read_events(self, job_id: str, after_seq: int = 0) -> Tuple[List[Tuple[int, str]], Optional[str]]:
+        """
+        Read the events published after a sequence number.
+
+        The job status is read in the same transaction, so a finished status
+        guarantees that no event is missing from the returned list.
+
+        Returns:
+            Tuple of ([(seq, payload), ...], job status or None if unknown)
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN")
+            status_row = conn.execute(
+                "SELECT status FROM extraction_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            rows = conn.execute(
+                "SELECT seq, payload FROM extraction_job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after_seq)
+            ).fetchall()
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        return [(row["seq"], row["payload"]) for row in rows], (status_row["status"] if status_row else None)
+
+    def follow_events(self, job_id: str, after_seq: int = 0, poll_interval: float = 0.2,
+                      idle_timeout: float = 30.0) -> Iterator[Optional[Tuple[int, str]]]:
+        """
+        Follow the event stream of a job until it finishes.
+
+        Yields (seq, payload) tuples as events arrive, and None after
+        idle_timeout seconds without events so callers can send keepalives.
+        """
+        last_event_at = time.time()
+        while True:
+            events, status = self.read_events(job_id, after_seq)
+            for seq, payload in events:
+                after_seq = seq
+                yield seq, payload
+
+            if status is None or status in FINISHED_STATUSES:
+                return
+
+            if events:
+                last_event_at = time.time()
+            elif time.time() - last_event_at >= idle_timeout:
+                last_event_at = time.time()
+                yield None
+                self.fail_stale_jobs()
+
+            time.sleep(poll_interval)
+
+    def fail_stale_jobs(self) -> int:
+        """
+        Fail running jobs whose worker stopped sending heartbeats, and queued
+        jobs no worker claimed within queued_timeout while no job is running
+        (no worker is running).
+
+        Returns:
+            Number of jobs that were failed
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            stale_jobs = [
+                (row["id"], "worker heartbeat lost", "Extraction worker stopped responding")
+                for row in conn.execute(
+                    "SELECT id FROM extraction_jobs WHERE status = ? AND heartbeat_at < ?",
+                    (JOB_RUNNING, now - self.stale_after)
+                ).fetchall()
+            ] + [
+                (row["id"], "no worker claimed the job", "No extraction worker is available, try again later")
+                for row in conn.execute(
+                    "SELECT id FROM extraction_jobs WHERE status = ? AND created_at < ? AND NOT EXISTS ("
+                    "SELECT 1 FROM extraction_jobs WHERE status = ? AND heartbeat_at >= ?)",
+                    (JOB_QUEUED, now - self.queued_timeout, JOB_RUNNING, now - self.stale_after)
+                ).fetchall()
+            ]
+            for job_id, error, message in stale_jobs:
+                row = conn.execute(
+                    "SELECT COALESCE(MAX(seq), 0) AS seq FROM extraction_job_events WHERE job_id = ?",
+                    (job_id,)
+                ).fetchone()
+                conn.execute(
+                    "INSERT INTO extraction_job_events (job_id, seq, payload, created_at) VALUES (?, ?, ?, ?)",
+                    (job_id, row["seq"] + 1, json.dumps({"type": "error", "message": message}), now)
+                )
+                conn.execute(
+                    "UPDATE extraction_jobs SET status = ?, error = ?, token = NULL, finished_at = ? WHERE id = ?",
+                    (JOB_FAILED, error, now, job_id)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        if stale_jobs:
+            print(f"[Extraction] Failed {len(stale_jobs)} stale job(s) without worker heartbeat or worker")
+        return len(stale_jobs)
+
+    def prune_finished_jobs(self) -> int:
+        """Delete finished jobs (and their events) older than the retention period, and the tokens of the others."""
+        cutoff = time.time() - self.retention
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "UPDATE extraction_jobs SET token = NULL WHERE status IN (?, ?) AND token IS NOT NULL",
+                FINISHED_STATUSES
+            )
+            old_ids = [
+                row["id"]
+                for row in conn.execute(
+                    "SELECT id FROM extraction_jobs WHERE status IN (?, ?) AND finished_at < ?",
+                    (*FINISHED_STATUSES, cutoff)
+                ).fetchall()
+            ]
+            for job_id in old_ids:
+                conn.execute("DELETE FROM extraction_job_events WHERE job_id = ?", (job_id,))
+                conn.execute("DELETE FROM extraction_jobs WHERE id = ?", (job_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return len(old_ids)
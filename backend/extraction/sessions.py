@@ -0,0 +1,276 @@
+"""
+Extraction session stores
+An extraction session is created by POST /api/extractions and claimed by the
+WebSocket connection that streams it. Sessions must be visible to every
+backend process, so the default store is the SQLite database shared with the
+job queue; the in-memory store only works with a single process.
+"""
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from extraction.jobs import default_db_path, restrict_db_permissions
+
+
+class ExtractionSessionStore(ABC):
+    """
+    Interface of the extraction session stores.
+
+    A session holds the token, repository and filters of an extraction. It
+    expires after its TTL and can only be claimed by one WebSocket at a time.
+    """
+
+    @abstractmethod
+    def create(self, token: str, repo: str, filters: Dict[str, Any], ttl: float = 300) -> str:
+        """Create a session and return its ID."""
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get an unexpired session, or None."""
+
+    @abstractmethod
+    def claim(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Atomically claim an unexpired, unclaimed session for a WebSocket connection.
+
+        Returns:
+            The claimed session, or None if it is missing, expired or already claimed
+        """
+
+    @abstractmethod
+    def release(self, session_id: str, job_id: Optional[str] = None, ttl: float = 300):
+        """Release a claim and keep the session for ttl more seconds (to allow a reconnect)."""
+
+    @abstractmethod
+    def set_job(self, session_id: str, job_id: str):
+        """Record the extraction job that serves a session."""
+
+    @abstractmethod
+    def delete(self, session_id: str):
+        """Delete a session."""
+
+    @abstractmethod
+    def cleanup_expired(self) -> int:
+        """Delete expired sessions and return how many were removed."""
+
+
+class InMemorySessionStore(ExtractionSessionStore):
+    """Session store kept in process memory (single backend process only)."""
+
+    def __init__(self):
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, token: str, repo: str, filters: Dict[str, Any], ttl: float = 300) -> str:
+        session_id = secrets.token_urlsafe(32)
+        with self._lock:
+            self._sessions[session_id] = {
+                "id": session_id,
+                "token": token,
+                "repo": repo,
+                "filters": filters,
+                "job_id": None,
+                "claimed_at": None,
+                "expires_at": time.time() + ttl,
+            }
+        return session_id
+
+    def _live_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        if session["expires_at"] <= time.time():
+            self._sessions.pop(session_id, None)
+            return None
+        return session
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            session = self._live_session(session_id)
+            return dict(session) if session else None
+
+    def claim(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            session = self._live_session(session_id)
+            if session is None or session["claimed_at"] is not None:
+                return None
+            session["claimed_at"] = time.time()
+            return dict(session)
+
+    def release(self, session_id: str, job_id: Optional[str] = None, ttl: float = 300):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            session["claimed_at"] = None
+            session["expires_at"] = time.time() + ttl
+            if job_id is not None:
+                session["job_id"] = job_id
+
+    def set_job(self, session_id: str, job_id: str):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session["job_id"] = job_id
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def cleanup_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired_ids = [
+                session_id
+                for session_id, session in self._sessions.items()
+                if session["expires_at"] <= now
+            ]
+            for session_id in expired_ids:
+                self._sessions.pop(session_id, None)
+        return len(expired_ids)
+
+
+class SQLiteSessionStore(ExtractionSessionStore):
+    """Session store shared by every backend process on the machine."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the SQLite session store.
+
+        Args:
+            db_path: Path of the SQLite database (defaults to the extraction queue database)
+        """
+        self.db_path = Path(db_path) if db_path else default_db_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        restrict_db_permissions(self.db_path)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS extraction_sessions (
+                    id TEXT PRIMARY KEY,
+                    token TEXT NOT NULL,
+                    repo TEXT NOT NULL,
+                    filters TEXT NOT NULL,
+                    job_id TEXT,
+                    claimed_at REAL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout = 30000")
+        # Tokens of deleted sessions are overwritten on disk, not left in free pages
+        conn.execute("PRAGMA secure_delete = ON")
+        return conn
+
+    @staticmethod
+    def _row_to_session(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        session = dict(row)
+        session["filters"] = json.loads(session["filters"])
+        return session
+
+    def create(self, token: str, repo: str, filters: Dict[str, Any], ttl: float = 300) -> str:
+        session_id = secrets.token_urlsafe(32)
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO extraction_sessions (id, token, repo, filters, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (session_id, token, repo, json.dumps(filters), time.time() + ttl)
+            )
+        finally:
+            conn.close()
+        return session_id
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT * FROM extraction_sessions WHERE id = ? AND expires_at > ?",
+                (session_id, time.time())
+            ).fetchone()
+        finally:
+            conn.close()
+        return self._row_to_session(row)
+
+    def claim(self, session_id: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute(
+                "UPDATE extraction_sessions SET claimed_at = ? "
+                "WHERE id = ? AND claimed_at IS NULL AND expires_at > ?",
+                (now, session_id, now)
+            )
+            row = None
+            if cursor.rowcount == 1:
+                row = conn.execute("SELECT * FROM extraction_sessions WHERE id = ?", (session_id,)).fetchone()
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return self._row_to_session(row)
+
+    def release(self, session_id: str, job_id: Optional[str] = None, ttl: float = 300):
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE extraction_sessions SET claimed_at = NULL, expires_at = ?, job_id = COALESCE(?, job_id) "
+                "WHERE id = ?",
+                (time.time() + ttl, job_id, session_id)
+            )
+        finally:
+            conn.close()
+
+    def set_job(self, session_id: str, job_id: str):
+        conn = self._connect()
+        try:
+            conn.execute("UPDATE extraction_sessions SET job_id = ? WHERE id = ?", (job_id, session_id))
+        finally:
+            conn.close()
+
+    def delete(self, session_id: str):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM extraction_sessions WHERE id = ?", (session_id,))
+        finally:
+            conn.close()
+
+    def cleanup_expired(self) -> int:
+        conn = self._connect()
+        try:
+            cursor = conn.execute("DELETE FROM extraction_sessions WHERE expires_at <= ?", (time.time(),))
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+
+def create_session_store(kind: Optional[str] = None, db_path: Optional[str] = None) -> ExtractionSessionStore:
+    """
+    Create the session store selected by EXTRACTION_SESSION_STORE ("sqlite" or "memory").
+
+    Args:
+        kind: Store kind (defaults to EXTRACTION_SESSION_STORE)
+        db_path: Database of the SQLite store (defaults to the extraction queue database)
+    """
+    kind = (kind or os.getenv("EXTRACTION_SESSION_STORE") or "sqlite").strip().lower()
+    if kind == "memory":
+        return InMemorySessionStore()
+    if kind == "sqlite":
+        return SQLiteSessionStore(db_path)
+    raise ValueError(f"Unknown extraction session store: {kind}")
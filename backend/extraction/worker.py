@@ -0,0 +1,272 @@
+"""
+Extraction worker processes
+Claims jobs from the extraction queue, runs the GHAminer collection for them
+and publishes every WebSocket message as a job event.
+
+Run a single worker with:
+    python -m extraction.worker
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional
+
+backend_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
+from core.utils.metrics import ACTIVE_EXTRACTIONS, write_snapshot
+from core.utils.profiling import (
+    profile_extraction,
+    profiling_enabled,
+    start_sampling,
+    take_profile_request,
+    take_sampling_request,
+)
+from core.utils.tracing import extraction_trace, span
+from extraction.jobs import ExtractionJobQueue
+from extraction.sessions import create_session_store
+
+
+class JobEventPublisher:
+    """
+    WebSocket stand-in handed to send_data inside a worker.
+
+    Messages are appended to the job's event log instead of being written to
+    a socket; the WebSocket handler of the web server replays them.
+    """
+
+    def __init__(self, queue: ExtractionJobQueue, job_id: str):
+        self.queue = queue
+        self.job_id = job_id
+        self.closed = False
+
+    def send(self, payload: str):
+        self.queue.publish(self.job_id, payload)
+
+    def close(self):
+        self.closed = True
+
+
+def _default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def run_job(queue: ExtractionJobQueue, job: Dict[str, Any], heartbeat_interval: float = 10.0,
+            share_metrics: bool = False):
+    """
+    Run one claimed extraction job to completion.
+
+    Args:
+        queue: Job queue the job was claimed from
+        job: Claimed job (as returned by ExtractionJobQueue.claim_job)
+        heartbeat_interval: Seconds between heartbeats while the collection runs
+        share_metrics: Write a metrics snapshot with every heartbeat (worker processes)
+    """
+    from analysis.endpoint import deserialize_filters, send_data
+
+    job_id = job["id"]
+    publisher = JobEventPublisher(queue, job_id)
+    heartbeat_stop = threading.Event()
+
+    # Profiling hooks cost one environment check unless EXTRACTION_PROFILING=1
+    profiling = profiling_enabled()
+    profile_request = take_profile_request(job["repo"]) if profiling else None
+    extraction_thread_id = threading.get_ident()
+
+    def _heartbeat():
+        # Keeps the job alive during long GitHub rate limit waits
+        while not heartbeat_stop.wait(heartbeat_interval):
+            try:
+                queue.heartbeat(job_id)
+            except Exception as e:
+                print(f"[Extraction] Heartbeat failed for job {job_id}: {e}")
+            if share_metrics:
+                write_snapshot()
+            if profiling:
+                sampling_request = take_sampling_request(job_id)
+                if sampling_request:
+                    start_sampling(f"{job_id}-sample-{int(time.time())}", job["repo"],
+                                   extraction_thread_id, sampling_request)
+
+    heartbeat_thread = threading.Thread(target=_heartbeat, daemon=True)
+    heartbeat_thread.start()
+
+    error = None
+    print(f"[Extraction] Running job {job_id} for {job['repo']}")
+    ACTIVE_EXTRACTIONS.inc()
+    if profile_request:
+        profiler = profile_extraction(job_id, job["repo"], profile_request.get("cpu", True),
+                                      profile_request.get("memory", False))
+    else:
+        profiler = nullcontext()
+    try:
+        with extraction_trace(job_id, job["repo"]), span("extraction", worker_id=job.get("worker_id")), profiler:
+            send_data(publisher, job["repo"], deserialize_filters(job["filters"]), job.get("token"))
+    except Exception as e:
+        error = str(e)
+        print(f"[Extraction] Job {job_id} failed: {e}")
+        try:
+            publisher.send(json.dumps({"type": "error", "message": f"Extraction failed: {e}"}))
+        except Exception:
+            pass
+    finally:
+        heartbeat_stop.set()
+        ACTIVE_EXTRACTIONS.dec()
+        queue.finish_job(job_id, error)
+        if share_metrics:
+            write_snapshot()
+        print(f"[Extraction] Finished job {job_id}")
+
+
+def start_inline_job(queue: ExtractionJobQueue, job_id: str) -> bool:
+    """
+    Run a queued job inside the current process (used when no worker processes are configured).
+
+    Returns:
+        True if the job was claimed and started
+    """
+    job = queue.claim_job(_default_worker_id(), job_id)
+    if job is None:
+        return False
+
+    try:
+        from gevent import spawn
+        spawn(run_job, queue, job)
+    except ImportError:
+        threading.Thread(target=run_job, args=(queue, job), daemon=True).start()
+    return True
+
+
+def run_worker(queue: ExtractionJobQueue, worker_id: Optional[str] = None,
+               poll_interval: float = 1.0, stop_event: Optional[threading.Event] = None,
+               parent_pid: Optional[int] = None):
+    """
+    Claim and run jobs until stopped.
+
+    Args:
+        queue: Job queue to consume
+        worker_id: Identifier recorded on claimed jobs
+        poll_interval: Seconds to wait when the queue is empty
+        stop_event: Optional event that stops the loop when set
+        parent_pid: Process id of the pool that started the worker; the loop
+            exits once the worker is no longer its child (the pool died)
+    """
+    worker_id = worker_id or _default_worker_id()
+    print(f"[Extraction] Worker {worker_id} started (queue: {queue.db_path})")
+    last_stale_check = 0.0
+    sessions = create_session_store(db_path=queue.db_path)
+    write_snapshot()
+
+    while not (stop_event and stop_event.is_set()):
+        if parent_pid is not None and os.getppid() != parent_pid:
+            print(f"[Extraction] Worker {worker_id} exiting: parent process {parent_pid} is gone")
+            break
+        job = queue.claim_job(worker_id)
+        if job is not None:
+            run_job(queue, job, share_metrics=True)
+            continue
+
+        if time.time() - last_stale_check >= queue.stale_after / 2:
+            queue.fail_stale_jobs()
+            # Expired sessions are deleted (with their tokens) even while no request comes in
+            sessions.cleanup_expired()
+            last_stale_check = time.time()
+        time.sleep(poll_interval)
+
+
+class ExtractionWorkerPool:
+    """
+    Starts and supervises N worker processes for the web server.
+    Crashed workers are restarted; running jobs of a crashed worker are failed
+    by the queue once their heartbeat goes stale.
+    """
+
+    def __init__(self, workers: int, db_path: Optional[str] = None):
+        """
+        Initialize the worker pool.
+
+        Args:
+            workers: Number of worker processes to run
+            db_path: Optional path of the queue database shared with the workers
+        """
+        self.workers = workers
+        self.db_path = db_path
+        self.processes: List[subprocess.Popen] = []
+        self._stopped = False
+
+    def _spawn(self) -> subprocess.Popen:
+        env = os.environ.copy()
+        if self.db_path:
+            env["EXTRACTION_DB_PATH"] = str(self.db_path)
+        env["EXTRACTION_PARENT_PID"] = str(os.getpid())
+        return subprocess.Popen(
+            [sys.executable, "-m", "extraction.worker"],
+            cwd=backend_path,
+            env=env
+        )
+
+    def start(self):
+        self.processes = [self._spawn() for _ in range(self.workers)]
+        threading.Thread(target=self._supervise, daemon=True).start()
+        print(f"[Extraction] Started {self.workers} extraction worker process(es)")
+
+    def _supervise(self):
+        while not self._stopped:
+            time.sleep(5)
+            for index, process in enumerate(self.processes):
+                if not self._stopped and process.poll() is not None:
+                    print(f"[Extraction] Worker pid {process.pid} exited with {process.returncode}; restarting")
+                    self.processes[index] = self._spawn()
+
+    def stop(self, timeout: float = 10.0):
+        """Terminate the worker processes (only the first call does anything)."""
+        if self._stopped:
+            return
+        self._stopped = True
+        for process in self.processes:
+            if process.poll() is None:
+                process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run GHA Dashboard extraction workers")
+    parser.add_argument("--processes", type=int, default=1, help="Number of worker processes to run")
+    parser.add_argument("--db-path", default=None, help="Path of the extraction queue database")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(backend_path, ".env"), override=True)
+
+    if args.processes > 1:
+        pool = ExtractionWorkerPool(args.processes, args.db_path)
+        pool.start()
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        try:
+            while True:
+                time.sleep(60)
+        except (KeyboardInterrupt, SystemExit):
+            pool.stop()
+        return
+
+    parent_pid = os.getenv("EXTRACTION_PARENT_PID")
+    try:
+        run_worker(ExtractionJobQueue(args.db_path), parent_pid=int(parent_pid) if parent_pid else None)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
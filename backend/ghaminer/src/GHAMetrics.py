@@ -13,16 +13,23 @@ import json
 import shutil
 import numpy as np
 import zipfile
-import io
 import yaml
 
-from log_parser import parse_test_results , identify_test_frameworks_and_count_dependencies , identify_build_language , get_github_actions_log
+from log_parser import parse_test_results , identify_test_frameworks_and_count_dependencies , identify_build_language , download_github_actions_log
 from patterns import framework_regex
-from commit_history_analyzer import get_commit_data_local, clone_repo_locally , calculate_sloc_and_test_lines
+from log_scanner import LogScanner
+from log_cache import create_log_cache
+from log_pool import LogParsingPool
+from commit_history_analyzer import get_commit_data_local, clone_repo_locally
+from commit_index import build_commit_index
+from sloc_counter import SlocCounter
+from repo_mirror import create_repo_mirror, fetch_missing_commits
+from pull_request_index import PullRequestIndex, lookup_pull_request_details
 from repo_info_collector import get_repository_languages , get_workflow_ids , count_lines_in_workflow_yml , get_workflow_all_ids
+from workflow_files import WorkflowFiles
 from metrics_aggregator import save_builds_to_file
 from build_run_analyzer import get_jobs_for_run , get_builds_info_from_build_yml , calculate_description_complexity
-from request_github import get_request
+from request_github import get_request, github_api_url
 from streaming_collector import StreamingCollector
 
 
@@ -87,7 +94,7 @@ def fetch_file_content(repo_full_name, path, commit_sha, token):
     if not path or path.strip() == "":
         return None  # Skip if path is empty
 
-    url = f"https://api.github.com/repos/{repo_full_name}/contents/{path}?ref={commit_sha}"
+    url = github_api_url(f"/repos/{repo_full_name}/contents/{path}?ref={commit_sha}")
     headers = {'Authorization': f'token {token}'}
     
     try:
@@ -111,45 +118,18 @@ def fetch_file_content(repo_full_name, path, commit_sha, token):
 
 
 
-def fetch_pull_request_details(repo_full_name, commit_sha, token):
+def fetch_pull_request_details(repo_full_name, commit_sha, token, pr_index=None, run_date=None):
     """Fetch pull request details including PR number, merge commit SHA, and correct comment count."""
-    
-    # Get PRs that contain this commit
-    pr_search_url = f"https://api.github.com/repos/{repo_full_name}/commits/{commit_sha}/pulls"
-    pr_response = get_request(pr_search_url, token)
-
-    if pr_response and isinstance(pr_response, list) and len(pr_response) > 0:
-        # Take the first PR found
-        pr_info = pr_response[0]
-        pr_number = pr_info.get('number', 0)
-
-        # Now fetch actual PR details including total comments
-        pr_details_url = f"https://api.github.com/repos/{repo_full_name}/pulls/{pr_number}"
-        pr_details = get_request(pr_details_url, token)
-
-        if pr_details:
-            return {
-                'gh_pull_req_number': pr_number,
-                'gh_is_pr': True,
-                'gh_num_pr_comments': pr_details.get('comments', 0),  # This gets the correct comment count
-                'git_merged_with': pr_info.get('merge_commit_sha', None),
-                'gh_description_complexity': calculate_description_complexity(pr_info),
-            }
-
-    return {
-        'gh_pull_req_number': 0,
-        'gh_is_pr': False,
-        'gh_num_pr_comments': 0,
-        'git_merged_with': None,
-        'gh_description_complexity': 0,
-    }
+    if pr_index is not None:
+        return pr_index.details(commit_sha, run_date)
+    return lookup_pull_request_details(repo_full_name, commit_sha, token)
 
 
 def fetch_run_details(run_id, repo_full_name, token):
     """
     Fetch details about a specific run, including its jobs and steps.
     """
-    url = f"https://api.github.com/repos/{repo_full_name}/actions/runs/{run_id}/jobs"
+    url = github_api_url(f"/repos/{repo_full_name}/actions/runs/{run_id}/jobs")
     response = get_request(url, token)
     if response and 'jobs' in response:
         return response['jobs']  # Return the list of jobs, each containing steps
@@ -163,7 +143,7 @@ def get_github_repo_files(owner, repo, token=None):
     """
     Fetch the list of files in the root of a GitHub repository.
     """
-    url = f"https://api.github.com/repos/{owner}/{repo}/contents/"
+    url = github_api_url(f"/repos/{owner}/{repo}/contents/")
     headers = {"Authorization": f"token {token}"} if token else {}
 
     response = requests.get(url, headers=headers)
@@ -199,7 +179,14 @@ def get_existing_build_ids(repo_full_name, output_csv):
 def get_builds_info(repo_full_name, token, output_csv, framework_regex , config):
     base_path = os.path.dirname(os.path.abspath(__file__))  # Get project folder path
     repo_url = f"https://github.com/{repo_full_name}.git"
-    local_repo_path = clone_repo_locally(repo_url, base_path)
+    # Only the commit metrics read every blob; the workflow files are read from the mirror too,
+    # temporary clones are only made for the commit and SLOC metrics
+    local_repo_path = None
+    repo_mirror = create_repo_mirror(repo_full_name, config)
+    if repo_mirror is not None:
+        local_repo_path = repo_mirror.update(blobs=config.get("fetch_commit_details", False))
+    elif config.get("fetch_commit_details", False) or config.get("fetch_sloc", False):
+        local_repo_path = clone_repo_locally(repo_url, base_path)
 
 
     # Get already recorded build IDs
@@ -210,6 +197,27 @@ def get_builds_info(repo_full_name, token, output_csv, framework_regex , config)
     build_workflow_ids = get_workflow_ids(repo_full_name, token, specific_workflow_ids)
 
     languages = get_repository_languages(repo_full_name, token)
+    log_cache = log_pool = None
+    if config.get("fetch_test_parsing_results", False):
+        log_cache = create_log_cache(config)
+        # Test results are parsed in worker processes while the next runs are mined (0 parses them inline)
+        log_parsing_workers = config.get("log_parsing_workers")
+        if log_parsing_workers != 0:
+            log_pool = LogParsingPool(log_parsing_workers)
+    # Commit metrics are read from an index of the clone's history instead of per-run git commands
+    commit_index = None
+    if config.get("fetch_commit_details", False) and config.get("commit_index", True) and local_repo_path:
+        commit_index = build_commit_index(local_repo_path)
+    # SLOC is counted once per tree, in worktrees of the clone, while the runs of a page are mined
+    sloc_counter = None
+    if config.get("fetch_sloc", False) and local_repo_path:
+        sloc_counter = SlocCounter(local_repo_path, config.get("sloc_workers"))
+    # PR details are looked up in an index of the repository's pull requests, read as far back as the mined runs
+    pr_index = None
+    if config.get("fetch_pull_request_details", False) and config.get("pull_request_index", True):
+        pr_index = PullRequestIndex(repo_full_name, token)
+    # Workflow files are read by blob SHA, from the clone or else once per blob from the API
+    workflow_files = WorkflowFiles(repo_full_name, token, local_repo_path)
     #commit_cache = LRUCache(capacity=10000)
     repo_files = get_github_repo_files(repo_full_name.split('/')[0], repo_full_name.split('/')[1], token)
     build_language = identify_build_language(repo_files)
@@ -225,7 +233,7 @@ def get_builds_info(repo_full_name, token, output_csv, framework_regex , config)
         last_end_date = None
 
         while True:
-            api_url = f"https://api.github.com/repos/{repo_full_name}/actions/workflows/{workflow_id}/runs?page={page}&per_page=100"
+            api_url = github_api_url(f"/repos/{repo_full_name}/actions/workflows/{workflow_id}/runs?page={page}&per_page=100")
             response = requests.get(api_url, headers={'Authorization': f'token {token}'})  # Make request
 
             if response.status_code != 200:
@@ -237,8 +245,17 @@ def get_builds_info(repo_full_name, token, output_csv, framework_regex , config)
 
             if 'workflow_runs' in response_data and response_data['workflow_runs']:
                 builds_info = []
+                pending_builds = []
                 workflow_runs = response_data['workflow_runs'] 
                 #workflow_runs = sorted(workflow_runs, key=lambda run: run['created_at'])
+                new_runs = [run for run in workflow_runs if str(run['id']) not in existing_build_ids]
+                if local_repo_path and new_runs:
+                    # One fetch for the commits of the page the clone lacks (e.g. pull requests from forks)
+                    fetch_missing_commits(local_repo_path, [run['head_sha'] for run in new_runs])
+                if pr_index is not None:
+                    pr_index.refresh()  # Pull requests updated since the previous page
+                if sloc_counter is not None:
+                    sloc_counter.prefetch((run['head_sha'], run['created_at']) for run in new_runs)
 
                 for idx, run in enumerate(workflow_runs):
                     run_id = str(run['id'])  # Convert ID to string for consistency
@@ -271,16 +288,16 @@ def get_builds_info(repo_full_name, token, output_csv, framework_regex , config)
                     if config.get("fetch_sloc", False):
                         print(f"Calculating repo SLOC & test lines for first run of workflow {workflow_id}")
                         timestamp_str = run_date.strftime("%Y-%m-%dT%H:%M:%SZ")
-                        sloc_initial, test_lines_initial = calculate_sloc_and_test_lines(local_repo_path, commit_sha=commit_sha, timestamp=timestamp_str)
+                        sloc_initial, test_lines_initial = sloc_counter.count(commit_sha=commit_sha, timestamp=timestamp_str)
                         test_lines_per_1000_sloc = (test_lines_initial / sloc_initial) * 1000
 
                     # get commits data within the range of this run and previous run
                     commit_data = {}
                     if config.get("fetch_commit_details", False):
-                        commit_data = get_commit_data_local(commit_sha, local_repo_path, run_date, run_plus_1_date)
+                        commit_data = get_commit_data_local(commit_sha, local_repo_path, run_date, run_plus_1_date, commit_index)
 
                     # Fetch line count of the workflow YAML file
-                    workflow_size = count_lines_in_workflow_yml(repo_full_name, workflow_filename, commit_sha, token)
+                    workflow_size = workflow_files.line_count(workflow_filename, commit_sha)
                     if workflow_size is None:
                         workflow_size = None  # Ensure NaN is recorded
 
@@ -292,12 +309,22 @@ def get_builds_info(repo_full_name, token, output_csv, framework_regex , config)
                     build_info = compile_build_info(
                         run, repo_full_name, commit_data, sloc_initial , test_lines_per_1000_sloc,  commit_sha, languages, total_builds,
                         build_language, test_frameworks, dependency_count, workflow_size, framework_regex ,workflow_name, event_trigger, issuer, workflow_id, duration_to_fetch,
-                        config
+                        config, log_cache, log_pool, pr_index
                     )
-                    builds_info.append(build_info)
+                    if log_pool is None:
+                        builds_info.append(build_info)
+                    else:
+                        test_results_future = submit_run_log_parsing(
+                            log_pool, run, repo_full_name, test_frameworks, build_language, framework_regex, log_cache
+                        )
+                        pending_builds.append((build_info, test_results_future))
+                        collect_parsed_builds(pending_builds, builds_info, max_pending=2 * log_pool.workers)
 
                     save_builds_to_file(builds_info, output_csv)
 
+                # Wait for the test results of the page
+                collect_parsed_builds(pending_builds, builds_info)
+                save_builds_to_file(builds_info, output_csv)
                 logging.info(f"Processed page {page} of builds for workflow {workflow_id}")
 
             else:
@@ -312,8 +339,13 @@ def get_builds_info(repo_full_name, token, output_csv, framework_regex , config)
 
     logging.info(f"Finished processing {repo_full_name}. Cleaning up...")
 
-    # Delete cloned repository
-    if os.path.exists(local_repo_path):
+    if log_pool is not None:
+        log_pool.shutdown()
+    if sloc_counter is not None:
+        sloc_counter.close()
+
+    # Delete cloned repository (mirrors are kept for the next sessions)
+    if repo_mirror is None and local_repo_path and os.path.exists(local_repo_path):
         shutil.rmtree(local_repo_path, ignore_errors=True)
         logging.info(f"Deleted temporary repository: {local_repo_path}")
 
@@ -328,8 +360,74 @@ def get_builds_info(repo_full_name, token, output_csv, framework_regex , config)
 
 
 
+def fetch_run_log_archive(run, repo_full_name, log_cache=None):
+    """
+    Get the log archive of a run, from the log cache or downloaded to a temporary file.
+
+    Returns:
+        (path or None, True if the path is a temporary download to delete after parsing)
+    """
+    # The logs of a completed run attempt never change: they are kept in the log cache
+    if log_cache is not None and run.get('status') == 'completed':
+        path = log_cache.get_or_download(
+            repo_full_name, run['id'], run.get('run_attempt', 1),
+            lambda directory: download_github_actions_log(repo_full_name, run['id'], github_token, directory=directory)
+        )
+        return path, False
+    return download_github_actions_log(repo_full_name, run['id'], github_token), True
+
+
+def submit_run_log_parsing(log_pool, run, repo_full_name, test_frameworks, build_language, framework_regex, log_cache=None):
+    """
+    Fetch the log archive of a run and parse its test results in the log pool.
+
+    Returns:
+        Future of the run test results, or None if there is nothing to parse
+    """
+    determined_framework = test_frameworks[0] if test_frameworks else "unknown"
+    if not LogScanner(determined_framework, build_language, framework_regex).counts_tests:
+        return None
+    build_log_path, temporary_log = fetch_run_log_archive(run, repo_full_name, log_cache)
+    if not build_log_path:
+        return None
+    try:
+        return log_pool.submit(build_log_path, determined_framework, build_language, framework_regex, delete=temporary_log)
+    except zipfile.BadZipFile:
+        print(f"Failed to unzip log file for build {run['id']}")
+        return None
+
+
+def collect_parsed_builds(pending_builds, builds_info, max_pending=0):
+    """
+    Move the builds whose test results are parsed from pending_builds to builds_info, in mining order.
+
+    Args:
+        pending_builds: (build_info, test results future or None) in mining order
+        builds_info: Builds ready to be saved
+        max_pending: Wait for the oldest parsings while more builds than this are pending
+    """
+    while pending_builds:
+        build_info, test_results_future = pending_builds[0]
+        if test_results_future is not None:
+            if not test_results_future.done() and len(pending_builds) <= max_pending:
+                break
+            try:
+                test_results = test_results_future.result()
+                print(f"Parsed test results from the logs of build {build_info['id_build']}: {test_results}")
+                build_info.update({
+                    'tests_passed': test_results['passed'],
+                    'tests_failed': test_results['failed'],
+                    'tests_skipped': test_results['skipped'],
+                    'tests_total': test_results['total']
+                })
+            except Exception as e:
+                logging.error(f"Failed to parse the logs of build {build_info['id_build']}: {e}")
+        builds_info.append(build_info)
+        pending_builds.pop(0)
+
+
 def compile_build_info(run, repo_full_name, commit_data, sloc_initial, test_lines_per_1000_sloc, commit_sha, languages, total_builds,
-                       build_language, test_frameworks , dependency_count , workflow_size , framework_regex , workflow_name, event_trigger, issuer, workflow_id, duration_to_fetch , config):
+                       build_language, test_frameworks , dependency_count , workflow_size , framework_regex , workflow_name, event_trigger, issuer, workflow_id, duration_to_fetch , config, log_cache=None, log_pool=None, pr_index=None):
     # Parsing build start and end times for the LATEST attempt
     # run_started_at gives the start time of the latest attempt (not created_at which is the first attempt)
     run_attempt = run.get('run_attempt', 1)
@@ -365,29 +463,26 @@ def compile_build_info(run, repo_full_name, commit_data, sloc_initial, test_line
     
     # set to true to fetch logs and parse test results
     if config.get("fetch_test_parsing_results", False):
-        # Proceed with existing logic, including log fetching and parsing
-        build_log = get_github_actions_log(repo_full_name, run['id'], github_token)
-        
-        try:
-            with zipfile.ZipFile(io.BytesIO(build_log), 'r') as zip_ref:
-                for file_info in zip_ref.infolist():
-                    if file_info.filename.endswith('.txt'):
-                        with zip_ref.open(file_info) as log_file:
-                            for line in log_file:
-                                log_content = line.decode('utf-8').strip()  # Process line-by-line
-                                if log_content:
-                                    test_results = parse_test_results(determined_framework, log_content, build_language, framework_regex)
-                                    cumulative_test_results['passed'] += test_results['passed']
-                                    cumulative_test_results['failed'] += test_results['failed']
-                                    cumulative_test_results['skipped'] += test_results['skipped']
-                                    cumulative_test_results['total'] += test_results['total']
-                                    print(f"Parsed test results from {file_info.filename}: {test_results}")
-        except zipfile.BadZipFile:
-            print(f"Failed to unzip log file for build {run['id']}")
+        # Logs are only downloaded when the framework has test counts to parse
+        scanner = LogScanner(determined_framework, build_language, framework_regex)
+        build_log_path, temporary_log = None, False
+        if scanner.counts_tests and log_pool is None:
+            build_log_path, temporary_log = fetch_run_log_archive(run, repo_full_name, log_cache)
+
+        if build_log_path:
+            try:
+                scanner.scan_archive(build_log_path, cumulative_test_results)
+                print(f"Parsed test results from the logs of build {run['id']}: {cumulative_test_results}")
+            except zipfile.BadZipFile:
+                print(f"Failed to unzip log file for build {run['id']}")
+            finally:
+                if temporary_log:
+                    os.remove(build_log_path)
         
     # Check if this build is PR-related
     if config.get("fetch_pull_request_details", False):
-        pr_details = fetch_pull_request_details(repo_full_name, commit_sha, github_token)
+        run_date = datetime.strptime(run['created_at'], '%Y-%m-%dT%H:%M:%SZ')
+        pr_details = fetch_pull_request_details(repo_full_name, commit_sha, github_token, pr_index, run_date)
 
 
     head_commit_data = run.get('head_commit') or {}
@@ -1,5 +1,6 @@
 import requests
 from repo_info_collector import get_workflow_ids
+from request_github import github_api_url
 from datetime import datetime, timezone, timedelta
 import time
 import logging
@@ -12,7 +13,7 @@ try:
     backend_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
     if backend_root not in sys.path:
         sys.path.insert(0, backend_root)
-    from core.utils.logger import get_performance_logger
+    from core.utils.logger import log_api_call, log_rate_limit_sleep
     PERFORMANCE_LOGGING = True
 except ImportError:
     PERFORMANCE_LOGGING = False
@@ -57,6 +58,7 @@ def get_request(url, token):
             logging.error(f"Unexpected GitHub request error. URL: {url}, Error: {e}")
             return None
 
+        data = None
         if response.status_code == 200:
             # Parse JSON once so we can log richer information
             try:
@@ -64,39 +66,35 @@ def get_request(url, token):
             except ValueError:
                 data = None
 
-            # Log API call duration (with counts when possible)
-            if PERFORMANCE_LOGGING:
-                try:
-                    perf_logger = get_performance_logger()
-                    # Extract API endpoint type from URL
-                    if '/actions/runs' in url and '/jobs' in url:
-                        api_type = "JOBS_API"
-                    elif '/actions/runs' in url:
-                        api_type = "WORKFLOW_RUNS_API"
-                    elif '/actions/workflows' in url:
-                        api_type = "WORKFLOW_RUNS_API"
-                    else:
-                        api_type = "OTHER_API"
-
-                    # Build base log message
-                    log_msg = f"API_CALL - {api_type} - URL: {url} - Duration: {duration:.3f}s - Status: {response.status_code}"
-
-                    # Enrich with counts when we can infer them from the payload
-                    if isinstance(data, dict):
-                        # Jobs endpoint: add number of jobs returned
-                        if api_type == "JOBS_API" and 'jobs' in data and isinstance(data['jobs'], list):
-                            jobs_count = len(data['jobs'])
-                            log_msg += f" - Jobs: {jobs_count}"
-                        # Workflow runs endpoint: add number of runs returned
-                        elif api_type == "WORKFLOW_RUNS_API" and 'workflow_runs' in data and isinstance(data['workflow_runs'], list):
-                            runs_count = len(data['workflow_runs'])
-                            log_msg += f" - Runs: {runs_count}"
-
-                    perf_logger.info(log_msg)
-                except Exception:
-                    # Don't break if logging fails
-                    pass
+        # Log API call duration and status (with counts when possible)
+        if PERFORMANCE_LOGGING:
+            try:
+                # Extract API endpoint type from URL
+                if '/actions/runs' in url and '/jobs' in url:
+                    api_type = "JOBS_API"
+                elif '/actions/runs' in url:
+                    api_type = "WORKFLOW_RUNS_API"
+                elif '/actions/workflows' in url:
+                    api_type = "WORKFLOW_RUNS_API"
+                else:
+                    api_type = "OTHER_API"
+
+                # Enrich with counts when we can infer them from the payload
+                counts = {}
+                if isinstance(data, dict):
+                    # Jobs endpoint: add number of jobs returned
+                    if api_type == "JOBS_API" and 'jobs' in data and isinstance(data['jobs'], list):
+                        counts['Jobs'] = len(data['jobs'])
+                    # Workflow runs endpoint: add number of runs returned
+                    elif api_type == "WORKFLOW_RUNS_API" and 'workflow_runs' in data and isinstance(data['workflow_runs'], list):
+                        counts['Runs'] = len(data['workflow_runs'])
+
+                log_api_call(api_type, url, duration, response.status_code, **counts)
+            except Exception:
+                # Don't break if logging fails
+                pass
 
+        if response.status_code == 200:
             return data
         elif response.status_code == 403 and 'X-RateLimit-Reset' in response.headers:
             reset_time = datetime.fromtimestamp(int(response.headers['X-RateLimit-Reset']), timezone.utc)
@@ -108,6 +106,11 @@ def get_request(url, token):
                 )
                 return None
             logging.error(f"Rate limit exceeded, sleeping for {sleep_time:.1f} seconds. URL: {url}")
+            if PERFORMANCE_LOGGING:
+                try:
+                    log_rate_limit_sleep(url, sleep_time, response.status_code)
+                except Exception:
+                    pass
             time.sleep(sleep_time)
         elif response.status_code in [500, 502, 503, 504] and attempt < max_attempts - 1:
             wait_time = min(2 ** attempt, 8)
@@ -123,7 +126,7 @@ def get_request(url, token):
 
 
 def get_jobs_for_run_old(repo_full_name, run_id, token):
-    url = f"https://api.github.com/repos/{repo_full_name}/actions/runs/{run_id}/jobs"
+    url = github_api_url(f"/repos/{repo_full_name}/actions/runs/{run_id}/jobs")
     headers = {'Authorization': f'token {token}'}
     jobs_response = requests.get(url, headers=headers).json()
     jobs_ids = []
@@ -138,7 +141,7 @@ def get_jobs_for_run_old_2(repo_full_name, run_id, token):
     """
     Fetch job details for a specific run. Handles retries and rate limits.
     """
-    url = f"https://api.github.com/repos/{repo_full_name}/actions/runs/{run_id}/jobs"
+    url = github_api_url(f"/repos/{repo_full_name}/actions/runs/{run_id}/jobs")
     jobs_response = get_request(url, token)
 
     jobs_ids = []
@@ -162,7 +165,7 @@ def get_jobs_for_run(repo_full_name, run_id, token):
     Fetch job details for a specific run. Handles retries and rate limits.
     Returns a list of job IDs, job details with steps info, and the count of jobs.
     """
-    url = f"https://api.github.com/repos/{repo_full_name}/actions/runs/{run_id}/jobs"
+    url = github_api_url(f"/repos/{repo_full_name}/actions/runs/{run_id}/jobs")
     jobs_response = get_request(url, token)
 
     jobs_ids = []
@@ -244,7 +247,7 @@ def get_builds_info_from_build_yml(repo_full_name, token, date_limit=None):
     for workflow_id in build_workflow_ids:
         page = 1
         while True:
-            url = f"https://api.github.com/repos/{repo_full_name}/actions/workflows/{workflow_id}/runs?page={page}&per_page=100"
+            url = github_api_url(f"/repos/{repo_full_name}/actions/workflows/{workflow_id}/runs?page={page}&per_page=100")
             runs_response = get_request(url, token)
             if not (runs_response and 'workflow_runs' in runs_response):
                 break
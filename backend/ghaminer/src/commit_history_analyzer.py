@@ -2,7 +2,10 @@ import requests
 import logging
 from datetime import datetime, timezone, timedelta
 import os
-from file_indicators import is_production_file , is_test_file
+from file_indicators import DOC_DIRECTORIES, DOC_EXTENSIONS
+from commit_index import git_timestamp
+from repo_mirror import missing_commits
+from path_classifier import DockerFile, PathCategory, classify_path
 import subprocess
 import json
 import shutil
@@ -64,24 +67,21 @@ def clone_repo_locally(repo_url, base_path):
 
 
 def is_documentation_file(file_path):
-    doc_extensions = ('.md', '.rst', '.txt', '.pdf')
-    doc_directories = ['doc', 'docs', 'documentation', 'guide', 'help', 'manual', 'manuals', 'guides']
-
     lower_path = file_path.lower()
-    if lower_path.endswith(doc_extensions):
+    if lower_path.endswith(DOC_EXTENSIONS):
         return True
 
     if lower_path.endswith('.html'):
         path_segments = lower_path.split('/')
-        if any(doc_dir in path_segments for doc_dir in doc_directories):
+        if any(doc_dir in path_segments for doc_dir in DOC_DIRECTORIES):
             return True
-        if any(doc_dir in lower_path for doc_dir in doc_directories):
+        if any(doc_dir in lower_path for doc_dir in DOC_DIRECTORIES):
             return True
 
         return False
 
     path_segments = lower_path.split('/')
-    if any(doc_dir in path_segments for doc_dir in doc_directories):
+    if any(doc_dir in path_segments for doc_dir in DOC_DIRECTORIES):
         return True
 
     return False
@@ -246,6 +246,87 @@ def get_last_commit_containing_file(file_path, commit_sha, local_repo_path):
     except subprocess.CalledProcessError:
         return None  # File has no prior history
 
+def summarize_commit_changes(author_name, changes):
+    """
+    Commit metadata from its file changes.
+
+    Args:
+        author_name: Commit author
+        changes: (file path, added lines, removed lines, status) of each changed file,
+                 status being "added", "deleted" or "modified"
+    """
+    # **Initialize commit metadata**
+    total_added = total_removed = tests_added = tests_removed = 0
+    src_files = doc_files = other_files = 0
+    file_types = set()
+    file_changes = []
+    dockerfile_changed = 0
+    docker_compose_changed = 0
+
+    unique_files_added = set()
+    unique_files_deleted = set()
+    unique_files_modified = set()
+
+    for filename, added_lines, removed_lines, status in changes:
+        # **Track total added/removed lines**
+        total_added += added_lines
+        total_removed += removed_lines
+
+        if status == "added":
+            unique_files_added.add(filename)
+        elif status == "deleted":
+            unique_files_deleted.add(filename)
+        else:
+            unique_files_modified.add(filename)
+
+        # **Classify files**
+        category, docker_file = classify_path(filename)
+        if category is PathCategory.TEST:
+            tests_added += added_lines
+            tests_removed += removed_lines
+        elif category is PathCategory.SOURCE:
+            src_files += 1
+        elif category is PathCategory.DOCUMENTATION:
+            doc_files += 1
+        else:
+            other_files += 1
+
+        # Count Docker-related files
+        if docker_file is DockerFile.DOCKERFILE:
+            dockerfile_changed += 1
+        elif docker_file is DockerFile.COMPOSE:
+            docker_compose_changed += 1
+
+        # **Track file extensions**
+        file_extension = os.path.splitext(filename)[1]
+        if file_extension:
+            file_types.add(file_extension)
+
+        # **Store file change data**
+        file_changes.append({
+            "file_path": filename,
+            "added_lines": added_lines,
+            "removed_lines": removed_lines
+        })
+
+    return {
+        'author': author_name,
+        'total_added': total_added,
+        'total_removed': total_removed,
+        'tests_added': tests_added,
+        'tests_removed': tests_removed,
+        'src_files': src_files,
+        'doc_files': doc_files,
+        'other_files': other_files,
+        'file_types': file_types,
+        'file_changes': file_changes,
+        'gh_files_added': len(unique_files_added),
+        'gh_files_deleted': len(unique_files_deleted),
+        'gh_files_modified': len(unique_files_modified),
+        'dockerfile_changed': dockerfile_changed,
+        'docker_compose_changed': docker_compose_changed,
+    }
+
 def fetch_full_commit_data_local(commit_sha, local_repo_path):
     """Fetch detailed commit data using local Git, ensuring the commit exists before retrieving details."""
     try:
@@ -254,12 +335,13 @@ def fetch_full_commit_data_local(commit_sha, local_repo_path):
             return {}
 
         # **Ensure the commit exists locally by fetching it explicitly**
-        fetch_result = subprocess.run(
-            ["git", "-C", local_repo_path, "fetch", "origin", commit_sha],
-            capture_output=True, text=True, encoding="utf-8", errors="replace"
-        )
-        if fetch_result.returncode != 0:
-            logging.warning(f"Failed to fetch commit {commit_sha}: {fetch_result.stderr.strip()}")
+        if missing_commits(local_repo_path, [commit_sha]):
+            fetch_result = subprocess.run(
+                ["git", "-C", local_repo_path, "fetch", "origin", commit_sha],
+                capture_output=True, text=True, encoding="utf-8", errors="replace"
+            )
+            if fetch_result.returncode != 0:
+                logging.warning(f"Failed to fetch commit {commit_sha}: {fetch_result.stderr.strip()}")
 
         # **Try to show commit details**
         result = subprocess.run(
@@ -278,18 +360,7 @@ def fetch_full_commit_data_local(commit_sha, local_repo_path):
 
         # **Extract commit author**
         author_name = output[0].strip() if output else "Unknown"
-        # **Initialize commit metadata**
-        total_added = total_removed = tests_added = tests_removed = 0
-        src_files = doc_files = other_files = 0
-        file_types = set()
-        file_changes = []
-        dockerfile_changed = 0
-        docker_compose_changed = 0
-
-
-        unique_files_added = set()
-        unique_files_deleted = set()
-        unique_files_modified = set()
+        changes = []
 
         # **Process file changes**
         for line in output[1:]:  # Skip author line
@@ -301,10 +372,6 @@ def fetch_full_commit_data_local(commit_sha, local_repo_path):
             added_lines = int(added_lines) if added_lines.isdigit() else 0
             removed_lines = int(removed_lines) if removed_lines.isdigit() else 0
 
-            # **Track total added/removed lines**
-            total_added += added_lines
-            total_removed += removed_lines
-
             # **Get previous commit SHA (parent of current commit)**
             parent_commit_result = subprocess.run(
                 ["git", "-C", local_repo_path, "rev-parse", f"{commit_sha}^"],
@@ -321,59 +388,15 @@ def fetch_full_commit_data_local(commit_sha, local_repo_path):
                 prev_line_count = get_file_line_count(last_known_commit, filename, local_repo_path)
 
             if prev_line_count is None and current_line_count is not None:
-                unique_files_added.add(filename)
+                status = "added"
             elif prev_line_count is not None and current_line_count is None:
-                unique_files_deleted.add(filename)
-            else:
-                unique_files_modified.add(filename)
-
-            # **Classify files**
-            if is_test_file(filename):
-                tests_added += added_lines
-                tests_removed += removed_lines
-            elif is_production_file(filename):
-                src_files += 1
-            elif is_documentation_file(filename):
-                doc_files += 1
+                status = "deleted"
             else:
-                other_files += 1
-
-            # Count Docker-related files
-            if "dockerfile" in filename.lower():
-                dockerfile_changed += 1
-            elif "docker-compose" in filename.lower():
-                docker_compose_changed += 1
-
-
-            # **Track file extensions**
-            file_extension = os.path.splitext(filename)[1]
-            if file_extension:
-                file_types.add(file_extension)
-
-            # **Store file change data**
-            file_changes.append({
-                "file_path": filename,
-                "added_lines": added_lines,
-                "removed_lines": removed_lines
-            })
-
-        return {
-            'author': author_name,
-            'total_added': total_added,
-            'total_removed': total_removed,
-            'tests_added': tests_added,
-            'tests_removed': tests_removed,
-            'src_files': src_files,
-            'doc_files': doc_files,
-            'other_files': other_files,
-            'file_types': file_types,
-            'file_changes': file_changes,
-            'gh_files_added': len(unique_files_added),
-            'gh_files_deleted': len(unique_files_deleted),
-            'gh_files_modified': len(unique_files_modified),
-            'dockerfile_changed': dockerfile_changed,
-            'docker_compose_changed': docker_compose_changed,
-        }
+                status = "modified"
+
+            changes.append((filename, added_lines, removed_lines, status))
+
+        return summarize_commit_changes(author_name, changes)
 
     except subprocess.CalledProcessError as e:
         logging.error(f"Failed to fetch commit details for {commit_sha}: {e}")
@@ -587,10 +610,13 @@ def get_commit_count_until_commit(local_repo_path, commit_sha):
 
 
 # gets commits details from a last end date till and untill date
-def get_commit_data_local(commit_sha, local_repo_path, run_date, run_plus_1_date):
+def get_commit_data_local(commit_sha, local_repo_path, run_date, run_plus_1_date, commit_index=None):
     """
     Aggregates commit-related information, ensuring the run's commit_sha is always included,
     along with commits between the last run's end date and this run's creation date.
+
+    With a commit_index (see commit_index.py), the history is read from the index
+    instead of running git commands, with the same results.
     """
     # Initialize aggregated metrics
     total_added = total_removed = tests_added = tests_removed = 0
@@ -608,7 +634,14 @@ def get_commit_data_local(commit_sha, local_repo_path, run_date, run_plus_1_date
     commit_shas = [commit_sha]  # Start with the head commit of the run
 
     # Determine the git log command based on the presence of run_plus_1_date
-    if run_plus_1_date is None:
+    additional_commits = []
+    git_log_command = None
+    if commit_index is not None:
+        if run_plus_1_date is not None:
+            additional_commits = commit_index.commits_between(
+                git_timestamp(run_plus_1_date, utc=True), git_timestamp(run_date, utc=True)
+            )
+    elif run_plus_1_date is None:
         # No previous run, only analyze the specific `commit_sha`
         git_log_command = [
             "git", "-C", local_repo_path, "show", "--pretty=format:%H", "--no-patch", commit_sha
@@ -622,8 +655,9 @@ def get_commit_data_local(commit_sha, local_repo_path, run_date, run_plus_1_date
         ]
 
     try:
-        result = subprocess.run(git_log_command, capture_output=True, text=True, check=True)
-        additional_commits = result.stdout.splitlines()
+        if git_log_command is not None:
+            result = subprocess.run(git_log_command, capture_output=True, text=True, check=True)
+            additional_commits = result.stdout.splitlines()
 
         # **Ensure commit_sha is at the beginning of the list**
         for sha in additional_commits:
@@ -637,7 +671,10 @@ def get_commit_data_local(commit_sha, local_repo_path, run_date, run_plus_1_date
     for sha in commit_shas:
 
         # **Get detailed file changes for this commit**
-        commit_full_data = fetch_full_commit_data_local(sha, local_repo_path)
+        if commit_index is not None:
+            commit_full_data = commit_index.commit_changes(sha)
+        else:
+            commit_full_data = fetch_full_commit_data_local(sha, local_repo_path)
         if commit_full_data:
             #commits_on_files_touched.add(sha)
             total_added += commit_full_data['total_added']
@@ -657,11 +694,19 @@ def get_commit_data_local(commit_sha, local_repo_path, run_date, run_plus_1_date
             dockerfile_changed += commit_full_data['dockerfile_changed']
             docker_compose_changed += commit_full_data['docker_compose_changed']
 
-    commits_on_files_touched_count = count_commits_on_files_last_3_months(local_repo_path, commit_sha)
-    committers_3_months = get_unique_committers_3_months(local_repo_path, run_date)
-    unique_committers = get_unique_committers(local_repo_path, run_date=run_date)
-    #commit_count = get_commit_count_until_date(local_repo_path, run_date)
-    commit_count = get_commit_count_until_commit(local_repo_path, commit_sha)
+    if commit_index is not None:
+        commits_on_files_touched_count = commit_index.count_commits_on_files_last_3_months(commit_sha)
+        committers_3_months_count = commit_index.team_size(
+            git_timestamp(run_date - timedelta(days=90)), git_timestamp(run_date)
+        )
+        unique_committers_count = commit_index.unique_committer_count(git_timestamp(run_date))
+        commit_count = commit_index.commit_count(commit_sha)
+    else:
+        commits_on_files_touched_count = count_commits_on_files_last_3_months(local_repo_path, commit_sha)
+        committers_3_months_count = len(get_unique_committers_3_months(local_repo_path, run_date))
+        unique_committers_count = len(get_unique_committers(local_repo_path, run_date=run_date))
+        #commit_count = get_commit_count_until_date(local_repo_path, run_date)
+        commit_count = get_commit_count_until_commit(local_repo_path, commit_sha)
 
 
     # **Return aggregated commit data**
@@ -682,7 +727,7 @@ def get_commit_data_local(commit_sha, local_repo_path, run_date, run_plus_1_date
         'file_types': list(file_types),
         'dockerfile_changed': dockerfile_changed,
         'docker_compose_changed': docker_compose_changed,
-        'unique_committers' : len(unique_committers),
-        "committers_3_months" : len(committers_3_months),
+        'unique_committers' : unique_committers_count,
+        "committers_3_months" : committers_3_months_count,
         "git_commits" : commit_count
     }
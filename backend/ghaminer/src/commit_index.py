@@ -0,0 +1,493 @@
+"""
+In-memory index of the git history of a cloned repository.
+
+get_commit_data_local used to spawn git processes for every run: a log for the
+commit range, a fetch and a show (plus several shows per file) for every
+commit, a log per touched file and full-history logs for the committers. The
+index reads the history once with a single `git log --raw --numstat` pass
+(plus one `git diff-tree --stdin` pass for the other parents of merges) and
+answers those queries from memory, with the same results as the git commands:
+
+- log walks from HEAD follow git's rules: --since prunes the walk, --until only
+  hides commits, and path-limited walks apply history simplification (a merge
+  follows its first parent TREESAME to the path);
+- the files of a commit are the first-parent diff with rename detection, like
+  `git show --numstat`.
+
+Commits the index cannot answer exactly (submodule entries, merges with files
+changed against every parent, glob-like paths, ...) fall back to the git commands.
+
+Usage:
+    commit_index = build_commit_index(local_repo_path)
+    commit_data = get_commit_data_local(sha, local_repo_path, run_date, run_plus_1_date, commit_index)
+"""
+import heapq
+import logging
+import subprocess
+import tempfile
+from datetime import timedelta, timezone
+
+from committer_timeline import CommitterTimeline
+from file_history import FileHistory
+
+THREE_MONTHS_SECONDS = int(timedelta(days=90).total_seconds())
+GITLINK_MODE = "160000"
+PATHSPEC_MAGIC = ("*", "?", "[", "\\")
+
+# Record separator, then hash, parents, committer timestamp, author name and email
+LOG_FORMAT = "--format=%x1e%H%x1f%P%x1f%ct%x1f%an%x1f%ae"
+
+
+def git_timestamp(date, utc=False):
+    """
+    Timestamp git gives to a datetime passed to --since/--until as date.isoformat().
+
+    Args:
+        date: Datetime (naive datetimes are local time for git, unless utc is set)
+        utc: The date is passed with a Z suffix
+    """
+    if utc and date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return int(date.timestamp())
+
+
+def path_prefixes(path):
+    """The path and its parent directories: the pathspecs a change of the path matches."""
+    prefixes = [path]
+    slash = path.rfind("/")
+    while slash > 0:
+        path = path[:slash]
+        prefixes.append(path)
+        slash = path.rfind("/")
+    return prefixes
+
+
+class CommitIndex:
+    """Commits, file changes and authors of every commit reachable from the refs of a clone."""
+
+    def __init__(self, local_repo_path):
+        """
+        Read the history of the clone.
+
+        Raises:
+            subprocess.CalledProcessError: If git cannot read the history
+        """
+        self.local_repo_path = local_repo_path
+        self.ids = {}
+        self.shas = []
+        self.parents = []
+        self.times = []
+        self.authors = []
+        self.identities = []
+        # Per commit: (file, added lines, removed lines, status) of the numstat lines, or None to ask git
+        self.changes = []
+        # Per commit: files listed by `git show --name-only`, or None to ask git
+        self.names = []
+        # Per commit and parent: changed paths and their parent directories
+        self.touched = []
+        self.generations = []
+        self.ancestor_counts = {}
+        self.fetched = []
+        self._strings = {}
+        self._merge_files = {}
+        self._merge_other_files = {}
+        self._timeline = self._timeline_head = None
+        self.file_history = FileHistory(self)
+        self._read_history(["--all"])
+        self.head = None
+        self.refresh_head()
+
+    def __len__(self):
+        return len(self.shas)
+
+    def _git(self, *args, **kwargs):
+        return subprocess.run(["git", "-C", self.local_repo_path, *args], capture_output=True, **kwargs)
+
+    def _intern(self, value):
+        return self._strings.setdefault(value, value)
+
+    def refresh_head(self):
+        """Re-read HEAD (after the clone checked out another commit)."""
+        result = self._git("rev-parse", "HEAD", text=True)
+        sha = result.stdout.strip() if result.returncode == 0 else None
+        self.head = self.ensure_commit(sha) if sha else None
+        return self.head
+
+    def _read_history(self, revisions, stdin_revisions=None):
+        """Index the commits of one `git log` pass (commits already indexed are skipped)."""
+        command = ["git", "-C", self.local_repo_path, "log"]
+        if stdin_revisions is not None:
+            command.append("--stdin")
+        command += [*revisions, "--raw", "--numstat", "--diff-merges=first-parent", LOG_FORMAT]
+
+        first_new = len(self.shas)
+        with tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(
+                command, stdin=subprocess.PIPE if stdin_revisions is not None else None,
+                stdout=subprocess.PIPE, stderr=stderr,
+            )
+            if stdin_revisions is not None:
+                process.stdin.write("".join(f"{revision}\n" for revision in stdin_revisions).encode())
+                process.stdin.close()
+            header, raw_lines, numstat_lines = None, [], []
+            for line in process.stdout:
+                line = line.rstrip(b"\n")
+                if line.startswith(b"\x1e"):
+                    if header is not None:
+                        self._add_commit(header, raw_lines, numstat_lines)
+                    header, raw_lines, numstat_lines = line[1:], [], []
+                elif line.startswith(b":"):
+                    raw_lines.append(line.decode("utf-8", errors="replace"))
+                elif line:
+                    numstat_lines.append(line.decode("utf-8", errors="replace"))
+            if header is not None:
+                self._add_commit(header, raw_lines, numstat_lines)
+            process.stdout.close()
+            if process.wait() != 0:
+                stderr.seek(0)
+                raise subprocess.CalledProcessError(process.returncode, command, stderr=stderr.read())
+
+        self._link_parents(first_new)
+        self._read_merge_parents(first_new)
+        self._compute_generations(first_new)
+
+    def _add_commit(self, header, raw_lines, numstat_lines):
+        sha, parents, commit_time, author, email = header.split(b"\x1f")
+        sha = sha.decode()
+        if sha in self.ids:
+            return
+        self.ids[sha] = len(self.shas)
+        self.shas.append(sha)
+        # Parent hashes until every commit is read, then ids (see _link_parents)
+        self.parents.append(tuple(parents.decode().split()))
+        self.times.append(int(commit_time))
+        author_name = author.decode("utf-8", errors="replace")
+        self.authors.append(self._intern(author_name.strip()))
+        self.identities.append(self._intern(
+            f"{author.decode('utf-8', errors='ignore')} <{email.decode('utf-8', errors='ignore')}>"
+        ))
+
+        changes, names, files = [], [], set()
+        exact = bool(author_name.strip()) and len(raw_lines) == len(numstat_lines)
+        for position, raw_line in enumerate(raw_lines):
+            meta, *paths = raw_line.split("\t")
+            old_mode, new_mode, _, _, status = meta[1:].split(" ")
+            status = status[0]
+            renamed = status in ("R", "C")
+            # Paths of the diff without rename detection (a copy leaves its source unchanged)
+            files.update(paths if status != "C" else paths[-1:])
+            names.append(paths[-1] if renamed else paths[0])
+
+            if position >= len(numstat_lines):
+                continue
+            parts = numstat_lines[position].split("\t")
+            if GITLINK_MODE in (old_mode, new_mode):
+                # Whether a submodule "exists" for git show depends on the objects of the clone
+                exact = False
+            if len(parts) != 3:
+                continue  # Skipped by fetch_full_commit_data_local too
+            added, removed, file_name = parts
+            if not renamed and file_name != paths[0]:
+                exact = False
+            if file_name.startswith('"') or renamed:
+                # git show cannot find quoted or "old => new" paths at either commit
+                file_status = "modified"
+            elif status == "A":
+                file_status = "added"
+            elif status == "D":
+                file_status = "deleted"
+            else:
+                file_status = "modified"
+            changes.append((
+                self._intern(file_name),
+                int(added) if added.isdigit() else 0,
+                int(removed) if removed.isdigit() else 0,
+                file_status,
+            ))
+
+        self.changes.append(tuple(changes) if exact else None)
+        self.names.append(tuple(self._intern(name) for name in names))
+        self.touched.append([frozenset(
+            self._intern(prefix) for path in files for prefix in path_prefixes(path)
+        )])
+        self.generations.append(0)
+        self.file_history.add_commit(self.ids[sha], files)
+        if len(parents.split()) > 1:
+            self._merge_files[self.ids[sha]] = files
+
+    def _link_parents(self, first_new):
+        """Replace the parent hashes of new commits by ids (parents missing from the clone are dropped)."""
+        for commit in range(first_new, len(self.shas)):
+            self.parents[commit] = tuple(self.ids[sha] for sha in self.parents[commit] if sha in self.ids)
+
+    def _read_merge_parents(self, first_new):
+        """Index the paths changed by new merges against their other parents, with one diff-tree pass."""
+        pairs = [
+            (commit, parent)
+            for commit in range(first_new, len(self.shas))
+            for parent in self.parents[commit][1:]
+        ]
+        output = []
+        if pairs:
+            # Each "<parent> <merge>" line prints the parent hash, then the paths changed
+            lines = "".join(f"{self.shas[parent]} {self.shas[commit]}\n" for commit, parent in pairs)
+            result = self._git(
+                "diff-tree", "--stdin", "--always", "-r", "--no-renames", "--name-only",
+                input=lines.encode(), check=True,
+            )
+            output = result.stdout.decode("utf-8", errors="replace").split("\n")
+        position = 0
+        for index, (commit, parent) in enumerate(pairs):
+            header = self.shas[parent]
+            next_header = self.shas[pairs[index + 1][1]] if index + 1 < len(pairs) else None
+            while position < len(output) and output[position] != header:
+                position += 1
+            position += 1
+            files = set()
+            while position < len(output) and output[position] != next_header:
+                if output[position]:
+                    files.add(output[position])
+                position += 1
+            self._merge_other_files.setdefault(commit, []).append(files)
+            self.touched[commit].append(frozenset(
+                self._intern(prefix) for path in files for prefix in path_prefixes(path)
+            ))
+
+        for commit in [commit for commit in self._merge_files if commit >= first_new]:
+            # `git show --name-only` lists the files differing from every parent (combined diff);
+            # when there are some, the dense combined diff may drop part of them: ask git
+            changed = self._merge_files.pop(commit)
+            for parent_files in self._merge_other_files.pop(commit, []):
+                changed &= parent_files
+            self.names[commit] = () if not changed else None
+
+    def _compute_generations(self, first_new):
+        """Generation numbers (1 + the highest generation of the parents) of the new commits."""
+        for start in range(first_new, len(self.shas)):
+            if self.generations[start]:
+                continue
+            stack = [start]
+            while stack:
+                commit = stack[-1]
+                pending = [parent for parent in self.parents[commit] if not self.generations[parent]]
+                if pending:
+                    stack.extend(pending)
+                    continue
+                stack.pop()
+                if not self.generations[commit]:
+                    self.generations[commit] = 1 + max(
+                        (self.generations[parent] for parent in self.parents[commit]), default=0
+                    )
+
+    def ensure_commit(self, sha):
+        """
+        Id of a commit, fetching it from origin and indexing its history if the clone lacks it.
+
+        Returns:
+            Commit id, or None if the commit cannot be found
+        """
+        commit = self.ids.get(sha)
+        if commit is not None:
+            return commit
+        if self._git("cat-file", "-e", f"{sha}^{{commit}}").returncode != 0:
+            fetch_result = self._git("fetch", "origin", sha, text=True, encoding="utf-8", errors="replace")
+            if fetch_result.returncode != 0:
+                logging.warning(f"Failed to fetch commit {sha}: {fetch_result.stderr.strip()}")
+                return None
+        try:
+            # Commits reachable from the refs are indexed already
+            self._read_history([sha, "--not", "--all"], [f"^{fetched}" for fetched in self.fetched])
+        except subprocess.CalledProcessError as e:
+            logging.error(f"Failed to index commit {sha}: {e.stderr}")
+            return None
+        commit = self.ids.get(sha)
+        if commit is not None:
+            self.fetched.append(sha)
+        return commit
+
+    def _walk(self, since=None, until=None, path=None):
+        """
+        Commits `git log [--since] [--until] [-- path]` lists from HEAD.
+
+        --since stops the walk at older commits (their parents are not visited, even
+        if they are more recent); --until only hides commits. With a path, merges
+        follow their first parent TREESAME to the path and are then hidden.
+        """
+        if self.head is None:
+            return []
+        shown = []
+        seen = {self.head}
+        stack = [self.head]
+        while stack:
+            commit = stack.pop()
+            commit_time = self.times[commit]
+            if since is not None and commit_time < since:
+                continue
+            parents = self.parents[commit]
+            treesame = False
+            if path is not None:
+                touched = self.touched[commit]
+                if not parents:
+                    treesame = path not in touched[0]
+                for nth, parent_touched in enumerate(touched[:len(parents)]):
+                    if path not in parent_touched:
+                        parents = (parents[nth],)
+                        treesame = True
+                        break
+            for parent in parents:
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+            if treesame or (until is not None and commit_time > until):
+                continue
+            shown.append(commit)
+        return shown
+
+    def commits_between(self, since, until):
+        """Hashes listed by `git log --since --until` (timestamps)."""
+        return [self.shas[commit] for commit in self._walk(since=since, until=until)]
+
+    def ancestors(self, commit):
+        """Ids of the commits reachable from a commit (itself included)."""
+        seen = {commit}
+        stack = [commit]
+        while stack:
+            for parent in self.parents[stack.pop()]:
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+        return seen
+
+    def committer_timeline(self):
+        """Committer counts of the history of HEAD (rebuilt when HEAD moves)."""
+        if self.head is None:
+            return None
+        if self._timeline is None or self._timeline_head != self.head:
+            self._timeline = CommitterTimeline(
+                self.ancestors(self.head), self.times, self.parents, self.generations, self.identities, self.head
+            )
+            self._timeline_head = self.head
+        return self._timeline
+
+    def unique_committer_count(self, until):
+        """Same result as len(get_unique_committers()) for a run date timestamp."""
+        timeline = self.committer_timeline()
+        return timeline.committer_count(until) if timeline else 0
+
+    def team_size(self, since, until):
+        """Same result as len(get_unique_committers_3_months()) for timestamps."""
+        timeline = self.committer_timeline()
+        return timeline.team_size(since, until) if timeline else 0
+
+    def commit_changes(self, sha):
+        """Same result as fetch_full_commit_data_local."""
+        from commit_history_analyzer import fetch_full_commit_data_local, summarize_commit_changes
+
+        commit = self.ensure_commit(sha)
+        if commit is None:
+            return {}
+        changes = self.changes[commit]
+        if changes is None:
+            return fetch_full_commit_data_local(sha, self.local_repo_path)
+        return summarize_commit_changes(self.authors[commit], changes)
+
+    def count_commits_on_files_last_3_months(self, sha):
+        """Same result as count_commits_on_files_last_3_months."""
+        from commit_history_analyzer import count_commits_on_files_last_3_months
+
+        commit = self.ensure_commit(sha)
+        if commit is None or self.names[commit] is None:
+            return count_commits_on_files_last_3_months(self.local_repo_path, sha)
+        files_in_commit = self.names[commit]
+        if not files_in_commit:
+            logging.warning(f"No files found for commit {sha}")
+            return 0
+
+        since = self.times[commit] - THREE_MONTHS_SECONDS
+        unique_commits = set()
+        for file_path in files_in_commit:
+            if file_path.startswith('"'):
+                continue  # A quoted path matches no file
+            if file_path.startswith(":") or any(char in file_path for char in PATHSPEC_MAGIC):
+                unique_commits.update(self._git_log_file(file_path, since))
+                continue
+            if self.file_history.is_directory(file_path):
+                # The pathspec also matches the files under the directory
+                commits = self._walk(since=since, path=file_path)
+            else:
+                commits = self.file_history.commits_since(file_path, since, self.head)
+            unique_commits.update(self.shas[c] for c in commits)
+        return len(unique_commits)
+
+    def _git_log_file(self, file_path, since):
+        """Commits of a file whose name is a glob or magic pathspec for git log."""
+        result = self._git("log", "--since", str(since), "--pretty=format:%H", "--", file_path, text=True)
+        if result.returncode != 0:
+            logging.warning(f"Error fetching commits for file {file_path}: {result.stderr.strip()}")
+            return set()
+        return set(result.stdout.strip().splitlines())
+
+    def commit_count(self, sha):
+        """Same result as `git rev-list --count sha`."""
+        target = self.ensure_commit(sha)
+        if target is None:
+            logging.error(f"Error fetching commit count for {sha}: unknown commit")
+            return 0
+
+        # Counts along the first-parent chain, from the oldest commit without a count
+        chain = []
+        commit = target
+        while commit is not None and commit not in self.ancestor_counts:
+            chain.append(commit)
+            commit = self.parents[commit][0] if self.parents[commit] else None
+        for commit in reversed(chain):
+            parents = self.parents[commit]
+            if not parents:
+                self.ancestor_counts[commit] = 1
+                continue
+            self.ancestor_counts[commit] = (
+                self.ancestor_counts[parents[0]] + 1 + self._count_not_reachable(parents[1:], parents[0])
+            )
+        return self.ancestor_counts[target]
+
+    def _count_not_reachable(self, tips, excluded_tip):
+        """Number of ancestors of tips that are not ancestors of excluded_tip."""
+        excluded, included = 1, 2
+        flags = {excluded_tip: excluded}
+        for tip in tips:
+            flags[tip] = flags.get(tip, 0) | included
+        queue = [(-self.generations[commit], commit) for commit in flags]
+        heapq.heapify(queue)
+        # Queued commits reachable from tips only: once there are none left, the
+        # rest of the walk only finds ancestors of excluded_tip
+        only_included = sum(1 for commit in flags if flags[commit] == included)
+        count = 0
+        while only_included:
+            # Commits come by decreasing generation: their children are visited, their flags final
+            _, commit = heapq.heappop(queue)
+            commit_flags = flags[commit]
+            if commit_flags == included:
+                count += 1
+                only_included -= 1
+            for parent in self.parents[commit]:
+                parent_flags = flags.get(parent)
+                if parent_flags is None:
+                    flags[parent] = commit_flags
+                    heapq.heappush(queue, (-self.generations[parent], parent))
+                    only_included += commit_flags == included
+                elif parent_flags | commit_flags != parent_flags:
+                    only_included -= parent_flags == included
+                    flags[parent] = parent_flags | commit_flags
+                    only_included += flags[parent] == included
+        return count
+
+
+def build_commit_index(local_repo_path):
+    """Commit index of a clone, or None if its history cannot be read."""
+    try:
+        commit_index = CommitIndex(local_repo_path)
+    except (OSError, subprocess.CalledProcessError) as e:
+        logging.error(f"Could not index the history of {local_repo_path}: {getattr(e, 'stderr', e)}")
+        return None
+    print(f"Indexed {len(commit_index)} commits of {local_repo_path}")
+    return commit_index
@@ -0,0 +1,99 @@
+"""
+Committer counts of a repository history at any date, without walking the history.
+
+For every run, git_num_committers is `git log --until <run date>` from HEAD and
+gh_team_size_last_3_month adds `--since <run date - 90 days>`. Both are answered
+from arrays built once per HEAD:
+
+- the cumulative count is the number of authors whose first commit (committer
+  date) is before the run date: a binary search in their sorted first-commit times;
+- the 3-month team size counts the distinct authors of a window of commits sorted
+  by date, with a window that slides between queries (runs are mined in date order,
+  so each query only moves it by the commits between two runs).
+
+git stops --since walks at the first commit older than the date, so with clock
+skew a recent commit can be hidden behind an older one. Commits are therefore
+sorted by their "reach time": the highest date for which the walk from HEAD still
+reaches them, i.e. the best, over the paths from HEAD, of the oldest commit date on
+the path. Commits whose reach time is not their own date are checked one by one
+(those of the window only).
+"""
+from bisect import bisect_left, bisect_right
+
+
+class CommitterTimeline:
+    """Committer counts of the history of one commit."""
+
+    def __init__(self, commits, times, parents, generations, authors, head):
+        """
+        Args:
+            commits: Ids of the ancestors of head (head included)
+            times: Commit id -> committer timestamp
+            parents: Commit id -> parent ids
+            generations: Commit id -> generation number (higher than those of its parents)
+            authors: Commit id -> author ("name <email>")
+            head: Commit id the history walks start from
+        """
+        # Reach times, children first (their reach time is final when their parents are visited)
+        reach = {head: times[head]}
+        for commit in sorted(commits, key=lambda commit: -generations[commit]):
+            commit_reach = reach[commit]
+            for parent in parents[commit]:
+                parent_reach = min(times[parent], commit_reach)
+                if parent not in reach or parent_reach > reach[parent]:
+                    reach[parent] = parent_reach
+
+        first_commit_times = {}
+        window_commits = []
+        self.skewed = []
+        for commit in commits:
+            author = authors[commit]
+            if times[commit] < first_commit_times.get(author, times[commit] + 1):
+                first_commit_times[author] = times[commit]
+            if reach[commit] == times[commit]:
+                window_commits.append((times[commit], author))
+            else:
+                self.skewed.append((reach[commit], times[commit], author))
+        self.first_commit_times = sorted(first_commit_times.values())
+        self.skewed.sort()
+        self.skewed_reach = [reach_time for reach_time, _, _ in self.skewed]
+        window_commits.sort()
+        self.window_times = [commit_time for commit_time, _ in window_commits]
+        self.window_authors = [author for _, author in window_commits]
+
+        # Sliding window: commits [start, end) of the window arrays, commit count per author
+        self.start = self.end = 0
+        self.window = {}
+
+    def committer_count(self, until):
+        """Number of authors listed by `git log --until` (timestamp)."""
+        return bisect_right(self.first_commit_times, until)
+
+    def _move_window(self, start, end):
+        window = self.window
+        authors = self.window_authors
+        for position in range(start, min(end, self.start)):
+            window[authors[position]] = window.get(authors[position], 0) + 1
+        for position in range(max(start, self.end), end):
+            window[authors[position]] = window.get(authors[position], 0) + 1
+        for position in list(range(self.start, min(start, self.end))) + list(range(max(end, self.start), self.end)):
+            count = window[authors[position]] - 1
+            if count:
+                window[authors[position]] = count
+            else:
+                del window[authors[position]]
+        self.start, self.end = start, end
+
+    def team_size(self, since, until):
+        """Number of authors listed by `git log --since --until` (timestamps)."""
+        start = bisect_left(self.window_times, since)
+        end = max(start, bisect_right(self.window_times, until))
+        self._move_window(start, end)
+        extra = {
+            author
+            for _, commit_time, author in self.skewed[
+                bisect_left(self.skewed_reach, since):bisect_right(self.skewed_reach, until)
+            ]
+            if commit_time <= until and author not in self.window
+        }
+        return len(self.window) + len(extra)
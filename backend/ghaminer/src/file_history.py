@@ -0,0 +1,176 @@
+"""
+Per-file commit index answering `git log --since <date> -- <file>` from memory.
+
+gh_commits_on_files_touched ran one `git log --since` per file of the run's
+commit. The commits changing each file are stored once, in NumPy arrays indexed
+by an interned path table (one slice of commit ids per path, sorted by commit
+date), so the commits of a file since a date start with a binary search.
+
+`git log -- <file>` also simplifies the history: a merge that kept the file of
+one of its parents is hidden and only that parent is walked. Walks from HEAD
+therefore follow first-parent chains and only turn at merges that changed the
+file against their first parent; the commits of a chain are found with an Euler
+tour of the first-parent forest (ancestor test on tour positions), and where a
+chain stops for --since with a jump table of the oldest commit date above each
+commit.
+"""
+from array import array
+
+import numpy as np
+
+
+class FileHistory:
+    """Commits changing each path, for the commits of a CommitIndex."""
+
+    def __init__(self, commit_index):
+        self.commit_index = commit_index
+        self.path_ids = {}
+        self.paths = []
+        self.directories = set()
+        # (path id, commit id) of every file of every first-parent diff, in commit order
+        self._pair_paths = array("q")
+        self._pair_commits = array("q")
+        self._arrays = None
+        self._forest = None
+
+    def add_commit(self, commit, files):
+        """Record the files a commit changes against its first parent (paths without rename detection)."""
+        for path in files:
+            path_id = self.path_ids.get(path)
+            if path_id is None:
+                path_id = self.path_ids[path] = len(self.paths)
+                self.paths.append(path)
+                slash = path.rfind("/")
+                while slash > 0:
+                    path = path[:slash]
+                    self.directories.add(path)
+                    slash = path.rfind("/")
+            self._pair_paths.append(path_id)
+            self._pair_commits.append(commit)
+        self._arrays = self._forest = None
+
+    def _path_arrays(self):
+        """Commit ids and dates of every path, path after path (CSR layout), sorted by date within a path."""
+        if self._arrays is None:
+            times = np.asarray(self.commit_index.times, dtype=np.int64)
+            pair_paths = np.array(self._pair_paths, dtype=np.int64)
+            pair_commits = np.array(self._pair_commits, dtype=np.int64)
+            order = np.lexsort((times[pair_commits], pair_paths))
+            commits = pair_commits[order]
+            offsets = np.searchsorted(pair_paths[order], np.arange(len(self.paths) + 1))
+            self._arrays = (commits, times[commits], offsets)
+        return self._arrays
+
+    def _first_parent_forest(self):
+        """
+        Euler tour positions and depths of the first-parent forest (a commit's tree parent
+        is its first parent), and jump tables: 2^k-th first-parent ancestor and oldest
+        commit date of the 2^k commits from a commit (itself included) toward the root.
+        """
+        if self._forest is None:
+            parents = self.commit_index.parents
+            count = len(parents)
+            first_parent = np.array([commit_parents[0] if commit_parents else -1 for commit_parents in parents],
+                                    dtype=np.int64)
+            children = [[] for _ in range(count)]
+            for commit in range(count):
+                if first_parent[commit] >= 0:
+                    children[first_parent[commit]].append(commit)
+
+            enter = np.zeros(count, dtype=np.int64)
+            leave = np.zeros(count, dtype=np.int64)
+            depth = np.zeros(count, dtype=np.int64)
+            clock = 0
+            for root in np.flatnonzero(first_parent < 0):
+                enter[root] = clock
+                clock += 1
+                stack = [(root, iter(children[root]))]
+                while stack:
+                    commit, pending = stack[-1]
+                    child = next(pending, None)
+                    if child is None:
+                        leave[commit] = clock
+                        stack.pop()
+                        continue
+                    enter[child] = clock
+                    depth[child] = depth[commit] + 1
+                    clock += 1
+                    stack.append((child, iter(children[child])))
+
+            jumps = [first_parent]
+            oldest = [np.asarray(self.commit_index.times, dtype=np.int64)]
+            while len(jumps) < max(1, int(depth.max(initial=0)).bit_length()):
+                up, low = jumps[-1], oldest[-1]
+                has_up = up >= 0
+                jumps.append(np.where(has_up, up[np.maximum(up, 0)], -1))
+                oldest.append(np.where(has_up, np.minimum(low, low[np.maximum(up, 0)]), low))
+            self._forest = (enter, leave, depth, jumps, oldest)
+        return self._forest
+
+    def _stop_depth(self, commit, since, forest):
+        """Depth of the first commit older than since on the first-parent chain of commit (-1 if none)."""
+        _, _, depth, jumps, oldest = forest
+        for level in range(len(jumps) - 1, -1, -1):
+            # Skip 2^level commits when none of them is older than since
+            if oldest[level][commit] >= since and jumps[level][commit] >= 0:
+                commit = jumps[level][commit]
+        return depth[commit] if self.commit_index.times[commit] < since else -1
+
+    def is_directory(self, path):
+        return path in self.directories
+
+    def commits_since(self, path, since, head):
+        """
+        Ids of the commits `git log --since <since> -- <path>` lists from head.
+
+        Args:
+            path: File path (not a directory of any commit: the pathspec would also match its files)
+            since: Timestamp
+            head: Commit id the walk starts from
+        """
+        path_id = self.path_ids.get(path)
+        if path_id is None or head is None:
+            return set()
+        commits, times, offsets = self._path_arrays()
+        start, end = offsets[path_id], offsets[path_id + 1]
+        # Commits older than since are never listed
+        candidates = commits[start + np.searchsorted(times[start:end], since):end]
+        if not len(candidates):
+            return set()
+
+        forest = self._first_parent_forest()
+        enter, leave, depth = forest[0], forest[1], forest[2]
+        candidate_enter, candidate_leave, candidate_depth = enter[candidates], leave[candidates], depth[candidates]
+        index = self.commit_index
+        shown, visited, started = set(), set(), set()
+        stack = [head]
+        while stack:
+            tip = stack.pop()
+            if tip in started or index.times[tip] < since:
+                continue
+            started.add(tip)
+            # Candidates on the first-parent chain of tip, above the commit stopping the walk
+            on_chain = (
+                (candidate_enter <= enter[tip]) & (enter[tip] < candidate_leave)
+                & (candidate_depth > self._stop_depth(tip, since, forest))
+            )
+            chain = candidates[on_chain]
+            for commit in chain[np.argsort(-candidate_depth[on_chain], kind="stable")].tolist():
+                if commit in visited:
+                    break  # The rest of the chain is walked already
+                visited.add(commit)
+                parents = index.parents[commit]
+                if len(parents) < 2:
+                    shown.add(commit)
+                    continue
+                # The path changed against the first parent: follow the first other parent
+                # that has the merge's version, or show the merge and walk every parent
+                touched = index.touched[commit]
+                same = next((nth for nth in range(1, len(parents)) if path not in touched[nth]), None)
+                if same is None:
+                    shown.add(commit)
+                    stack.extend(parents[1:])
+                else:
+                    stack.append(parents[same])
+                    break
+        return shown
@@ -0,0 +1,222 @@
+"""
+On-disk cache of downloaded GitHub Actions run log archives.
+
+The logs of a completed run attempt never change, so archives are kept by
+(repo, run_id, run_attempt) and re-mining a repository (e.g. with other
+framework_regex settings) parses them without touching the network.
+
+Archives are stored by the SHA-256 of their content (blobs/<digest>.zip), with
+an SQLite index of the run attempts pointing at them. When the archives exceed
+the size budget, the least recently used ones are evicted.
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path):
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class RunLogCache:
+    """
+    Size-bounded LRU store of run log archives, shared by the processes mining with the same directory.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            directory: Cache directory
+            max_bytes: Size budget of the stored archives
+        """
+        self.directory = os.path.abspath(directory)
+        self.blob_dir = os.path.join(self.directory, "blobs")
+        self.tmp_dir = os.path.join(self.directory, "tmp")
+        self.db_path = os.path.join(self.directory, "index.sqlite3")
+        self.max_bytes = max_bytes
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        self._init_schema()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout = 30000")
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS run_logs (
+                    repo TEXT NOT NULL,
+                    run_id INTEGER NOT NULL,
+                    run_attempt INTEGER NOT NULL,
+                    digest TEXT NOT NULL,
+                    PRIMARY KEY (repo, run_id, run_attempt)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_run_logs_digest ON run_logs (digest)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_blobs_last_access ON blobs (last_access)")
+        finally:
+            conn.close()
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blob_dir, f"{digest}.zip")
+
+    def get(self, repo, run_id, run_attempt=1):
+        """
+        Path of the cached log archive of a run attempt, or None on a cache miss.
+        The path stays valid until the archive is evicted.
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT digest FROM run_logs WHERE repo = ? AND run_id = ? AND run_attempt = ?",
+                (repo, int(run_id), int(run_attempt or 1)),
+            ).fetchone()
+            if not row:
+                return None
+            path = self._blob_path(row[0])
+            if not os.path.exists(path):
+                # Blob removed behind the index's back
+                conn.execute("DELETE FROM run_logs WHERE digest = ?", (row[0],))
+                conn.execute("DELETE FROM blobs WHERE digest = ?", (row[0],))
+                return None
+            conn.execute("UPDATE blobs SET last_access = ? WHERE digest = ?", (time.time(), row[0]))
+            return path
+        finally:
+            conn.close()
+
+    def put(self, repo, run_id, run_attempt, source_path):
+        """
+        Move a downloaded archive into the cache.
+
+        Args:
+            repo: Repository (owner/repo)
+            run_id: Workflow run ID
+            run_attempt: Run attempt the logs belong to
+            source_path: Downloaded archive (moved into the cache, or deleted if already stored)
+
+        Returns:
+            Path of the cached archive
+        """
+        digest = file_digest(source_path)
+        path = self._blob_path(digest)
+        size = os.path.getsize(source_path)
+        if os.path.exists(path):
+            os.remove(source_path)
+        else:
+            os.replace(source_path, path)
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO blobs (digest, size, last_access) VALUES (?, ?, ?)",
+                (digest, size, time.time()),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO run_logs (repo, run_id, run_attempt, digest) VALUES (?, ?, ?, ?)",
+                (repo, int(run_id), int(run_attempt or 1), digest),
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+        self.evict(keep=digest)
+        return path
+
+    def get_or_download(self, repo, run_id, run_attempt, download):
+        """
+        Path of the log archive of a run attempt, downloading it on a cache miss.
+
+        Args:
+            repo: Repository (owner/repo)
+            run_id: Workflow run ID
+            run_attempt: Run attempt the logs belong to
+            download: Callable(directory) downloading the archive into directory and returning its path (or None)
+
+        Returns:
+            Path of the cached archive, or None if the download failed
+        """
+        path = self.get(repo, run_id, run_attempt)
+        if path:
+            return path
+        downloaded_path = download(self.tmp_dir)
+        if not downloaded_path:
+            return None
+        return self.put(repo, run_id, run_attempt, downloaded_path)
+
+    def evict(self, keep=None):
+        """
+        Delete the least recently used archives until the cache fits in max_bytes.
+
+        Args:
+            keep: Digest never evicted (the archive just stored)
+
+        Returns:
+            Number of archives evicted
+        """
+        conn = self._connect()
+        evicted = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+            if total > self.max_bytes:
+                for digest, size in conn.execute("SELECT digest, size FROM blobs ORDER BY last_access").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    if digest == keep:
+                        continue
+                    conn.execute("DELETE FROM run_logs WHERE digest = ?", (digest,))
+                    conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+                    evicted.append(digest)
+                    total -= size
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+        for digest in evicted:
+            try:
+                os.remove(self._blob_path(digest))
+            except OSError as e:
+                logging.warning(f"Could not remove evicted log archive {digest}: {e}")
+        return len(evicted)
+
+    def stats(self):
+        """Number of cached run attempts and archives, and their total size."""
+        conn = self._connect()
+        try:
+            runs = conn.execute("SELECT COUNT(*) FROM run_logs").fetchone()[0]
+            archives, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        finally:
+            conn.close()
+        return {"runs": runs, "archives": archives, "bytes": size, "max_bytes": self.max_bytes}
+
+
+def create_log_cache(config):
+    """Run log cache configured by log_cache_dir and log_cache_max_mb, or None if disabled."""
+    directory = config.get("log_cache_dir")
+    if not directory:
+        return None
+    max_mb = config.get("log_cache_max_mb")
+    max_bytes = int(max_mb * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
+    return RunLogCache(os.path.expanduser(directory), max_bytes)
@@ -1,7 +1,7 @@
 import re
 import requests
 import base64
-from request_github import get_request
+from request_github import get_request, github_api_url
 import logging
 
 import re
@@ -261,48 +261,75 @@ def count_dependencies(content, file_type):
         return 0
 
 
+import os
+import tempfile
 import time
 import requests
 import logging
 
-def get_github_actions_log(repo_full_name, run_id, token=None, max_retries=3):
+LOG_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def download_github_actions_log(repo_full_name, run_id, token=None, max_retries=3, directory=None):
     """
-    Fetch the logs for a specific GitHub Actions workflow run.
-    Handles binary (ZIP) responses correctly and retries on rate limits.
+    Download the log archive of a GitHub Actions workflow run to a temporary file.
+    The ZIP is streamed to disk in chunks, so memory stays bounded whatever its size.
+    Retries on rate limits and connection errors.
+
+    Args:
+        repo_full_name: Repository (owner/repo)
+        run_id: Workflow run ID
+        token: GitHub token
+        max_retries: Download attempts
+        directory: Directory of the temporary file (system default if None)
+
+    Returns:
+        Path of the downloaded archive (to be deleted by the caller), or None
     """
-    url = f"https://api.github.com/repos/{repo_full_name}/actions/runs/{run_id}/logs"
+    url = github_api_url(f"/repos/{repo_full_name}/actions/runs/{run_id}/logs")
     headers = {"Authorization": f"token {token}"} if token else {}
 
     retries = 0  # Track retries
 
     while retries < max_retries:
+        log_path = None
         try:
-            response = requests.get(url, headers=headers, stream=True)  # Use raw binary stream
-            
-            if response.status_code == 200:
-                return response.content  # Return raw binary log data
-            
-            elif response.status_code == 403:  # Rate limit exceeded
-                rate_limit_reset = response.headers.get("X-RateLimit-Reset")
-                if rate_limit_reset:
-                    wait_time = int(rate_limit_reset) - int(time.time()) + 1  # Ensure at least 1s wait
-                    logging.warning(f"GitHub API rate limit exceeded. Sleeping for {wait_time} seconds...")
-                    time.sleep(wait_time)  # Sleep until the rate limit resets
+            with requests.get(url, headers=headers, stream=True) as response:  # Use raw binary stream
+
+                if response.status_code == 200:
+                    fd, log_path = tempfile.mkstemp(prefix=f"run_{run_id}_", suffix=".zip", dir=directory)
+                    with os.fdopen(fd, "wb") as log_file:
+                        for chunk in response.iter_content(chunk_size=LOG_DOWNLOAD_CHUNK_SIZE):
+                            log_file.write(chunk)
+                    return log_path
+
+                elif response.status_code == 403:  # Rate limit exceeded
+                    rate_limit_reset = response.headers.get("X-RateLimit-Reset")
+                    if rate_limit_reset:
+                        wait_time = int(rate_limit_reset) - int(time.time()) + 1  # Ensure at least 1s wait
+                        logging.warning(f"GitHub API rate limit exceeded. Sleeping for {wait_time} seconds...")
+                        time.sleep(wait_time)  # Sleep until the rate limit resets
+                    else:
+                        logging.warning("GitHub API rate limit hit but no reset time provided. Sleeping for 60s.")
+                        #time.sleep(1)  # Default sleep time before retrying
+
+                elif response.status_code == 404:
+                    logging.error(f"Logs for build {run_id} in {repo_full_name} were not found. They may have expired.")
+                    return None  # No point retrying if logs don't exist
+
                 else:
-                    logging.warning("GitHub API rate limit hit but no reset time provided. Sleeping for 60s.")
-                    #time.sleep(1)  # Default sleep time before retrying
-                
-            elif response.status_code == 404:
-                logging.error(f"Logs for build {run_id} in {repo_full_name} were not found. They may have expired.")
-                return None  # No point retrying if logs don't exist
-            
-            else:
-                logging.info(f"logs data for run {run_id} in {repo_full_name} does not exist, Status: {response.status_code}")
-                return None  # Other errors should not be retried
-            
-        except requests.exceptions.RequestException as err:
+                    logging.info(f"logs data for run {run_id} in {repo_full_name} does not exist, Status: {response.status_code}")
+                    return None  # Other errors should not be retried
+
+        except (requests.exceptions.RequestException, OSError) as err:
             logging.error(f"Unexpected error fetching logs for run {run_id} in {repo_full_name}: {err}")
-        
+            if log_path:
+                # Partial download
+                try:
+                    os.remove(log_path)
+                except OSError:
+                    pass
+
         retries += 1
         logging.warning(f"Retrying log fetch for {repo_full_name}, run {run_id} (attempt {retries}/{max_retries})")
         time.sleep(5)  # Short delay before retrying
@@ -311,6 +338,22 @@ def get_github_actions_log(repo_full_name, run_id, token=None, max_retries=3):
     return None  # Return None if all retries fail
 
 
+def get_github_actions_log(repo_full_name, run_id, token=None, max_retries=3):
+    """
+    Fetch the logs for a specific GitHub Actions workflow run.
+    Handles binary (ZIP) responses correctly and retries on rate limits.
+    Holds the whole archive in memory: prefer download_github_actions_log for large runs.
+    """
+    log_path = download_github_actions_log(repo_full_name, run_id, token, max_retries)
+    if log_path is None:
+        return None
+    try:
+        with open(log_path, "rb") as log_file:
+            return log_file.read()  # Return raw binary log data
+    finally:
+        os.remove(log_path)
+
+
     
 def get_file_content(owner, repo, path, token=None):
     """
@@ -318,7 +361,7 @@ def get_file_content(owner, repo, path, token=None):
     Uses get_request to handle rate limits properly.
     Includes explicit error handling.
     """
-    url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
+    url = github_api_url(f"/repos/{owner}/{repo}/contents/{path}")
 
     try:
         response = get_request(url, token)
@@ -802,9 +845,90 @@ def identify_build_language(files):
 
 
 
+ANSI_ESCAPE = re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]')
+
+
 def remove_ansi_escape_sequences(text):
-    ansi_escape = re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]')
-    return ansi_escape.sub('', text)
+    return ANSI_ESCAPE.sub('', text)
+
+
+def count_test_matches(framework, matches):
+    """
+    Count the passed, failed and skipped tests of the framework regex matches of a log line.
+    Frameworks without a counting rule count no tests.
+    """
+    passed_tests = 0
+    failed_tests = 0
+    skipped_tests = 0
+    errors_tests = 0
+
+    for match in matches:
+        if framework == "pytest":
+            if match[0]:
+                passed_tests += int(match[0])
+            if match[1]:
+                failed_tests += int(match[1])
+            if match[2]:
+                skipped_tests += int(match[2])
+        elif framework == "junit-gradle":
+            passed_tests += int(match[0])
+            failed_tests += int(match[1])
+            errors_tests += int(match[2])  # Count errors for JUnit
+            skipped_tests += int(match[3])
+
+        elif framework == "junit-maven":
+            passed_tests += int(match[0]) - int(match[1]) - int(match[2]) - int(
+                match[3])  # Subtract failed, errors, and skipped
+            failed_tests += int(match[1])
+            errors_tests += int(match[2])  # Count errors for JUnit
+            skipped_tests += int(match[3])
+
+
+        elif framework == "rspec":
+            if match[0]:
+                passed_tests += int(match[0])
+            if match[1]:
+                failed_tests += int(match[1])
+                passed_tests -= int(match[1])  # Subtract failed tests from passed
+            if match[2]:
+                skipped_tests += int(match[2])
+                passed_tests -= int(match[2])  # Subtract skipped tests from passed
+        elif framework == "cucumber-ruby":
+            scenarios_skipped = int(match[1].split()[0]) if match[1] else 0
+            scenarios_undefined = int(match[2].split()[0]) if match[2] else 0
+            scenarios_failed = int(match[3].split()[0]) if match[3] else 0
+            scenarios_passed = int(match[4].split()[0]) if match[4] else 0
+            steps_skipped = int(match[6].split()[0]) if match[6] else 0
+            steps_undefined = int(match[7].split()[0]) if match[7] else 0
+            steps_failed = int(match[8].split()[0]) if match[8] else 0
+            steps_passed = int(match[9].split()[0]) if match[9] else 0
+
+            passed_tests += scenarios_passed + steps_passed
+            failed_tests += scenarios_failed + steps_failed
+            skipped_tests += scenarios_skipped + steps_skipped
+            # undefined_tests += scenarios_undefined + steps_undefined
+            # No skipped or errors for this format
+            # No errors for this format
+        elif framework == "Cucumber-Java":
+            passed_tests += int(match[0])
+            failed_tests += int(match[1])
+            errors_tests += int(match[2])
+            skipped_tests += int(match[3])
+        elif framework == "testunit":
+            passed_tests += int(match[0])
+            # assertions += int(match[1])
+            failed_tests += int(match[2])
+            errors_tests += int(match[3])
+            # pendings, omissions, and notifications are not being counted in total
+
+    total_tests = passed_tests + failed_tests + skipped_tests + errors_tests
+
+    return {
+        'passed': passed_tests,
+        'failed': failed_tests,
+        'skipped': skipped_tests,
+        'total': total_tests
+    }
 
 
 def parse_test_results(framework, log_content, build_language , framework_regex):
@@ -837,77 +961,6 @@ def parse_test_results(framework, log_content, build_language , framework_regex)
         # print("Matches found: ", matches)
 
         if matches:
-            passed_tests = 0
-            failed_tests = 0
-            skipped_tests = 0
-            errors_tests = 0
-
-            for match in matches:
-                if framework == "pytest":
-                    if match[0]:
-                        passed_tests += int(match[0])
-                    if match[1]:
-                        failed_tests += int(match[1])
-                    if match[2]:
-                        skipped_tests += int(match[2])
-                elif framework == "junit-gradle":
-                    passed_tests += int(match[0])
-                    failed_tests += int(match[1])
-                    errors_tests += int(match[2])  # Count errors for JUnit
-                    skipped_tests += int(match[3])
-
-                elif framework == "junit-maven":
-                    passed_tests += int(match[0]) - int(match[1]) - int(match[2]) - int(
-                        match[3])  # Subtract failed, errors, and skipped
-                    failed_tests += int(match[1])
-                    errors_tests += int(match[2])  # Count errors for JUnit
-                    skipped_tests += int(match[3])
-
-
-                elif framework == "rspec":
-                    if match[0]:
-                        passed_tests += int(match[0])
-                    if match[1]:
-                        failed_tests += int(match[1])
-                        passed_tests -= int(match[1])  # Subtract failed tests from passed
-                    if match[2]:
-                        skipped_tests += int(match[2])
-                        passed_tests -= int(match[2])  # Subtract skipped tests from passed
-                elif framework == "cucumber-ruby":
-                    scenarios_skipped = int(match[1].split()[0]) if match[1] else 0
-                    scenarios_undefined = int(match[2].split()[0]) if match[2] else 0
-                    scenarios_failed = int(match[3].split()[0]) if match[3] else 0
-                    scenarios_passed = int(match[4].split()[0]) if match[4] else 0
-                    steps_skipped = int(match[6].split()[0]) if match[6] else 0
-                    steps_undefined = int(match[7].split()[0]) if match[7] else 0
-                    steps_failed = int(match[8].split()[0]) if match[8] else 0
-                    steps_passed = int(match[9].split()[0]) if match[9] else 0
-
-                    passed_tests += scenarios_passed + steps_passed
-                    failed_tests += scenarios_failed + steps_failed
-                    skipped_tests += scenarios_skipped + steps_skipped
-                    # undefined_tests += scenarios_undefined + steps_undefined
-                    # No skipped or errors for this format
-                    # No errors for this format
-                elif framework == "Cucumber-Java":
-                    passed_tests += int(match[0])
-                    failed_tests += int(match[1])
-                    errors_tests += int(match[2])
-                    skipped_tests += int(match[3])
-                elif framework == "testunit":
-                    passed_tests += int(match[0])
-                    # assertions += int(match[1])
-                    failed_tests += int(match[2])
-                    errors_tests += int(match[3])
-                    # pendings, omissions, and notifications are not being counted in total
-
-            total_tests = passed_tests + failed_tests + skipped_tests + errors_tests
-
-            return {
-                'passed': passed_tests,
-                'failed': failed_tests,
-                'skipped': skipped_tests,
-                'total': total_tests
-            }
+            return count_test_matches(framework, matches)
 
     return {'passed': 0, 'failed': 0, 'skipped': 0, 'total': 0}
@@ -0,0 +1,157 @@
+"""
+Process pool counting the test results of run log archives.
+
+Test result parsing is CPU-bound regex work, so archives are dispatched to
+worker processes while the mining process goes on downloading the next runs.
+Workers receive the path of the archive (never its bytes); large zip members
+are scanned by separate workers and their counts merged back per run.
+
+Usage:
+    with LogParsingPool(workers=4) as pool:
+        future = pool.submit(archive_path, framework, build_language, framework_regex)
+        ...
+        test_results = future.result()  # {passed, failed, skipped, total}
+"""
+import logging
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from log_scanner import LogScanner, empty_test_results
+
+LARGE_MEMBER_BYTES = 32 * 1024 * 1024
+
+
+def scan_archive_members(archive_path, framework, build_language, framework_regex, members=None):
+    """
+    Count the test results of the .txt members of a run log archive (runs in a worker process).
+
+    Args:
+        archive_path: Path of the log archive
+        framework: Test framework
+        build_language: Build language (selects the JUnit regex)
+        framework_regex: Framework name -> compiled regex
+        members: Names of the members to scan (every .txt member if None)
+
+    Returns:
+        Dict with passed, failed, skipped and total counts
+    """
+    scanner = LogScanner(framework, build_language, framework_regex)
+    results = empty_test_results()
+    with zipfile.ZipFile(archive_path, 'r') as zip_ref:
+        for file_info in zip_ref.infolist():
+            if not file_info.filename.endswith('.txt'):
+                continue
+            if members is not None and file_info.filename not in members:
+                continue
+            with zip_ref.open(file_info) as log_file:
+                scanner.scan_stream(log_file, results)
+    return results
+
+
+def split_archive_members(archive_path, large_member_bytes=LARGE_MEMBER_BYTES):
+    """
+    Group the .txt members of a log archive into worker tasks: one task per large
+    member, and one task for all the others.
+
+    Returns:
+        List of member name lists
+    """
+    with zipfile.ZipFile(archive_path, 'r') as zip_ref:
+        log_members = [info for info in zip_ref.infolist() if info.filename.endswith('.txt')]
+    large = [[info.filename] for info in log_members if info.file_size >= large_member_bytes]
+    small = [info.filename for info in log_members if info.file_size < large_member_bytes]
+    return large + ([small] if small else [])
+
+
+class LogParsingPool:
+    """Parses run log archives in worker processes."""
+
+    def __init__(self, workers=None, large_member_bytes=LARGE_MEMBER_BYTES):
+        """
+        Args:
+            workers: Worker processes (one per CPU core if None)
+            large_member_bytes: Uncompressed size from which a zip member gets a worker task of its own
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.large_member_bytes = large_member_bytes
+        # Workers are not forked from the miner: its threads (SLOC counting, git subprocesses,
+        # logging) may hold locks at fork time that a forked child would wait for forever
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                            mp_context=multiprocessing.get_context(start_method))
+
+    def submit(self, archive_path, framework, build_language, framework_regex, delete=False):
+        """
+        Count the test results of a run log archive in the worker processes.
+
+        Args:
+            archive_path: Path of the log archive
+            framework: Test framework
+            build_language: Build language (selects the JUnit regex)
+            framework_regex: Framework name -> compiled regex
+            delete: Delete the archive once parsed (temporary downloads)
+
+        Returns:
+            Future of the dict with passed, failed, skipped and total counts
+
+        Raises:
+            zipfile.BadZipFile: If the archive is not a zip file
+        """
+        try:
+            tasks = split_archive_members(archive_path, self.large_member_bytes)
+        except Exception:
+            if delete:
+                os.remove(archive_path)
+            raise
+
+        run_future = Future()
+        run_future.set_running_or_notify_cancel()
+        results = empty_test_results()
+        remaining = [len(tasks)]
+        lock = threading.Lock()
+
+        def finish(error=None):
+            if delete:
+                try:
+                    os.remove(archive_path)
+                except OSError as e:
+                    logging.warning(f"Could not remove parsed log archive {archive_path}: {e}")
+            if error is not None:
+                run_future.set_exception(error)
+            else:
+                run_future.set_result(results)
+
+        def merge(task_future):
+            with lock:
+                if run_future.done() or remaining[0] == 0:
+                    return
+                error = task_future.exception()
+                if error is None:
+                    for key, value in task_future.result().items():
+                        results[key] += value
+                remaining[0] = 0 if error is not None else remaining[0] - 1
+                if remaining[0] == 0:
+                    finish(error)
+
+        if not tasks:
+            finish()
+            return run_future
+
+        for members in tasks:
+            task = self.executor.submit(
+                scan_archive_members, archive_path, framework, build_language, framework_regex, members
+            )
+            task.add_done_callback(merge)
+        return run_future
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.shutdown()
@@ -0,0 +1,147 @@
+"""
+Streaming scanner counting the test results of GitHub Actions run logs.
+
+Gives the same counts as calling parse_test_results on every line of a log, but:
+- log members are decoded in large chunks and ANSI escape codes are removed once per chunk;
+- chunks are prefiltered with the literals every counted summary line contains
+  ("passed", "Tests run: ", ...), so the framework regex only runs on candidate lines.
+
+Usage:
+    scanner = LogScanner(framework, build_language, framework_regex)
+    test_results = scanner.scan_archive(build_log)  # zip archive returned by get_github_actions_log
+"""
+import codecs
+import io
+import re
+import zipfile
+
+from log_parser import ANSI_ESCAPE, count_test_matches
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Literals found in every line the framework regex counts tests from (after ANSI removal).
+# Frameworks missing here have no counting rule in count_test_matches: they count no tests.
+TEST_RESULT_ANCHORS = {
+    "pytest": ("passed", "failed", "skipped"),
+    "junit-gradle": ("Passed: ",),
+    "junit-maven": ("Tests run: ",),
+    "Cucumber-Java": ("Tests run: ",),
+    "rspec": (" example",),
+    "cucumber-ruby": (" scenario",),
+    "testunit": (" tests, ",),
+}
+
+
+def resolve_test_framework(framework, build_language):
+    """Framework regex used for a test framework (JUnit depends on the build tool)."""
+    if framework == "junit" and build_language == "java-maven":
+        return "junit-maven"
+    if framework == "junit" and build_language == "java-gradle":
+        return "junit-gradle"
+    return framework
+
+
+def empty_test_results():
+    return {'passed': 0, 'failed': 0, 'skipped': 0, 'total': 0}
+
+
+class LogScanner:
+    """Counts the test results of log files for one test framework."""
+
+    def __init__(self, framework, build_language, framework_regex, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.framework = resolve_test_framework(framework, build_language)
+        self.chunk_size = chunk_size
+        self.regex = framework_regex.get(self.framework)
+        anchors = TEST_RESULT_ANCHORS.get(self.framework)
+        if self.regex is None or not anchors:
+            # Nothing to count: scans return zeros without reading the logs
+            self.prefilter = None
+        else:
+            self.prefilter = re.compile("|".join(re.escape(anchor) for anchor in anchors))
+
+    @property
+    def counts_tests(self):
+        return self.prefilter is not None
+
+    def _add_lines(self, results, text):
+        """Count the candidate lines of complete log lines (ANSI escape codes already removed)."""
+        line_end = -1
+        for anchor in self.prefilter.finditer(text):
+            if anchor.start() <= line_end:
+                continue  # Line already counted
+            line_start = text.rfind("\n", 0, anchor.start()) + 1
+            line_end = text.find("\n", anchor.end())
+            if line_end == -1:
+                line_end = len(text)
+            line = text[line_start:line_end].strip()
+            if not line:
+                continue
+            matches = self.regex.findall(line)
+            if matches:
+                line_results = count_test_matches(self.framework, matches)
+                for key in results:
+                    results[key] += line_results[key]
+
+    def scan_stream(self, stream, results=None):
+        """
+        Count the test results of a binary log stream.
+
+        Args:
+            stream: Binary file object (e.g. a member opened from the log zip)
+            results: Results to add the counts to (a new dict if None)
+
+        Returns:
+            Dict with passed, failed, skipped and total counts
+        """
+        results = results if results is not None else empty_test_results()
+        if not self.counts_tests:
+            return results
+
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pending = ""
+        while True:
+            chunk = stream.read(self.chunk_size)
+            text = pending + decoder.decode(chunk, final=not chunk)
+            if not chunk:
+                break
+            # Keep the incomplete last line for the next chunk
+            last_newline = text.rfind("\n")
+            if last_newline == -1:
+                pending = text
+                continue
+            pending = text[last_newline + 1:]
+            complete = ANSI_ESCAPE.sub("", text[:last_newline])
+            if self.prefilter.search(complete):
+                self._add_lines(results, complete)
+
+        remaining = ANSI_ESCAPE.sub("", text)
+        if remaining and self.prefilter.search(remaining):
+            self._add_lines(results, remaining)
+        return results
+
+    def scan_bytes(self, data, results=None):
+        """Count the test results of a log held in memory."""
+        return self.scan_stream(io.BytesIO(data), results)
+
+    def scan_archive(self, build_log, results=None):
+        """
+        Count the test results of every .txt file of a run log archive.
+
+        Args:
+            build_log: Zip archive content, path or binary file object
+            results: Results to add the counts to (a new dict if None)
+
+        Returns:
+            Dict with passed, failed, skipped and total counts
+        """
+        results = results if results is not None else empty_test_results()
+        if not self.counts_tests:
+            return results
+
+        source = io.BytesIO(build_log) if isinstance(build_log, (bytes, bytearray)) else build_log
+        with zipfile.ZipFile(source, 'r') as zip_ref:
+            for file_info in zip_ref.infolist():
+                if file_info.filename.endswith('.txt'):
+                    with zip_ref.open(file_info) as log_file:
+                        self.scan_stream(log_file, results)
+        return results
@@ -0,0 +1,96 @@
+"""
+Classification of changed file paths (test, source, documentation, other; Docker files).
+
+summarize_commit_changes classified every file of every commit with
+is_test_file, is_production_file and is_documentation_file, each looping over
+lists of substrings in Python. The same rules are compiled here once: the
+substring lists into one regular expression each, the production extensions
+into a set looked up with the suffixes of the file name, and the documentation
+directories into a set of path segments. Paths repeat heavily across commits,
+so the classification of the most recent paths is memoized.
+"""
+import re
+from enum import Enum
+from functools import lru_cache
+
+from file_indicators import (
+    DOC_DIRECTORIES, DOC_EXTENSIONS, LEGACY_TEST_INDICATORS, PRODUCTION_EXTENSIONS, TEST_DIRECTORIES,
+    TEST_FILE_PATTERNS, TEST_INDICATORS,
+)
+
+PATH_CACHE_SIZE = 1 << 16
+
+
+class PathCategory(Enum):
+    TEST = "test"
+    SOURCE = "source"
+    DOCUMENTATION = "documentation"
+    OTHER = "other"
+
+
+class DockerFile(Enum):
+    NONE = "none"
+    DOCKERFILE = "dockerfile"
+    COMPOSE = "docker-compose"
+
+
+def _substring_regex(substrings):
+    """Regex matching strings containing any of substrings (longest first, duplicates removed)."""
+    return re.compile("|".join(re.escape(substring) for substring in sorted(set(substrings), key=len, reverse=True)))
+
+
+_TEST_REGEX = _substring_regex(TEST_DIRECTORIES + TEST_FILE_PATTERNS + LEGACY_TEST_INDICATORS)
+_NOT_PRODUCTION_REGEX = _substring_regex(TEST_INDICATORS)
+_DOC_DIRECTORY_REGEX = _substring_regex(DOC_DIRECTORIES)
+# Every production extension starts with a dot and has no slash: it can only be a suffix
+# of the file name starting at one of its dots
+_PRODUCTION_SUFFIXES = frozenset(PRODUCTION_EXTENSIONS)
+_DOC_DIRECTORY_SET = frozenset(DOC_DIRECTORIES)
+
+
+def _has_production_extension(file_path):
+    """file_path.endswith(PRODUCTION_EXTENSIONS) (case-sensitive), from the dots of the file name."""
+    slash = file_path.rfind("/")
+    dot = file_path.rfind(".")
+    while dot > slash:
+        if file_path[dot:] in _PRODUCTION_SUFFIXES:
+            return True
+        dot = file_path.rfind(".", slash + 1, dot)
+    return False
+
+
+def _is_documentation(lower_path):
+    """is_documentation_file on a lowercase path."""
+    if lower_path.endswith(DOC_EXTENSIONS):
+        return True
+    if not _DOC_DIRECTORY_SET.isdisjoint(lower_path.split("/")):
+        return True
+    return lower_path.endswith(".html") and _DOC_DIRECTORY_REGEX.search(lower_path) is not None
+
+
+@lru_cache(maxsize=PATH_CACHE_SIZE)
+def classify_path(file_path):
+    """
+    Category of a changed file, as summarize_commit_changes counted it (first of is_test_file,
+    is_production_file and is_documentation_file), and the Docker file it is.
+
+    Returns:
+        (PathCategory, DockerFile)
+    """
+    lower_path = file_path.lower()
+    if _TEST_REGEX.search(lower_path):
+        category = PathCategory.TEST
+    elif _NOT_PRODUCTION_REGEX.search(lower_path) is None and _has_production_extension(file_path):
+        category = PathCategory.SOURCE
+    elif _is_documentation(lower_path):
+        category = PathCategory.DOCUMENTATION
+    else:
+        category = PathCategory.OTHER
+
+    if "dockerfile" in lower_path:
+        docker = DockerFile.DOCKERFILE
+    elif "docker-compose" in lower_path:
+        docker = DockerFile.COMPOSE
+    else:
+        docker = DockerFile.NONE
+    return category, docker
@@ -0,0 +1,222 @@
+"""
+Pull requests of a repository by commit SHA, for the PR details of the mined runs.
+
+fetch_pull_request_details called /commits/{sha}/pulls and then /pulls/{number}
+for every run, although most runs are on the head or merge commit of a pull
+request mined for other runs already. The index lists the repository's pull
+requests instead (/pulls?state=all, 100 per request) with their comment counts
+(/issues?state=all lists pull requests too), and maps their head and merge
+commits to them.
+
+Runs are mined newest first, so the lists are read most recently updated first
+and only as far back as the mined runs: a pull request is updated when commits
+are pushed to it or when it is merged, shortly before its runs are created.
+refresh() reads the pull requests updated since the last read.
+
+/commits/{sha}/pulls lists the open and merged pull requests of a commit, not
+the closed ones: closed pull requests are not indexed. Commits of no indexed
+pull request (or of several) are looked up with the API calls, once per commit.
+"""
+import logging
+from datetime import timedelta
+
+from build_run_analyzer import calculate_description_complexity
+from request_github import get_request, github_api_url
+
+PAGE_SIZE = 100
+# Runs of a commit are created after the last update of its pull request up to this long
+# (the merge of a pull request is its last update, the runs of the merge commit follow it)
+UPDATE_MARGIN = timedelta(days=1)
+
+
+def lookup_pull_request_details(repo_full_name, commit_sha, token):
+    """PR details of a commit from the API (/commits/{sha}/pulls, then the pull request of the first result)."""
+    # Get PRs that contain this commit
+    pr_search_url = github_api_url(f"/repos/{repo_full_name}/commits/{commit_sha}/pulls")
+    pr_response = get_request(pr_search_url, token)
+
+    if pr_response and isinstance(pr_response, list) and len(pr_response) > 0:
+        # Take the first PR found
+        pr_info = pr_response[0]
+        pr_number = pr_info.get('number', 0)
+
+        # Now fetch actual PR details including total comments
+        pr_details_url = github_api_url(f"/repos/{repo_full_name}/pulls/{pr_number}")
+        pr_details = get_request(pr_details_url, token)
+
+        if pr_details:
+            return {
+                'gh_pull_req_number': pr_number,
+                'gh_is_pr': True,
+                'gh_num_pr_comments': pr_details.get('comments', 0),  # This gets the correct comment count
+                'git_merged_with': pr_info.get('merge_commit_sha', None),
+                'gh_description_complexity': calculate_description_complexity(pr_info),
+            }
+
+    return {
+        'gh_pull_req_number': 0,
+        'gh_is_pr': False,
+        'gh_num_pr_comments': 0,
+        'git_merged_with': None,
+        'gh_description_complexity': 0,
+    }
+
+
+class PullRequestIndex:
+    """Open and merged pull requests of a repository, by head and merge commit SHA."""
+
+    def __init__(self, repo_full_name, token):
+        self.repo_full_name = repo_full_name
+        self.token = token
+        self.pulls = {}
+        self.comments = {}
+        self.by_sha = {}
+        self.looked_up = {}
+        self.pulls_page = self.issues_page = 0
+        self.pulls_done = self.issues_done = False
+        # Update date of the last pull request and issue read, newest update read
+        self.pulls_until = self.issues_until = None
+        self.newest_update = None
+
+    def _list(self, kind, page, since=None):
+        query = f"state=all&sort=updated&direction=desc&per_page={PAGE_SIZE}&page={page}"
+        if since:
+            query += f"&since={since}"
+        items = get_request(github_api_url(f"/repos/{self.repo_full_name}/{kind}?{query}"), self.token)
+        if not isinstance(items, list):
+            logging.warning(f"Failed to list the {kind} of {self.repo_full_name}, looking pull requests up per commit")
+            return None
+        return items
+
+    def _add_pull(self, pull):
+        number = pull["number"]
+        for sha in self.pulls.get(number, {}).get("shas", ()):
+            self.by_sha[sha].discard(number)
+        shas = []
+        if pull.get("state") == "open" or pull.get("merged_at"):
+            # Commits pushed before the current head keep the pull request
+            shas = list(self.pulls.get(number, {}).get("shas", ()))
+            shas.append(pull["head"]["sha"])
+            if pull.get("merged_at") and pull.get("merge_commit_sha"):
+                shas.append(pull["merge_commit_sha"])
+        self.pulls[number] = {
+            "number": number,
+            "title": pull.get("title", ""),
+            "body": pull.get("body"),
+            "merge_commit_sha": pull.get("merge_commit_sha"),
+            "shas": shas,
+        }
+        for sha in shas:
+            self.by_sha.setdefault(sha, set()).add(number)
+        if self.newest_update is None or pull["updated_at"] > self.newest_update:
+            self.newest_update = pull["updated_at"]
+
+    def _add_issue(self, issue):
+        if "pull_request" in issue:
+            self.comments[issue["number"]] = issue.get("comments", 0)
+
+    def _read_pulls_page(self):
+        self.pulls_page += 1
+        pulls = self._list("pulls", self.pulls_page)
+        if pulls is None:
+            self.pulls_done = True
+            return
+        for pull in pulls:
+            if pull["number"] not in self.pulls:
+                self._add_pull(pull)
+            self.pulls_until = pull["updated_at"]
+        if len(pulls) < PAGE_SIZE:
+            self.pulls_done = True
+
+    def _read_issues_page(self):
+        self.issues_page += 1
+        issues = self._list("issues", self.issues_page)
+        if issues is None:
+            self.issues_done = True
+            return
+        for issue in issues:
+            if issue["number"] not in self.comments:
+                self._add_issue(issue)
+            self.issues_until = issue["updated_at"]
+        if len(issues) < PAGE_SIZE:
+            self.issues_done = True
+
+    def load_until(self, run_date):
+        """Read the pull requests (and their comment counts) updated after run_date - UPDATE_MARGIN."""
+        since = (run_date - UPDATE_MARGIN).strftime("%Y-%m-%dT%H:%M:%SZ")
+        while not self.pulls_done and (self.pulls_until is None or self.pulls_until >= since):
+            self._read_pulls_page()
+        if self.pulls_until is None:
+            return
+        # Issues are read as far back as the pull requests read
+        while not self.issues_done and (self.issues_until is None or self.issues_until >= self.pulls_until):
+            self._read_issues_page()
+
+    def refresh(self):
+        """Read the pull requests and comment counts updated since the newest update read."""
+        if self.newest_update is None:
+            return
+        since = self.newest_update
+        page = 0
+        while True:
+            page += 1
+            pulls = self._list("pulls", page)
+            if not pulls:
+                break
+            for pull in pulls:
+                if pull["updated_at"] >= since:
+                    self._add_pull(pull)
+            if len(pulls) < PAGE_SIZE or pulls[-1]["updated_at"] < since:
+                break
+        page = 0
+        while True:
+            page += 1
+            issues = self._list("issues", page, since=since)
+            if not issues:
+                break
+            for issue in issues:
+                self._add_issue(issue)
+            if len(issues) < PAGE_SIZE:
+                break
+
+    def _comment_count(self, number):
+        if number not in self.comments:
+            pr_details = get_request(github_api_url(f"/repos/{self.repo_full_name}/pulls/{number}"), self.token)
+            if not pr_details:
+                return None
+            self.comments[number] = pr_details.get("comments", 0)
+        return self.comments[number]
+
+    def get(self, commit_sha, run_date=None):
+        """
+        PR details of a commit (as fetch_pull_request_details returns them), or None if the
+        index cannot tell.
+        """
+        if commit_sha in self.looked_up:
+            return self.looked_up[commit_sha]
+        if run_date is not None:
+            self.load_until(run_date)
+        numbers = self.by_sha.get(commit_sha)
+        if not numbers or len(numbers) > 1:
+            return None
+        number = next(iter(numbers))
+        comments = self._comment_count(number)
+        if comments is None:
+            return None
+        pull = self.pulls[number]
+        return {
+            'gh_pull_req_number': number,
+            'gh_is_pr': True,
+            'gh_num_pr_comments': comments,
+            'git_merged_with': pull["merge_commit_sha"],
+            'gh_description_complexity': calculate_description_complexity(pull),
+        }
+
+    def details(self, commit_sha, run_date=None):
+        """PR details of a run's commit, from the index or else from the API calls (once per commit)."""
+        pr_details = self.get(commit_sha, run_date)
+        if pr_details is None:
+            pr_details = self.looked_up[commit_sha] = lookup_pull_request_details(
+                self.repo_full_name, commit_sha, self.token
+            )
+        return pr_details
@@ -4,7 +4,7 @@ from datetime import datetime, timezone, timedelta
 import time
 import math
 import base64
-from request_github import get_request
+from request_github import get_request, github_api_url
 
 import base64
 import logging
@@ -19,7 +19,7 @@ def count_lines_in_workflow_yml(repo_full_name, workflow_path, commit_sha, token
     if not workflow_path or workflow_path.strip() == "":
         return None  # Return NaN if path is empty
 
-    url = f"https://api.github.com/repos/{repo_full_name}/contents/{workflow_path}?ref={commit_sha}"
+    url = github_api_url(f"/repos/{repo_full_name}/contents/{workflow_path}?ref={commit_sha}")
 
     try:
         response = get_request(url, token)
@@ -43,7 +43,7 @@ def count_lines_in_workflow_yml(repo_full_name, workflow_path, commit_sha, token
 
 
 def get_repository_languages(repo_full_name, token):
-    url = f"https://api.github.com/repos/{repo_full_name}/languages"
+    url = github_api_url(f"/repos/{repo_full_name}/languages")
     languages_data = get_request(url, token)
     if languages_data:
         total_bytes = sum(languages_data.values())
@@ -67,7 +67,7 @@ def get_workflow_ids(repo_full_name, token, specific_workflow_ids=None):
     Returns:
         list: List of workflow IDs to process.
     """
-    url = f"https://api.github.com/repos/{repo_full_name}/actions/workflows"
+    url = github_api_url(f"/repos/{repo_full_name}/actions/workflows")
     workflows_response = get_request(url, token)
     
     if not workflows_response or 'workflows' not in workflows_response:
@@ -107,7 +107,7 @@ def get_workflow_ids_by_name(repo_full_name, token, workflow_names=None):
     Returns:
         list: List of workflow IDs to process.
     """
-    url = f"https://api.github.com/repos/{repo_full_name}/actions/workflows"
+    url = github_api_url(f"/repos/{repo_full_name}/actions/workflows")
     workflows_response = get_request(url, token)
     
     if not workflows_response or 'workflows' not in workflows_response:
@@ -0,0 +1,170 @@
+"""
+Persistent bare mirrors of the mined repositories, shared by mining sessions.
+
+clone_repo_locally cloned the whole repository (every blob of its history) into
+tmp/ for every session, and get_builds_info deleted it at the end. A mirror is
+kept in repo_cache_dir instead: the next session only fetches the new commits.
+
+Commit metrics diff file contents (line counts), but SLOC only reads the trees
+of the mined commits: without fetch_commit_details, mirrors are blobless partial
+clones (--filter=blob:none) and git downloads the blobs of a tree when it is
+first checked out. A blobless mirror is completed (fetch --refetch) the first
+time a session needs every blob.
+
+Run commits missing from the mirror (pull requests from forks, force-pushed
+branches) are fetched by SHA, one fetch per page of runs.
+"""
+import logging
+import os
+import shutil
+import subprocess
+import time
+from contextlib import contextmanager
+
+FETCH_BATCH_SIZE = 256
+LOCK_TIMEOUT = 3600
+PARTIAL_CLONE_FILTER = "blob:none"
+
+
+def missing_commits(local_repo_path, shas):
+    """The SHAs of shas (in order, without duplicates) that are not commits of the repository."""
+    shas = list(dict.fromkeys(sha for sha in shas if sha))
+    if not shas:
+        return []
+    result = subprocess.run(
+        ["git", "-C", local_repo_path, "cat-file", "--batch-check=%(objecttype)"],
+        input="".join(f"{sha}^{{commit}}\n" for sha in shas), capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        logging.warning(f"Failed to check commits in {local_repo_path}: {result.stderr.strip()}")
+        return shas
+    return [sha for sha, line in zip(shas, result.stdout.splitlines()) if line != "commit"]
+
+
+def fetch_missing_commits(local_repo_path, shas):
+    """
+    Fetch from origin the commits of shas the repository lacks, in batched fetches.
+
+    Returns:
+        SHAs that could not be fetched
+    """
+    missing = missing_commits(local_repo_path, shas)
+    unavailable = []
+    for start in range(0, len(missing), FETCH_BATCH_SIZE):
+        batch = missing[start:start + FETCH_BATCH_SIZE]
+        result = subprocess.run(
+            ["git", "-C", local_repo_path, "fetch", "--quiet", "--no-tags", "--no-write-fetch-head", "origin", *batch],
+            capture_output=True, text=True, encoding="utf-8", errors="replace"
+        )
+        if result.returncode == 0:
+            continue
+        # One unavailable commit fails the whole batch: fetch the commits one by one
+        for sha in batch:
+            result = subprocess.run(
+                ["git", "-C", local_repo_path, "fetch", "--quiet", "--no-tags", "--no-write-fetch-head", "origin", sha],
+                capture_output=True, text=True, encoding="utf-8", errors="replace"
+            )
+            if result.returncode != 0:
+                logging.warning(f"Failed to fetch commit {sha}: {result.stderr.strip()}")
+                unavailable.append(sha)
+    if missing:
+        logging.info(f"Fetched {len(missing) - len(unavailable)} missing commits into {local_repo_path}")
+    return unavailable
+
+
+class RepoMirror:
+    """Bare mirror of one repository (branches and tags), updated incrementally."""
+
+    def __init__(self, directory, repo_full_name, url=None):
+        """
+        Args:
+            directory: Mirror cache directory (mirrors are stored as <owner>/<name>.git)
+            repo_full_name: "owner/name"
+            url: Remote to mirror (the GitHub repository if None)
+        """
+        owner, name = repo_full_name.split("/")
+        self.path = os.path.join(os.path.abspath(directory), owner, f"{name}.git")
+        self.url = url or f"https://github.com/{repo_full_name}.git"
+
+    def _git(self, *args, check=False):
+        return subprocess.run(
+            ["git", "-C", self.path, *args],
+            capture_output=True, text=True, encoding="utf-8", errors="replace", check=check
+        )
+
+    @contextmanager
+    def _lock(self):
+        """Serialize the updates of the mirror between the processes sharing it."""
+        lock_path = f"{self.path}.lock"
+        os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > LOCK_TIMEOUT:
+                        logging.warning(f"Removing stale mirror lock {lock_path}")
+                        os.remove(lock_path)
+                        continue
+                except OSError:
+                    continue  # Released meanwhile
+                time.sleep(1)
+        try:
+            yield
+        finally:
+            os.remove(lock_path)
+
+    def is_partial(self):
+        return bool(self._git("config", "remote.origin.partialclonefilter").stdout.strip())
+
+    def update(self, blobs=True):
+        """
+        Clone the mirror, or fetch the commits pushed since the last session.
+
+        Args:
+            blobs: Whether the session needs every blob (else a new mirror is blobless)
+
+        Returns:
+            Path of the mirror, or None if it cannot be cloned
+        """
+        with self._lock():
+            if not os.path.exists(self.path):
+                return self._clone(blobs)
+            if blobs and self.is_partial():
+                print(f"Downloading the file contents of the mirror {self.path}")
+                self._git("config", "--unset", "remote.origin.partialclonefilter")
+                result = self._git("fetch", "--refetch", "--prune", "origin")
+            else:
+                print(f"Updating the mirror {self.path}")
+                result = self._git("fetch", "--prune", "origin")
+            if result.returncode != 0:
+                logging.error(f"Failed to update the mirror {self.path}: {result.stderr.strip()}")
+        return self.path
+
+    def _clone(self, blobs):
+        print(f"Cloning {self.url} into the mirror {self.path}")
+        # Cloned next to the mirror and renamed: an interrupted clone never looks like a mirror
+        tmp_path = f"{self.path}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        command = ["git", "clone", "--bare", "--quiet"]
+        if not blobs:
+            command.append(f"--filter={PARTIAL_CLONE_FILTER}")
+        result = subprocess.run([*command, self.url, tmp_path], capture_output=True, text=True)
+        if result.returncode != 0:
+            logging.error(f"Error cloning repo: {result.stderr}")
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return None
+        # Bare clones have no fetch refspec: keep branches and tags up to date
+        subprocess.run(["git", "-C", tmp_path, "config", "remote.origin.fetch", "+refs/heads/*:refs/heads/*"])
+        subprocess.run(["git", "-C", tmp_path, "config", "--add", "remote.origin.fetch", "+refs/tags/*:refs/tags/*"])
+        os.replace(tmp_path, self.path)
+        return self.path
+
+
+def create_repo_mirror(repo_full_name, config):
+    """Mirror of a repository in repo_cache_dir, or None if disabled."""
+    directory = config.get("repo_cache_dir")
+    if not directory:
+        return None
+    return RepoMirror(os.path.expanduser(directory), repo_full_name)
@@ -10,13 +10,16 @@ import re
 import numpy as np
 import sys
 
+# Add backend root to path
+backend_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if backend_root not in sys.path:
+    sys.path.insert(0, backend_root)
+
+from core.utils.github import github_api_url
+
 # Try to import performance logger
 try:
-    # Add backend root to path
-    backend_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-    if backend_root not in sys.path:
-        sys.path.insert(0, backend_root)
-    from core.utils.logger import get_performance_logger
+    from core.utils.logger import log_api_call, log_rate_limit_sleep
     PERFORMANCE_LOGGING = True
 except ImportError:
     PERFORMANCE_LOGGING = False
@@ -40,6 +43,11 @@ def get_request(url, token):
             if remaining_requests == 0 and reset_time:
                 sleep_time = max(0, (datetime.fromtimestamp(int(reset_time), timezone.utc) - datetime.now(timezone.utc)).total_seconds() + 10)
                 logging.warning(f"Rate limit hit! Sleeping for {sleep_time} seconds.")
+                if PERFORMANCE_LOGGING:
+                    try:
+                        log_rate_limit_sleep(url, sleep_time, response.status_code)
+                    except Exception:
+                        pass
                 time.sleep(sleep_time)
                 continue  # Retry after sleeping
 
@@ -47,7 +55,6 @@ def get_request(url, token):
                 # Log API call duration
                 if PERFORMANCE_LOGGING:
                     try:
-                        perf_logger = get_performance_logger()
                         # Extract API endpoint type from URL
                         if '/actions/runs' in url and '/jobs' in url:
                             api_type = "JOBS_API"
@@ -57,13 +64,18 @@ def get_request(url, token):
                             api_type = "WORKFLOW_RUNS_API"
                         else:
                             api_type = "OTHER_API"
-                        perf_logger.info(f"API_CALL - {api_type} - URL: {url} - Duration: {duration:.3f}s - Status: {response.status_code}")
+                        log_api_call(api_type, url, duration, response.status_code)
                     except:
                         pass  # Don't break if logging fails
                 return response.json()
             elif response.status_code == 403 and reset_time:
                 sleep_time = max(0, (datetime.fromtimestamp(int(reset_time), timezone.utc) - datetime.now(timezone.utc)).total_seconds() + 10)
                 logging.error(f"Rate limit exceeded, sleeping for {sleep_time} seconds. URL: {url}")
+                if PERFORMANCE_LOGGING:
+                    try:
+                        log_rate_limit_sleep(url, sleep_time, response.status_code)
+                    except Exception:
+                        pass
                 time.sleep(sleep_time)
                 continue  # Retry after sleeping
             elif response.status_code in [500, 502, 503, 504]:
@@ -0,0 +1,204 @@
+"""
+SLOC and test lines of the commits of a cloned repository, computed once per tree.
+
+calculate_sloc_and_test_lines checks the commit out in the clone, runs scc and
+reads every test file, then checks `main` out again: the work of every run is
+serialized on one working directory, and repeated for runs of identical trees
+(re-runs, other workflows of the same commit, commits that only change metadata).
+
+SlocCounter keeps the results by tree hash and computes missing trees in a pool
+of detached git worktrees (one per worker thread), so the runs of a page are
+counted in parallel before they are mined. Worktrees are reused: checking the
+next commit out only rewrites the files that changed. Test file line counts are
+kept by blob hash, so only the test files that changed since a counted tree are read.
+
+Usage:
+    sloc_counter = SlocCounter(local_repo_path)
+    sloc_counter.prefetch([(commit_sha, timestamp), ...])
+    sloc, test_lines = sloc_counter.count(commit_sha, timestamp)
+    sloc_counter.close()
+"""
+import json
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+
+from commit_history_analyzer import ensure_executable, get_scc_path
+
+REGULAR_FILE_MODES = ("100644", "100755")
+
+
+def is_test_path(file_path):
+    """Files counted as test lines (by name, like calculate_sloc_and_test_lines)."""
+    file_lower = file_path.lower()
+    return "test" in file_lower or "spec" in file_lower
+
+
+def count_file_lines(path):
+    """Line count of a text file read as calculate_sloc_and_test_lines does (universal newlines)."""
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return sum(1 for _ in f)
+
+
+class SlocCounter:
+    """SLOC and test lines of the trees of a clone, cached by tree hash."""
+
+    def __init__(self, local_repo_path, workers=None, scc_path=None):
+        """
+        Args:
+            local_repo_path: Clone of the repository
+            workers: Worktrees counted in parallel (one per CPU core if None)
+            scc_path: scc executable (the one shipped next to GHAminer if None)
+        """
+        self.local_repo_path = os.path.abspath(local_repo_path)
+        self.scc_path = scc_path or get_scc_path()
+        if os.path.exists(self.scc_path):
+            ensure_executable(self.scc_path)
+        git_dir = self._git("rev-parse", "--git-common-dir", cwd=self.local_repo_path).stdout.strip()
+        # Per process: mining sessions may share the repository (repo_cache_dir)
+        self.worktree_dir = os.path.join(self.local_repo_path, git_dir, "ghaminer-worktrees", str(os.getpid()))
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        self.trees = {}
+        self.blob_lines = {}
+        self.lock = threading.Lock()
+        self.free_worktrees = queue.LifoQueue()
+        self.worktrees = []
+
+    def _git(self, *args, cwd=None, **kwargs):
+        return subprocess.run(
+            ["git", "-C", cwd or self.local_repo_path, *args],
+            capture_output=True, text=True, encoding="utf-8", errors="replace", **kwargs
+        )
+
+    def resolve_commit(self, commit_sha=None, timestamp=None):
+        """
+        Commit counted for a run: commit_sha if the clone has it, else the last commit of HEAD
+        before timestamp ("%Y-%m-%dT%H:%M:%SZ"), else HEAD.
+        """
+        if commit_sha and self._git("cat-file", "-e", f"{commit_sha}^{{commit}}").returncode == 0:
+            return commit_sha
+        if commit_sha:
+            logging.warning(f"Commit {commit_sha} is not in the clone, counting SLOC at the run date")
+        if timestamp:
+            git_timestamp = datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ").strftime("%Y-%m-%d %H:%M:%S")
+            result = self._git("rev-list", "-1", "--before", git_timestamp, "HEAD")
+            if result.returncode == 0 and result.stdout.strip():
+                return result.stdout.strip()
+        return "HEAD"
+
+    def submit(self, commit_sha=None, timestamp=None):
+        """
+        Future of the (SLOC, test lines) of a run's commit ((None, None) if scc fails).
+        Trees already counted or being counted are not counted again.
+        """
+        commit = self.resolve_commit(commit_sha, timestamp)
+        result = self._git("rev-parse", f"{commit}^{{tree}}")
+        if result.returncode != 0:
+            logging.error(f"Could not resolve the tree of {commit}: {result.stderr.strip()}")
+            future = Future()
+            future.set_result((None, None))
+            return future
+        tree = result.stdout.strip()
+        with self.lock:
+            future = self.trees.get(tree)
+            if future is None:
+                future = self.trees[tree] = self.executor.submit(self._count_tree, commit, tree)
+        return future
+
+    def prefetch(self, commits):
+        """Start counting the trees of (commit_sha, timestamp) pairs in the worker threads."""
+        for commit_sha, timestamp in commits:
+            self.submit(commit_sha, timestamp)
+
+    def count(self, commit_sha=None, timestamp=None):
+        """(SLOC, test lines) of a run's commit, like calculate_sloc_and_test_lines."""
+        sloc, test_lines = self.submit(commit_sha, timestamp).result()
+        print(f"SLOC: {sloc}, Test Lines: {test_lines}")
+        return sloc, test_lines
+
+    def _acquire_worktree(self, commit):
+        try:
+            worktree = self.free_worktrees.get_nowait()
+        except queue.Empty:
+            with self.lock:
+                worktree = os.path.join(self.worktree_dir, str(len(self.worktrees)))
+                self.worktrees.append(worktree)
+            shutil.rmtree(worktree, ignore_errors=True)
+            self._git("worktree", "prune")
+            self._git("worktree", "add", "--detach", "--force", worktree, commit, check=True)
+            return worktree
+        self._git("checkout", "--quiet", "--detach", "--force", commit, cwd=worktree, check=True)
+        return worktree
+
+    def _count_tree(self, commit, tree):
+        try:
+            worktree = self._acquire_worktree(commit)
+        except subprocess.CalledProcessError as e:
+            logging.error(f"Failed to check out {commit} for SLOC: {e.stderr.strip()}")
+            self._forget(tree)
+            return None, None
+        try:
+            result = subprocess.run(
+                [self.scc_path, "--no-cocomo", "--format", "json", worktree],
+                capture_output=True, text=True, encoding="utf-8", errors="replace"
+            )
+            if result.returncode != 0:
+                logging.error(f"scc execution failed: {result.stderr}")
+                self._forget(tree)
+                return None, None
+            sloc = sum(entry["Code"] for entry in json.loads(result.stdout))
+            return sloc, self._count_test_lines(worktree)
+        except Exception as e:
+            logging.error(f"Error running scc: {e}")
+            self._forget(tree)
+            return None, None
+        finally:
+            self.free_worktrees.put(worktree)
+
+    def _forget(self, tree):
+        # Failures are retried by the next run of the tree
+        with self.lock:
+            self.trees.pop(tree, None)
+
+    def _count_test_lines(self, worktree):
+        """Lines of the tracked test files of a worktree, reading only files whose blob is not counted yet."""
+        result = self._git("ls-files", "--stage", cwd=worktree)
+        if result.returncode != 0:
+            return 0
+        test_lines = 0
+        for line in result.stdout.splitlines():
+            entry, _, file_path = line.partition("\t")
+            if not is_test_path(file_path):
+                continue
+            mode, blob = entry.split(" ")[:2]
+            cacheable = mode in REGULAR_FILE_MODES
+            with self.lock:
+                lines = self.blob_lines.get(blob) if cacheable else None
+            if lines is None:
+                full_path = os.path.join(worktree, file_path)
+                if not os.path.exists(full_path):
+                    continue
+                try:
+                    lines = count_file_lines(full_path)
+                except Exception as e:
+                    logging.warning(f"Error reading file {file_path}: {e}")
+                    continue
+                if cacheable:
+                    with self.lock:
+                        self.blob_lines[blob] = lines
+            test_lines += lines
+        return test_lines
+
+    def close(self):
+        """Wait for the pending counts and remove the worktrees."""
+        self.executor.shutdown(wait=True)
+        for worktree in self.worktrees:
+            self._git("worktree", "remove", "--force", worktree)
+        self._git("worktree", "prune")
+        shutil.rmtree(self.worktree_dir, ignore_errors=True)
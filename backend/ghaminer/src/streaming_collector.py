@@ -12,7 +12,7 @@ import json
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Callable, Dict, List
 from build_run_analyzer import get_jobs_for_run
-from request_github import get_request
+from request_github import get_request, github_api_url
 
 logger = logging.getLogger(__name__)
 
@@ -79,7 +79,7 @@ class StreamingCollector:
             max_pages: Maximum number of pages to fetch
         """
         owner, repo_name = self.repo_full_name.split("/")
-        url = f"https://api.github.com/repos/{owner}/{repo_name}/actions/runs"
+        url = github_api_url(f"/repos/{owner}/{repo_name}/actions/runs")
         
         headers = {
             "Authorization": f"Bearer {self.token}",
@@ -0,0 +1,106 @@
+"""
+Workflow files of the mined runs, read from the clone or cached by blob SHA.
+
+count_lines_in_workflow_yml downloaded the workflow file of every run from the
+contents API, although the file at a given path rarely changes between commits.
+Files are identified by their blob SHA instead: in the clone (`git ls-tree`)
+when it has the run's commit, else from one listing of the file's directory per
+commit (contents API). The content of each blob is read once, from the clone or
+from the blobs API, so runs of an unchanged workflow file cost no API call with
+a clone and at most one per commit without.
+"""
+import base64
+import logging
+import os
+import posixpath
+import subprocess
+
+import numpy as np
+
+from request_github import get_request, github_api_url
+
+
+class WorkflowFiles:
+    """Workflow file contents of a repository by (path, commit SHA)."""
+
+    def __init__(self, repo_full_name, token, local_repo_path=None):
+        """
+        Args:
+            repo_full_name: "owner/name"
+            token: GitHub token
+            local_repo_path: Clone (or mirror) of the repository, if any
+        """
+        self.repo_full_name = repo_full_name
+        self.token = token
+        self.local_repo_path = local_repo_path if local_repo_path and os.path.exists(local_repo_path) else None
+        # (commit SHA, directory) -> {file path: blob SHA} of the directory listings
+        self.listings = {}
+        # blob SHA -> content (bytes), None if it cannot be read
+        self.blobs = {}
+
+    def _local_blob_sha(self, path, commit_sha):
+        result = subprocess.run(
+            ["git", "-C", self.local_repo_path, "ls-tree", "-z", commit_sha, "--", path],
+            capture_output=True
+        )
+        if result.returncode != 0:
+            return None  # The clone lacks the commit
+        entry = result.stdout.split(b"\0", 1)[0]
+        if not entry:
+            return ""  # No such file at this commit
+        _, object_type, blob_sha = entry.split(b"\t", 1)[0].split(b" ")
+        return blob_sha.decode() if object_type == b"blob" else ""
+
+    def _listed_blob_sha(self, path, commit_sha):
+        directory = posixpath.dirname(path)
+        key = (commit_sha, directory)
+        if key not in self.listings:
+            entries = get_request(github_api_url(f"/repos/{self.repo_full_name}/contents/{directory}?ref={commit_sha}"),
+                                  self.token)
+            if not isinstance(entries, list):
+                return ""  # Missing directory (or API error), as a missing file
+            self.listings[key] = {entry["path"]: entry["sha"] for entry in entries if entry.get("type") == "file"}
+        return self.listings[key].get(path, "")
+
+    def blob_sha(self, path, commit_sha):
+        """Blob SHA of a file at a commit ("" if the commit has no such file)."""
+        if self.local_repo_path is not None:
+            blob_sha = self._local_blob_sha(path, commit_sha)
+            if blob_sha is not None:
+                return blob_sha
+        return self._listed_blob_sha(path, commit_sha)
+
+    def _read_blob(self, blob_sha):
+        if self.local_repo_path is not None:
+            result = subprocess.run(["git", "-C", self.local_repo_path, "cat-file", "blob", blob_sha], capture_output=True)
+            if result.returncode == 0:
+                return result.stdout
+        blob = get_request(github_api_url(f"/repos/{self.repo_full_name}/git/blobs/{blob_sha}"), self.token)
+        if blob and blob.get("encoding") == "base64":
+            try:
+                return base64.b64decode(blob["content"])
+            except (base64.binascii.Error, ValueError):
+                pass
+        logging.warning(f"Failed to read blob {blob_sha} of {self.repo_full_name}")
+        return None
+
+    def content_bytes(self, path, commit_sha):
+        """Content of a file at a commit, or None if missing or unreadable."""
+        if not path or path.strip() == "":
+            return None
+        blob_sha = self.blob_sha(path, commit_sha)
+        if not blob_sha:
+            return None
+        if blob_sha not in self.blobs:
+            self.blobs[blob_sha] = self._read_blob(blob_sha)
+        return self.blobs[blob_sha]
+
+    def line_count(self, path, commit_sha):
+        """Lines of a workflow file at a commit, like count_lines_in_workflow_yml (None if missing, NaN if binary)."""
+        content = self.content_bytes(path, commit_sha)
+        if content is None:
+            return None
+        try:
+            return len(content.decode("utf-8").splitlines())
+        except UnicodeDecodeError:
+            return np.nan
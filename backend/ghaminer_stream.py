@@ -21,9 +21,13 @@ if backend_path not in sys.path:
 
 import yaml
 
+from core.utils.github import github_api_url
+from core.utils.tracing import span
+
 # Try to import performance logger
 try:
-    from core.utils.logger import get_performance_logger
+    from core.utils.logger import get_performance_logger, log_api_call
+    from core.utils.metrics import JOBS_COLLECTED, PHASE_DURATION, RUNS_COLLECTED
     PERFORMANCE_LOGGING = True
 except ImportError:
     PERFORMANCE_LOGGING = False
@@ -32,6 +36,7 @@ except ImportError:
 try:
     from data.persistence import DataPersistence
     from data.manager import DataManager
+    from data.checkpoints import ExtractionCheckpointStore
     DATA_PERSISTENCE_AVAILABLE = True
 except ImportError as e:
     print(f"[GHAminer Stream] Warning: Data persistence not available: {e}")
@@ -208,7 +213,7 @@ def convert_ghaminer_run_to_dashboard(run_data: dict, repo: str) -> dict:
         'event': run_data.get('workflow_event_trigger') or run_data.get('event'),
         'html_url': f"https://github.com/{repo}/actions/runs/{run_data.get('id_build') or run_data.get('id')}",
         'pull_request_number': pull_request_number,
-        'jobs_url': f"https://api.github.com/repos/{repo}/actions/runs/{run_data.get('id_build') or run_data.get('id')}/jobs",
+        'jobs_url': github_api_url(f"/repos/{repo}/actions/runs/{run_data.get('id_build') or run_data.get('id')}/jobs"),
         'jobs': jobs,
         'commit_sha': commit_sha,
         'head_sha': commit_sha  # Also include as head_sha for compatibility
@@ -244,7 +249,7 @@ def get_total_workflow_runs_count(repo: str, token: str, created_filter: str = N
     Returns total_count from the /repos/{owner}/{repo}/actions/runs endpoint.
     """
     try:
-        api_url = f"https://api.github.com/repos/{repo}/actions/runs"
+        api_url = github_api_url(f"/repos/{repo}/actions/runs")
         params = {"per_page": 1}
         if created_filter:
             params["created"] = created_filter
@@ -257,14 +262,16 @@ def get_total_workflow_runs_count(repo: str, token: str, created_filter: str = N
         
         # Log API call duration
         start_time = time.time()
-        resp = req_module.get(api_url, headers=headers, params=params, timeout=30)
+        with span("github.workflow_runs_count") as attributes:
+            resp = req_module.get(api_url, headers=headers, params=params, timeout=30)
+            if attributes is not None:
+                attributes["status"] = resp.status_code
         duration = time.time() - start_time
         request_url = getattr(resp, "url", api_url)
         
         if PERFORMANCE_LOGGING:
             try:
-                perf_logger = get_performance_logger()
-                perf_logger.info(f"API_CALL - WORKFLOW_RUNS_COUNT_API - URL: {request_url} - Duration: {duration:.3f}s - Status: {resp.status_code}")
+                log_api_call("WORKFLOW_RUNS_COUNT_API", request_url, duration, resp.status_code)
             except:
                 pass
         
@@ -282,6 +289,15 @@ def get_total_workflow_runs_count(repo: str, token: str, created_filter: str = N
 
 
 def stream_workflow_runs_phase1(repo: str, token: str, config: dict = None) -> Generator[tuple[Dict[str, Any], int, int, List[Dict[str, Any]]], None, None]:
+    """
+    Phase 1: Collect all workflow runs FIRST (without job details), traced as one span
+    Yields: (dashboard_run_dict, current_count, total_count, all_runs_list)
+    """
+    with span("phase_1.workflow_runs", repo=repo):
+        yield from _stream_workflow_runs_phase1(repo, token, config)
+
+
+def _stream_workflow_runs_phase1(repo: str, token: str, config: dict = None) -> Generator[tuple[Dict[str, Any], int, int, List[Dict[str, Any]]], None, None]:
     """
     Phase 1: Collect all workflow runs FIRST (without job details)
     Yields: (dashboard_run_dict, current_count, total_count, all_runs_list)
@@ -329,6 +345,38 @@ def stream_workflow_runs_phase1(repo: str, token: str, config: dict = None) -> G
         print("[GHAminer Stream] Using repository workflow runs endpoint for fast collection")
     else:
         print(f"[GHAminer Stream] Found {len(workflow_ids)} workflows to process")
+
+    # Resume from the checkpoint of an interrupted extraction of the same scope
+    checkpoint_key = config.get("checkpoint_key")
+    checkpoint_store = None
+    checkpoint = None
+    workflow_keys = [str(workflow_id) for workflow_id in workflow_ids]
+    if checkpoint_key and persistence and data_manager:
+        try:
+            checkpoint_store = ExtractionCheckpointStore(persistence.data_dir / "checkpoints")
+            checkpoint = checkpoint_store.load(checkpoint_key)
+        except Exception as e:
+            print(f"[GHAminer Stream] Warning: Failed to load extraction checkpoint: {e}")
+        if checkpoint and checkpoint.get("workflow_ids") != workflow_keys:
+            checkpoint = None
+        if checkpoint:
+            if checkpoint.get("phase1_complete"):
+                print("[GHAminer Stream] Resuming from checkpoint: workflow runs already collected, checking for new runs only")
+            else:
+                print(f"[GHAminer Stream] Resuming from checkpoint: workflow {checkpoint.get('workflow_index', 0) + 1}/{len(workflow_ids)}, page {checkpoint.get('page')}")
+
+    def save_phase1_checkpoint(workflow_index, next_page, skip_pages, skipped_page, watermark):
+        if not checkpoint_store:
+            return
+        checkpoint_store.save(checkpoint_key, {
+            "workflow_ids": workflow_keys,
+            "workflow_index": workflow_index,
+            "page": next_page,
+            "skip_next_pages": skip_pages,
+            "last_skipped_page": skipped_page,
+            "watermark": watermark,
+            "phase1_complete": False,
+        })
     
     total_runs = 0
     new_runs_collected = 0
@@ -348,17 +396,32 @@ def stream_workflow_runs_phase1(repo: str, token: str, config: dict = None) -> G
     actual_total = total_count if total_count > 0 else None
     
     # Process each workflow
-    for workflow_id in workflow_ids:
+    for workflow_index, workflow_id in enumerate(workflow_ids):
         page = 1
         skip_next_pages = 0  # Track how many pages to skip
         last_skipped_page = None  # Track last skipped page for backtracking
+
+        # When resuming, walk from page 1 until the first page whose runs are all
+        # known (runs created since the checkpoint), then jump to the saved page.
+        resume_page = None
+        resume_watermark = None
+        verify_resume_watermark = False
+        catching_up = False
+        if checkpoint:
+            checkpoint_index = checkpoint.get("workflow_index", 0)
+            if checkpoint.get("phase1_complete") or workflow_index < checkpoint_index:
+                catching_up = True
+            elif workflow_index == checkpoint_index and (checkpoint.get("page") or 1) > 1:
+                catching_up = True
+                resume_page = checkpoint["page"]
+                resume_watermark = checkpoint.get("watermark")
         
         while True:
             # Fetch workflow runs page
             if use_repository_runs_endpoint:
-                api_url = f"https://api.github.com/repos/{repo}/actions/runs"
+                api_url = github_api_url(f"/repos/{repo}/actions/runs")
             else:
-                api_url = f"https://api.github.com/repos/{repo}/actions/workflows/{workflow_id}/runs"
+                api_url = github_api_url(f"/repos/{repo}/actions/workflows/{workflow_id}/runs")
             params = {"page": page, "per_page": 100}
             if created_filter:
                 params["created"] = created_filter
@@ -369,18 +432,17 @@ def stream_workflow_runs_phase1(repo: str, token: str, config: dict = None) -> G
 
             # Measure API call duration
             start_time = time.time()
-            resp = req_module.get(api_url, headers=headers, params=params, timeout=30)
+            with span("github.workflow_runs_page", workflow_id=workflow_id, page=page) as attributes:
+                resp = req_module.get(api_url, headers=headers, params=params, timeout=30)
+                if attributes is not None:
+                    attributes["status"] = resp.status_code
             duration = time.time() - start_time
             request_url = getattr(resp, "url", api_url)
 
             if resp.status_code != 200:
                 if PERFORMANCE_LOGGING:
                     try:
-                        perf_logger = get_performance_logger()
-                        perf_logger.info(
-                            f"API_CALL - WORKFLOW_RUNS_API - URL: {request_url} - Duration: {duration:.3f}s "
-                            f"- Status: {resp.status_code} - Page: {page} - Runs: 0"
-                        )
+                        log_api_call("WORKFLOW_RUNS_API", request_url, duration, resp.status_code, Page=page, Runs=0)
                     except Exception:
                         pass
                 print(f"[GHAminer Stream] Failed to fetch page {page}: {resp.status_code}")
@@ -391,11 +453,7 @@ def stream_workflow_runs_phase1(repo: str, token: str, config: dict = None) -> G
             if not response or 'workflow_runs' not in response:
                 if PERFORMANCE_LOGGING:
                     try:
-                        perf_logger = get_performance_logger()
-                        perf_logger.info(
-                            f"API_CALL - WORKFLOW_RUNS_API - URL: {request_url} - Duration: {duration:.3f}s "
-                            f"- Status: {resp.status_code} - Page: {page} - Runs: 0"
-                        )
+                        log_api_call("WORKFLOW_RUNS_API", request_url, duration, resp.status_code, Page=page, Runs=0)
                     except Exception:
                         pass
                 break
@@ -405,11 +463,7 @@ def stream_workflow_runs_phase1(repo: str, token: str, config: dict = None) -> G
             if not workflow_runs:
                 if PERFORMANCE_LOGGING:
                     try:
-                        perf_logger = get_performance_logger()
-                        perf_logger.info(
-                            f"API_CALL - WORKFLOW_RUNS_API - URL: {request_url} - Duration: {duration:.3f}s "
-                            f"- Status: {resp.status_code} - Page: {page} - Runs: 0"
-                        )
+                        log_api_call("WORKFLOW_RUNS_API", request_url, duration, resp.status_code, Page=page, Runs=0)
                     except Exception:
                         pass
                 break
@@ -417,13 +471,39 @@ def stream_workflow_runs_phase1(repo: str, token: str, config: dict = None) -> G
             # Log successful call including how many runs were returned
             if PERFORMANCE_LOGGING:
                 try:
-                    perf_logger = get_performance_logger()
-                    perf_logger.info(
-                        f"API_CALL - WORKFLOW_RUNS_API - URL: {request_url} - Duration: {duration:.3f}s "
-                        f"- Status: {resp.status_code} - Page: {page} - Runs: {runs_count}"
-                    )
+                    log_api_call("WORKFLOW_RUNS_API", request_url, duration, resp.status_code, Page=page, Runs=runs_count)
                 except Exception:
                     pass
+
+            if catching_up and all(data_manager.should_skip_run(run['id']) for run in workflow_runs):
+                for run in workflow_runs:
+                    existing_run = data_manager.get_existing_run(str(run['id']))
+                    if existing_run:
+                        upsert_unique_run(all_runs, existing_run, all_run_ids)
+                catching_up = False
+                if resume_page is None or resume_page <= page + 1:
+                    if resume_page is None:
+                        print(f"[GHAminer Stream] Caught up with new runs at page {page}, rest of the history is already collected")
+                        break
+                    # The checkpoint page directly follows this fully known page
+                    page += 1
+                else:
+                    print(f"[GHAminer Stream] Caught up with new runs at page {page}, resuming at checkpoint page {resume_page}")
+                    page = resume_page
+                    verify_resume_watermark = bool(resume_watermark)
+                skip_next_pages = checkpoint.get("skip_next_pages") or 0
+                last_skipped_page = checkpoint.get("last_skipped_page")
+                continue
+
+            if verify_resume_watermark:
+                # Runs deleted since the checkpoint shift older runs to earlier pages.
+                # Step back until the page overlaps what was already collected.
+                newest_on_page = max((run.get('created_at') or '') for run in workflow_runs)
+                if page > 1 and newest_on_page and newest_on_page < resume_watermark:
+                    print(f"[GHAminer Stream] Page {page} does not overlap the checkpoint watermark, going back one page")
+                    page -= 1
+                    continue
+                verify_resume_watermark = False
             
             # Check if we should skip this page (using data manager)
             if not use_repository_runs_endpoint and data_manager and skip_next_pages == 0:
@@ -450,6 +530,8 @@ def stream_workflow_runs_phase1(repo: str, token: str, config: dict = None) -> G
                     last_skipped_page = page
                     # Skip to next page
                     page += 1
+                    if not catching_up:
+                        save_phase1_checkpoint(workflow_index, page, skip_next_pages, last_skipped_page, None)
                     continue
             elif not use_repository_runs_endpoint and skip_next_pages > 0:
                 # We're skipping pages - check if this page has any existing runs
@@ -495,6 +577,8 @@ def stream_workflow_runs_phase1(repo: str, token: str, config: dict = None) -> G
                 else:
                     last_skipped_page = page
                 page += 1
+                if not catching_up:
+                    save_phase1_checkpoint(workflow_index, page, skip_next_pages, last_skipped_page, None)
                 continue
             
             workflow_label = "repository" if use_repository_runs_endpoint else f"workflow {workflow_id}"
@@ -571,6 +655,8 @@ def stream_workflow_runs_phase1(repo: str, token: str, config: dict = None) -> G
                     continue
                 total_runs = len(all_runs)  # Update total to include all runs
                 new_runs_collected += 1
+                if PERFORMANCE_LOGGING:
+                    RUNS_COLLECTED.inc()
                 
                 # Save run to persistence (batch for efficiency)
                 if persistence:
@@ -616,6 +702,10 @@ def stream_workflow_runs_phase1(repo: str, token: str, config: dict = None) -> G
             
             if has_next:
                 page += 1
+                if not catching_up:
+                    # Runs of this page are saved above, so the cursor can move past it
+                    oldest_on_page = min((run.get('created_at') or '') for run in workflow_runs) or None
+                    save_phase1_checkpoint(workflow_index, page, skip_next_pages, last_skipped_page, oldest_on_page)
             else:
                 break
     
@@ -632,11 +722,18 @@ def stream_workflow_runs_phase1(repo: str, token: str, config: dict = None) -> G
     all_runs = dedupe_runs_by_id(all_runs)
     total_runs = len(all_runs)
 
+    if checkpoint_store:
+        if config.get("fetch_job_details", False):
+            checkpoint_store.save(checkpoint_key, {"workflow_ids": workflow_keys, "phase1_complete": True})
+        else:
+            checkpoint_store.clear(checkpoint_key)
+
     phase1_duration = time.time() - phase1_start_time
     print(f"[GHAminer Stream] Phase 1 complete: {new_runs_collected} new runs collected, {total_runs} total runs (including {existing_runs_count} existing)")
     
     if PERFORMANCE_LOGGING:
         try:
+            PHASE_DURATION.observe(phase1_duration, phase="phase_1_workflow_runs")
             perf_logger = get_performance_logger()
             perf_logger.info(f"PHASE_END - PHASE_1_WORKFLOW_RUNS_COLLECTION - Total Duration: {phase1_duration:.3f}s - New Runs: {new_runs_collected} - Total Runs: {total_runs}")
         except:
@@ -644,6 +741,15 @@ def stream_workflow_runs_phase1(repo: str, token: str, config: dict = None) -> G
 
 
 def stream_job_details_phase2(repo: str, token: str, all_runs: List[Dict[str, Any]], config: dict = None) -> Generator[tuple[Dict[str, Any], int, int], None, None]:
+    """
+    Phase 2: Collect job details for all collected runs, traced as one span
+    Yields: (updated_dashboard_run_dict, current_count, total_runs)
+    """
+    with span("phase_2.jobs", repo=repo, runs=len(all_runs)):
+        yield from _stream_job_details_phase2(repo, token, all_runs, config)
+
+
+def _stream_job_details_phase2(repo: str, token: str, all_runs: List[Dict[str, Any]], config: dict = None) -> Generator[tuple[Dict[str, Any], int, int], None, None]:
     """
     Phase 2: Collect job details for all collected runs
     Yields: (updated_dashboard_run_dict, current_count, total_runs)
@@ -694,6 +800,17 @@ def stream_job_details_phase2(repo: str, token: str, all_runs: List[Dict[str, An
     total_runs = len(all_runs)
     print(f"[GHAminer Stream] Phase 2: Starting job details collection for {total_runs} runs")
 
+    # Phase 1 left a completed checkpoint; it is cleared once the jobs are collected.
+    # Jobs are saved as they are fetched, so a resumed extraction only fetches the
+    # jobs of the runs filter_runs_needing_jobs still returns.
+    checkpoint_key = config.get("checkpoint_key")
+    checkpoint_store = None
+    if checkpoint_key and persistence:
+        try:
+            checkpoint_store = ExtractionCheckpointStore(persistence.data_dir / "checkpoints")
+        except Exception as e:
+            print(f"[GHAminer Stream] Warning: Failed to open extraction checkpoints: {e}")
+
     pending_job_saves: Dict[str, List[Dict[str, Any]]] = {}
 
     def flush_pending_job_saves():
@@ -742,7 +859,8 @@ def stream_job_details_phase2(repo: str, token: str, all_runs: List[Dict[str, An
 
             try:
                 # Fetch job details from GitHub API
-                jobs_ids, job_details, job_count = get_jobs_for_run(repo, int(run_id), token)
+                with span("github.jobs", run_id=str(run_id)):
+                    jobs_ids, job_details, job_count = get_jobs_for_run(repo, int(run_id), token)
 
                 # Convert job details to dashboard format (list of job objects)
                 jobs_list = []
@@ -785,6 +903,8 @@ def stream_job_details_phase2(repo: str, token: str, all_runs: List[Dict[str, An
 
                 # Update the dashboard dict directly with jobs
                 dashboard_run['jobs'] = jobs_list
+                if PERFORMANCE_LOGGING:
+                    JOBS_COLLECTED.inc(len(jobs_list))
 
                 # Save jobs to persistence in batches to avoid rewriting the storage file per run.
                 if persistence:
@@ -804,12 +924,16 @@ def stream_job_details_phase2(repo: str, token: str, all_runs: List[Dict[str, An
                 yield (dashboard_run, idx + 1, total_runs)
     finally:
         flush_pending_job_saves()
+
+    if checkpoint_store:
+        checkpoint_store.clear(checkpoint_key)
     
     phase2_duration = time.time() - phase2_start_time
     print(f"[GHAminer Stream] Phase 2 complete: Job details collected for {total_runs} runs")
     
     if PERFORMANCE_LOGGING:
         try:
+            PHASE_DURATION.observe(phase2_duration, phase="phase_2_jobs")
             perf_logger = get_performance_logger()
             perf_logger.info(f"PHASE_END - PHASE_2_JOBS_COLLECTION - Total Duration: {phase2_duration:.3f}s - Total Runs: {total_runs}")
         except:
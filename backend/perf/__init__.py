@@ -0,0 +1,4 @@
+"""
+Performance tooling for GHA Dashboard
+Command-line tools to measure and compare the speed of data collection
+"""
@@ -0,0 +1,693 @@
+"""
+Benchmark suite for the collection, storage and streaming paths of GHA-Dashboard.
+Every benchmark runs against synthetic repositories (served by perf.fake_github
+when it talks to the GitHub API) in its own process, so a slow case can be timed
+out and memory is measured in isolation.
+
+    python -m perf.benchmarks --sizes 1000,10000 -o results.json
+    python -m perf.benchmarks --sizes 1000 --only persistence_save,persistence_load
+    python -m perf.benchmarks --sizes 1000,10000 --baseline results.json --threshold 20
+
+With --baseline, cases slower (or using more memory) than the baseline by more
+than the threshold are reported as regressions and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+backend_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
+from perf.fake_github import FakeGitHubServer
+from perf.synthetic import SyntheticHistory, SyntheticHistoryRepository, generate_history, write_to_storage
+
+DEFAULT_SIZES = (1_000, 10_000)
+BENCHMARK_REPO = "bench/repo"
+RESULT_PREFIX = "BENCHMARK_RESULT "
+
+# name -> (context manager factory(size, workdir) yielding the measured callable, default max size)
+BENCHMARKS: Dict[str, tuple] = {}
+
+
+def benchmark(name: str, max_size: Optional[int] = None):
+    """
+    Register a benchmark.
+
+    The decorated generator sets the case up for `size` runs inside `workdir`,
+    yields a callable doing the measured work (returning the number of items
+    processed), then tears the case down.
+
+    Args:
+        name: Benchmark name
+        max_size: Largest size run by default (cases over the GitHub API are bounded by request count)
+    """
+    def decorator(func):
+        BENCHMARKS[name] = (contextmanager(func), max_size)
+        return func
+    return decorator
+
+
+def synthetic_history(size: int) -> SyntheticHistory:
+    return generate_history(repo=BENCHMARK_REPO, runs=size)
+
+
+def populate_storage(size: int, with_jobs: bool = True):
+    """Write a synthetic repository of `size` runs into the storage directory (DATA_STORAGE_DIR)."""
+    history = synthetic_history(size)
+    write_to_storage(history, with_jobs=with_jobs)
+    return list(history.dashboard_runs())
+
+
+@contextmanager
+def fake_github(size: int):
+    """Serve the synthetic repository of `size` runs (the one written by populate_storage)."""
+    server = FakeGitHubServer([SyntheticHistoryRepository(synthetic_history(size))]).start()
+    os.environ["GITHUB_API_URL"] = server.url
+    try:
+        yield server
+    finally:
+        server.stop()
+
+
+class FakeWebSocket:
+    """WebSocket stand-in counting the frames sent by send_data."""
+
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+
+    def send(self, payload):
+        self.frames += 1
+        self.bytes += len(payload)
+
+    def close(self):
+        pass
+
+
+@benchmark("phase1", max_size=100_000)
+def bench_phase1(size, workdir):
+    import ghaminer_stream
+
+    with fake_github(size):
+        yield lambda: sum(1 for _ in ghaminer_stream.stream_workflow_runs_phase1(BENCHMARK_REPO, "token", {}))
+
+
+@benchmark("phase2", max_size=100_000)
+def bench_phase2(size, workdir):
+    import ghaminer_stream
+
+    runs = populate_storage(size, with_jobs=False)
+    with fake_github(size):
+        yield lambda: sum(1 for _ in ghaminer_stream.stream_job_details_phase2(
+            BENCHMARK_REPO, "token", runs, {"fetch_job_details": True}
+        ))
+
+
+@benchmark("send_data")
+def bench_send_data(size, workdir):
+    # Cached repository: runs and jobs are streamed from storage without refreshing from GitHub
+    from analysis import endpoint
+    from analysis.endpoint import AggregationFilters
+
+    populate_storage(size)
+
+    def run():
+        ws = FakeWebSocket()
+        endpoint.send_data(ws, BENCHMARK_REPO, AggregationFilters(), "token")
+        return size
+
+    yield run
+
+
+LOG_LINES_PER_JOB = 1_000
+
+
+def build_log_archive(path: str, jobs: int, seed: int = 0) -> str:
+    """
+    Write a run log archive of `jobs` job logs to `path`.
+
+    The job logs are those of the zip archive named by BENCHMARK_LOG_ARCHIVE (a real run
+    log downloaded from GitHub, cycled through until there are `jobs` of them), or
+    synthetic pytest job logs of LOG_LINES_PER_JOB lines with ANSI colors.
+    """
+    import random
+    import zipfile
+
+    real_archive = os.getenv("BENCHMARK_LOG_ARCHIVE")
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        if real_archive:
+            with zipfile.ZipFile(real_archive) as source:
+                members = [source.read(info) for info in source.infolist() if info.filename.endswith(".txt")]
+            if not members:
+                raise ValueError(f"No .txt log in {real_archive}")
+            for index in range(jobs):
+                archive.writestr(f"{index}_job.txt", members[index % len(members)])
+            return path
+
+        rng = random.Random(seed)
+        for index in range(jobs):
+            lines = [f"2025-01-01T00:00:00.0000000Z \x1b[36;1mpython -m pytest tests/ -v\x1b[0m"]
+            for line_number in range(LOG_LINES_PER_JOB - 2):
+                timestamp = f"2025-01-01T00:{line_number // 60 % 60:02d}:{line_number % 60:02d}.{rng.randrange(10**7):07d}Z"
+                kind = rng.random()
+                if kind < 0.6:
+                    outcome = "\x1b[32mPASSED\x1b[0m" if rng.random() < 0.95 else "\x1b[31mFAILED\x1b[0m"
+                    lines.append(f"{timestamp} tests/test_module_{rng.randrange(50)}.py::test_case_{line_number} "
+                                 f"{outcome}{' ' * rng.randrange(5, 30)}[{line_number * 100 // LOG_LINES_PER_JOB:3d}%]")
+                elif kind < 0.9:
+                    lines.append(f"{timestamp} Collecting package-{rng.randrange(1000)}==1.{rng.randrange(30)}.0 "
+                                 f"(from -r requirements.txt (line {rng.randrange(80)}))")
+                else:
+                    lines.append(f"{timestamp}   Downloading https://files.example.org/{rng.getrandbits(64):x}.whl "
+                                 f"({rng.randrange(10, 900)} kB)")
+            lines.append(f"2025-01-01T00:59:59.0000000Z \x1b[32m====== {rng.randrange(500)} passed, "
+                         f"{rng.randrange(5)} failed, {rng.randrange(10)} skipped in {rng.random() * 60:.2f}s ======\x1b[0m")
+            archive.writestr(f"{index}_test ({index}).txt", "\n".join(lines) + "\n")
+    return path
+
+
+def _ghaminer_log_modules():
+    ghaminer_src_path = os.path.join(backend_path, "ghaminer", "src")
+    if ghaminer_src_path not in sys.path:
+        sys.path.insert(0, ghaminer_src_path)
+    import log_parser
+    import log_scanner
+    from patterns import framework_regex
+    return log_parser, log_scanner, framework_regex
+
+
+@benchmark("log_parse_lines", max_size=100)
+def bench_log_parse_lines(size, workdir):
+    # Test result parsing as done before log_scanner: parse_test_results on every line
+    import zipfile
+
+    log_parser, _, framework_regex = _ghaminer_log_modules()
+    archive_path = build_log_archive(os.path.join(workdir, "logs.zip"), size)
+    framework = os.getenv("BENCHMARK_LOG_FRAMEWORK", "pytest")
+
+    def run():
+        with zipfile.ZipFile(archive_path) as zip_ref:
+            for file_info in zip_ref.infolist():
+                with zip_ref.open(file_info) as log_file:
+                    for line in log_file:
+                        log_content = line.decode("utf-8").strip()
+                        if log_content:
+                            log_parser.parse_test_results(framework, log_content, None, framework_regex)
+        return size
+
+    yield run
+
+
+@benchmark("log_scan", max_size=10_000)
+def bench_log_scan(size, workdir):
+    _, log_scanner, framework_regex = _ghaminer_log_modules()
+    archive_path = build_log_archive(os.path.join(workdir, "logs.zip"), size)
+    scanner = log_scanner.LogScanner(os.getenv("BENCHMARK_LOG_FRAMEWORK", "pytest"), None, framework_regex)
+
+    def run():
+        scanner.scan_archive(archive_path)
+        return size
+
+    yield run
+
+
+@benchmark("log_scan_pool", max_size=10_000)
+def bench_log_scan_pool(size, workdir):
+    # Archives of 10 job logs parsed by one worker process per CPU core
+    _, log_scanner, framework_regex = _ghaminer_log_modules()
+    from log_pool import LogParsingPool
+
+    archive_paths = [build_log_archive(os.path.join(workdir, f"logs_{index}.zip"), min(10, size - index), seed=index)
+                     for index in range(0, size, 10)]
+    framework = os.getenv("BENCHMARK_LOG_FRAMEWORK", "pytest")
+
+    with LogParsingPool() as pool:
+        def run():
+            futures = [pool.submit(path, framework, None, framework_regex) for path in archive_paths]
+            for future in futures:
+                future.result()
+            return size
+
+        yield run
+
+
+FILES_PER_GIT_HISTORY_COMMIT = (1, 6)
+QUERIED_COMMITS = 50
+
+
+def build_git_history(path: str, commits: int, seed: int = 0) -> str:
+    """
+    Create a git repository of `commits` hourly commits at `path` (with git fast-import),
+    or return the clone named by BENCHMARK_GIT_REPO.
+
+    Every 10th main commit merges a side branch of two commits; commits change 1 to 5
+    files of a tree of `commits` / 10 files.
+    """
+    import random
+
+    real_repo = os.getenv("BENCHMARK_GIT_REPO")
+    if real_repo:
+        return real_repo
+
+    rng = random.Random(seed)
+    files = [f"src/module_{index % 25}/file_{index}.py" for index in range(max(50, commits // 10))]
+    stream: List[str] = []
+    mark = 0
+    timestamp = 1_700_000_000
+
+    def commit(parents: List[int], changes: Dict[str, str]) -> int:
+        nonlocal mark, timestamp
+        mark += 1
+        timestamp += 3600
+        stream.extend([
+            "commit refs/heads/main", f"mark :{mark}",
+            f"author Dev {rng.randrange(40)} <dev@example.com> {timestamp} +0000",
+            f"committer Dev <dev@example.com> {timestamp} +0000", "data 0",
+        ])
+        if parents:
+            stream.append(f"from :{parents[0]}")
+            stream.extend(f"merge :{parent}" for parent in parents[1:])
+        for file_path, content in changes.items():
+            stream.extend([f"M 100644 inline {file_path}", f"data {len(content.encode())}", content])
+        return mark
+
+    def random_changes() -> Dict[str, str]:
+        return {file_path: f"{mark} {file_path}\n" for file_path in rng.sample(files, rng.randrange(*FILES_PER_GIT_HISTORY_COMMIT))}
+
+    main_tip = commit([], {file_path: "initial\n" for file_path in files})
+    while mark < commits:
+        if mark % 10 == 9 and commits - mark >= 3:
+            first_changes, second_changes = random_changes(), random_changes()
+            side_tip = commit([commit([main_tip], first_changes)], second_changes)
+            main_tip = commit([main_tip, side_tip], {**first_changes, **second_changes})
+        else:
+            main_tip = commit([main_tip], random_changes())
+
+    subprocess.run(["git", "init", "-q", path], check=True)
+    subprocess.run(["git", "-C", path, "fast-import", "--quiet"], input="\n".join(stream + [""]).encode(), check=True)
+    subprocess.run(["git", "-C", path, "symbolic-ref", "HEAD", "refs/heads/main"], check=True)
+    return path
+
+
+def _ghaminer_commit_modules():
+    ghaminer_src_path = os.path.join(backend_path, "ghaminer", "src")
+    if ghaminer_src_path not in sys.path:
+        sys.path.insert(0, ghaminer_src_path)
+    import commit_history_analyzer
+    import commit_index
+    return commit_history_analyzer, commit_index
+
+
+def _queried_commits(repo_path: str) -> List[str]:
+    """QUERIED_COMMITS commits spread over the history of HEAD (the head commits of mined runs)."""
+    shas = subprocess.run(["git", "-C", repo_path, "rev-list", "HEAD"], capture_output=True, text=True,
+                          check=True).stdout.split()
+    return shas[::max(1, len(shas) // QUERIED_COMMITS)][:QUERIED_COMMITS]
+
+
+@benchmark("commit_files_git", max_size=10_000)
+def bench_commit_files_git(size, workdir):
+    # gh_commits_on_files_touched with a git log per file of each commit; the size is the number of commits
+    commit_history_analyzer, _ = _ghaminer_commit_modules()
+    repo_path = build_git_history(os.path.join(workdir, "repo"), size)
+    shas = _queried_commits(repo_path)
+
+    def run():
+        for sha in shas:
+            commit_history_analyzer.count_commits_on_files_last_3_months(repo_path, sha)
+        return len(shas)
+
+    yield run
+
+
+@benchmark("commit_files_index", max_size=100_000)
+def bench_commit_files_index(size, workdir):
+    # Same counts from the per-file commit index (built before the measure, as once per mined repository)
+    _, commit_index = _ghaminer_commit_modules()
+    repo_path = build_git_history(os.path.join(workdir, "repo"), size)
+    shas = _queried_commits(repo_path)
+    index = commit_index.CommitIndex(repo_path)
+
+    def run():
+        for sha in shas:
+            index.count_commits_on_files_last_3_months(sha)
+        return len(shas)
+
+    yield run
+
+
+@benchmark("commit_index_build", max_size=100_000)
+def bench_commit_index_build(size, workdir):
+    _, commit_index = _ghaminer_commit_modules()
+    repo_path = build_git_history(os.path.join(workdir, "repo"), size)
+
+    def run():
+        index = commit_index.CommitIndex(repo_path)
+        index.count_commits_on_files_last_3_months(index.shas[index.head])
+        return len(index)
+
+    yield run
+
+
+CHANGED_FILES_PER_PATH = 100
+
+
+def changed_file_paths(size: int, seed: int = 0) -> List[str]:
+    """
+    `size` * CHANGED_FILES_PER_PATH changed files of commits, drawn from `size` paths of a
+    repository (sources, tests, docs, configuration and Docker files) with a skew toward hot files.
+    """
+    import random
+
+    rng = random.Random(seed)
+    layouts = [
+        ("src/{package}/{name}.py", 30), ("tests/{package}/test_{name}.py", 12), ("lib/{package}/{name}.ts", 10),
+        ("lib/{package}/{name}.spec.ts", 5), ("docs/{package}/{name}.md", 6), ("site/guide/{name}.html", 2),
+        ("src/main/java/{package}/{name}.java", 10), ("src/test/java/{package}/{name}Test.java", 5),
+        ("config/{package}/{name}.yml", 4), ("assets/{package}/{name}.png", 4), ("{package}/Dockerfile", 1),
+        ("deploy/{package}/docker-compose.{name}.yml", 1), ("{package}/README", 2),
+    ]
+    templates = [template for template, weight in layouts for _ in range(weight)]
+    paths = [rng.choice(templates).format(package=f"pkg_{rng.randrange(max(1, size // 50))}", name=f"file_{index}")
+             for index in range(size)]
+    weights = [1 / (rank + 1) for rank in range(size)]
+    return rng.choices(paths, weights=weights, k=size * CHANGED_FILES_PER_PATH)
+
+
+@benchmark("path_classify_lists", max_size=10_000)
+def bench_path_classify_lists(size, workdir):
+    # Classification of changed files as done before path_classifier: is_test_file, is_production_file
+    # and is_documentation_file (substring lists), then the Docker substrings
+    commit_history_analyzer, _ = _ghaminer_commit_modules()
+    from file_indicators import is_production_file, is_test_file
+
+    paths = changed_file_paths(size)
+
+    def run():
+        for path in paths:
+            if not is_test_file(path) and not is_production_file(path):
+                commit_history_analyzer.is_documentation_file(path)
+            if "dockerfile" not in path.lower():
+                "docker-compose" in path.lower()
+        return len(paths)
+
+    yield run
+
+
+@benchmark("path_classify", max_size=100_000)
+def bench_path_classify(size, workdir):
+    _ghaminer_commit_modules()
+    from path_classifier import classify_path
+
+    paths = changed_file_paths(size)
+
+    def run():
+        classify_path.cache_clear()
+        for path in paths:
+            classify_path(path)
+        return len(paths)
+
+    yield run
+
+
+@benchmark("persistence_save")
+def bench_persistence_save(size, workdir):
+    from data.persistence import DataPersistence
+
+    history = synthetic_history(size)
+    runs, jobs_by_run = list(history.dashboard_runs()), history.jobs_by_run()
+
+    def run():
+        persistence = DataPersistence()
+        persistence.save_runs_batch(BENCHMARK_REPO, runs)
+        persistence.save_jobs_batch(BENCHMARK_REPO, jobs_by_run)
+        return size
+
+    yield run
+
+
+@benchmark("persistence_load")
+def bench_persistence_load(size, workdir):
+    from data.persistence import DataPersistence
+
+    populate_storage(size)
+    yield lambda: len(DataPersistence().get_all_runs(BENCHMARK_REPO))
+
+
+@benchmark("data_manager_load_cache")
+def bench_data_manager_load_cache(size, workdir):
+    from data.manager import DataManager
+    from data.persistence import DataPersistence
+
+    populate_storage(size)
+
+    def run():
+        manager = DataManager(BENCHMARK_REPO, DataPersistence())
+        manager._load_cache()
+        return len(manager._cached_run_ids)
+
+    yield run
+
+
+@benchmark("api_data_load")
+def bench_api_data_load(size, workdir):
+    import importlib
+
+    populate_storage(size)
+    sys.argv = ["app.py"]
+    client = importlib.import_module("app").app.test_client()
+
+    def run():
+        response = client.get(f"/api/data/load/{BENCHMARK_REPO}")
+        if response.status_code != 200:
+            raise RuntimeError(f"/api/data/load returned {response.status_code}")
+        return response.get_json()["totalRuns"]
+
+    yield run
+
+
+@contextmanager
+def _isolated_environment(workdir: str) -> Iterator[None]:
+    """Point storage, traces and metrics at a scratch directory for one case."""
+    names = ("DATA_STORAGE_DIR", "EXTRACTION_DB_PATH", "METRICS_DIR", "EXTRACTION_TRACING", "GITHUB_API_URL")
+    previous = {name: os.environ.get(name) for name in names}
+    os.environ["DATA_STORAGE_DIR"] = os.path.join(workdir, "storage")
+    os.environ["EXTRACTION_DB_PATH"] = os.path.join(workdir, "extractions.sqlite3")
+    os.environ["METRICS_DIR"] = os.path.join(workdir, "metrics")
+    os.environ["EXTRACTION_TRACING"] = "0"
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def run_case(name: str, size: int, repeat: int = 1, measure_memory: bool = True) -> Dict[str, Any]:
+    """
+    Run one benchmark case in this process.
+
+    Every repetition (and the tracemalloc run) gets a fresh setup in a new scratch directory.
+
+    Returns:
+        Result dict (seconds are the median over the repetitions)
+    """
+    factory = BENCHMARKS[name][0]
+    durations, cpu_durations, items = [], [], 0
+
+    for _ in range(max(1, repeat)):
+        with tempfile.TemporaryDirectory(prefix=f"bench_{name}_") as workdir, _isolated_environment(workdir):
+            with factory(size, workdir) as measured:
+                start_wall, start_cpu = time.perf_counter(), time.process_time()
+                items = measured()
+                durations.append(time.perf_counter() - start_wall)
+                cpu_durations.append(time.process_time() - start_cpu)
+
+    seconds = statistics.median(durations)
+    result = {
+        "benchmark": name,
+        "size": size,
+        "status": "ok",
+        "seconds": seconds,
+        "seconds_all": durations,
+        "cpu_seconds": statistics.median(cpu_durations),
+        "items": items,
+        "items_per_second": items / seconds if seconds > 0 else None,
+        "peak_memory_bytes": None,
+    }
+
+    if measure_memory:
+        with tempfile.TemporaryDirectory(prefix=f"bench_{name}_") as workdir, _isolated_environment(workdir):
+            with factory(size, workdir) as measured:
+                tracemalloc.start()
+                try:
+                    measured()
+                    result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+
+    # ru_maxrss is in KiB on Linux
+    result["max_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return result
+
+
+def run_case_subprocess(name: str, size: int, repeat: int, measure_memory: bool, timeout: float) -> Dict[str, Any]:
+    """Run one benchmark case in a child process (output of the collectors is discarded)."""
+    command = [sys.executable, "-m", "perf.benchmarks", "--case", name, str(size), "--repeat", str(repeat)]
+    if not measure_memory:
+        command.append("--no-memory")
+    try:
+        completed = subprocess.run(
+            command, cwd=backend_path, capture_output=True, text=True, timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return {"benchmark": name, "size": size, "status": "timeout", "error": f"Exceeded {timeout:.0f}s"}
+
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    error = (completed.stderr.strip().splitlines() or [f"exit status {completed.returncode}"])[-1]
+    return {"benchmark": name, "size": size, "status": "error", "error": error}
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """
+    Compare two result files case by case.
+
+    Args:
+        baseline: Baseline results
+        current: Current results
+        threshold: Allowed slowdown/memory growth in percent
+
+    Returns:
+        One row per case and metric present in both, with `regression` set when over the threshold
+    """
+    baseline_cases = {
+        (case["benchmark"], case["size"]): case for case in baseline.get("results", []) if case.get("status") == "ok"
+    }
+    rows = []
+    for case in current.get("results", []):
+        previous = baseline_cases.get((case["benchmark"], case["size"]))
+        if previous is None or case.get("status") != "ok":
+            continue
+        for metric in ("seconds", "peak_memory_bytes"):
+            old, new = previous.get(metric), case.get(metric)
+            if not old or new is None:
+                continue
+            change_pct = (new - old) / old * 100
+            rows.append({
+                "benchmark": case["benchmark"],
+                "size": case["size"],
+                "metric": metric,
+                "baseline": old,
+                "current": new,
+                "change_pct": change_pct,
+                "regression": change_pct > threshold,
+            })
+    return rows
+
+
+def _format_bytes(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(value) < 1024 or unit == "GiB":
+            return f"{value:.1f} {unit}"
+        value /= 1024
+
+
+def print_results(results: Dict[str, Any], comparison: Optional[List[Dict[str, Any]]] = None, out=None):
+    out = out or sys.stdout
+    out.write(f"{'benchmark':<26} {'size':>9} {'seconds':>10} {'items/s':>12} {'peak mem':>12} {'max rss':>12}\n")
+    for case in results["results"]:
+        if case.get("status") != "ok":
+            out.write(f"{case['benchmark']:<26} {case['size']:>9} {case['status']:>10}  {case.get('error', '')}\n")
+            continue
+        rate = f"{case['items_per_second']:.0f}" if case.get("items_per_second") else "-"
+        out.write(
+            f"{case['benchmark']:<26} {case['size']:>9} {case['seconds']:>10.3f} {rate:>12} "
+            f"{_format_bytes(case.get('peak_memory_bytes')):>12} {_format_bytes(case.get('max_rss_bytes')):>12}\n"
+        )
+
+    if comparison:
+        out.write("\nComparison with baseline\n")
+        for row in comparison:
+            flag = "REGRESSION" if row["regression"] else ""
+            out.write(f"{row['benchmark']:<26} {row['size']:>9} {row['metric']:<18} {row['change_pct']:>+8.1f}%  {flag}\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="GHA-Dashboard benchmark suite")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma-separated repository sizes in runs (e.g. 1000,10000,100000,1000000)")
+    parser.add_argument("--only", default=None, help=f"Comma-separated benchmarks among: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed repetitions per case (the median is reported)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run of every case")
+    parser.add_argument("--all-sizes", action="store_true", help="Ignore the default size limit of API-bound benchmarks")
+    parser.add_argument("--timeout", type=float, default=1800.0, help="Seconds allowed per case")
+    parser.add_argument("-o", "--output", default=None, help="Write the results to this JSON file")
+    parser.add_argument("--baseline", default=None, help="Results JSON to compare with")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Regression threshold in percent")
+    parser.add_argument("--case", nargs=2, metavar=("NAME", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.case:
+        result = run_case(args.case[0], int(args.case[1]), args.repeat, not args.no_memory)
+        print(RESULT_PREFIX + json.dumps(result))
+        return 0
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(unknown)}")
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    results = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "sizes": sizes,
+        "results": [],
+    }
+    for name in names:
+        max_size = BENCHMARKS[name][1]
+        for size in sizes:
+            if max_size is not None and size > max_size and not args.all_sizes:
+                result = {"benchmark": name, "size": size, "status": "skipped",
+                          "error": f"over {max_size} runs (use --all-sizes)"}
+            else:
+                print(f"[Benchmarks] Running {name} with {size} runs...", file=sys.stderr)
+                result = run_case_subprocess(name, size, args.repeat, not args.no_memory, args.timeout)
+            results["results"].append(result)
+
+    comparison = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            comparison = compare_results(json.load(f), results, args.threshold)
+        results["comparison"] = comparison
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    print_results(results, comparison)
+
+    return 1 if comparison and any(row["regression"] for row in comparison) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,726 @@
+"""
+Fake GitHub API server for offline, deterministic performance testing.
+Serves synthetic repositories of any size (runs are computed from their index,
+nothing is materialized) or repositories recorded from the real API, with Link
+pagination, rate-limit headers and 403/429 responses, and injected latency.
+
+Point the backend at it with GITHUB_API_URL:
+    python -m perf.fake_github serve --port 8765 --repo owner/repo --runs 100000
+    GITHUB_API_URL=http://127.0.0.1:8765 python app.py
+
+Record a real repository into a fixture:
+    python -m perf.fake_github record owner/repo -o owner_repo.json --max-runs 500
+"""
+import argparse
+import base64
+import hashlib
+import io
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zipfile
+from abc import ABC, abstractmethod
+from collections import Counter
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+backend_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
+GITHUB_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+RUN_ID_BASE = 1_000_000_000
+CONCLUSIONS = ("success", "failure", "cancelled", "skipped")
+
+
+def _format_time(value: datetime) -> str:
+    return value.strftime(GITHUB_TIME_FORMAT)
+
+
+def _parse_time(value: str, end_of_day: bool = False) -> datetime:
+    value = value.strip()
+    if len(value) == 10:
+        parsed = datetime.strptime(value, "%Y-%m-%d")
+        return parsed + timedelta(days=1, microseconds=-1) if end_of_day else parsed
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+
+
+def parse_created_filter(created: Optional[str]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Parse the 'created' query qualifier of the runs endpoints.
+
+    Returns:
+        (earliest, latest) inclusive bounds, None when unbounded
+    """
+    if not created:
+        return None, None
+    if ".." in created:
+        start, end = created.split("..", 1)
+        return (_parse_time(start) if start and start != "*" else None,
+                _parse_time(end, end_of_day=True) if end and end != "*" else None)
+    if created.startswith(">="):
+        return _parse_time(created[2:]), None
+    if created.startswith(">"):
+        return _parse_time(created[1:], end_of_day=True) + timedelta(microseconds=1), None
+    if created.startswith("<="):
+        return None, _parse_time(created[2:], end_of_day=True)
+    if created.startswith("<"):
+        return None, _parse_time(created[1:]) - timedelta(microseconds=1)
+    return _parse_time(created), _parse_time(created, end_of_day=True)
+
+
+class _MappedSequence(Sequence):
+    """Read-only sequence applying a function to the items of another sequence (lazily)."""
+
+    def __init__(self, items: Sequence, transform):
+        self.items = items
+        self.transform = transform
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.transform(item) for item in self.items[index]]
+        return self.transform(self.items[index])
+
+
+class FakeRepository(ABC):
+    """Interface of the repositories served by the fake server."""
+
+    full_name: str
+
+    @abstractmethod
+    def workflows(self) -> List[Dict[str, Any]]:
+        """Workflows of the repository."""
+
+    @abstractmethod
+    def select_runs(self, workflow_id: Optional[int] = None, created: Optional[str] = None) -> Sequence[Dict[str, Any]]:
+        """Runs newest first, optionally restricted to a workflow and a 'created' qualifier."""
+
+    @abstractmethod
+    def jobs(self, run_id: int) -> Optional[List[Dict[str, Any]]]:
+        """Jobs of a run, or None if the run does not exist."""
+
+    def logs_archive(self, run_id: int) -> Optional[bytes]:
+        """Zip archive of the run logs, or None if the run does not exist."""
+        jobs = self.jobs(run_id)
+        if jobs is None:
+            return None
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for index, job in enumerate(jobs, start=1):
+                lines = [f"{job.get('started_at')} ##[group]Run {job.get('name')}"]
+                for step in job.get("steps") or []:
+                    lines.append(f"{step.get('started_at')} Step {step.get('number')}: {step.get('name')} {step.get('conclusion')}")
+                lines.append(f"{job.get('completed_at')} Tests run: 42, Failures: 0, Errors: 0, Skipped: 1")
+                archive.writestr(f"{index}_{job.get('name')}.txt", "\n".join(lines) + "\n")
+        return buffer.getvalue()
+
+    def commit(self, sha: str) -> Dict[str, Any]:
+        digest = hashlib.sha1(sha.encode("utf-8")).digest()
+        files = [
+            {
+                "filename": f"src/module_{digest[index] % 50}/file_{digest[index + 1]}.py",
+                "status": "modified",
+                "additions": digest[index + 2] % 40,
+                "deletions": digest[index + 3] % 20,
+                "changes": digest[index + 2] % 40 + digest[index + 3] % 20,
+            }
+            for index in range(0, 4 * (digest[0] % 4 + 1), 4)
+        ]
+        return {"sha": sha, "commit": {"message": f"Change {sha[:7]}"}, "files": files}
+
+
+class SyntheticRepository(FakeRepository):
+    """
+    Repository whose runs are computed from their number, so any size can be served.
+    Run number n (1 = oldest) is created n - 1 intervals after `start` and belongs
+    to workflow n % workflows.
+    """
+
+    def __init__(self, full_name: str, runs: int, workflows: int = 3, jobs_per_run: int = 3,
+                 steps_per_job: int = 4, start: datetime = datetime(2025, 1, 1),
+                 interval: timedelta = timedelta(minutes=30), failure_rate: float = 0.1, seed: int = 0):
+        self.full_name = full_name
+        self.run_count = runs
+        self.workflow_count = max(1, workflows)
+        self.jobs_per_run = jobs_per_run
+        self.steps_per_job = steps_per_job
+        self.start = start
+        self.interval = interval
+        self.failure_rate = failure_rate
+        self.seed = seed
+
+    def workflow_id(self, index: int) -> int:
+        return 1000 + index
+
+    def workflows(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": self.workflow_id(index),
+                "name": f"Workflow {index}",
+                "path": f".github/workflows/workflow_{index}.yml",
+                "state": "active",
+            }
+            for index in range(self.workflow_count)
+        ]
+
+    def _numbers(self, workflow_id: Optional[int], created: Optional[str]) -> range:
+        low, high = 1, self.run_count
+        earliest, latest = parse_created_filter(created)
+        interval_seconds = self.interval.total_seconds()
+        if earliest is not None:
+            low = max(low, math.ceil((earliest - self.start).total_seconds() / interval_seconds) + 1)
+        if latest is not None:
+            high = min(high, math.floor((latest - self.start).total_seconds() / interval_seconds) + 1)
+        if workflow_id is None:
+            return range(high, low - 1, -1)
+
+        residue = workflow_id - self.workflow_id(0)
+        if residue < 0 or residue >= self.workflow_count or high < low:
+            return range(0)
+        newest = high - ((high - residue) % self.workflow_count)
+        return range(newest, low - 1, -self.workflow_count)
+
+    def select_runs(self, workflow_id=None, created=None):
+        return _MappedSequence(self._numbers(workflow_id, created), self.run)
+
+    def _random(self, number: int) -> random.Random:
+        return random.Random(self.seed * 1_000_003 + number)
+
+    def run(self, number: int) -> Dict[str, Any]:
+        rng = self._random(number)
+        created_at = self.start + self.interval * (number - 1)
+        duration = rng.randint(60, 1800)
+        conclusion = "failure" if rng.random() < self.failure_rate else "success"
+        workflow_index = number % self.workflow_count
+        sha = hashlib.sha1(f"{self.full_name}:{number}".encode("utf-8")).hexdigest()
+        return {
+            "id": RUN_ID_BASE + number,
+            "name": f"Workflow {workflow_index}",
+            "workflow_id": self.workflow_id(workflow_index),
+            "run_number": number,
+            "run_attempt": 1,
+            "event": "pull_request" if number % 3 == 0 else "push",
+            "status": "completed",
+            "conclusion": conclusion,
+            "head_branch": "main" if number % 4 else f"feature-{number % 17}",
+            "head_sha": sha,
+            "actor": {"login": f"user{number % 11}"},
+            "triggering_actor": {"login": f"user{number % 11}"},
+            "created_at": _format_time(created_at),
+            "run_started_at": _format_time(created_at),
+            "updated_at": _format_time(created_at + timedelta(seconds=duration)),
+            "pull_requests": [{"number": number % 500 + 1}] if number % 3 == 0 else [],
+            "html_url": f"https://github.com/{self.full_name}/actions/runs/{RUN_ID_BASE + number}",
+        }
+
+    def jobs(self, run_id: int) -> Optional[List[Dict[str, Any]]]:
+        number = int(run_id) - RUN_ID_BASE
+        if number < 1 or number > self.run_count:
+            return None
+        run = self.run(number)
+        rng = self._random(number)
+        started_at = datetime.strptime(run["created_at"], GITHUB_TIME_FORMAT)
+        failed_job = rng.randrange(self.jobs_per_run) if run["conclusion"] == "failure" and self.jobs_per_run else -1
+        jobs = []
+        for job_index in range(self.jobs_per_run):
+            job_start = started_at + timedelta(seconds=rng.randint(0, 30))
+            steps = []
+            step_start = job_start
+            for step_index in range(self.steps_per_job):
+                step_end = step_start + timedelta(seconds=rng.randint(1, 120))
+                steps.append({
+                    "name": f"Step {step_index}",
+                    "number": step_index + 1,
+                    "status": "completed",
+                    "conclusion": "failure" if job_index == failed_job and step_index == self.steps_per_job - 1 else "success",
+                    "started_at": _format_time(step_start),
+                    "completed_at": _format_time(step_end),
+                })
+                step_start = step_end
+            jobs.append({
+                "id": (RUN_ID_BASE + number) * 100 + job_index,
+                "run_id": run["id"],
+                "name": f"job-{job_index}",
+                "status": "completed",
+                "conclusion": "failure" if job_index == failed_job else "success",
+                "started_at": _format_time(job_start),
+                "completed_at": _format_time(step_start),
+                "head_sha": run["head_sha"],
+                "runner_name": f"runner-{rng.randint(1, 20)}",
+                "steps": steps,
+            })
+        return jobs
+
+
+class FixtureRepository(FakeRepository):
+    """
+    Repository served from recorded (or generated) GitHub API payloads:
+    {"full_name": ..., "workflows": [...], "runs": [...], "jobs": {"<run_id>": [...]}}
+    """
+
+    def __init__(self, fixture: Dict[str, Any]):
+        self.full_name = fixture["full_name"]
+        self._workflows = fixture.get("workflows") or []
+        self._runs = sorted(fixture.get("runs") or [], key=lambda run: run.get("created_at") or "", reverse=True)
+        self._jobs = {str(run_id): jobs for run_id, jobs in (fixture.get("jobs") or {}).items()}
+        self._run_ids = {str(run["id"]) for run in self._runs}
+
+    @classmethod
+    def load(cls, path: str) -> "FixtureRepository":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def workflows(self):
+        return self._workflows
+
+    def select_runs(self, workflow_id=None, created=None):
+        earliest, latest = parse_created_filter(created)
+        runs = []
+        for run in self._runs:
+            if workflow_id is not None and run.get("workflow_id") != workflow_id:
+                continue
+            created_at = _parse_time(run["created_at"]) if (earliest or latest) else None
+            if earliest and created_at < earliest:
+                continue
+            if latest and created_at > latest:
+                continue
+            runs.append(run)
+        return runs
+
+    def jobs(self, run_id):
+        if str(run_id) not in self._run_ids:
+            return None
+        return self._jobs.get(str(run_id), [])
+
+
+class RateLimiter:
+    """Per-token request budget emulating GitHub's primary rate limit."""
+
+    def __init__(self, limit: Optional[int], window: float = 3600.0):
+        self.limit = limit
+        self.window = window
+        self._buckets: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, token: str) -> Tuple[bool, Dict[str, str]]:
+        """
+        Count a request against a token's budget.
+
+        Returns:
+            (allowed, rate limit headers)
+        """
+        if self.limit is None:
+            return True, {}
+        now = time.time()
+        with self._lock:
+            used, reset_at = self._buckets.get(token, (0, now + self.window))
+            if now >= reset_at:
+                used, reset_at = 0, now + self.window
+            allowed = used < self.limit
+            if allowed:
+                used += 1
+            self._buckets[token] = (used, reset_at)
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(max(0, self.limit - used)),
+            "X-RateLimit-Used": str(used),
+            "X-RateLimit-Reset": str(math.ceil(reset_at)),
+            "X-RateLimit-Resource": "core",
+        }
+        if not allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(reset_at - now)))
+        return allowed, headers
+
+
+class FakeGitHubServer:
+    """
+    Local HTTP server implementing the GitHub API endpoints used by the collectors.
+    """
+
+    def __init__(self, repositories: Optional[List[FakeRepository]] = None, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, rate_limit: Optional[int] = None,
+                 rate_limit_window: float = 3600.0, rate_limit_status: int = 403,
+                 default_runs: Optional[int] = None, seed: int = 0):
+        """
+        Initialize the fake server.
+
+        Args:
+            repositories: Repositories to serve
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Seconds added to every response
+            jitter: Maximum random seconds added on top of the latency
+            rate_limit: Requests allowed per token and window (None disables rate limiting)
+            rate_limit_window: Seconds until an exhausted budget resets
+            rate_limit_status: Status of rate-limited responses (403 like GitHub's primary limit, or 429)
+            default_runs: Serve unknown repositories as synthetic repositories of this size (404 when None)
+            seed: Seed of the latency jitter and of auto-created repositories
+        """
+        self.repositories: Dict[str, FakeRepository] = {
+            repository.full_name.lower(): repository for repository in repositories or []
+        }
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limiter = RateLimiter(rate_limit, rate_limit_window)
+        self.rate_limit_status = rate_limit_status
+        self.default_runs = default_runs
+        self.seed = seed
+        self.request_counts: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add_repository(self, repository: FakeRepository):
+        with self._lock:
+            self.repositories[repository.full_name.lower()] = repository
+
+    def repository(self, full_name: str) -> Optional[FakeRepository]:
+        with self._lock:
+            repository = self.repositories.get(full_name.lower())
+            if repository is None and self.default_runs is not None:
+                repository = SyntheticRepository(full_name, self.default_runs, seed=self.seed)
+                self.repositories[full_name.lower()] = repository
+            return repository
+
+    def start(self) -> "FakeGitHubServer":
+        """Serve requests from a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def count_request(self, route: str):
+        """Count a request to a route (handler threads run concurrently)."""
+        with self._lock:
+            self.request_counts[route] += 1
+
+    def _delay(self) -> float:
+        if not self.latency and not self.jitter:
+            return 0.0
+        with self._lock:
+            return self.latency + self._random.uniform(0, self.jitter)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(_FakeGitHubHandler):
+            fake = server
+
+        return Handler
+
+
+class _FakeGitHubHandler(BaseHTTPRequestHandler):
+    fake: FakeGitHubServer
+    protocol_version = "HTTP/1.1"
+
+    ROUTES = (
+        ("user", re.compile(r"^/user$")),
+        ("rate_limit", re.compile(r"^/rate_limit$")),
+        ("repository", re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)$")),
+        ("workflows", re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/actions/workflows$")),
+        ("workflow_runs", re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/actions/workflows/(?P<workflow_id>\d+)/runs$")),
+        ("runs", re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/actions/runs$")),
+        ("jobs", re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/actions/runs/(?P<run_id>\d+)/jobs$")),
+        ("logs", re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/actions/runs/(?P<run_id>\d+)/logs$")),
+        ("commit", re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/commits/(?P<sha>[0-9a-fA-F]+)$")),
+        ("contents", re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/contents(?:/(?P<path>.*))?$")),
+    )
+
+    def log_message(self, format, *args):
+        # Keep benchmark output clean
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+        for route, pattern in self.ROUTES:
+            match = pattern.match(url.path)
+            if match:
+                break
+        else:
+            route, match = "unknown", None
+        self.fake.count_request(route)
+
+        delay = self.fake._delay()
+        if delay:
+            time.sleep(delay)
+
+        authorization = self.headers.get("Authorization", "")
+        allowed, rate_headers = self.fake.rate_limiter.acquire(authorization)
+        if not allowed:
+            self._send_json(self.fake.rate_limit_status, {
+                "message": "API rate limit exceeded",
+                "documentation_url": "https://docs.github.com/rest/overview/resources-in-the-rest-api#rate-limiting",
+            }, rate_headers)
+            return
+
+        if match is None:
+            self._send_json(404, {"message": "Not Found"}, rate_headers)
+            return
+
+        try:
+            getattr(self, f"_get_{route}")(match.groupdict(), query, url.path, rate_headers)
+        except Exception as e:
+            self._send_json(500, {"message": f"Fake server error: {e}"}, rate_headers)
+
+    def _repository(self, params, headers) -> Optional[FakeRepository]:
+        repository = self.fake.repository(params["repo"])
+        if repository is None:
+            self._send_json(404, {"message": "Not Found"}, headers)
+        return repository
+
+    def _get_user(self, params, query, path, headers):
+        self._send_json(200, {"login": "fake-user", "id": 1, "type": "User"}, headers)
+
+    def _get_rate_limit(self, params, query, path, headers):
+        limiter = self.fake.rate_limiter
+        core = {
+            "limit": limiter.limit or 5000,
+            "remaining": int(headers.get("X-RateLimit-Remaining", limiter.limit or 5000)),
+            "reset": int(headers.get("X-RateLimit-Reset", time.time() + 3600)),
+        }
+        self._send_json(200, {"resources": {"core": core}, "rate": core}, headers)
+
+    def _get_repository(self, params, query, path, headers):
+        repository = self._repository(params, headers)
+        if repository:
+            self._send_json(200, {
+                "full_name": repository.full_name,
+                "name": repository.full_name.split("/")[-1],
+                "private": False,
+                "default_branch": "main",
+                "permissions": {"pull": True, "push": False, "admin": False},
+            }, headers)
+
+    def _get_workflows(self, params, query, path, headers):
+        repository = self._repository(params, headers)
+        if repository:
+            workflows = repository.workflows()
+            self._send_json(200, {"total_count": len(workflows), "workflows": workflows}, headers)
+
+    def _get_workflow_runs(self, params, query, path, headers):
+        repository = self._repository(params, headers)
+        if repository:
+            runs = repository.select_runs(int(params["workflow_id"]), query.get("created"))
+            self._send_page(runs, "workflow_runs", query, path, headers)
+
+    def _get_runs(self, params, query, path, headers):
+        repository = self._repository(params, headers)
+        if repository:
+            runs = repository.select_runs(None, query.get("created"))
+            self._send_page(runs, "workflow_runs", query, path, headers)
+
+    def _get_jobs(self, params, query, path, headers):
+        repository = self._repository(params, headers)
+        if not repository:
+            return
+        jobs = repository.jobs(int(params["run_id"]))
+        if jobs is None:
+            self._send_json(404, {"message": "Not Found"}, headers)
+            return
+        self._send_page(jobs, "jobs", query, path, headers)
+
+    def _get_logs(self, params, query, path, headers):
+        repository = self._repository(params, headers)
+        if not repository:
+            return
+        archive = repository.logs_archive(int(params["run_id"]))
+        if archive is None:
+            self._send_json(404, {"message": "Not Found"}, headers)
+            return
+        self._send_bytes(200, archive, "application/zip", headers)
+
+    def _get_commit(self, params, query, path, headers):
+        repository = self._repository(params, headers)
+        if repository:
+            self._send_json(200, repository.commit(params["sha"]), headers)
+
+    def _get_contents(self, params, query, path, headers):
+        repository = self._repository(params, headers)
+        if not repository:
+            return
+        file_path = params.get("path") or ""
+        workflow = next((item for item in repository.workflows() if item.get("path") == file_path), None)
+        if workflow is None:
+            self._send_json(404, {"message": "Not Found"}, headers)
+            return
+        content = f"name: {workflow.get('name')}\non: [push, pull_request]\njobs:\n  build:\n    runs-on: ubuntu-latest\n"
+        self._send_json(200, {
+            "name": file_path.split("/")[-1],
+            "path": file_path,
+            "encoding": "base64",
+            "content": base64.b64encode(content.encode("utf-8")).decode("ascii"),
+        }, headers)
+
+    def _send_page(self, items: Sequence, key: str, query: Dict[str, str], path: str, headers: Dict[str, str]):
+        try:
+            per_page = max(1, min(100, int(query.get("per_page", 30))))
+            page = max(1, int(query.get("page", 1)))
+        except ValueError:
+            self._send_json(422, {"message": "Invalid pagination parameters"}, headers)
+            return
+
+        total = len(items)
+        last_page = max(1, math.ceil(total / per_page))
+        payload = {"total_count": total, key: items[(page - 1) * per_page:page * per_page]}
+
+        links = []
+        base = f"http://{self.headers.get('Host', 'localhost')}{path}"
+
+        def page_url(number):
+            return f"{base}?{urlencode({**query, 'page': number, 'per_page': per_page})}"
+
+        if page < last_page:
+            links.append(f'<{page_url(page + 1)}>; rel="next"')
+            links.append(f'<{page_url(last_page)}>; rel="last"')
+        if page > 1:
+            links.append(f'<{page_url(1)}>; rel="first"')
+            links.append(f'<{page_url(page - 1)}>; rel="prev"')
+        if links:
+            headers = {**headers, "Link": ", ".join(links)}
+        self._send_json(200, payload, headers)
+
+    def _send_json(self, status: int, payload: Any, headers: Dict[str, str]):
+        self._send_bytes(status, json.dumps(payload).encode("utf-8"), "application/json; charset=utf-8", headers)
+
+    def _send_bytes(self, status: int, body: bytes, content_type: str, headers: Dict[str, str]):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def record_repository(repo: str, token: str, max_runs: int = 1000, fetch_jobs: bool = True) -> Dict[str, Any]:
+    """
+    Record a repository from the GitHub API (GITHUB_API_URL) into a fixture.
+
+    Args:
+        repo: Repository (owner/name)
+        token: GitHub token
+        max_runs: Newest runs to record
+        fetch_jobs: Also record the jobs of every recorded run
+
+    Returns:
+        Fixture dict loadable with FixtureRepository
+    """
+    import requests
+    from core.utils.github import github_api_url
+
+    headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github+json"}
+
+    def get(path, params=None):
+        response = requests.get(github_api_url(path), headers=headers, params=params, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    workflows = get(f"/repos/{repo}/actions/workflows").get("workflows", [])
+    runs = []
+    page = 1
+    while len(runs) < max_runs:
+        page_runs = get(f"/repos/{repo}/actions/runs", {"page": page, "per_page": 100}).get("workflow_runs", [])
+        if not page_runs:
+            break
+        runs.extend(page_runs)
+        page += 1
+    runs = runs[:max_runs]
+
+    jobs = {}
+    if fetch_jobs:
+        for run in runs:
+            jobs[str(run["id"])] = get(f"/repos/{repo}/actions/runs/{run['id']}/jobs", {"per_page": 100}).get("jobs", [])
+    return {"full_name": repo, "workflows": workflows, "runs": runs, "jobs": jobs}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Fake GitHub API server for offline performance testing")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve = subparsers.add_parser("serve", help="Serve synthetic and recorded repositories")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--repo", action="append", default=[], help="Synthetic repository (owner/name), repeatable")
+    serve.add_argument("--runs", type=int, default=1000, help="Runs of each synthetic repository")
+    serve.add_argument("--workflows", type=int, default=3, help="Workflows of each synthetic repository")
+    serve.add_argument("--jobs-per-run", type=int, default=3)
+    serve.add_argument("--failure-rate", type=float, default=0.1)
+    serve.add_argument("--fixture", action="append", default=[], help="Recorded repository fixture (JSON), repeatable")
+    serve.add_argument("--default-runs", type=int, default=None,
+                       help="Serve any unknown repository as a synthetic repository of this size")
+    serve.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    serve.add_argument("--jitter", type=float, default=0.0, help="Maximum random seconds added to the latency")
+    serve.add_argument("--rate-limit", type=int, default=None, help="Requests per token and window")
+    serve.add_argument("--rate-limit-window", type=float, default=3600.0)
+    serve.add_argument("--rate-limit-status", type=int, choices=(403, 429), default=403)
+    serve.add_argument("--seed", type=int, default=0)
+
+    record = subparsers.add_parser("record", help="Record a repository from the GitHub API into a fixture")
+    record.add_argument("repo")
+    record.add_argument("-o", "--output", required=True)
+    record.add_argument("--max-runs", type=int, default=1000)
+    record.add_argument("--no-jobs", action="store_true", help="Do not record the jobs of the runs")
+    record.add_argument("--token", default=None, help="GitHub token (defaults to GITHUB_TOKEN)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        token = args.token or os.getenv("GITHUB_TOKEN")
+        fixture = record_repository(args.repo, token, args.max_runs, not args.no_jobs)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(fixture, f)
+        print(f"[FakeGitHub] Recorded {len(fixture['runs'])} runs of {args.repo} to {args.output}")
+        return
+
+    repositories: List[FakeRepository] = [
+        SyntheticRepository(repo, args.runs, args.workflows, args.jobs_per_run,
+                            failure_rate=args.failure_rate, seed=args.seed)
+        for repo in args.repo
+    ]
+    repositories.extend(FixtureRepository.load(path) for path in args.fixture)
+    server = FakeGitHubServer(
+        repositories, args.host, args.port, latency=args.latency, jitter=args.jitter,
+        rate_limit=args.rate_limit, rate_limit_window=args.rate_limit_window,
+        rate_limit_status=args.rate_limit_status, default_runs=args.default_runs, seed=args.seed
+    )
+    print(f"[FakeGitHub] Serving {len(repositories)} repositories on {server.url}")
+    print(f"[FakeGitHub] Start the backend with GITHUB_API_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
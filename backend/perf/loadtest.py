@@ -0,0 +1,383 @@
+"""
+WebSocket load test simulating many dashboard clients.
+
+Each client follows the extension's protocol: POST /api/extractions, connect to
+/data/<extractionId> and consume the runs/job_progress/complete messages. Clients
+run in waves of increasing concurrency; every wave reports time to first batch,
+completion time, message rates, errors and the CPU/RSS of the backend process tree.
+
+Start a backend and a fake GitHub server, then load them:
+    python -m perf.loadtest --spawn-backend --concurrency 1,5,10,25 --runs 1000 -o load.json
+
+Or load an already running backend (pointed at a fake GitHub with GITHUB_API_URL):
+    python -m perf.loadtest --backend http://127.0.0.1:3000 --server-pid 12345 --concurrency 5,10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import requests
+
+backend_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
+from perf.fake_github import FakeGitHubServer
+from perf.log_analyzer import percentile
+
+# Always accepted by is_allowed_origin, whatever CHROME_EXTENSION_ID is configured
+DEFAULT_ORIGIN = "moz-extension://gha-dashboard-loadtest"
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def _process_tree(root_pid: int) -> List[int]:
+    """PIDs of a process and all its descendants (extraction workers), read from /proc."""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(entry))
+
+    pids, pending = [], [root_pid]
+    while pending:
+        pid = pending.pop()
+        pids.append(pid)
+        pending.extend(children.get(pid, []))
+    return pids
+
+
+def _process_usage(pid: int) -> Optional[tuple]:
+    """(CPU seconds, RSS bytes) of one process."""
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    # Fields after the command name start at field 3 (state): utime is 14, stime 15, rss 24
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    return cpu_seconds, int(fields[21]) * PAGE_SIZE
+
+
+class ProcessSampler:
+    """Samples the CPU time and RSS of a backend process tree in a background thread."""
+
+    def __init__(self, pid: Optional[int], interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[tuple] = []
+        # Exited workers keep their last CPU time in the totals
+        self._cpu_by_pid: Dict[int, float] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self):
+        if self.pid is None:
+            return
+        rss = 0
+        for pid in _process_tree(self.pid):
+            usage = _process_usage(pid)
+            if usage:
+                self._cpu_by_pid[pid] = usage[0]
+                rss += usage[1]
+        self.samples.append((time.perf_counter(), sum(self._cpu_by_pid.values()), rss))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        self.sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop sampling and summarize: CPU seconds used, average cores busy and peak RSS."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.sample()
+        if len(self.samples) < 2:
+            return {"cpu_seconds": None, "cpu_cores": None, "peak_rss_bytes": None}
+        wall = self.samples[-1][0] - self.samples[0][0]
+        cpu = self.samples[-1][1] - self.samples[0][1]
+        return {
+            "cpu_seconds": cpu,
+            "cpu_cores": cpu / wall if wall > 0 else None,
+            "peak_rss_bytes": max(sample[2] for sample in self.samples),
+        }
+
+
+def run_client(backend_url: str, repo: str, token: str, filters: Dict[str, Any], origin: str,
+               timeout: float) -> Dict[str, Any]:
+    """
+    Run one dashboard client through the extraction protocol.
+
+    Returns:
+        Client result: timings (seconds from the POST), message counts and the error if any
+    """
+    from simple_websocket import Client, ConnectionClosed
+
+    result = {
+        "repo": repo, "status": "ok", "error": None, "time_to_first_batch": None, "completion_time": None,
+        "messages": {}, "bytes": 0, "runs": 0,
+    }
+    start = time.perf_counter()
+    client = None
+    try:
+        response = requests.post(
+            f"{backend_url}/api/extractions",
+            headers={"Authorization": f"Bearer {token}", "Origin": origin},
+            json={"repo": repo, "filters": filters},
+            timeout=timeout,
+        )
+        if response.status_code != 201:
+            raise RuntimeError(f"POST /api/extractions returned {response.status_code}")
+        extraction_id = response.json()["extractionId"]
+
+        ws_url = backend_url.replace("http://", "ws://", 1).replace("https://", "wss://", 1)
+        client = Client.connect(f"{ws_url}/data/{extraction_id}", headers={"Origin": origin})
+        deadline = start + timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise TimeoutError(f"No completion after {timeout:.0f}s")
+            payload = client.receive(timeout=remaining)
+            if payload is None:
+                continue
+            result["bytes"] += len(payload)
+            message = json.loads(payload)
+            message_type = message.get("type", "unknown")
+            result["messages"][message_type] = result["messages"].get(message_type, 0) + 1
+            if message_type == "runs":
+                result["runs"] += len(message.get("data") or [])
+                if result["time_to_first_batch"] is None:
+                    result["time_to_first_batch"] = time.perf_counter() - start
+            elif message_type == "error":
+                raise RuntimeError(f"Server error: {message.get('message')}")
+            elif message_type == "complete":
+                result["completion_time"] = time.perf_counter() - start
+                break
+    except ConnectionClosed:
+        result["status"], result["error"] = "error", "Connection closed before completion"
+    except Exception as e:
+        result["status"], result["error"] = "error", f"{type(e).__name__}: {e}"
+    finally:
+        if client is not None:
+            try:
+                client.close()
+            except Exception:
+                pass
+    return result
+
+
+def _distribution(values: List[float]) -> Dict[str, Optional[float]]:
+    values = sorted(value for value in values if value is not None)
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "max": values[-1] if values else None,
+        "mean": statistics.fmean(values) if values else None,
+    }
+
+
+def run_wave(backend_url: str, concurrency: int, repos: List[str], token: str, filters: Dict[str, Any],
+             origin: str, timeout: float, server_pid: Optional[int]) -> Dict[str, Any]:
+    """Run `concurrency` clients at once and summarize the wave."""
+    results: List[Optional[Dict[str, Any]]] = [None] * concurrency
+    start_barrier = threading.Barrier(concurrency)
+
+    def client(index):
+        start_barrier.wait()
+        results[index] = run_client(backend_url, repos[index], token, filters, origin, timeout)
+
+    sampler = ProcessSampler(server_pid).start()
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(index,), daemon=True) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    server = sampler.stop()
+
+    messages = sum(sum(result["messages"].values()) for result in results)
+    errors: Dict[str, int] = {}
+    for result in results:
+        if result["error"]:
+            kind = result["error"].split(":", 1)[0]
+            errors[kind] = errors.get(kind, 0) + 1
+    return {
+        "concurrency": concurrency,
+        "clients_completed": sum(1 for result in results if result["status"] == "ok"),
+        "errors": errors,
+        "wall_seconds": wall,
+        "time_to_first_batch": _distribution([result["time_to_first_batch"] for result in results]),
+        "completion_time": _distribution([result["completion_time"] for result in results]),
+        "messages": messages,
+        "messages_per_second": messages / wall if wall > 0 else None,
+        "runs_received": sum(result["runs"] for result in results),
+        "bytes_received": sum(result["bytes"] for result in results),
+        "server": server,
+        "clients": results,
+    }
+
+
+class SpawnedBackend:
+    """Backend process (python app.py) with scratch storage, pointed at a fake GitHub API."""
+
+    def __init__(self, github_url: str, port: int, workers: int, log_path: Optional[str] = None):
+        self.workdir = tempfile.TemporaryDirectory(prefix="gha_loadtest_")
+        self.url = f"http://127.0.0.1:{port}"
+        env = {
+            **os.environ,
+            "GITHUB_API_URL": github_url,
+            "FLASK_RUN_PORT": str(port),
+            "FLASK_RUN_HOST": "127.0.0.1",
+            "FLASK_DEBUG": "0",
+            "EXTRACTION_WORKERS": str(workers),
+            "DATA_STORAGE_DIR": os.path.join(self.workdir.name, "storage"),
+            "EXTRACTION_DB_PATH": os.path.join(self.workdir.name, "extractions.sqlite3"),
+            "METRICS_DIR": os.path.join(self.workdir.name, "metrics"),
+            "TRACE_DIR": os.path.join(self.workdir.name, "traces"),
+        }
+        self.log_file = open(log_path, "w") if log_path else subprocess.DEVNULL
+        self.process = subprocess.Popen(
+            [sys.executable, "app.py"], cwd=backend_path, env=env, stdout=self.log_file, stderr=subprocess.STDOUT
+        )
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def wait_ready(self, timeout: float = 60.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Backend exited with status {self.process.returncode}")
+            try:
+                if requests.get(f"{self.url}/health", timeout=2).status_code == 200:
+                    return
+            except requests.RequestException:
+                pass
+            time.sleep(0.25)
+        raise TimeoutError(f"Backend not ready after {timeout:.0f}s")
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        if self.log_file is not subprocess.DEVNULL:
+            self.log_file.close()
+        self.workdir.cleanup()
+
+
+def _format_seconds(value: Optional[float]) -> str:
+    return f"{value:.2f}" if value is not None else "-"
+
+
+def print_report(waves: List[Dict[str, Any]], out=None):
+    out = out or sys.stdout
+    out.write(f"{'clients':>7} {'ok':>5} {'errors':>6} {'first p50':>10} {'first p95':>10} {'done p50':>9} "
+              f"{'done p95':>9} {'msg/s':>8} {'cpu cores':>9} {'peak rss':>10}\n")
+    for wave in waves:
+        server = wave["server"]
+        rss = f"{server['peak_rss_bytes'] / 1024 / 1024:.0f} MiB" if server.get("peak_rss_bytes") else "-"
+        cores = f"{server['cpu_cores']:.2f}" if server.get("cpu_cores") is not None else "-"
+        out.write(
+            f"{wave['concurrency']:>7} {wave['clients_completed']:>5} {sum(wave['errors'].values()):>6} "
+            f"{_format_seconds(wave['time_to_first_batch']['p50']):>10} {_format_seconds(wave['time_to_first_batch']['p95']):>10} "
+            f"{_format_seconds(wave['completion_time']['p50']):>9} {_format_seconds(wave['completion_time']['p95']):>9} "
+            f"{wave['messages_per_second'] or 0:>8.1f} {cores:>9} {rss:>10}\n"
+        )
+        for kind, count in wave["errors"].items():
+            out.write(f"{'':>7} {count} x {kind}\n")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="WebSocket load test simulating concurrent dashboard clients")
+    parser.add_argument("--backend", default=None, help="URL of a running backend (e.g. http://127.0.0.1:3000)")
+    parser.add_argument("--server-pid", type=int, default=None, help="PID of the running backend, to sample CPU/RSS")
+    parser.add_argument("--spawn-backend", action="store_true",
+                        help="Start a backend and a fake GitHub server for the test")
+    parser.add_argument("--port", type=int, default=3900, help="Port of the spawned backend")
+    parser.add_argument("--workers", type=int, default=2, help="Extraction workers of the spawned backend")
+    parser.add_argument("--backend-log", default=None, help="Write the spawned backend output to this file")
+    parser.add_argument("--concurrency", default="1,5,10", help="Comma-separated numbers of concurrent clients")
+    parser.add_argument("--runs", type=int, default=1000, help="Runs of each repository served by the fake GitHub server")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake GitHub latency in seconds")
+    parser.add_argument("--shared-repo", action="store_true",
+                        help="All clients of a wave request the same repository (exercises single-flight extractions)")
+    parser.add_argument("--jobs", action="store_true", help="Also collect job details (Phase 2)")
+    parser.add_argument("--token", default="loadtest-token")
+    parser.add_argument("--origin", default=DEFAULT_ORIGIN)
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds allowed per client")
+    parser.add_argument("-o", "--output", default=None, help="Write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    if not args.spawn_backend and not args.backend:
+        parser.error("Pass --backend URL or --spawn-backend")
+
+    fake_github = None
+    backend = None
+    backend_url, server_pid = args.backend, args.server_pid
+    if args.spawn_backend:
+        fake_github = FakeGitHubServer(default_runs=args.runs, latency=args.latency).start()
+        backend = SpawnedBackend(fake_github.url, args.port, args.workers, args.backend_log)
+        backend_url, server_pid = backend.url, backend.pid
+        print(f"[LoadTest] Started backend on {backend_url} (pid {server_pid}) with fake GitHub on {fake_github.url}")
+
+    filters = {"fetchJobDetails": args.jobs}
+    run_prefix = uuid.uuid4().hex[:6]
+    waves = []
+    try:
+        if backend:
+            backend.wait_ready()
+        for concurrency in [int(value) for value in args.concurrency.split(",") if value]:
+            # New repositories every wave, so no wave is served from the storage of a previous one
+            if args.shared_repo:
+                repos = [f"loadtest/{run_prefix}-c{concurrency}"] * concurrency
+            else:
+                repos = [f"loadtest/{run_prefix}-c{concurrency}-{index}" for index in range(concurrency)]
+            print(f"[LoadTest] Running {concurrency} concurrent clients...")
+            waves.append(run_wave(backend_url, concurrency, repos, args.token, filters, args.origin,
+                                  args.timeout, server_pid))
+    finally:
+        if backend:
+            backend.stop()
+        if fake_github:
+            fake_github.stop()
+
+    report = {
+        "backend": backend_url,
+        "runs_per_repository": args.runs if args.spawn_backend else None,
+        "shared_repo": args.shared_repo,
+        "fetch_job_details": args.jobs,
+        "waves": waves,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print_report(waves)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""
+Performance log analyzer
+Stream-parses backend/logs/performance_*.log files (format documented in
+PERFORMANCE_LOGGING.md) and reports API latency percentiles, runs/jobs
+throughput, rate-limit sleeps and phase durations.
+
+Usage:
+    python -m perf.log_analyzer logs/performance_owner_repo_*.log
+    python -m perf.log_analyzer new.log --baseline old.log
+    python -m perf.log_analyzer logs/*.log --group-by repo --json
+"""
+import argparse
+import json
+import re
+import sys
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+LINE_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) - \w+ - (.*)$")
+REPOSITORY_PATTERN = re.compile(r"^Performance logging started for repository: (.+)$")
+SECONDS_PATTERN = re.compile(r"^([\d.]+)s$")
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Percentile of sorted values with linear interpolation between closest ranks."""
+    if not sorted_values:
+        return None
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def _parse_fields(parts: Iterable[str]) -> Dict[str, str]:
+    fields = {}
+    for part in parts:
+        name, separator, value = part.partition(": ")
+        if separator:
+            fields[name.strip()] = value.strip()
+    return fields
+
+
+def _seconds(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    match = SECONDS_PATTERN.match(value)
+    return float(match.group(1)) if match else None
+
+
+def _int(value: Optional[str]) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class LogStats:
+    """Statistics accumulated over one or more performance logs."""
+
+    def __init__(self, name: str, interval: float = 60.0):
+        """
+        Initialize empty statistics.
+
+        Args:
+            name: Label of the group (file, repository or 'all')
+            interval: Width in seconds of the throughput-over-time buckets
+        """
+        self.name = name
+        self.interval = interval
+        self.files: List[str] = []
+        self.repositories = set()
+        self.api_durations: Dict[str, List[float]] = defaultdict(list)
+        self.api_statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.runs_fetched = 0
+        self.jobs_fetched = 0
+        self.rate_limit_sleeps = 0
+        self.rate_limit_sleep_seconds = 0.0
+        self.phase_durations: Dict[str, List[float]] = defaultdict(list)
+        self.timeline: Dict[int, Counter] = defaultdict(Counter)
+        self.wall_seconds = 0.0
+        self.unparsed_lines = 0
+
+    def add_file(self, path: str, lines: Iterable[str]):
+        """Parse the lines of one log file into the statistics."""
+        self.files.append(path)
+        first_time = None
+        last_time = None
+
+        for line in lines:
+            match = LINE_PATTERN.match(line.rstrip("\n"))
+            if not match:
+                if line.strip():
+                    self.unparsed_lines += 1
+                continue
+
+            timestamp = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S")
+            if first_time is None:
+                first_time = timestamp
+            last_time = timestamp
+            bucket = int((timestamp - first_time).total_seconds() // self.interval)
+            message = match.group(2)
+
+            if message.startswith("API_CALL - "):
+                parts = message.split(" - ")
+                api_type = parts[1] if len(parts) > 1 else "UNKNOWN_API"
+                fields = _parse_fields(parts[2:])
+                duration = _seconds(fields.get("Duration"))
+                if duration is not None:
+                    self.api_durations[api_type].append(duration)
+                self.api_statuses[api_type][fields.get("Status", "unknown")] += 1
+                runs = _int(fields.get("Runs"))
+                jobs = _int(fields.get("Jobs"))
+                self.runs_fetched += runs
+                self.jobs_fetched += jobs
+                self.timeline[bucket]["api_calls"] += 1
+                self.timeline[bucket]["runs"] += runs
+                self.timeline[bucket]["jobs"] += jobs
+            elif message.startswith("RATE_LIMIT_SLEEP - "):
+                fields = _parse_fields(message.split(" - ")[1:])
+                self.rate_limit_sleeps += 1
+                self.rate_limit_sleep_seconds += _seconds(fields.get("Duration")) or 0.0
+                self.timeline[bucket]["rate_limit_sleeps"] += 1
+            elif message.startswith("PHASE_END - "):
+                parts = message.split(" - ")
+                duration = _seconds(_parse_fields(parts[2:]).get("Total Duration"))
+                if duration is not None:
+                    self.phase_durations[parts[1]].append(duration)
+            else:
+                repository = REPOSITORY_PATTERN.match(message)
+                if repository:
+                    self.repositories.add(repository.group(1))
+
+        if first_time is not None:
+            self.wall_seconds += (last_time - first_time).total_seconds()
+
+    def _rate(self, count: int, phase_prefix: str) -> Optional[float]:
+        seconds = sum(
+            sum(durations) for phase, durations in self.phase_durations.items()
+            if phase.startswith(phase_prefix)
+        ) or self.wall_seconds
+        return count / seconds if seconds > 0 else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary of the statistics as a JSON-serializable dict."""
+        api = {}
+        for api_type in sorted(self.api_statuses):
+            durations = sorted(self.api_durations.get(api_type, []))
+            api[api_type] = {
+                "calls": sum(self.api_statuses[api_type].values()),
+                "statuses": dict(sorted(self.api_statuses[api_type].items())),
+                "mean": sum(durations) / len(durations) if durations else None,
+                "max": durations[-1] if durations else None,
+                **{f"p{pct}": percentile(durations, pct) for pct in PERCENTILES},
+            }
+
+        return {
+            "name": self.name,
+            "files": len(self.files),
+            "repositories": sorted(self.repositories),
+            "api": api,
+            "runs_fetched": self.runs_fetched,
+            "jobs_fetched": self.jobs_fetched,
+            "runs_per_second": self._rate(self.runs_fetched, "PHASE_1"),
+            "jobs_per_second": self._rate(self.jobs_fetched, "PHASE_2"),
+            "rate_limit_sleeps": self.rate_limit_sleeps,
+            "rate_limit_sleep_seconds": self.rate_limit_sleep_seconds,
+            "phases": {
+                phase: {"count": len(durations), "total": sum(durations), "mean": sum(durations) / len(durations)}
+                for phase, durations in sorted(self.phase_durations.items())
+            },
+            "throughput": [
+                {"start": bucket * self.interval, **dict(counts)}
+                for bucket, counts in sorted(self.timeline.items())
+            ],
+            "wall_seconds": self.wall_seconds,
+            "unparsed_lines": self.unparsed_lines,
+        }
+
+
+def analyze(paths: Iterable[str], group_by: str = "all", interval: float = 60.0) -> List[Dict[str, Any]]:
+    """
+    Analyze performance logs.
+
+    Args:
+        paths: Log file paths
+        group_by: 'all' (one report), 'file' or 'repo' (one report per file or repository)
+        interval: Width in seconds of the throughput-over-time buckets
+
+    Returns:
+        One summary dict per group
+    """
+    groups: Dict[str, LogStats] = {}
+    for path in paths:
+        if group_by == "file":
+            key = path
+        elif group_by == "repo":
+            key = _repository_of(path) or path
+        else:
+            key = "all"
+        stats = groups.get(key)
+        if stats is None:
+            stats = groups[key] = LogStats(key, interval)
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            stats.add_file(path, f)
+    return [stats.to_dict() for stats in groups.values()]
+
+
+def _repository_of(path: str) -> Optional[str]:
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for index, line in enumerate(f):
+            match = LINE_PATTERN.match(line.rstrip("\n"))
+            repository = REPOSITORY_PATTERN.match(match.group(2)) if match else None
+            if repository:
+                return repository.group(1)
+            if index >= 10:
+                return None
+    return None
+
+
+def compare(baseline: Dict[str, Any], candidate: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Compare two summaries metric by metric.
+
+    Returns:
+        Rows with the metric name, both values and the relative change in percent
+    """
+    rows = []
+
+    def add(metric, before, after):
+        change = None
+        if before not in (None, 0) and after is not None:
+            change = (after - before) / before * 100
+        rows.append({"metric": metric, "baseline": before, "candidate": after, "change_pct": change})
+
+    for api_type in sorted(set(baseline["api"]) | set(candidate["api"])):
+        before = baseline["api"].get(api_type, {})
+        after = candidate["api"].get(api_type, {})
+        add(f"{api_type} calls", before.get("calls"), after.get("calls"))
+        for pct in PERCENTILES:
+            add(f"{api_type} p{pct} (s)", before.get(f"p{pct}"), after.get(f"p{pct}"))
+    for phase in sorted(set(baseline["phases"]) | set(candidate["phases"])):
+        add(f"{phase} mean (s)",
+            baseline["phases"].get(phase, {}).get("mean"), candidate["phases"].get(phase, {}).get("mean"))
+    add("runs/s", baseline["runs_per_second"], candidate["runs_per_second"])
+    add("jobs/s", baseline["jobs_per_second"], candidate["jobs_per_second"])
+    add("rate limit sleeps", baseline["rate_limit_sleeps"], candidate["rate_limit_sleeps"])
+    return rows
+
+
+def _fmt(value: Any, digits: int = 3) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.{digits}f}"
+    return str(value)
+
+
+def print_summary(summary: Dict[str, Any], out: Optional[TextIO] = None):
+    """Print a summary as text tables."""
+    out = out or sys.stdout
+    repositories = ", ".join(summary["repositories"]) or "unknown"
+    print(f"== {summary['name']} ({summary['files']} file(s); repositories: {repositories})", file=out)
+    print(f"{'API type':<26}{'calls':>8}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  statuses", file=out)
+    for api_type, api in summary["api"].items():
+        statuses = " ".join(f"{status}:{count}" for status, count in api["statuses"].items())
+        print(
+            f"{api_type:<26}{api['calls']:>8}{_fmt(api['p50']):>9}{_fmt(api['p90']):>9}"
+            f"{_fmt(api['p99']):>9}{_fmt(api['max']):>9}  {statuses}",
+            file=out
+        )
+    for phase, stats in summary["phases"].items():
+        print(f"{phase}: {stats['count']} run(s), mean {stats['mean']:.3f}s, total {stats['total']:.3f}s", file=out)
+    print(
+        f"Runs fetched: {summary['runs_fetched']} ({_fmt(summary['runs_per_second'], 1)}/s)  "
+        f"Jobs fetched: {summary['jobs_fetched']} ({_fmt(summary['jobs_per_second'], 1)}/s)",
+        file=out
+    )
+    print(
+        f"Rate limit sleeps: {summary['rate_limit_sleeps']} ({summary['rate_limit_sleep_seconds']:.1f}s)",
+        file=out
+    )
+    if summary["throughput"]:
+        print("Throughput over time:", file=out)
+        for bucket in summary["throughput"]:
+            print(
+                f"  +{bucket['start']:>7.0f}s  api calls {bucket.get('api_calls', 0):>5}  "
+                f"runs {bucket.get('runs', 0):>6}  jobs {bucket.get('jobs', 0):>6}  "
+                f"rate limit sleeps {bucket.get('rate_limit_sleeps', 0)}",
+                file=out
+            )
+    print(file=out)
+
+
+def print_comparison(rows: List[Dict[str, Any]], out: Optional[TextIO] = None):
+    """Print a comparison as a text table."""
+    out = out or sys.stdout
+    print(f"{'metric':<40}{'baseline':>12}{'candidate':>12}{'change':>10}", file=out)
+    for row in rows:
+        change = f"{row['change_pct']:+.1f}%" if row["change_pct"] is not None else "-"
+        print(f"{row['metric']:<40}{_fmt(row['baseline']):>12}{_fmt(row['candidate']):>12}{change:>10}", file=out)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Analyze GHA Dashboard performance logs")
+    parser.add_argument("logs", nargs="+", help="Performance log files (backend/logs/performance_*.log)")
+    parser.add_argument("--baseline", nargs="+", help="Log files to compare the analyzed logs against")
+    parser.add_argument("--group-by", choices=("all", "file", "repo"), default="all",
+                        help="Report per file or per repository instead of one combined report")
+    parser.add_argument("--interval", type=float, default=60.0, help="Throughput bucket width in seconds")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of text")
+    args = parser.parse_args(argv)
+
+    summaries = analyze(args.logs, args.group_by, args.interval)
+    result: Dict[str, Any] = {"reports": summaries}
+    if args.baseline:
+        baseline = analyze(args.baseline, "all", args.interval)[0]
+        candidate = analyze(args.logs, "all", args.interval)[0]
+        result["baseline"] = baseline
+        result["comparison"] = compare(baseline, candidate)
+
+    if args.json:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+        return
+
+    for summary in summaries:
+        print_summary(summary)
+    if args.baseline:
+        print_comparison(result["comparison"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,509 @@
+"""
+Synthetic repository history generator for load and scale testing.
+
+Samples a whole history of workflow runs and their jobs with NumPy (1M runs in a
+few seconds) and materializes them on demand in the dashboard storage format
+(the output of convert_ghaminer_run_to_dashboard and Phase 2 jobs) or in the
+GitHub API format served by perf.fake_github.
+
+    python -m perf.synthetic write owner/repo --runs 1000000
+    python -m perf.synthetic serve owner/repo --runs 100000 --port 8765
+    python -m perf.synthetic fixture owner/repo --runs 5000 -o owner_repo.json
+
+Re-runs are modelled as separate runs on the same commit and workflow with
+run_attempt 2; a flaky run is a failure whose re-run succeeds.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+backend_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
+from core.utils.github import github_api_url
+from perf.fake_github import RUN_ID_BASE, FakeGitHubServer, FakeRepository, _MappedSequence, parse_created_filter
+
+SUCCESS, FAILURE, CANCELLED = 0, 1, 2
+CONCLUSION_NAMES = ("success", "failure", "cancelled")
+EVENT_NAMES = ("push", "pull_request", "schedule", "workflow_dispatch")
+PUSH, PULL_REQUEST, SCHEDULE, WORKFLOW_DISPATCH = range(4)
+WORKFLOW_NAMES = ("CI", "Tests", "Lint", "Release", "Docs", "Nightly", "CodeQL", "Deploy")
+JOB_NAMES = ("build", "test", "lint", "typecheck", "integration", "package", "docs", "deploy")
+
+
+@dataclass
+class SyntheticHistoryConfig:
+    """Shape of a generated repository history."""
+
+    repo: str = "synthetic/repo"
+    runs: int = 10_000
+    workflows: int = 5
+    branches: int = 50
+    actors: int = 30
+    main_branch_share: float = 0.6
+    runs_per_commit: float = 2.0
+    runs_per_day: float = 200.0
+    jobs_min: int = 1
+    jobs_max: int = 8
+    steps_per_job: int = 5
+    failure_rate: float = 0.08
+    flake_rate: float = 0.04
+    cancel_rate: float = 0.02
+    rerun_rate: float = 0.5
+    duration_median_seconds: float = 300.0
+    duration_sigma: float = 0.6
+    schedule_share: float = 0.05
+    start: datetime = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    seed: int = 0
+
+
+def _zipf_weights(count: int, exponent: float = 1.0) -> np.ndarray:
+    weights = 1.0 / np.arange(1, count + 1) ** exponent
+    return weights / weights.sum()
+
+
+def _iso_times(epoch_seconds: np.ndarray) -> List[str]:
+    return np.datetime_as_string(epoch_seconds.astype("datetime64[s]"), unit="s", timezone="UTC").tolist()
+
+
+class SyntheticHistory:
+    """
+    Columns of a generated history, ordered by creation time (index 0 = oldest run).
+    Run IDs are RUN_ID_BASE + index + 1, as for perf.fake_github.SyntheticRepository.
+    """
+
+    def __init__(self, config: SyntheticHistoryConfig):
+        self.config = config
+        rng = np.random.default_rng(config.seed)
+        base_count = max(1, config.runs)
+
+        # Runs arrive as a Poisson process
+        start = config.start.timestamp()
+        created = start + np.cumsum(rng.exponential(86400.0 / config.runs_per_day, base_count))
+        workflow = rng.choice(config.workflows, base_count, p=_zipf_weights(config.workflows)).astype(np.int32)
+        if config.branches > 1:
+            feature_branch = rng.choice(config.branches - 1, base_count, p=_zipf_weights(config.branches - 1, 0.8)) + 1
+            branch = np.where(rng.random(base_count) < config.main_branch_share, 0, feature_branch).astype(np.int32)
+        else:
+            branch = np.zeros(base_count, dtype=np.int32)
+        actor = rng.choice(config.actors, base_count, p=_zipf_weights(config.actors)).astype(np.int32)
+        new_commit = rng.random(base_count) < 1.0 / max(1.0, config.runs_per_commit)
+        new_commit[0] = True
+        commit = np.cumsum(new_commit).astype(np.int64) - 1
+        event = np.where(
+            branch == 0,
+            np.where(rng.random(base_count) < config.schedule_share, SCHEDULE, PUSH),
+            np.where(rng.random(base_count) < 0.9, PULL_REQUEST, WORKFLOW_DISPATCH),
+        ).astype(np.int8)
+
+        # Per-workflow run numbers (runs are already in creation order)
+        order = np.argsort(workflow, kind="stable")
+        counts = np.bincount(workflow, minlength=config.workflows)
+        run_number = np.empty(base_count, dtype=np.int64)
+        run_number[order] = np.arange(base_count) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+
+        # Log-normal durations around a per-workflow median; failures stop early
+        workflow_median = config.duration_median_seconds * rng.lognormal(0.0, 0.5, config.workflows)
+        duration = rng.lognormal(np.log(workflow_median[workflow]), config.duration_sigma)
+        outcome = rng.random(base_count)
+        flaky = (outcome >= config.failure_rate) & (outcome < config.failure_rate + config.flake_rate)
+        conclusion = np.full(base_count, SUCCESS, dtype=np.int8)
+        conclusion[outcome < config.failure_rate + config.flake_rate] = FAILURE
+        conclusion[
+            (outcome >= config.failure_rate + config.flake_rate)
+            & (outcome < config.failure_rate + config.flake_rate + config.cancel_rate)
+        ] = CANCELLED
+        duration = np.where(conclusion == SUCCESS, duration, duration * rng.uniform(0.1, 1.0, base_count))
+
+        # Re-runs of failed runs: same commit, workflow and run number, second attempt
+        rerun = (conclusion == FAILURE) & (rng.random(base_count) < config.rerun_rate)
+        rerun_count = int(rerun.sum())
+        rerun_created = created[rerun] + duration[rerun] + rng.exponential(1800.0, rerun_count)
+        rerun_duration = rng.lognormal(np.log(workflow_median[workflow[rerun]]), config.duration_sigma)
+        rerun_conclusion = np.where(flaky[rerun], SUCCESS, FAILURE).astype(np.int8)
+
+        columns = {
+            "created": np.concatenate([created, rerun_created]),
+            "workflow": np.concatenate([workflow, workflow[rerun]]),
+            "branch": np.concatenate([branch, branch[rerun]]),
+            "actor": np.concatenate([actor, actor[rerun]]),
+            "commit": np.concatenate([commit, commit[rerun]]),
+            "event": np.concatenate([event, event[rerun]]),
+            "run_number": np.concatenate([run_number, run_number[rerun]]),
+            "attempt": np.concatenate([np.ones(base_count, dtype=np.int8), np.full(rerun_count, 2, dtype=np.int8)]),
+            "duration": np.concatenate([duration, rerun_duration]),
+            "conclusion": np.concatenate([conclusion, rerun_conclusion]),
+        }
+        # Keep the oldest `runs` runs: a kept re-run always has its original run
+        order = np.argsort(columns["created"], kind="stable")[:config.runs]
+        for name, values in columns.items():
+            setattr(self, name, values[order])
+        self.created = np.floor(self.created).astype(np.int64)
+        self.duration = np.maximum(1, np.round(self.duration)).astype(np.int64)
+        self.updated = self.created + self.duration
+
+        # Jobs run in parallel after a queueing delay; a failed run has one failing job
+        self.workflow_jobs = rng.integers(config.jobs_min, config.jobs_max + 1, config.workflows)
+        job_counts = self.workflow_jobs[self.workflow]
+        self.job_offsets = np.concatenate([[0], np.cumsum(job_counts)])
+        job_run = np.repeat(np.arange(len(self.created)), job_counts)
+        job_index = np.arange(len(job_run)) - np.repeat(self.job_offsets[:-1], job_counts)
+        queue_delay = np.minimum(rng.integers(0, 30, len(job_run)), self.duration[job_run] - 1)
+        job_duration = np.maximum(1, (self.duration[job_run] - queue_delay) * rng.uniform(0.4, 1.0, len(job_run)))
+        self.job_started = self.created[job_run] + queue_delay
+        self.job_completed = self.job_started + job_duration.astype(np.int64)
+        failing_job = (rng.random(len(self.created)) * job_counts).astype(np.int64)[job_run]
+        run_conclusion = self.conclusion[job_run]
+        self.job_conclusion = np.full(len(job_run), SUCCESS, dtype=np.int8)
+        self.job_conclusion[(run_conclusion == FAILURE) & (job_index == failing_job)] = FAILURE
+        self.job_conclusion[(run_conclusion == CANCELLED) & (job_index >= failing_job)] = CANCELLED
+        self.job_index = job_index
+
+        commit_count = int(self.commit.max()) + 1 if len(self.commit) else 0
+        self._commit_shas = rng.bytes(20 * commit_count).hex()
+        self._rows: Optional[Dict[str, list]] = None
+        self._job_rows: Optional[Dict[str, list]] = None
+        self._runs_url = github_api_url(f"/repos/{config.repo}/actions/runs")
+
+    def __len__(self):
+        return len(self.created)
+
+    @property
+    def repo(self) -> str:
+        return self.config.repo
+
+    def run_id(self, index: int) -> int:
+        return RUN_ID_BASE + index + 1
+
+    def run_index(self, run_id: int) -> Optional[int]:
+        index = int(run_id) - RUN_ID_BASE - 1
+        return index if 0 <= index < len(self) else None
+
+    def workflow_id(self, workflow: int) -> int:
+        return 1000 + workflow
+
+    def workflow_name(self, workflow: int) -> str:
+        name = WORKFLOW_NAMES[workflow % len(WORKFLOW_NAMES)]
+        return name if workflow < len(WORKFLOW_NAMES) else f"{name} {workflow // len(WORKFLOW_NAMES) + 1}"
+
+    def branch_name(self, branch: int) -> str:
+        return "main" if branch == 0 else f"feature/branch-{branch}"
+
+    def commit_sha(self, commit: int) -> str:
+        return self._commit_shas[commit * 40:(commit + 1) * 40]
+
+    def _columns(self) -> Dict[str, list]:
+        # Python lists (and formatted timestamps) are built once: indexing NumPy arrays per field is slow
+        if self._rows is None:
+            self._rows = {
+                "workflow": self.workflow.tolist(),
+                "branch": self.branch.tolist(),
+                "actor": self.actor.tolist(),
+                "commit": self.commit.tolist(),
+                "event": self.event.tolist(),
+                "run_number": self.run_number.tolist(),
+                "attempt": self.attempt.tolist(),
+                "duration": self.duration.tolist(),
+                "conclusion": self.conclusion.tolist(),
+                "created_at": _iso_times(self.created),
+                "updated_at": _iso_times(self.updated),
+            }
+        return self._rows
+
+    def _job_columns(self) -> Dict[str, list]:
+        # Built separately: formatting the timestamps of every job dominates materialization
+        if self._job_rows is None:
+            self._job_rows = {
+                "started_at": _iso_times(self.job_started),
+                "completed_at": _iso_times(self.job_completed),
+                "duration": (self.job_completed - self.job_started).tolist(),
+                "conclusion": self.job_conclusion.tolist(),
+                "index": self.job_index.tolist(),
+                "offsets": self.job_offsets.tolist(),
+            }
+        return self._job_rows
+
+    def dashboard_run(self, index: int) -> Dict[str, Any]:
+        """Run `index` in the stored dashboard format (convert_ghaminer_run_to_dashboard), without jobs."""
+        rows = self._columns()
+        run_id = self.run_id(index)
+        sha = self.commit_sha(rows["commit"][index])
+        branch = rows["branch"][index]
+        event = rows["event"][index]
+        return {
+            'id': run_id,
+            'workflow_id': self.workflow_id(rows["workflow"][index]),
+            'workflow_name': self.workflow_name(rows["workflow"][index]),
+            'branch': self.branch_name(branch),
+            'actor': f"user{rows['actor'][index]}",
+            'status': 'completed',
+            'conclusion': CONCLUSION_NAMES[rows["conclusion"][index]],
+            'created_at': rows["created_at"][index],
+            'updated_at': rows["updated_at"][index],
+            'duration': float(rows["duration"][index]),
+            'run_number': rows["run_number"][index],
+            'event': EVENT_NAMES[event],
+            'html_url': f"https://github.com/{self.repo}/actions/runs/{run_id}",
+            'pull_request_number': branch if event == PULL_REQUEST else None,
+            'jobs_url': f"{self._runs_url}/{run_id}/jobs",
+            'jobs': [],
+            'commit_sha': sha,
+            'head_sha': sha
+        }
+
+    def dashboard_jobs(self, index: int) -> List[Dict[str, Any]]:
+        """Jobs of run `index` in the stored dashboard format (Phase 2)."""
+        jobs = self._job_columns()
+        return [
+            {
+                'id': None,
+                'name': self._job_name(jobs["index"][job]),
+                'status': 'completed',
+                'conclusion': CONCLUSION_NAMES[jobs["conclusion"][job]],
+                'duration': float(jobs["duration"][job]),
+                'started_at': jobs["started_at"][job],
+                'completed_at': jobs["completed_at"][job]
+            }
+            for job in range(jobs["offsets"][index], jobs["offsets"][index + 1])
+        ]
+
+    def _job_name(self, job_index: int) -> str:
+        name = JOB_NAMES[job_index % len(JOB_NAMES)]
+        return name if job_index < len(JOB_NAMES) else f"{name}-{job_index // len(JOB_NAMES) + 1}"
+
+    def dashboard_runs(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self)):
+            yield self.dashboard_run(index)
+
+    def jobs_by_run(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {str(self.run_id(index)): self.dashboard_jobs(index) for index in range(len(self))}
+
+    def github_run(self, index: int) -> Dict[str, Any]:
+        """Run `index` as returned by the GitHub workflow runs API."""
+        rows = self._columns()
+        run_id = self.run_id(index)
+        actor = {"login": f"user{rows['actor'][index]}"}
+        branch = rows["branch"][index]
+        return {
+            "id": run_id,
+            "name": self.workflow_name(rows["workflow"][index]),
+            "workflow_id": self.workflow_id(rows["workflow"][index]),
+            "run_number": rows["run_number"][index],
+            "run_attempt": rows["attempt"][index],
+            "event": EVENT_NAMES[rows["event"][index]],
+            "status": "completed",
+            "conclusion": CONCLUSION_NAMES[rows["conclusion"][index]],
+            "head_branch": self.branch_name(branch),
+            "head_sha": self.commit_sha(rows["commit"][index]),
+            "actor": actor,
+            "triggering_actor": actor,
+            "created_at": rows["created_at"][index],
+            "run_started_at": rows["created_at"][index],
+            "updated_at": rows["updated_at"][index],
+            "pull_requests": [{"number": branch}] if rows["event"][index] == PULL_REQUEST else [],
+            "html_url": f"https://github.com/{self.repo}/actions/runs/{run_id}",
+        }
+
+    def github_jobs(self, index: int) -> List[Dict[str, Any]]:
+        """Jobs of run `index` as returned by the GitHub jobs API (steps split the job evenly)."""
+        rows = self._columns()
+        job_rows = self._job_columns()
+        steps_per_job = max(1, self.config.steps_per_job)
+        jobs = []
+        for job, dashboard_job in zip(range(job_rows["offsets"][index], job_rows["offsets"][index + 1]),
+                                      self.dashboard_jobs(index)):
+            started = int(self.job_started[job])
+            step_length = max(1, job_rows["duration"][job] // steps_per_job)
+            step_times = _iso_times(np.minimum(started + np.arange(steps_per_job + 1) * step_length,
+                                               int(self.job_completed[job])))
+            conclusion = dashboard_job["conclusion"]
+            steps = [
+                {
+                    "name": f"Step {step + 1}",
+                    "number": step + 1,
+                    "status": "completed",
+                    "conclusion": conclusion if step == steps_per_job - 1 else "success",
+                    "started_at": step_times[step],
+                    "completed_at": step_times[step + 1],
+                }
+                for step in range(steps_per_job)
+            ]
+            jobs.append({
+                "id": self.run_id(index) * 100 + job_rows["index"][job],
+                "run_id": self.run_id(index),
+                "name": dashboard_job["name"],
+                "status": "completed",
+                "conclusion": conclusion,
+                "started_at": dashboard_job["started_at"],
+                "completed_at": dashboard_job["completed_at"],
+                "head_sha": self.commit_sha(rows["commit"][index]),
+                "steps": steps,
+            })
+        return jobs
+
+    def summary(self) -> Dict[str, Any]:
+        reruns = self.attempt == 2
+        return {
+            "repo": self.repo,
+            "runs": len(self),
+            "jobs": int(self.job_offsets[-1]),
+            "workflows": self.config.workflows,
+            "commits": int(self.commit.max()) + 1 if len(self) else 0,
+            "failure_rate": float((self.conclusion == FAILURE).mean()) if len(self) else 0.0,
+            "reruns": int(reruns.sum()),
+            "flaky_reruns": int((reruns & (self.conclusion == SUCCESS)).sum()),
+            "first_run": _iso_times(self.created[:1])[0] if len(self) else None,
+            "last_run": _iso_times(self.created[-1:])[0] if len(self) else None,
+        }
+
+
+def generate_history(config: Optional[SyntheticHistoryConfig] = None, **overrides) -> SyntheticHistory:
+    """
+    Generate a repository history.
+
+    Args:
+        config: Generation parameters (defaults to SyntheticHistoryConfig())
+        **overrides: Fields of the config to override
+
+    Returns:
+        Generated history
+    """
+    config = config or SyntheticHistoryConfig()
+    if overrides:
+        config = SyntheticHistoryConfig(**{**config.__dict__, **overrides})
+    return SyntheticHistory(config)
+
+
+def write_to_storage(history: SyntheticHistory, persistence=None, with_jobs: bool = True):
+    """
+    Write a history into DataPersistence storage (runs, then jobs, in one write each).
+
+    Args:
+        history: Generated history
+        persistence: DataPersistence instance (defaults to DataPersistence())
+        with_jobs: Also store the jobs of every run
+    """
+    if persistence is None:
+        from data.persistence import DataPersistence
+        persistence = DataPersistence()
+
+    persistence.save_runs_batch(history.repo, list(history.dashboard_runs()))
+    if with_jobs:
+        persistence.save_jobs_batch(history.repo, history.jobs_by_run())
+    return persistence
+
+
+class SyntheticHistoryRepository(FakeRepository):
+    """Serves a generated history from perf.fake_github, materializing runs per page."""
+
+    def __init__(self, history: SyntheticHistory):
+        self.history = history
+        self.full_name = history.repo
+        self._selections: Dict[tuple, np.ndarray] = {}
+
+    def workflows(self):
+        return [
+            {
+                "id": self.history.workflow_id(workflow),
+                "name": self.history.workflow_name(workflow),
+                "path": f".github/workflows/{self.history.workflow_name(workflow).lower().replace(' ', '_')}.yml",
+                "state": "active",
+            }
+            for workflow in range(self.history.config.workflows)
+        ]
+
+    def select_runs(self, workflow_id=None, created=None):
+        key = (workflow_id, created)
+        indices = self._selections.get(key)
+        if indices is None:
+            earliest, latest = parse_created_filter(created)
+            low, high = 0, len(self.history)
+            if earliest is not None:
+                low = int(np.searchsorted(self.history.created, earliest.replace(tzinfo=timezone.utc).timestamp(), "left"))
+            if latest is not None:
+                high = int(np.searchsorted(self.history.created, latest.replace(tzinfo=timezone.utc).timestamp(), "right"))
+            indices = np.arange(low, max(low, high))
+            if workflow_id is not None:
+                indices = indices[self.history.workflow[low:max(low, high)] == workflow_id - self.history.workflow_id(0)]
+            indices = indices[::-1]
+            self._selections[key] = indices
+        return _MappedSequence(indices, lambda index: self.history.github_run(int(index)))
+
+    def jobs(self, run_id):
+        index = self.history.run_index(run_id)
+        return None if index is None else self.history.github_jobs(index)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Synthetic repository history generator")
+    parser.add_argument("command", choices=("write", "serve", "fixture", "summary"),
+                        help="write into DataPersistence storage, serve from the fake GitHub server, "
+                             "export a fake server fixture, or only print the summary")
+    parser.add_argument("repo", help="Repository name (owner/name)")
+    parser.add_argument("--runs", type=int, default=10_000)
+    parser.add_argument("--workflows", type=int, default=5)
+    parser.add_argument("--branches", type=int, default=50)
+    parser.add_argument("--actors", type=int, default=30)
+    parser.add_argument("--jobs-min", type=int, default=1)
+    parser.add_argument("--jobs-max", type=int, default=8)
+    parser.add_argument("--failure-rate", type=float, default=0.08)
+    parser.add_argument("--flake-rate", type=float, default=0.04)
+    parser.add_argument("--rerun-rate", type=float, default=0.5)
+    parser.add_argument("--runs-per-day", type=float, default=200.0)
+    parser.add_argument("--duration-median", type=float, default=300.0, help="Median run duration in seconds")
+    parser.add_argument("--duration-sigma", type=float, default=0.6, help="Sigma of the log-normal durations")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=None, help="Storage directory for 'write' (defaults to DataPersistence's)")
+    parser.add_argument("--no-jobs", action="store_true", help="Do not store jobs with 'write'")
+    parser.add_argument("-o", "--output", default=None, help="Fixture file for 'fixture'")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    start_time = time.perf_counter()
+    history = generate_history(
+        repo=args.repo, runs=args.runs, workflows=args.workflows, branches=args.branches, actors=args.actors,
+        jobs_min=args.jobs_min, jobs_max=args.jobs_max, failure_rate=args.failure_rate, flake_rate=args.flake_rate,
+        rerun_rate=args.rerun_rate, runs_per_day=args.runs_per_day, duration_median_seconds=args.duration_median,
+        duration_sigma=args.duration_sigma, seed=args.seed,
+    )
+    print(f"[Synthetic] Generated history in {time.perf_counter() - start_time:.2f}s: {json.dumps(history.summary())}")
+
+    if args.command == "write":
+        from data.persistence import DataPersistence
+        start_time = time.perf_counter()
+        persistence = write_to_storage(history, DataPersistence(args.data_dir), not args.no_jobs)
+        print(f"[Synthetic] Wrote {len(history)} runs to {persistence.data_dir} in {time.perf_counter() - start_time:.2f}s")
+    elif args.command == "fixture":
+        if not args.output:
+            parser.error("fixture requires --output")
+        repository = SyntheticHistoryRepository(history)
+        fixture = {
+            "full_name": history.repo,
+            "workflows": repository.workflows(),
+            "runs": [history.github_run(index) for index in range(len(history))],
+            "jobs": {str(history.run_id(index)): history.github_jobs(index) for index in range(len(history))},
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(fixture, f)
+        print(f"[Synthetic] Wrote fixture to {args.output}")
+    elif args.command == "serve":
+        server = FakeGitHubServer([SyntheticHistoryRepository(history)], args.host, args.port, latency=args.latency)
+        print(f"[Synthetic] Serving {history.repo} on {server.url} (GITHUB_API_URL={server.url})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()